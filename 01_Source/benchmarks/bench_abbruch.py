@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Abbruch und Zeitlimit der Zeitraum-Exporte (teamflow_export_abbruch)
+Fuer --eintraege Eintraege und jede Variante (pdf, pdf mit 2 Prozessen,
+xlsx/openpyxl, xlsx/streaming, xlsx/nativ):
+
+    ohne/mit    create_* mit KEIN_FORTSCHRITT gegen create_* mit
+                Abbruch.ueberwache() und einem Zeitlimit, das nie ablaeuft –
+                beste Zeit aus --runs Laeufen, abwechselnd
+    Pruefungen  Anzahl der Pruefungen und laengste Pause dazwischen (so lange
+                dauert ein Abbruch im schlimmsten Fall)
+    Anteil      Kosten der Pruefungen an der Exportzeit: Zaehler.weiter() pro
+                Zeile isoliert gemessen mal Zeilen – ganze Exporte schwanken
+                hier staerker als der Unterschied
+
+Danach als eigene Prozesse, wie main.js sie startet:
+
+    --timeout-s   die Haelfte der Exportzeit ("ohne" oben) – die Frist laeuft
+                  erst ab main(), nach den Importen
+    SIGTERM       eine halbe Exportzeit vor dem Ende eines ganzen Prozesses,
+                  also mitten im Export (nicht unter Windows)
+    stdin         --abbruch-stdin und "abbrechen" ebenso
+    alte Datei    --timeout-s, bevor der Export schreibt: die vorhandene
+                  Zieldatei bleibt unveraendert
+
+Erwartet werden Exit-Code 3 und keine angefangene Datei; ausgegeben wird die
+Zeit vom Ausloeser bis zum Prozessende (beim Zeitlimit ab dem Prozessstart,
+also mit Importen). Weicht etwas ab oder liegt der Anteil ueber --max-anteil,
+Exit-Code 1.
+
+Aufruf: python benchmarks/bench_abbruch.py [--eintraege 20000] [--runs 3]
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+sys.path.insert(0, SCRIPTS)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from export_to_excel import create_excel  # noqa: E402
+from export_to_pdf import create_pdf  # noqa: E402
+from teamflow_export_abbruch import EXIT_ABGEBROCHEN, Abbruch  # noqa: E402
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, mit_pruefung  # noqa: E402
+from teamflow_export_modell import lade_json  # noqa: E402
+from teamflow_export_core import auswerten  # noqa: E402
+from teamflow_export_vorschau import merkmale  # noqa: E402
+
+# Variante -> (create, kwargs, Skript, Argumente, Endung)
+VARIANTEN = {
+    "pdf":            (create_pdf,   {"workers": 1},               "export_to_pdf.py",   ["--workers", "1"], ".pdf"),
+    "pdf/2 Prozesse": (create_pdf,   {"workers": 2},               "export_to_pdf.py",   ["--workers", "2"], ".pdf"),
+    "xlsx/openpyxl":  (create_excel, {"streaming_ab": 10 ** 9},    "export_to_excel.py", ["--streaming-ab", str(10 ** 9)], ".xlsx"),
+    "xlsx/streaming": (create_excel, {"streaming_ab": 0},          "export_to_excel.py", ["--streaming-ab", "0"], ".xlsx"),
+    "xlsx/nativ":     (create_excel, {"backend": "nativ"},         "export_to_excel.py", ["--backend", "nativ"], ".xlsx"),
+}
+
+
+# ── Im Prozess ───────────────────────────────────────────────────────────────
+def exportiere(create, pfad, ausgabe, kwargs, fortschritt):
+    """-> (Start, Ende) des create-Aufrufs; die Payload jedes Mal frisch gelesen"""
+    payload = lade_json(pfad)
+    with redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+        start = time.perf_counter()
+        create(payload, ausgabe, fortschritt=fortschritt, **kwargs)
+        return start, time.perf_counter()
+
+
+def miss(create, pfad, ausgabe, kwargs, runs):
+    """Beste Zeit ohne und mit Pruefung; die Varianten laufen abwechselnd"""
+    ohne = mit = float("inf")
+    for _ in range(runs):
+        start, ende = exportiere(create, pfad, ausgabe, kwargs, KEIN_FORTSCHRITT)
+        ohne = min(ohne, ende - start)
+        start, ende = exportiere(create, pfad, ausgabe, kwargs, Abbruch(10 ** 9).ueberwache(KEIN_FORTSCHRITT))
+        mit = min(mit, ende - start)
+    return ohne, mit
+
+
+def pruefungen(create, pfad, ausgabe, kwargs):
+    """Anzahl der Pruefungen und laengste Pause (auch vor der ersten und nach der letzten)"""
+    zeiten = []
+    abbruch = Abbruch(10 ** 9)
+
+    def pruefe():
+        zeiten.append(time.perf_counter())
+        abbruch.pruefe()
+    start, ende = exportiere(create, pfad, ausgabe, kwargs, mit_pruefung(KEIN_FORTSCHRITT, pruefe))
+    zeiten = [start, *zeiten, ende]
+    return len(zeiten) - 2, max(b - a for a, b in zip(zeiten, zeiten[1:]))
+
+
+def kosten_pro_zeile(n=2_000_000):
+    """ns pro Zaehler.weiter() mit Pruefung, abzueglich KEIN_FORTSCHRITT"""
+    def schleife(zaehler):
+        start = time.perf_counter()
+        for _ in range(n):
+            zaehler.weiter()
+        return time.perf_counter() - start
+
+    ohne = schleife(KEIN_FORTSCHRITT.zaehler("x", n))
+    mit = schleife(Abbruch(10 ** 9).ueberwache(KEIN_FORTSCHRITT).zaehler("x", n))
+    return (mit - ohne) / n * 1e9
+
+
+# ── Als Prozess ──────────────────────────────────────────────────────────────
+def abbrechen(skript, argumente, eingabe, ausgabe, art=None, nach=0.0):
+    """
+    Startet den Export, loest nach `nach` Sekunden aus -> (Exit-Code, Sekunden
+    bis Ende, stderr). Ohne art laeuft der Export durch.
+    """
+    if art == "timeout":
+        argumente = [*argumente, "--timeout-s", f"{nach:.2f}"]
+    elif art == "stdin":
+        argumente = [*argumente, "--abbruch-stdin"]
+    start = time.perf_counter()
+    prozess = subprocess.Popen([sys.executable, os.path.join(SCRIPTS, skript), *argumente, eingabe, ausgabe],
+                               stdin=subprocess.PIPE if art == "stdin" else None,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if art in ("sigterm", "stdin"):
+        time.sleep(nach)
+        try:
+            if art == "sigterm":
+                prozess.send_signal(signal.SIGTERM)
+            else:
+                prozess.stdin.write(b"abbrechen\n")
+                prozess.stdin.close()
+        except (BrokenPipeError, ProcessLookupError):
+            pass  # schon fertig – faellt unten am Exit-Code auf
+    fehler = prozess.stderr.read()
+    prozess.wait()
+    return prozess.returncode, time.perf_counter() - start - nach, fehler.decode("utf-8", "replace").strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, default=20000)
+    parser.add_argument("--mitarbeiter", type=int, default=400)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-anteil", type=float, default=0.01,
+                        help="erlaubter Anteil der Pruefungen an der Exportzeit (Standard: 0.01)")
+    args = parser.parse_args()
+
+    pro_typ = max(1, args.eintraege // (args.mitarbeiter * 4))
+    payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ, tage=3 * 365)
+    zeilen = sum(merkmale(auswerten(payload["exportData"]["mitarbeiter"])).values())
+    ok = True
+    exportzeit = {}
+
+    with tempfile.TemporaryDirectory() as ordner:
+        eingabe = os.path.join(ordner, "zeitraum.json")
+        with open(eingabe, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+        pro_zeile = kosten_pro_zeile()
+        print(f"{args.mitarbeiter * pro_typ * 4} Eintraege, {zeilen} Tabellenzeilen, "
+              f"Zaehler.weiter() mit Pruefung {pro_zeile:+.1f} ns pro Zeile\n")
+        print(f"{'':<16}{'ohne':>9}{'mit':>9}{'Pruefungen':>12}{'laengste Pause':>16}{'Anteil':>9}")
+        for name, (create, kwargs, _, _, endung) in VARIANTEN.items():
+            ausgabe = os.path.join(ordner, "ausgabe" + endung)
+            ohne, mit = miss(create, eingabe, ausgabe, kwargs, args.runs)
+            exportzeit[name] = ohne
+            anzahl, pause = pruefungen(create, eingabe, ausgabe, kwargs)
+            anteil = max(0.0, pro_zeile) * 1e-9 * zeilen / ohne
+            ok = ok and anteil <= args.max_anteil
+            print(f"{name:<16}{ohne:>8.2f}s{mit:>8.2f}s{anzahl:>12}{pause * 1000:>14.0f}ms{anteil:>9.3%}", flush=True)
+
+        print(f"\n{'':<16}{'Ausloeser':<12}{'Exit':>6}{'bis Ende':>10}  Datei")
+        arten = ["timeout", "stdin"] + (["sigterm"] if os.name == "posix" else [])
+        for name, (_, _, skript, argumente, endung) in VARIANTEN.items():
+            ausgabe = os.path.join(ordner, "abbruch" + endung)
+            _, gesamt, _ = abbrechen(skript, argumente, eingabe, ausgabe)
+            haelfte = exportzeit[name] / 2
+            for art in arten:
+                if os.path.exists(ausgabe):
+                    os.remove(ausgabe)
+                code, bis_ende, fehler = abbrechen(skript, argumente, eingabe, ausgabe, art,
+                                                   haelfte if art == "timeout" else gesamt - haelfte)
+                uebrig = os.path.exists(ausgabe)
+                ok = ok and code == EXIT_ABGEBROCHEN and not uebrig
+                print(f"{name:<16}{art:<12}{code:>6}{bis_ende * 1000:>8.0f}ms  "
+                      f"{'liegt noch da' if uebrig else '-'}{'' if code == EXIT_ABGEBROCHEN else '  ' + fehler}")
+
+            # Vorhandene Datei, Abbruch vor dem Schreiben: bleibt, wie sie war
+            with open(ausgabe, "wb") as f:
+                f.write(b"alt")
+            code, _, _ = abbrechen(skript, argumente, eingabe, ausgabe, "timeout", 0.01)
+            with open(ausgabe, "rb") as f:
+                alt = f.read() == b"alt"
+            ok = ok and code == EXIT_ABGEBROCHEN and alt
+            print(f"{name:<16}{'alte Datei':<12}{code:>6}{'':>10}  {'unveraendert' if alt else 'VERAENDERT'}")
+
+    if not ok:
+        print("\nAbbruch fehlerhaft oder Pruefungen zu teuer")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
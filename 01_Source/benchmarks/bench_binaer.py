@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Einlesen der Zeitraum-Payload als JSON vs. Binaerformat (.tfex)
+Misst pro Groesse Dateigroesse und beste Ladezeit von lade_json fuer
+
+    json    – JSON mit indent=2 (wie main.js sie bisher geschrieben hat)
+    tfex    – teamflow_export_binaer, per mmap
+
+Vorher wird geprueft, dass die .tfex-Datei dieselbe Payload ergibt (inkl.
+Sonderfaellen: Datum mit Uhrzeit, Abteilung None, unbekannter Typ) und dass
+export_to_excel und export_to_pdf daraus dieselbe Datei erzeugen wie aus der
+JSON (ohne die Zeitstempel, siehe bench_stdio.vergleichbar). Bei einer
+Abweichung Exit-Code 1.
+
+Aufruf: python benchmarks/bench_binaer.py [--eintraege 10000 100000] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HIER        = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+sys.path.insert(0, SCRIPTS_DIR)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from bench_stdio import vergleichbar  # noqa: E402
+from teamflow_export_modell import lade_json  # noqa: E402
+from teamflow_export_binaer import schreibe_binaer  # noqa: E402
+from teamflow_export_cache import _json_default  # noqa: E402
+
+
+def _normalisiert(payload):
+    return json.dumps(payload, sort_keys=True, default=_json_default)
+
+
+def schreibe_beide(payload, ordner):
+    json_pfad = os.path.join(ordner, "payload.json")
+    tfex_pfad = os.path.join(ordner, "payload.tfex")
+    with open(json_pfad, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    schreibe_binaer(lade_json(json_pfad), tfex_pfad)
+    return json_pfad, tfex_pfad
+
+
+def pruefe(ordner):
+    payload = erzeuge_zeitraum_payload(30, 5)
+    payload["erstelltAm"] = "2025-01-02T03:04"
+    liste = payload["exportData"]["mitarbeiter"]
+    liste[0]["eintraege"][0]["von_datum"] = "2025-01-01T10:00"
+    liste[0]["eintraege"][1]["notiz"] = "Umlaute äöü & <Klammern>"
+    liste[1]["mitarbeiter"]["abteilung"] = None
+    liste[2]["eintraege"][0]["typ"] = "sonderurlaub"
+    json_pfad, tfex_pfad = schreibe_beide(payload, ordner)
+
+    ok = _normalisiert(lade_json(json_pfad)) == _normalisiert(lade_json(tfex_pfad))
+    print(f"{'Payload':<20}{'gleich' if ok else 'ABWEICHUNG'}")
+
+    for script, endung in (("export_to_excel.py", "xlsx"), ("export_to_pdf.py", "pdf")):
+        dateien = []
+        for quelle in (json_pfad, tfex_pfad):
+            ziel = f"{quelle}.{endung}"
+            subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), quelle, ziel],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with open(ziel, "rb") as f:
+                dateien.append(vergleichbar(f.read(), endung))
+        gleich = dateien[0] == dateien[1]
+        ok = ok and gleich
+        print(f"{script:<20}{'gleich' if gleich else 'ABWEICHUNG'}")
+    print()
+    return ok
+
+
+def beste_ladezeit(pfad, runs):
+    beste = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        lade_json(pfad)
+        beste = min(beste, time.perf_counter() - start)
+    return beste * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--mitarbeiter", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as ordner:
+        if not pruefe(ordner):
+            sys.exit(1)
+
+        print(f"{'Eintraege':>9} {'Format':>6} {'Datei':>10} {'Laden':>9}")
+        for n in args.eintraege:
+            pro_typ = max(1, n // (args.mitarbeiter * 4))
+            pfade = schreibe_beide(erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ), ordner)
+            for name, pfad in zip(("json", "tfex"), pfade):
+                kb = os.path.getsize(pfad) / 1024
+                print(f"{args.mitarbeiter * pro_typ * 4:>9} {name:>6} {kb:>7.0f} KB "
+                      f"{beste_ladezeit(pfad, args.runs):>6.0f} ms", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Datumsformatierung (teamflow_export_datum.fmt_datum)
+Formatiert alle Von/Bis-Daten einer Zeitraum-Payload wie die Detail-Schleifen
+der Exporte und gibt die beste Zeit aus --runs Laeufen aus fuer
+
+    strptime  – das fruehere fmt_datum der Scripts (strptime + strftime je Aufruf)
+    kalt      – fmt_datum mit leerem Zwischenspeicher (wie der erste Export
+                in einem neuen Prozess)
+    warm      – fmt_datum, alle Daten schon einmal gesehen (export_worker)
+
+Vorher wird fmt_datum mit dem frueheren Verhalten verglichen – fuer leere,
+unlesbare und ungewoehnliche Eingaben (Uhrzeit dahinter, 2025-1-5, 30.
+Februar, Nicht-Strings, ...) und zufaellige Texte, jeweils mit "" und "–"
+fuer leere Daten. Bei einer Abweichung Exit-Code 1.
+
+Aufruf: python benchmarks/bench_datum.py [--eintraege 100000] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from teamflow_export_modell import eintraege  # noqa: E402
+import teamflow_export_datum  # noqa: E402
+from teamflow_export_datum import fmt_datum  # noqa: E402
+
+
+def fmt_datum_alt(d, leer=""):
+    """Wie bisher in jedem Script"""
+    if not d:
+        return leer
+    try:
+        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
+    except Exception:
+        return d
+
+
+def pruefe():
+    rng = random.Random(1)
+    faelle = ["", None, 0, 7, [], ["x"], b"2025-01-05", "2025-01-05", "2025-01-05T10:00", "2025-1-5",
+              "2025-02-29", "2024-02-29", "2025-02-30", "0000-01-01", "0999-03-04", "9999-12-31",
+              "2025/01/05", " 2025-01-05", "2025-01-5x", "٢٠٢٥-01-05", "2025-0_-05", "abc"]
+    for _ in range(20000):
+        faelle.append("".join(rng.choice("0123456789- T:x") for _ in range(rng.randint(0, 14))))
+        faelle.append(f"{rng.randint(1, 9999):04d}-{rng.randint(0, 13):02d}-{rng.randint(0, 32):02d}")
+
+    fehler = 0
+    for d in faelle:
+        for leer in ("", "–"):
+            alt, neu = fmt_datum_alt(d, leer), fmt_datum(d, leer)
+            if alt != neu or type(alt) is not type(neu):
+                fehler += 1
+                if fehler <= 10:
+                    print(f"ABWEICHUNG: {d!r}: {alt!r} statt {neu!r}")
+    print(f"{'Pruefung':<10}{len(faelle)} Eingaben, {'ok' if not fehler else 'FEHLER'}\n")
+    return not fehler
+
+
+def beste(funktion, daten, runs, vorher=None):
+    zeit = float("inf")
+    for _ in range(runs):
+        if vorher:
+            vorher()
+        start = time.perf_counter()
+        for d in daten:
+            funktion(d)
+        zeit = min(zeit, time.perf_counter() - start)
+    return zeit * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, default=100000)
+    parser.add_argument("--mitarbeiter", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if not pruefe():
+        sys.exit(1)
+
+    pro_typ = max(1, args.eintraege // (args.mitarbeiter * 4))
+    payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ, tage=3 * 365)
+    daten = []
+    for ma in payload["exportData"]["mitarbeiter"]:
+        for e in eintraege(ma["eintraege"]):
+            daten += (e.von, e.bis)
+
+    alt = beste(fmt_datum_alt, daten, args.runs)
+    kalt = beste(fmt_datum, daten, args.runs, vorher=teamflow_export_datum._FORMATIERT.clear)
+    warm = beste(fmt_datum, daten, args.runs)
+    print(f"{len(daten)} Daten ({len(set(daten))} verschieden)")
+    print(f"{'strptime':<10}{alt:>8.1f} ms")
+    print(f"{'kalt':<10}{kalt:>8.1f} ms  {alt / kalt:>5.1f}x")
+    print(f"{'warm':<10}{warm:>8.1f} ms  {alt / warm:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: warmer Export-Worker vs. ein Prozess pro Export
+Vergleicht die Latenz pro Export fuer beide Wege, die main.js nutzen kann.
+
+Aufruf: python benchmarks/bench_export_worker.py [--runs 5] [--mitarbeiter 30]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HIER        = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import erzeuge_zeitraum_payload, erzeuge_jahres_payload, erzeuge_stammdaten_payload  # noqa: E402
+
+FAELLE = [
+    # (kind, script, endung, payload-fabrik)
+    ("excel",             "export_to_excel.py",            "xlsx", None),
+    ("pdf",               "export_to_pdf.py",              "pdf",  None),
+    ("employeeDetailPdf", "export_employee_detail.py",     "pdf",  erzeuge_stammdaten_payload),
+    ("employeeYearPdf",   "export_employee_year.py",       "pdf",  erzeuge_jahres_payload),
+    ("employeeYearExcel", "export_employee_year_excel.py", "xlsx", erzeuge_jahres_payload),
+]
+
+
+def miss_einzelprozess(script, payload, out_dir, endung, runs):
+    json_pfad = os.path.join(out_dir, "payload.json")
+    with open(json_pfad, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    zeiten = []
+    for i in range(runs):
+        ziel = os.path.join(out_dir, f"spawn_{i}.{endung}")
+        start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), json_pfad, ziel],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        zeiten.append((time.perf_counter() - start) * 1000)
+    return zeiten
+
+
+def miss_worker(worker, kind, payload, out_dir, endung, runs):
+    zeiten = []
+    for i in range(runs):
+        ziel = os.path.join(out_dir, f"worker_{kind}_{i}.{endung}")
+        start = time.perf_counter()
+        worker.stdin.write(json.dumps({"id": str(i), "kind": kind, "payload": payload, "output": ziel}).encode("utf-8") + b"\n")
+        worker.stdin.flush()
+        antwort = json.loads(worker.stdout.readline())
+        zeiten.append((time.perf_counter() - start) * 1000)
+        if not antwort.get("ok"):
+            raise RuntimeError(antwort.get("error"))
+    return zeiten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mitarbeiter", type=int, default=30)
+    args = parser.parse_args()
+
+    zeitraum = erzeuge_zeitraum_payload(mitarbeiter=args.mitarbeiter)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        worker = subprocess.Popen([sys.executable, os.path.join(SCRIPTS_DIR, "export_worker.py")],
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        json.loads(worker.stdout.readline())  # ready-Meldung
+        worker_start_ms = (time.perf_counter() - start) * 1000
+
+        print(f"Worker-Start (einmalig): {worker_start_ms:8.1f} ms\n")
+        print(f"{'Export':<20}{'Einzelprozess':>16}{'Worker (warm)':>16}{'Faktor':>9}")
+        try:
+            for kind, script, endung, fabrik in FAELLE:
+                payload = fabrik() if fabrik else zeitraum
+                spawn = statistics.median(miss_einzelprozess(script, payload, out_dir, endung, args.runs))
+                warm  = statistics.median(miss_worker(worker, kind, payload, out_dir, endung, args.runs))
+                print(f"{kind:<20}{spawn:>13.1f} ms{warm:>13.1f} ms{spawn / warm:>8.1f}x")
+        finally:
+            worker.stdin.close()
+            worker.wait()
+
+
+if __name__ == "__main__":
+    main()
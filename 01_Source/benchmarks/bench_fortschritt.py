@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kosten der Fortschrittsmeldungen (--fortschritt)
+Rendert dieselbe Zeitraum-Payload mit create_excel (normal und Streaming) und
+create_pdf jeweils
+
+    aus        – KEIN_FORTSCHRITT (Standard ohne --fortschritt)
+    an         – Fortschritt wie mit --fortschritt (JSON-Zeilen, max. 4/s je Phase)
+    jede       – Fortschritt mit intervall=0: jede Pruefung sendet (ungebremst)
+
+und gibt die beste Zeit aus --runs Laeufen (Varianten abwechselnd) und den
+Aufschlag gegenueber "aus" an. Die Meldungen werden wie auf stdout als JSON
+kodiert, aber verworfen. Weil ganze Exporte stark schwanken, wird zusaetzlich
+ein Zaehler.weiter() pro Zeile isoliert gemessen.
+
+Aufruf: python benchmarks/bench_fortschritt.py [--mitarbeiter 200] [--pro-typ 10] [--runs 3]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+sys.path.insert(0, HIER)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, Fortschritt  # noqa: E402
+from teamflow_export_modell import lade_json  # noqa: E402
+import export_to_excel  # noqa: E402
+import export_to_pdf  # noqa: E402
+
+
+def _verwerfen(ereignis):
+    json.dumps(ereignis).encode("utf-8")
+
+
+VARIANTEN = {
+    "aus":  lambda: KEIN_FORTSCHRITT,
+    "an":   lambda: Fortschritt(_verwerfen),
+    "jede": lambda: Fortschritt(_verwerfen, intervall=0),
+}
+
+EXPORTE = {
+    "excel":        (".xlsx", lambda p, a, f: export_to_excel.create_excel(p, a, streaming_ab=10**9, fortschritt=f)),
+    "excel-stream": (".xlsx", lambda p, a, f: export_to_excel.create_excel(p, a, streaming_ab=0, fortschritt=f)),
+    "pdf":          (".pdf",  lambda p, a, f: export_to_pdf.create_pdf(p, a, fortschritt=f, workers=1)),
+}
+
+
+def miss(export, pfad, ordner, runs):
+    """Beste Zeit und Anzahl Meldungen je Variante; die Varianten laufen abwechselnd"""
+    endung, create = EXPORTE[export]
+    ausgabe = os.path.join(ordner, "ausgabe" + endung)
+    ergebnisse = {v: (None, 0) for v in VARIANTEN}
+    for _ in range(runs):
+        for variante, neu in VARIANTEN.items():
+            payload = lade_json(pfad)
+            fortschritt = neu()
+            with redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+                start = time.perf_counter()
+                create(payload, ausgabe, fortschritt)
+                dauer = time.perf_counter() - start
+            beste = ergebnisse[variante][0]
+            ergebnisse[variante] = (dauer if beste is None else min(beste, dauer), getattr(fortschritt, "gesendet", 0))
+    return ergebnisse
+
+
+def kosten_pro_zeile(n=2_000_000):
+    """ns pro Zaehler.weiter() (abzueglich der leeren Schleife) fuer aus/an"""
+    def schleife(zaehler):
+        start = time.perf_counter()
+        for _ in range(n):
+            zaehler.weiter()
+        return time.perf_counter() - start
+
+    class _Leer:
+        def weiter(self, n=1):
+            pass
+
+    leer = schleife(_Leer())
+    return {
+        "aus": (schleife(KEIN_FORTSCHRITT.zaehler("x", n)) - leer) / n * 1e9,
+        "an":  (schleife(Fortschritt(_verwerfen).zaehler("x", n)) - leer) / n * 1e9,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mitarbeiter", type=int, default=200)
+    parser.add_argument("--pro-typ", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    payload = erzeuge_zeitraum_payload(args.mitarbeiter, args.pro_typ)
+    eintraege = sum(len(m["eintraege"]) for m in payload["exportData"]["mitarbeiter"])
+
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, "payload.json")
+        with open(pfad, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+
+        k = kosten_pro_zeile()
+        print(f"Zaehler.weiter() pro Zeile gegenueber leerem Aufruf: aus {k['aus']:+.0f} ns, an {k['an']:+.0f} ns\n")
+
+        print(f"{eintraege} Eintraege, {args.mitarbeiter} Mitarbeiter, bestes von {args.runs}")
+        print(f"{'':<14}{'aus':>9}{'an':>9}{'Meld.':>7}{'Aufschl.':>10}{'jede':>9}{'Meld.':>7}{'Aufschl.':>10}")
+        for export in EXPORTE:
+            r = miss(export, pfad, ordner, args.runs)
+            (aus, _), (an, n_an), (jede, n_jede) = r["aus"], r["an"], r["jede"]
+            print(f"{export:<14}{aus:>8.2f}s{an:>8.2f}s{n_an:>7}{an / aus - 1:>+10.1%}"
+                  f"{jede:>8.2f}s{n_jede:>7}{jede / aus - 1:>+10.1%}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
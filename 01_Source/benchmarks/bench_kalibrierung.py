@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kalibrierung der Export-Vorschau (--dry-run, teamflow_export_vorschau)
+Startet export_to_excel und export_to_pdf je Variante (pdf, xlsx/openpyxl,
+xlsx/streaming, xlsx/nativ) als eigenen Prozess fuer mehrere Payload-Groessen
+und misst Laufzeit (Minimum ueber --wiederholungen Laeufe), Dateigroesse und
+bei der PDF die Seitenzahl. Daraus werden je Variante und Groesse die
+Koeffizienten von
+
+    wert = konstant + zusammenfassung * Zeilen der Zusammenfassung
+                    + details * Zeilen der Details
+
+nach kleinsten Quadraten der relativen Abweichung bestimmt (kleine Exporte
+zaehlen so viel wie grosse) und mit der Abweichung je Messpunkt ausgegeben.
+Mit --schreibe gehen sie nach scripts/teamflow_export_kalibrierung.py (auf
+dem Rechner, fuer den geschaetzt werden soll, neu erzeugen).
+
+Danach laeuft --dry-run von export_to_excel und export_to_pdf fuer die
+groesste Payload; dauert er laenger als --max-anteil des echten Exports in
+derselben Variante, Exit-Code 1.
+
+Aufruf: python benchmarks/bench_kalibrierung.py [--wiederholungen 2] [--schreibe]
+"""
+
+import argparse
+import json
+import os
+import platform
+import pprint
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+sys.path.insert(0, SCRIPTS)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from teamflow_export_core import auswerten  # noqa: E402
+from teamflow_export_vorschau import merkmale  # noqa: E402
+from export_to_excel import STREAMING_AB_EINTRAEGEN  # noqa: E402
+
+ZIEL = os.path.normpath(os.path.join(SCRIPTS, "teamflow_export_kalibrierung.py"))
+
+# (mitarbeiter, eintraege pro typ, abteilungen, tage) – Mitarbeiter und
+# Eintraege unabhaengig voneinander variiert, damit sich die Koeffizienten trennen
+GROESSEN = [
+    (20, 5, 4, 90),
+    (300, 1, 8, 365),
+    (100, 20, 6, 365),
+    (400, 8, 10, 365),
+    (150, 30, 8, 3 * 365),
+    (500, 25, 12, 3 * 365),
+]
+
+# Variante -> (Skript, Argumente, Endung, hoechstens Eintraege)
+VARIANTEN = {
+    "pdf":            ("export_to_pdf.py",   ["--workers", "1"],                 ".pdf",  None),
+    "xlsx/openpyxl":  ("export_to_excel.py", ["--streaming-ab", str(10 ** 9)],  ".xlsx", STREAMING_AB_EINTRAEGEN),
+    "xlsx/streaming": ("export_to_excel.py", ["--streaming-ab", "0"],           ".xlsx", None),
+    "xlsx/nativ":     ("export_to_excel.py", ["--backend", "nativ"],            ".xlsx", None),
+}
+
+MERKMALE = ("konstant", "zusammenfassung", "details")
+
+
+# ── Ausgleichsrechnung ───────────────────────────────────────────────────────
+def kleinste_quadrate(zeilen, werte):
+    """
+    Minimiert die Summe der quadrierten relativen Abweichungen: jede Zeile wird
+    durch ihren Messwert geteilt, dann die Normalgleichungen (X^T X) b = X^T y
+    per Gauss-Elimination geloest
+    """
+    zeilen = [[x / y for x in z] for z, y in zip(zeilen, werte)]
+    werte = [1.0] * len(zeilen)
+    n = len(zeilen[0])
+    a = [[sum(z[i] * z[j] for z in zeilen) for j in range(n)] + [sum(z[i] * y for z, y in zip(zeilen, werte))]
+         for i in range(n)]
+    for k in range(n):
+        p = max(range(k, n), key=lambda r: abs(a[r][k]))
+        a[k], a[p] = a[p], a[k]
+        for r in range(n):
+            if r != k:
+                f = a[r][k] / a[k][k]
+                a[r] = [x - f * y for x, y in zip(a[r], a[k])]
+    return [a[i][n] / a[i][i] for i in range(n)]
+
+
+def zeilen_vektor(m):
+    return [1, m["zusammenfassung"], m["details"]]
+
+
+# ── Messung ──────────────────────────────────────────────────────────────────
+def seiten(pfad):
+    with open(pfad, "rb") as f:
+        return len(re.findall(rb"/Type /Page\b(?!s)", f.read()))
+
+
+def starte(skript, argumente, eingabe, ausgabe):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(SCRIPTS, skript), *argumente, eingabe, ausgabe],
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def miss(ordner, wiederholungen):
+    """Liefert {variante: [(merkmale, {"sekunden", "groesse_kb"[, "seiten"]}), ...]} und die Eingabe-Dateien"""
+    messungen = {v: [] for v in VARIANTEN}
+    eingaben = []
+    for mitarbeiter, pro_typ, abteilungen, tage in GROESSEN:
+        payload = erzeuge_zeitraum_payload(mitarbeiter, pro_typ, tage=tage, anzahl_abteilungen=abteilungen)
+        m = merkmale(auswerten(payload["exportData"]["mitarbeiter"]))
+        eingabe = os.path.join(ordner, f"zeitraum_{mitarbeiter}_{pro_typ}.json")
+        with open(eingabe, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        eingaben.append(eingabe)
+        eintraege = mitarbeiter * pro_typ * 4
+
+        for variante, (skript, argumente, endung, hoechstens) in VARIANTEN.items():
+            if hoechstens is not None and eintraege >= hoechstens:
+                continue
+            ausgabe = os.path.join(ordner, "ausgabe" + endung)
+            zeit = min(starte(skript, argumente, eingabe, ausgabe) for _ in range(wiederholungen))
+            werte = {"sekunden": zeit, "groesse_kb": os.path.getsize(ausgabe) / 1024}
+            if endung == ".pdf":
+                werte["seiten"] = seiten(ausgabe)
+            messungen[variante].append((m, werte))
+            print(f"{variante:<16}{eintraege:>8} Eintr.{zeit:>8.2f}s{werte['groesse_kb']:>10.0f} KB"
+                  f"{werte.get('seiten', ''):>7}", flush=True)
+    return messungen, eingaben
+
+
+def anpassen(messungen):
+    modelle = {}
+    for variante, punkte in messungen.items():
+        x = [zeilen_vektor(m) for m, _ in punkte]
+        modelle[variante] = {
+            groesse: dict(zip(MERKMALE, (round(k, 9) for k in kleinste_quadrate(x, [w[groesse] for _, w in punkte]))))
+            for groesse in punkte[0][1]
+        }
+    return modelle
+
+
+def abweichungen(messungen, modelle):
+    print(f"\n{'Variante':<16}{'Eintr.':>8}  Abweichung der Schaetzung")
+    for variante, punkte in messungen.items():
+        for m, werte in punkte:
+            teile = []
+            for groesse, gemessen in werte.items():
+                geschaetzt = sum(k * v for k, v in zip(modelle[variante][groesse].values(), zeilen_vektor(m)))
+                teile.append(f"{groesse} {geschaetzt / gemessen - 1:+.0%}")
+            print(f"{variante:<16}{m['details']:>8}  {', '.join(teile)}")
+
+
+def schreibe(modelle, wiederholungen):
+    kalibrierung = {
+        "meta": {
+            "erstellt":       datetime.now().isoformat(timespec="seconds"),
+            "python":         platform.python_version(),
+            "plattform":      platform.platform(),
+            "cpus":           os.cpu_count(),
+            "wiederholungen": wiederholungen,
+            "groessen":       GROESSEN,
+        },
+        "modelle": modelle,
+    }
+    with open(ZIEL, "w", encoding="utf-8") as f:
+        f.write("# -*- coding: utf-8 -*-\n"
+                "# Erzeugt von benchmarks/bench_kalibrierung.py – nicht von Hand aendern.\n"
+                "# Koeffizienten der Schaetzung in teamflow_export_vorschau (--dry-run).\n")
+        f.write(f"KALIBRIERUNG = {pprint.pformat(kalibrierung, width=100, sort_dicts=False)}\n")
+    print(f"\nKalibrierung gespeichert: {ZIEL}")
+
+
+def pruefe_dry_run(eingabe, messungen, max_anteil):
+    ok = True
+    print()
+    for skript in ("export_to_pdf.py", "export_to_excel.py"):
+        start = time.perf_counter()
+        ausgabe = subprocess.run([sys.executable, os.path.join(SCRIPTS, skript), "--dry-run", eingabe, "-"],
+                                 check=True, stdout=subprocess.PIPE).stdout
+        dauer = time.perf_counter() - start
+        vorschau = json.loads(ausgabe)
+        # Echter Export derselben Payload in der Variante, die --dry-run schaetzt
+        echt = next(w["sekunden"] for m, w in messungen[vorschau["variante"]]
+                    if m["details"] == vorschau["zeilen"]["details"])
+        ok = ok and dauer <= max_anteil * echt
+        print(f"--dry-run {vorschau['variante']:<16}{vorschau['eintraege']:>8} Eintr.{dauer:>8.2f}s"
+              f"  ({dauer / echt:.1%} von {echt:.2f}s)  geschaetzt {vorschau['geschaetzt']}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wiederholungen", type=int, default=2, metavar="N")
+    parser.add_argument("--schreibe", action="store_true", help=f"Koeffizienten nach {os.path.relpath(ZIEL)}")
+    parser.add_argument("--max-anteil", type=float, default=0.1,
+                        help="erlaubte Dauer von --dry-run, Anteil am echten Export (Standard: 0.1)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as ordner:
+        messungen, eingaben = miss(ordner, args.wiederholungen)
+        modelle = anpassen(messungen)
+        abweichungen(messungen, modelle)
+        if args.schreibe:
+            schreibe(modelle, args.wiederholungen)
+        if not pruefe_dry_run(eingaben[-1], messungen, args.max_anteil):
+            print("--dry-run zu langsam")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
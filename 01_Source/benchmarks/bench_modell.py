@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: dict pro Eintrag vs. teamflow_export_modell.Eintrag
+Schreibt eine synthetische Zeitraum-Payload (Standard: 100.000 Eintraege) als
+JSON und liest sie einmal mit json.load (dicts wie bisher) und einmal mit
+lade_json (Eintrag mit __slots__, Typ-Code, internierte Strings) ein.
+
+Jede Variante laeuft in einem eigenen Prozess. Gemessen werden Einlesezeit,
+Spitzenwert (tracemalloc) waehrend des Einlesens, danach noch belegter
+Speicher, die Zeit fuer auswerten() und – ausser unter Windows – der maximale RSS des Prozesses.
+
+Aufruf: python benchmarks/bench_modell.py [--eintraege 100000] [--mitarbeiter 500]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+
+
+_MESSUNG = r"""
+import json, sys, time, tracemalloc
+sys.path.insert(0, sys.argv[3])
+from teamflow_export_modell import lade_json
+from teamflow_export_core import auswerten
+
+variante, pfad = sys.argv[1], sys.argv[2]
+
+def lade():
+    if variante == "dict":
+        with open(pfad, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    return lade_json(pfad)
+
+# Zeit ohne tracemalloc (das bremst selbst), Speicher in einem zweiten Durchlauf
+start = time.perf_counter()
+payload = lade()
+einlesen = time.perf_counter() - start
+del payload
+
+tracemalloc.start()
+payload = lade()
+belegt, spitze = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+# Einmal durch den Auswertungs-Kern (bei "dict" inklusive Umwandlung)
+start = time.perf_counter()
+auswertung = auswerten(payload["exportData"]["mitarbeiter"])
+auswerten_s = time.perf_counter() - start
+
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    rss = None
+print(json.dumps({"einlesen_s": einlesen, "spitze_mb": spitze / 2**20, "belegt_mb": belegt / 2**20,
+                  "auswerten_s": auswerten_s, "rss_mb": rss, "eintraege": auswertung.anzahl_eintraege}))
+"""
+
+
+def miss(variante, pfad):
+    ergebnis = subprocess.run(
+        [sys.executable, "-c", _MESSUNG, variante, pfad, SCRIPTS],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(ergebnis.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, default=100000)
+    parser.add_argument("--mitarbeiter", type=int, default=500)
+    args = parser.parse_args()
+
+    pro_typ = max(1, args.eintraege // (args.mitarbeiter * 4))
+    payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ)
+
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, "payload.json")
+        with open(pfad, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        del payload
+        groesse = os.path.getsize(pfad) / 2**20
+
+        ergebnisse = {v: miss(v, pfad) for v in ("dict", "modell")}
+
+    n = ergebnisse["dict"]["eintraege"]
+    print(f"{n} Eintraege, {args.mitarbeiter} Mitarbeiter, JSON {groesse:.1f} MB")
+    print(f"{'':>8} {'Einlesen':>9} {'Spitze':>9} {'belegt':>9} {'auswerten':>10} {'max RSS':>9}")
+    for variante, r in ergebnisse.items():
+        rss = f"{r['rss_mb']:.0f} MB" if r["rss_mb"] is not None else "–"
+        print(f"{variante:>8} {r['einlesen_s']:>8.2f}s {r['spitze_mb']:>6.0f} MB {r['belegt_mb']:>6.0f} MB "
+              f"{r['auswerten_s']:>9.2f}s {rss:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Aufbauzeit der PDF-Detail-Tabelle in Abhaengigkeit der Eintraege
+Baut die komplette Abwesenheits-PDF (export_to_pdf.create_pdf) fuer mehrere
+Groessen und gibt Zeit, Seiten und Zeit pro 1000 Eintraege aus. Bei linearem
+Aufwand bleibt die letzte Spalte ueber alle Groessen etwa gleich.
+
+Mit --alt wird zum Vergleich zusaetzlich die fruehere Variante gemessen (eine
+einzige Table ueber alle Detail-Zeilen) – nur bis --alt-max Eintraege, weil
+sie quadratisch waechst.
+
+Aufruf: python benchmarks/bench_pdf_detail.py [--eintraege 10000 50000 100000] [--alt]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+
+import export_to_pdf  # noqa: E402
+
+
+class _EineTabelle:
+    """Fruehere Detail-Tabelle: eine Table ueber alle Zeilen"""
+
+    def __enter__(self):
+        self._original = export_to_pdf.DetailTabelle
+        export_to_pdf.DetailTabelle = lambda zeilen, col_widths, **_: export_to_pdf.detail_tabelle(zeilen, col_widths)
+
+    def __exit__(self, *exc):
+        export_to_pdf.DetailTabelle = self._original
+
+
+def miss(payload, pfad):
+    with contextlib.redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+        start = time.perf_counter()
+        export_to_pdf.create_pdf(payload, pfad, workers=1)
+        dauer = time.perf_counter() - start
+    with open(pfad, "rb") as f:
+        seiten = len(re.findall(rb"/Type /Page\b", f.read()))
+    return dauer, seiten
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--mitarbeiter", type=int, default=200)
+    parser.add_argument("--alt", action="store_true", help="fruehere Variante mitmessen")
+    parser.add_argument("--alt-max", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'Eintraege':>10}{'Seiten':>8}{'Zeit':>10}{'s/1000':>9}{'alt':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        pfad = os.path.join(out_dir, "detail.pdf")
+        for n in args.eintraege:
+            pro_typ = max(1, n // (args.mitarbeiter * 4))
+            payload = erzeuge_zeitraum_payload(mitarbeiter=args.mitarbeiter, eintraege_pro_typ=pro_typ)
+            anzahl = sum(len(m["eintraege"]) for m in payload["exportData"]["mitarbeiter"])
+
+            dauer, seiten = miss(payload, pfad)
+            alt = ""
+            if args.alt and anzahl <= args.alt_max:
+                with _EineTabelle():
+                    alt = f"{miss(payload, pfad)[0]:>9.1f}s"
+            print(f"{anzahl:>10}{seiten:>8}{dauer:>9.1f}s{dauer / anzahl * 1000:>9.2f}{alt:>10}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
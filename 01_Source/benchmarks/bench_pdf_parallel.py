@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Abwesenheits-PDF seriell vs. in Abschnitten (export_to_pdf --workers)
+Baut dieselbe Zeitraum-Payload mit create_pdf(workers=1) und mit
+create_pdf(workers=N) (teamflow_pdf_teile: Details in Abschnitten aus ganzen
+Seiten im Prozesspool, danach zusammengefuegt) und gibt Zeiten und Faktor aus.
+
+Dabei wird jede Datei Seite fuer Seite verglichen: gleiche Seitenzahl, gleicher
+Seiteninhalt (entpackter Content-Stream, Schriften ueber ihren Namen statt
+der Objektnummer). An den Abschnittsgrenzen darf nur die Reihenfolge der
+Gitterlinien abweichen – dort zaehlt der Inhalt sortiert. Jede Seite muss
+ihre eigene Nummer im Fuss tragen. Bei einer Abweichung Exit-Code 1.
+
+Auf einem Rechner mit einem Kern gibt es nichts zu gewinnen; der Faktor zeigt
+dann nur die Kosten fuer Seitenplan und Zusammenfuegen.
+
+Aufruf: python benchmarks/bench_pdf_parallel.py [--eintraege 10000 50000] [--workers 4]
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+
+import export_to_pdf  # noqa: E402
+from teamflow_pdf_teile import _Teil  # noqa: E402
+
+
+def seiteninhalte(pfad):
+    """Entpackte Content-Streams aller Seiten, Schriften als BaseFont-Namen"""
+    with open(pfad, "rb") as f:
+        teil = _Teil(f.read())
+    inhalte = []
+    for seite in teil.seiten:
+        objekt = teil.objekte[seite]
+        inhalt = int(re.search(rb"/Contents (\d+) 0 R", objekt).group(1))
+        schriften = int(re.search(rb"/Font (\d+) 0 R", objekt).group(1))
+        namen = {m.group(1): re.search(rb"/BaseFont /(\S+)", teil.objekte[int(m.group(2))]).group(1)
+                 for m in re.finditer(rb"/(F\d+) (\d+) 0 R", teil.objekte[schriften])}
+        roh = teil.objekte[inhalt].partition(b"stream\n")[2]
+        roh = roh[:roh.rindex(b"endstream")].strip()
+        if not roh.startswith(b"<~"):
+            roh = b"<~" + roh
+        daten = zlib.decompress(base64.a85decode(roh, adobe=True))
+        inhalte.append(re.sub(rb"/(F\d+) ", lambda m: b"/" + namen[m.group(1)] + b" ", daten))
+    return inhalte
+
+
+def vergleiche(seriell, parallel):
+    """Liste der Abweichungen (leer = gleich) und Zahl der nur sortiert gleichen Seiten"""
+    a, b = seiteninhalte(seriell), seiteninhalte(parallel)
+    fehler = []
+    if len(a) != len(b):
+        fehler.append(f"Seiten: {len(a)} seriell, {len(b)} parallel")
+    umsortiert = 0
+    for nr, (x, y) in enumerate(zip(a, b), 1):
+        if x != y:
+            if sorted(x.split(b"\n")) != sorted(y.split(b"\n")):
+                fehler.append(f"Seite {nr}: Inhalt")
+                continue
+            umsortiert += 1
+        if b"(Seite %d)" % nr not in y:
+            fehler.append(f"Seite {nr}: Seitenzahl im Fuss")
+    return fehler, umsortiert
+
+
+def miss(payload, pfad, workers):
+    with contextlib.redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+        start = time.perf_counter()
+        export_to_pdf.create_pdf(payload, pfad, workers=workers)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--mitarbeiter", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=max(2, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    print(f"CPU-Kerne: {os.cpu_count()}, workers: {args.workers}\n")
+    print(f"{'Eintraege':>9} {'Seiten':>6} {'seriell':>8} {'parallel':>9} {'Faktor':>7} {'umsortiert':>10}  Pruefung")
+    ok = True
+    with tempfile.TemporaryDirectory() as ordner:
+        seriell = os.path.join(ordner, "seriell.pdf")
+        parallel = os.path.join(ordner, "parallel.pdf")
+        for n in args.eintraege:
+            pro_typ = max(1, n // (args.mitarbeiter * 4))
+            payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ)
+            payload["erstelltAm"] = "2025-01-02T03:04"
+
+            zeit_s = miss(payload, seriell, 1)
+            zeit_p = miss(payload, parallel, args.workers)
+            fehler, umsortiert = vergleiche(seriell, parallel)
+            ok = ok and not fehler
+
+            print(f"{args.mitarbeiter * pro_typ * 4:>9} {len(seiteninhalte(seriell)):>6} {zeit_s:>7.2f}s "
+                  f"{zeit_p:>8.2f}s {zeit_s / zeit_p:>6.2f}x {umsortiert:>10}  {'ok' if not fehler else 'FEHLER'}",
+                  flush=True)
+            for f in fehler[:10]:
+                print(f"ABWEICHUNG: {f}")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
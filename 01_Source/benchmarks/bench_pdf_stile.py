@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Zeilenfarben als zusammengefasste Stil-Kommandos (teamflow_pdf_stile)
+Baut die Abwesenheits-PDF (export_to_pdf, Zusammenfassung + Details) und die
+Jahresuebersicht (export_employee_year, Eintragstabelle) je zweimal:
+
+    vorher   – ein BACKGROUND pro gefaerbter Zeile, reportlab-Table
+    nachher  – hintergruende() + StilTabelle (BACKGROUND ueber Zeilenbereiche,
+               ROWBACKGROUNDS fuer den Wechsel)
+
+und gibt die Zahl der Hintergrund-Kommandos (ueber alle Tabellen, bei den
+Details ueber alle Fenster) und die beste Zeit aus --runs Laeufen aus.
+Vorher hatte die Jahresuebersicht auf jeder zweiten Zeile ein zweites
+BACKGROUND ueber der Typ-Farbe; "vorher" zaehlt hier schon nur eines.
+
+Vorher wird geprueft, dass jede Zelle dieselbe Farbe bekommt und nur einmal
+gemalt wird: fuer zufaellige Farbfolgen und fuer eine lange Tabelle, die
+wie im Dokument Seite fuer Seite gesplittet wird (ROWBACKGROUNDS im Takt) –
+beides auch fuer den Rueckfall ohne ROWBACKGROUNDS (plain Table), falls die
+installierte reportlab-Version nicht passt. Bei einer Abweichung Exit-Code 1.
+
+Aufruf: python benchmarks/bench_pdf_stile.py [--eintraege 10000 50000] [--jahr-eintraege 2000] [--runs 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_zeitraum_payload, erzeuge_jahres_payload  # noqa: E402
+
+from reportlab.lib import colors  # noqa: E402
+from reportlab.platypus import Table, TableStyle  # noqa: E402
+
+import export_to_pdf  # noqa: E402
+import export_employee_year  # noqa: E402
+from reportlab import Version as REPORTLAB  # noqa: E402
+from teamflow_pdf_stile import hintergruende, StilTabelle, IM_TAKT  # noqa: E402
+
+MODULE = (export_to_pdf, export_employee_year)
+
+
+def zeilenweise(farben, start=1, spalten=(0, -1)):
+    """Fruehere Form: ein BACKGROUND pro Zeile mit Farbe"""
+    sc, ec = spalten
+    return [("BACKGROUND", (sc, start + i), (ec, start + i), f) for i, f in enumerate(farben) if f is not None]
+
+
+# ── Pruefung ─────────────────────────────────────────────────────────────────
+def gemalt(cmds, zeilen):
+    """Farben je Zeile in Malreihenfolge, wie Table._drawBkgrnd sie aufbringt"""
+    ergebnis = [[] for _ in range(zeilen)]
+    for cmd, (_, sr), (_, er), arg in cmds:
+        for r in range(sr, er + 1):
+            farbe = arg[(r - sr) % len(arg)] if cmd == "ROWBACKGROUNDS" else arg
+            if farbe is not None:
+                ergebnis[r].append(farbe)
+    return ergebnis
+
+
+def pruefe_folgen(fehler):
+    rng = random.Random(1)
+    palette = [None, colors.red, colors.green, colors.blue]
+    for _ in range(2000):
+        farben = [rng.choice(palette[:rng.randint(1, 4)]) for _ in range(rng.randint(0, 30))]
+        soll = [[f] if f is not None else [] for f in farben]
+        for wechsel in (True, False):
+            cmds = hintergruende(farben, start=0, wechsel=wechsel)
+            if gemalt(cmds, len(farben)) != soll:
+                fehler.append(f"Folge {farben}: {cmds}")
+                return
+            if len(cmds) > len(zeilenweise(farben)):
+                fehler.append(f"Folge {farben}: mehr Kommandos als zeilenweise")
+                return
+            if not wechsel and any(c[0] == "ROWBACKGROUNDS" for c in cmds):
+                fehler.append(f"Folge {farben}: ROWBACKGROUNDS im Rueckfall")
+                return
+
+
+def teile(table, hoehe):
+    """Seiten wie im Dokument: wrap + split, bis der Rest passt"""
+    seiten = []
+    while True:
+        _, h = table.wrap(500, hoehe)
+        if h <= hoehe:
+            return seiten + [table]
+        erster, table = table.split(500, hoehe)
+        seiten.append(erster)
+
+
+def pruefe_umbruch(fehler):
+    # Laenge so, dass die Seiten mal nach einer geraden, mal nach einer ungeraden Zeilenzahl umbrechen
+    rng = random.Random(2)
+    farben = []
+    for typ in (colors.red, colors.green, colors.blue):
+        hell = colors.Color(typ.red * 0.95, typ.green * 0.95, typ.blue * 0.95)
+        farben += [typ if i % 2 else hell for i in range(rng.randint(40, 90))]
+    daten = [["Kopf"]] + [[str(i)] for i in range(len(farben))]
+
+    seiten = []
+    for klasse, cmds in ((Table, zeilenweise(farben)), (StilTabelle, hintergruende(farben)),
+                         (Table, hintergruende(farben, wechsel=False))):
+        table = klasse(daten, repeatRows=1)
+        table.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, 0), colors.black), *cmds]))
+        seiten.append([gemalt(t._bkgrndcmds, len(t._cellvalues)) for t in teile(table, 17 * 18 + 5)])
+    for name, andere in (("StilTabelle", seiten[1]), ("Rueckfall", seiten[2])):
+        if andere != seiten[0]:
+            fehler.append(f"Umbruch {name}: {len(seiten[0])}/{len(andere)} Seiten, Farben weichen ab")
+
+
+# ── Messung ──────────────────────────────────────────────────────────────────
+@contextlib.contextmanager
+def variante(vorher, zaehler):
+    funktion = zeilenweise if vorher else hintergruende
+    tabelle = Table if vorher else StilTabelle
+
+    def zaehlend(*args, **kwargs):
+        cmds = funktion(*args, **kwargs)
+        zaehler[0] += len(cmds)
+        return cmds
+
+    for modul in MODULE:
+        modul.hintergruende, modul.StilTabelle = zaehlend, tabelle
+    try:
+        yield
+    finally:
+        for modul in MODULE:
+            modul.hintergruende, modul.StilTabelle = hintergruende, StilTabelle
+
+
+def miss(erzeuge, payload, pfad, vorher, runs):
+    beste = float("inf")
+    for _ in range(runs):
+        zaehler = [0]
+        with variante(vorher, zaehler), contextlib.redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+            start = time.perf_counter()
+            erzeuge(payload, pfad)
+            beste = min(beste, time.perf_counter() - start)
+    return zaehler[0], beste
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--mitarbeiter", type=int, default=1000)
+    parser.add_argument("--jahr-eintraege", type=int, nargs="+", default=[2000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    fehler = []
+    pruefe_folgen(fehler)
+    pruefe_umbruch(fehler)
+    for f in fehler[:10]:
+        print(f"ABWEICHUNG: {f}")
+    print(f"{'Pruefung':<12}{'ok' if not fehler else 'FEHLER'}")
+    print(f"reportlab {REPORTLAB}: {'ROWBACKGROUNDS im Takt' if IM_TAKT else 'Rueckfall ohne ROWBACKGROUNDS'}\n")
+    if fehler:
+        sys.exit(1)
+
+    faelle = []
+    for n in args.eintraege:
+        pro_typ = max(1, n // (args.mitarbeiter * 4))
+        payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ)
+        faelle.append((f"Zeitraum {args.mitarbeiter * pro_typ * 4}",
+                       lambda p, a: export_to_pdf.create_pdf(p, a, workers=1), payload))
+    for n in args.jahr_eintraege:
+        payload = erzeuge_jahres_payload(max(1, n // 4))
+        faelle.append((f"Jahr {len(payload['eintraege'])}", export_employee_year.create_year_pdf, payload))
+
+    print(f"{'Export':<16} {'Kommandos':>19} {'vorher':>8} {'nachher':>8} {'Faktor':>7}")
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, "stile.pdf")
+        for name, erzeuge, payload in faelle:
+            cmds_a, zeit_a = miss(erzeuge, payload, pfad, True, args.runs)
+            cmds_b, zeit_b = miss(erzeuge, payload, pfad, False, args.runs)
+            print(f"{name:<16} {cmds_a:>9} -> {cmds_b:>6} {zeit_a:>7.2f}s {zeit_b:>7.2f}s {zeit_a / zeit_b:>6.2f}x",
+                  flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruefung: gleiche Eingabe -> byteweise gleiche Datei (teamflow_export_reproduzierbar)
+Startet jeden Exporter (Excel auch mit --streaming-ab 0 und --backend nativ,
+PDF auch mit --workers 2,
+Jahres-Excel auch mit --sammelmappe)
+zweimal als eigenen Prozess, mit --pause Sekunden dazwischen, und vergleicht
+die sha256 der Ausgaben. Die Payloads haben ein festes erstelltAm. Weicht
+eine Datei ab, endet die Pruefung mit Exit-Code 1.
+
+Aufruf: python benchmarks/bench_reproduzierbar.py [--pause 2]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+HIER        = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import (erzeuge_zeitraum_payload, erzeuge_jahres_payload, erzeuge_jahres_batch,  # noqa: E402
+                      erzeuge_stammdaten_payload)
+
+FAELLE = [
+    # (script, zusaetzliche Argumente, payload-fabrik)
+    ("export_to_excel.py",            [],                        erzeuge_zeitraum_payload),
+    ("export_to_excel.py",            ["--streaming-ab", "0"],   erzeuge_zeitraum_payload),
+    ("export_to_excel.py",            ["--backend", "nativ"],    erzeuge_zeitraum_payload),
+    ("export_to_pdf.py",              [],                        erzeuge_zeitraum_payload),
+    ("export_to_pdf.py",              ["--workers", "2"],        erzeuge_zeitraum_payload),
+    ("export_employee_detail.py",     [],                        erzeuge_stammdaten_payload),
+    ("export_employee_year.py",       [],                        erzeuge_jahres_payload),
+    ("export_employee_year_excel.py", [],                        erzeuge_jahres_payload),
+    ("export_employee_year_excel.py", ["--sammelmappe"],         lambda: {"batch": erzeuge_jahres_batch(50)}),
+]
+
+
+def fingerabdruecke():
+    ergebnis = []
+    for script, argumente, fabrik in FAELLE:
+        payload = fabrik()
+        payload["erstelltAm"] = "2025-01-02T03:04"
+        datei = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *argumente, "-", "-"],
+                               input=json.dumps(payload).encode("utf-8"),
+                               check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+        ergebnis.append(hashlib.sha256(datei).hexdigest())
+    return ergebnis
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pause", type=float, default=2.0,
+                        help="Sekunden zwischen den Laeufen (Zeitstempel der Uhr muessen sich unterscheiden)")
+    args = parser.parse_args()
+
+    erster = fingerabdruecke()
+    time.sleep(args.pause)
+    zweiter = fingerabdruecke()
+
+    ok = True
+    for (script, argumente, _), a, b in zip(FAELLE, erster, zweiter):
+        gleich = a == b
+        ok = ok and gleich
+        print(f"{script + ' ' + ' '.join(argumente):<44} {a[:16]}  {'gleich' if gleich else 'ABWEICHUNG'}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Sammelmappe der Jahresuebersichten (export_employee_year_excel --sammelmappe)
+Schreibt fuer N Mitarbeiter eine Arbeitsmappe (Index-Blatt + ein Blatt pro
+Mitarbeiter) und gibt Laufzeit, Dateigroesse und Speicherspitze (tracemalloc,
+eigener Durchlauf) aus. Zum Vergleich: die Speicherspitze der Eingabe allein –
+die Blaetter selbst sollen kaum etwas dazulegen.
+
+Vorher wird eine kleine Mappe mit openpyxl geladen und geprueft: ein Blatt pro
+Mitarbeiter mit gueltigem, eindeutigem Namen, Index-Zeilen mit Kennzahlen und
+Link auf das richtige Blatt, Anzahl Eintragszeilen pro Blatt. Dazu der
+Export-Cache wie bei --sammelmappe --cache: ein zweiter Lauf am selben Tag
+(anderes "erstelltAm") muss ein Treffer sein, einer am naechsten Tag nicht. Bei einer Abweichung Exit-Code 1.
+
+Aufruf: python benchmarks/bench_sammelmappe.py [--mitarbeiter 100 500 1000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_jahres_batch  # noqa: E402
+from export_employee_year_excel import create_year_workbook, INDEX_TITEL  # noqa: E402
+from teamflow_export_batch import batch_jobs  # noqa: E402
+from teamflow_export_cache import ExportCache, exportiere  # noqa: E402
+
+
+def _still(funktion, *args):
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        return funktion(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def pruefe(ordner):
+    from openpyxl import load_workbook
+
+    jobs = erzeuge_jahres_batch(40, eintraege_pro_typ=3)
+    jobs[1]["employee"]["name"] = "Meier/Müller [Aushilfe]: mit einem sehr langen Namen"
+    jobs[2]["employee"]["name"] = jobs[3]["employee"]["name"]
+    jobs[4]["eintraege"] = []
+    pfad = os.path.join(ordner, "pruefung.xlsx")
+    _still(create_year_workbook, {"batch": jobs, "erstelltAm": "2025-01-02T03:04"}, pfad)
+
+    fehler = []
+    if any("erstelltAm" in job for job in jobs):
+        fehler.append("batch_jobs() hat die Auftraege der Eingabe veraendert")
+    wb = load_workbook(pfad)
+    namen = wb.sheetnames[1:-1]
+    if wb.sheetnames[0] != INDEX_TITEL or wb.sheetnames[-1] != "Legende" or len(namen) != len(jobs):
+        fehler.append(f"Blaetter: {wb.sheetnames[:3]} ... ({len(wb.sheetnames)})")
+    if len({n.lower() for n in namen}) != len(namen):
+        fehler.append("Blattnamen nicht eindeutig")
+    if any(len(n) > 31 or set(n) & set("[]:*?/\\") for n in namen):
+        fehler.append("ungueltiger Blattname")
+
+    index = wb[INDEX_TITEL]
+    for i, (job, name) in enumerate(zip(jobs, namen)):
+        row = 5 + i
+        if index.cell(row, 1).value != job["employee"]["name"]:
+            fehler.append(f"Index Zeile {row}: {index.cell(row, 1).value}")
+        if index.cell(row, 6).value != job["stats"]["urlaub_genommen"]:
+            fehler.append(f"Index Zeile {row}: Genommen {index.cell(row, 6).value}")
+        ziel = index.cell(row, 1).hyperlink
+        if ziel is None or ziel.location != "'{}'!A1".format(name.replace("'", "''")):
+            fehler.append(f"Index Zeile {row}: Link {ziel and ziel.location}")
+        if index.cell(row, 11).value != len(job["eintraege"]):
+            fehler.append(f"Index Zeile {row}: Eintraege {index.cell(row, 11).value}")
+
+        ws = wb[name]
+        # Kopf (3) + Kennzahlen (3) + Abstand + Header, dann Typ-Trennzeilen und Eintraege
+        daten = [r for r in ws.iter_rows(min_row=9, values_only=True) if r[1]]
+        if len(daten) != len(job["eintraege"]):
+            fehler.append(f"{name}: {len(daten)} statt {len(job['eintraege'])} Eintraege")
+
+    # Wie main(): batch_jobs() traegt erstelltAm in jeden Auftrag ein
+    cache = ExportCache(os.path.join(ordner, "cache"))
+    treffer = [_still(exportiere, cache, create_year_workbook,
+                      batch_jobs({"batch": erzeuge_jahres_batch(5, 3), "erstelltAm": erstellt}), pfad)
+               for erstellt in ("2025-01-02T03:04", "2025-01-02T17:30", "2025-01-03T03:04")]
+    if treffer != [False, True, False] or len(os.listdir(cache.ordner)) != 2:
+        fehler.append(f"Export-Cache: Treffer {treffer}, {len(os.listdir(cache.ordner))} Eintraege")
+
+    for f in fehler[:10]:
+        print(f"ABWEICHUNG: {f}")
+    print(f"{'Pruefung':<12}{'ok' if not fehler else 'FEHLER'}\n")
+    return not fehler
+
+
+def spitze(funktion, *args):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funktion(*args)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mitarbeiter", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--eintraege-pro-typ", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as ordner:
+        if not pruefe(ordner):
+            sys.exit(1)
+
+        pfad = os.path.join(ordner, "sammelmappe.xlsx")
+        print(f"{'Mitarbeiter':>11} {'Eintraege':>9} {'Zeit':>8} {'Datei':>8} {'Spitze':>9} {'Eingabe':>9}")
+        for n in args.mitarbeiter:
+            eingabe = spitze(erzeuge_jahres_batch, n, args.eintraege_pro_typ)
+            payload = {"batch": erzeuge_jahres_batch(n, args.eintraege_pro_typ), "erstelltAm": "2025-01-02T03:04"}
+            eintraege = sum(len(job["eintraege"]) for job in payload["batch"])
+
+            start = time.perf_counter()
+            _still(create_year_workbook, payload, pfad)
+            zeit = time.perf_counter() - start
+            mb = spitze(_still, create_year_workbook, payload, pfad)
+
+            print(f"{n:>11} {eintraege:>9} {zeit:>7.2f}s {os.path.getsize(pfad) / 2**20:>5.1f} MB "
+                  f"{mb:>6.1f} MB {eingabe:>6.1f} MB", flush=True)
+
+
+if __name__ == "__main__":
+    main()
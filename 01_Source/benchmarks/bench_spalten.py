@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Spalten-Schema der Zeitraum-Exporte (teamflow_export_spalten)
+Misst die Schleifen pro Zeile in export_to_excel fuer --eintraege Eintraege
+und gibt die beste Zeit aus --runs Laeufen aus:
+
+    Zeilen    Werte der Detail-Zeilen aller Mitarbeiter (mitarbeiter_block)
+    openpyxl  Detail-Zellen als WriteOnlyCell mit Stil (Streaming-Modus)
+    nativ     Detail-Zellen als (wert, stil_index) (--backend nativ)
+
+jeweils vorher (Bedingungen und Stil-Aufloesung pro Zelle, Typ-Text und
+Einheit pro Eintrag, wie bisher in beiden Exportern) und nachher (Layout
+und detail_formatierer).
+
+Vorher wird geprueft, dass beide Varianten dieselben Werte und Zellstile
+ergeben – auch fuer die PDF-Zeilen – und dass Breiten und Ausrichtung
+beider Formate den frueheren Angaben entsprechen. Bei einer Abweichung
+Exit-Code 1.
+
+Aufruf: python benchmarks/bench_spalten.py [--eintraege 100000] [--runs 5]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from reportlab.lib.units import cm  # noqa: E402
+
+import export_to_excel  # noqa: E402
+import export_to_pdf  # noqa: E402
+from export_to_excel import DETAIL, stil_daten, _StreamBlatt, _NativBlatt  # noqa: E402
+from teamflow_export_core import auswerten, fmt_zahl  # noqa: E402
+from teamflow_export_datum import fmt_datum  # noqa: E402
+from teamflow_export_modell import UEBERSTUNDEN  # noqa: E402
+from teamflow_xlsx_native import Mappe  # noqa: E402
+
+
+# ── Fruehere Form ────────────────────────────────────────────────────────────
+def block_vorher(auswertung, i, zeitraum, typ_label=export_to_excel.TYP_LABEL):
+    """mitarbeiter_block wie bisher in export_to_excel (export_to_pdf: gleiche Werte, eigene Typ-Texte)"""
+    name, abt, eintraege = auswertung.mitarbeiter[i]
+    details = []
+    for e in eintraege:
+        typ   = e.typ_name
+        farbe = export_to_excel.TYP_FARBEN.get(typ, "FFFFFF")
+        label = typ_label.get(typ, typ)
+        wert  = fmt_zahl(e.wert)
+        einheit = "h" if e.typ == UEBERSTUNDEN else "T"
+        details.append((farbe, [name, abt, label, fmt_datum(e.von), fmt_datum(e.bis), f"{wert} {einheit}",
+                                e.notiz or e.titel or ""]))
+    return [[name, abt, *auswertung.zahlen(i), zeitraum], details]
+
+
+def zellen_vorher(blatt, zeilen):
+    return [[blatt.zelle(w, bg=farbe if col > 2 else None, center=col in (3, 4, 5, 6))
+             for col, w in enumerate(werte, 1)] for farbe, werte in zeilen]
+
+
+def zellen_nachher(blatt, zeilen):
+    stile = DETAIL.zell_stile(blatt.stil, stil_daten)
+    return [blatt.zellen(werte, stile(farbe)) for farbe, werte in zeilen]
+
+
+# Fruehere Breiten (cm bzw. Zeichen) und Ausrichtung der Datenzeilen je Spalte
+PDF_ZUSAMMENFASSUNG = ([5.5, 4, 2.2, 2.2, 2.5, 2.5, 1.8], "LLCCCCC")
+PDF_DETAILS         = ([4.5, 3.5, 2.8, 2.5, 2.5, 2, None], "LLLCCCL")
+XLSX_ZUSAMMENFASSUNG = [28, 20, 12, 14, 13, 14, 10, 22]
+XLSX_DETAILS         = [28, 20, 18, 12, 12, 10, 35]
+
+
+def ausrichtung_je_spalte(cmds, spalten):
+    """Wirksame Ausrichtung der Datenzeilen je Spalte ("L"/"C"); das letzte Kommando gewinnt"""
+    ergebnis = ["L"] * spalten
+    for _, (sc, _), (ec, _), wert in cmds:
+        for c in range(sc, (ec % spalten) + 1):
+            ergebnis[c] = wert[0]
+    return "".join(ergebnis)
+
+
+# ── Pruefung ─────────────────────────────────────────────────────────────────
+def zellen_inhalt(zeilen):
+    return [[(z.value, z.style) if hasattr(z, "style") else z for z in zeile] for zeile in zeilen]
+
+
+def pruefe(auswertung, fehler):
+    zeitraum = "01.01.2025 – 31.12.2025"
+    for i in range(len(auswertung)):
+        if export_to_excel.mitarbeiter_block(auswertung, i, zeitraum) != block_vorher(auswertung, i, zeitraum):
+            fehler.append(f"Excel-Werte, Mitarbeiter {i}")
+        pdf = export_to_pdf.mitarbeiter_block(auswertung, i)
+        soll = block_vorher(auswertung, i, zeitraum, export_to_pdf.TYP_LABEL)
+        if pdf[0] != soll[0][:-1] or [w for w, _ in pdf[1]] != [w for _, w in soll[1]]:
+            fehler.append(f"PDF-Werte, Mitarbeiter {i}")
+        if fehler:
+            return
+
+    zeilen = [z for i in range(len(auswertung)) for z in export_to_excel.mitarbeiter_block(auswertung, i, zeitraum)[1]]
+    zeilen.append((None, ["a", "b", "c", "d", "e", "f", "g"]))
+    for name, blatt in (("openpyxl", lambda: _StreamBlatt(Workbook(write_only=True), "Details", [])),
+                        ("nativ", lambda: _NativBlatt(Mappe(io.BytesIO()), "Details", []))):
+        # Je ein frisches Blatt: die Stile muessen auch in derselben Reihenfolge registriert werden
+        a, b = blatt(), blatt()
+        if zellen_inhalt(zellen_vorher(a, zeilen)) != zellen_inhalt(zellen_nachher(b, zeilen)):
+            fehler.append(f"{name}: Zellen oder Stile weichen ab")
+        if name == "nativ" and a.stile._index != b.stile._index:
+            fehler.append("nativ: Stil-Register weicht ab")
+
+    if export_to_excel.SUMMARY.breiten != XLSX_ZUSAMMENFASSUNG or DETAIL.breiten != XLSX_DETAILS:
+        fehler.append("Excel-Breiten")
+    for layout, (breiten, ausrichtung) in ((export_to_pdf.SUMMARY, PDF_ZUSAMMENFASSUNG),
+                                           (export_to_pdf.DETAIL, PDF_DETAILS)):
+        soll = [b * cm for b in breiten if b is not None]
+        if export_to_pdf.spalten_breiten(layout)[:len(soll)] != soll:
+            fehler.append(f"PDF-Breiten {layout.titel}")
+        if ausrichtung_je_spalte(layout.ausrichtung(), len(layout)) != ausrichtung:
+            fehler.append(f"PDF-Ausrichtung {layout.titel}")
+    if export_to_pdf.DETAIL.typfarbe_spalten != (2, 5):
+        fehler.append("PDF: Spalten mit Typ-Farbe")
+
+
+# ── Messung ──────────────────────────────────────────────────────────────────
+def beste(funktion, runs):
+    zeit = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        funktion()
+        zeit = min(zeit, time.perf_counter() - start)
+    return zeit * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, default=100000)
+    parser.add_argument("--mitarbeiter", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    pro_typ = max(1, args.eintraege // (args.mitarbeiter * 4))
+    payload = erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ)
+    auswertung = auswerten(payload["exportData"]["mitarbeiter"])
+
+    fehler = []
+    pruefe(auswertung, fehler)
+    for f in fehler[:10]:
+        print(f"ABWEICHUNG: {f}")
+    print(f"{'Pruefung':<10}{'ok' if not fehler else 'FEHLER'}\n")
+    if fehler:
+        sys.exit(1)
+
+    zeitraum = "01.01.2025 – 31.12.2025"
+    mitarbeiter = range(len(auswertung))
+    zeilen = [z for i in mitarbeiter for z in export_to_excel.mitarbeiter_block(auswertung, i, zeitraum)[1]]
+    blaetter = (("openpyxl", _StreamBlatt(Workbook(write_only=True), "Details", [])),
+                ("nativ", _NativBlatt(Mappe(io.BytesIO()), "Details", [])))
+
+    messungen = [("Zeilen",
+                  lambda: [block_vorher(auswertung, i, zeitraum) for i in mitarbeiter],
+                  lambda: [export_to_excel.mitarbeiter_block(auswertung, i, zeitraum) for i in mitarbeiter])]
+    for name, blatt in blaetter:
+        messungen.append((name, lambda b=blatt: zellen_vorher(b, zeilen), lambda b=blatt: zellen_nachher(b, zeilen)))
+
+    print(f"{len(zeilen)} Detail-Zeilen")
+    print(f"{'':<10}{'vorher':>10}{'nachher':>10}{'Faktor':>8}")
+    for name, vorher, nachher in messungen:
+        a, b = beste(vorher, args.runs), beste(nachher, args.runs)
+        print(f"{name:<10}{a:>8.0f}ms{b:>8.0f}ms{a / b:>7.1f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
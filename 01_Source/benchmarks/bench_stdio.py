@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Datei-Ein-/Ausgabe vs. "-" (stdin/stdout) fuer alle fuenf Exporter
+Datei:  JSON (mit indent=2, wie bisher main.js) auf die Platte schreiben,
+        Script mit <input.json> <output> starten, Ausgabe zuruecklesen.
+Pipe:   Script mit - - starten, JSON auf stdin, Datei von stdout.
+
+Nur Zeiten; dass beide Wege dieselbe Datei liefern, prueft
+tests/test_stdio.py.
+
+Aufruf: python benchmarks/bench_stdio.py [--runs 5] [--mitarbeiter 200]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HIER        = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import erzeuge_zeitraum_payload, erzeuge_jahres_payload, erzeuge_stammdaten_payload  # noqa: E402
+
+FAELLE = [
+    # (script, endung, payload-fabrik)
+    ("export_to_excel.py",            "xlsx", None),
+    ("export_to_pdf.py",              "pdf",  None),
+    ("export_employee_detail.py",     "pdf",  erzeuge_stammdaten_payload),
+    ("export_employee_year.py",       "pdf",  erzeuge_jahres_payload),
+    ("export_employee_year_excel.py", "xlsx", erzeuge_jahres_payload),
+]
+
+
+def ueber_datei(script, payload, ordner, endung):
+    json_pfad = os.path.join(ordner, "payload.json")
+    ziel = os.path.join(ordner, f"ausgabe.{endung}")
+    with open(json_pfad, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), json_pfad, ziel],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(ziel, "rb") as f:
+        f.read()  # wie bei der Pipe: die Datei kommt beim Aufrufer an
+    os.remove(json_pfad)
+
+
+def ueber_pipe(script, payload):
+    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), "-", "-"],
+                   input=json.dumps(payload).encode("utf-8"),
+                   check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mitarbeiter", type=int, default=200)
+    parser.add_argument("--eintraege-pro-typ", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'Script':<32} {'Datei':>10} {'Pipe':>10}")
+    with tempfile.TemporaryDirectory() as ordner:
+        for script, endung, fabrik in FAELLE:
+            payload = fabrik() if fabrik else erzeuge_zeitraum_payload(args.mitarbeiter, args.eintraege_pro_typ)
+            payload["erstelltAm"] = "2025-01-02T03:04"
+
+            zeiten = {"datei": [], "pipe": []}
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                ueber_datei(script, payload, ordner, endung)
+                zeiten["datei"].append((time.perf_counter() - start) * 1000)
+                start = time.perf_counter()
+                ueber_pipe(script, payload)
+                zeiten["pipe"].append((time.perf_counter() - start) * 1000)
+
+            print(f"{script:<32} {statistics.median(zeiten['datei']):>8.0f}ms "
+                  f"{statistics.median(zeiten['pipe']):>8.0f}ms", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark- und Regressions-Suite fuer die fuenf Export-Skripte
+Startet jedes Skript so, wie main.js es tut (eigener Prozess, input.json,
+Ausgabedatei), mit deterministischen Payloads aus payloads.py in mehreren
+Groessen. Pro Skript und Groesse werden gemessen:
+
+    wall_s          – Laufzeit des Prozesses inkl. Interpreter-Start und Imports
+                      (Minimum ueber --wiederholungen Laeufe)
+    rss_mb          – maximaler RSS des Prozesses (ru_maxrss, nur Linux/macOS)
+    tracemalloc_mb  – Spitzenwert von tracemalloc (eigener Lauf, tracemalloc bremst)
+
+Die Ergebnisse gehen als JSON nach --out. Mit --baseline werden sie gegen eine
+gespeicherte Messung verglichen; liegt ein Wert um mehr als die Toleranz
+darueber, endet die Suite mit Exit-Code 1. Laeuft komplett offline.
+
+Aufruf:
+    python benchmarks/bench_suite.py                                   # klein + mittel
+    python benchmarks/bench_suite.py --groessen klein --skripte excel pdf
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json --toleranz-zeit 0.3
+    python benchmarks/bench_suite.py --out benchmarks/baseline.json    # neue Baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import (  # noqa: E402
+    erzeuge_zeitraum_payload, erzeuge_jahres_payload, erzeuge_stammdaten_payload,
+)
+
+
+# ── Groessen ─────────────────────────────────────────────────────────────────
+# Zeitraum-Exporte: Mitarbeiter x Abteilungen x Eintraege pro Typ (4 Typen)
+GROESSEN = {
+    "klein":  {"mitarbeiter": 20,  "abteilungen": 4,  "pro_typ": 5,  "jahr_pro_typ": 10,  "notiz": 20, "tage": 90},
+    "mittel": {"mitarbeiter": 200, "abteilungen": 8,  "pro_typ": 10, "jahr_pro_typ": 50,  "notiz": 40, "tage": 365},
+    "gross":  {"mitarbeiter": 500, "abteilungen": 12, "pro_typ": 25, "jahr_pro_typ": 250, "notiz": 80, "tage": 365},
+}
+
+# Skript -> (Datei, Endung, Payload-Art)
+SKRIPTE = {
+    "excel":       ("export_to_excel.py",            ".xlsx", "zeitraum"),
+    "pdf":         ("export_to_pdf.py",              ".pdf",  "zeitraum"),
+    "detail-pdf":  ("export_employee_detail.py",     ".pdf",  "stammdaten"),
+    "year-pdf":    ("export_employee_year.py",       ".pdf",  "jahr"),
+    "year-excel":  ("export_employee_year_excel.py", ".xlsx", "jahr"),
+}
+
+METRIKEN = ("wall_s", "rss_mb", "tracemalloc_mb")
+
+
+def payload(art, g):
+    if art == "zeitraum":
+        return erzeuge_zeitraum_payload(g["mitarbeiter"], g["pro_typ"], tage=g["tage"],
+                                        anzahl_abteilungen=g["abteilungen"], notiz_laenge=g["notiz"])
+    if art == "jahr":
+        return erzeuge_jahres_payload(g["jahr_pro_typ"], notiz_laenge=g["notiz"])
+    return erzeuge_stammdaten_payload()
+
+
+def anzahl_eintraege(art, daten):
+    if art == "zeitraum":
+        return sum(len(m["eintraege"]) for m in daten["exportData"]["mitarbeiter"])
+    return len(daten.get("eintraege", []))
+
+
+# ── Messung ──────────────────────────────────────────────────────────────────
+# Laeuft im Kindprozess: startet das Skript wie "python skript.py ..." und
+# schreibt RSS/tracemalloc in eine Berichtsdatei (stdout gehoert dem Skript)
+_LAEUFER = r"""
+import json, runpy, sys
+bericht, trace, skript = sys.argv[1], sys.argv[2] == "1", sys.argv[3]
+sys.argv = sys.argv[3:]
+sys.path.insert(0, __import__("os").path.dirname(skript))
+if trace:
+    import tracemalloc
+    tracemalloc.start()
+code = 0
+try:
+    runpy.run_path(skript, run_name="__main__")
+except SystemExit as e:
+    code = e.code or 0
+ergebnis = {"exit": code}
+if trace:
+    ergebnis["tracemalloc_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ergebnis["rss_mb"] = rss / 2**20 if sys.platform == "darwin" else rss / 1024
+except ImportError:
+    pass
+with open(bericht, "w") as f:
+    json.dump(ergebnis, f)
+"""
+
+
+def _lauf(skript, eingabe, ausgabe, bericht, trace):
+    start = time.perf_counter()
+    prozess = subprocess.run(
+        [sys.executable, "-c", _LAEUFER, bericht, "1" if trace else "0", skript, eingabe, ausgabe],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    dauer = time.perf_counter() - start
+    with open(bericht) as f:
+        ergebnis = json.load(f)
+    if prozess.returncode or ergebnis.get("exit"):
+        raise RuntimeError(f"{os.path.basename(skript)} fehlgeschlagen: {prozess.stderr.decode('utf-8', 'replace')}")
+    return dauer, ergebnis
+
+
+def miss(name, groesse, ordner, wiederholungen):
+    datei, endung, art = SKRIPTE[name]
+    skript = os.path.join(SCRIPTS, datei)
+    daten = payload(art, GROESSEN[groesse])
+
+    eingabe = os.path.join(ordner, f"{name}_{groesse}.json")
+    ausgabe = os.path.join(ordner, f"{name}_{groesse}{endung}")
+    bericht = os.path.join(ordner, "bericht.json")
+    with open(eingabe, "w", encoding="utf-8") as f:
+        json.dump(daten, f, ensure_ascii=False)
+
+    zeiten, rss = [], []
+    for _ in range(wiederholungen):
+        dauer, ergebnis = _lauf(skript, eingabe, ausgabe, bericht, trace=False)
+        zeiten.append(dauer)
+        rss.append(ergebnis.get("rss_mb"))
+    _, ergebnis = _lauf(skript, eingabe, ausgabe, bericht, trace=True)
+
+    return {
+        "eintraege":      anzahl_eintraege(art, daten),
+        "wall_s":         round(min(zeiten), 3),
+        "rss_mb":         round(max(rss), 1) if rss[0] is not None else None,
+        "tracemalloc_mb": round(ergebnis["tracemalloc_mb"], 1),
+        "ausgabe_kb":     round(os.path.getsize(ausgabe) / 1024, 1),
+    }
+
+
+# ── Vergleich mit der Baseline ───────────────────────────────────────────────
+def vergleiche(ergebnisse, baseline, toleranzen):
+    """Liefert Zeilen (schluessel, metrik, alt, neu, aenderung, regression)"""
+    zeilen = []
+    for schluessel, neu in ergebnisse.items():
+        alt = baseline.get(schluessel)
+        if alt is None:
+            continue
+        for metrik in METRIKEN:
+            a, n = alt.get(metrik), neu.get(metrik)
+            if not a or n is None:
+                continue
+            aenderung = n / a - 1
+            zeilen.append((schluessel, metrik, a, n, aenderung, aenderung > toleranzen[metrik]))
+    return zeilen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skripte", nargs="+", choices=list(SKRIPTE), default=list(SKRIPTE))
+    parser.add_argument("--groessen", nargs="+", choices=list(GROESSEN), default=["klein", "mittel"])
+    parser.add_argument("--wiederholungen", type=int, default=3, metavar="N",
+                        help="Laeufe fuer wall_s/rss_mb, gewertet wird das Minimum (Standard: 3)")
+    parser.add_argument("--out", metavar="PFAD", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", metavar="PFAD", help="gegen diese Ergebnisse vergleichen")
+    parser.add_argument("--toleranz-zeit", type=float, default=0.25, metavar="ANTEIL",
+                        help="erlaubte Verschlechterung von wall_s (Standard: 0.25 = +25%%)")
+    parser.add_argument("--toleranz-speicher", type=float, default=0.15, metavar="ANTEIL",
+                        help="erlaubte Verschlechterung von rss_mb und tracemalloc_mb (Standard: 0.15)")
+    args = parser.parse_args()
+
+    ergebnisse = {}
+    with tempfile.TemporaryDirectory() as ordner:
+        for groesse in args.groessen:
+            for name in args.skripte:
+                # Die Stammdaten-PDF hat keine Eintraege – eine Groesse reicht
+                if SKRIPTE[name][2] == "stammdaten" and groesse != args.groessen[0]:
+                    continue
+                schluessel = f"{name}/{groesse}"
+                ergebnisse[schluessel] = r = miss(name, groesse, ordner, args.wiederholungen)
+                rss = f"{r['rss_mb']:.0f} MB" if r["rss_mb"] is not None else "–"
+                print(f"{schluessel:<20}{r['eintraege']:>8} Eintr.{r['wall_s']:>9.2f}s{rss:>10}"
+                      f"{r['tracemalloc_mb']:>9.1f} MB", flush=True)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "erstellt":   datetime.now().isoformat(timespec="seconds"),
+                    "python":     platform.python_version(),
+                    "plattform":  platform.platform(),
+                    "cpus":       os.cpu_count(),
+                    "groessen":   {g: GROESSEN[g] for g in args.groessen},
+                },
+                "ergebnisse": ergebnisse,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\nErgebnisse gespeichert: {args.out}")
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["ergebnisse"]
+    toleranzen = {"wall_s": args.toleranz_zeit, "rss_mb": args.toleranz_speicher,
+                  "tracemalloc_mb": args.toleranz_speicher}
+    zeilen = vergleiche(ergebnisse, baseline, toleranzen)
+
+    print(f"\nVergleich mit {args.baseline}")
+    for schluessel, metrik, alt, neu, aenderung, regression in zeilen:
+        markierung = "  REGRESSION" if regression else ""
+        print(f"{schluessel:<20}{metrik:<16}{alt:>10.2f}{neu:>10.2f}{aenderung:>+9.0%}{markierung}")
+
+    regressionen = sum(1 for z in zeilen if z[5])
+    if regressionen:
+        print(f"\n{regressionen} Regression(en) ueber der Toleranz")
+        sys.exit(1)
+    print("\nKeine Regressionen")
+
+
+if __name__ == "__main__":
+    main()
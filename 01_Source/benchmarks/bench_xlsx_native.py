@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: openpyxl vs. eigener xlsx-Schreiber (export_to_excel --backend nativ)
+Rendert dieselbe Zeitraum-Payload mit
+
+    openpyxl    – normaler Modus (nur bis --openpyxl-max Eintraege, sonst zu langsam)
+    stream      – openpyxl write_only (Standard ab 20.000 Eintraegen)
+    nativ       – teamflow_xlsx_native, zipfile + XML Zeile fuer Zeile
+
+Jede Variante laeuft in einem eigenen Prozess: Zeit ohne tracemalloc, dann
+die tracemalloc-Spitze in einem zweiten Durchlauf und – ausser unter Windows –
+der maximale RSS. Dazu Zeilen pro Sekunde und Dateigroesse.
+
+Nur Messung; dass "nativ" Zelle fuer Zelle dasselbe schreibt wie openpyxl,
+prueft tests/test_xlsx_native.py.
+
+Aufruf: python benchmarks/bench_xlsx_native.py [--eintraege 20000 100000] [--mitarbeiter 500]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = os.path.join(HIER, "..", "scripts")
+sys.path.insert(0, HIER)
+
+from payloads import erzeuge_zeitraum_payload  # noqa: E402
+
+
+VARIANTEN = {
+    "openpyxl": {"streaming_ab": 10**9},
+    "stream":   {"streaming_ab": 0},
+    "nativ":    {"backend": "nativ"},
+}
+
+_MESSUNG = r"""
+import contextlib, io, json, os, sys, time, tracemalloc
+sys.path.insert(0, sys.argv[4])
+from teamflow_export_modell import lade_json
+import export_to_excel
+
+kwargs, pfad, ausgabe = json.loads(sys.argv[1]), sys.argv[2], sys.argv[3]
+
+def lauf():
+    payload = lade_json(pfad)
+    with contextlib.redirect_stdout(io.TextIOWrapper(io.BytesIO())):
+        start = time.perf_counter()
+        export_to_excel.create_excel(payload, ausgabe, **kwargs)
+        return time.perf_counter() - start
+
+dauer = lauf()
+tracemalloc.start()
+lauf()
+spitze = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    rss = None
+print(json.dumps({"s": dauer, "spitze_mb": spitze / 2**20, "rss_mb": rss, "mb": os.path.getsize(ausgabe) / 2**20}))
+"""
+
+
+def miss(variante, pfad, ordner):
+    ausgabe = os.path.join(ordner, variante + ".xlsx")
+    ergebnis = subprocess.run(
+        [sys.executable, "-c", _MESSUNG, json.dumps(VARIANTEN[variante]), pfad, ausgabe, SCRIPTS],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(ergebnis.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eintraege", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--mitarbeiter", type=int, default=500)
+    parser.add_argument("--openpyxl-max", type=int, default=20000,
+                        help="normalen openpyxl-Modus nur bis zu dieser Groesse messen")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as ordner:
+        print(f"{'Eintraege':>9} {'Variante':>9} {'Zeit':>8} {'Zeilen/s':>9} {'Spitze':>9} {'max RSS':>9} {'Datei':>8}")
+        for n in args.eintraege:
+            pro_typ = max(1, n // (args.mitarbeiter * 4))
+            pfad = os.path.join(ordner, "payload.json")
+            with open(pfad, "w", encoding="utf-8") as f:
+                json.dump(erzeuge_zeitraum_payload(args.mitarbeiter, pro_typ), f, ensure_ascii=False)
+            eintraege = args.mitarbeiter * pro_typ * 4
+
+            for variante in VARIANTEN:
+                if variante == "openpyxl" and eintraege > args.openpyxl_max:
+                    continue
+                r = miss(variante, pfad, ordner)
+                rss = f"{r['rss_mb']:.0f} MB" if r["rss_mb"] is not None else "–"
+                print(f"{eintraege:>9} {variante:>9} {r['s']:>7.2f}s {eintraege / r['s']:>9.0f} "
+                      f"{r['spitze_mb']:>6.1f} MB {rss:>9} {r['mb']:>5.1f} MB", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Zellstile pro Zelle vs. gemeinsames Stil-Register
+Baut ein Details-Blatt mit N Zeilen einmal mit dem frueheren Verfahren (neue
+Font/PatternFill/Alignment/Border-Objekte pro Zelle) und einmal ueber
+teamflow_xlsx_styles. Gemessen werden Aufbau-, Speicher- und Gesamtzeit sowie
+die Anzahl der Stil-Eintraege (cellXfs) in der gespeicherten Datei.
+
+Aufruf: python benchmarks/bench_xlsx_styles.py [--zeilen 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from openpyxl import Workbook  # noqa: E402
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side  # noqa: E402
+
+import export_to_excel  # noqa: E402
+
+
+def _legacy_style_data_cell(cell, bg=None, center=False, bold=False):
+    """Stand vor dem Stil-Register (pro Zelle neue Stil-Objekte)"""
+    if bg:
+        cell.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+    cell.font = Font(bold=bold, size=9)
+    cell.alignment = Alignment(horizontal='center' if center else 'left', vertical='center', wrap_text=False)
+    side = Side(style='thin')
+    cell.border = Border(left=side, right=side, top=side, bottom=side)
+
+
+def baue_details(zeilen, style_fn):
+    farben = list(export_to_excel.TYP_FARBEN.values())
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, zeilen + 1):
+        farbe = farben[row % len(farben)]
+        werte = [f"Mitarbeiter {row % 300}", "Verkauf", "Urlaub", "01.01.2025", "05.01.2025", "5 T", "Notiz"]
+        for col, val in enumerate(werte, 1):
+            cell = ws.cell(row=row, column=col, value=val)
+            style_fn(cell, bg=farbe if col > 2 else None, center=col in (3, 4, 5, 6))
+    return wb
+
+
+def miss(name, zeilen, style_fn, out_dir):
+    start = time.perf_counter()
+    wb = baue_details(zeilen, style_fn)
+    aufbau = time.perf_counter() - start
+    pfad = os.path.join(out_dir, f"{name}.xlsx")
+    wb.save(pfad)
+    gesamt = time.perf_counter() - start
+    with zipfile.ZipFile(pfad) as z:
+        styles_xml = z.read("xl/styles.xml").decode("utf-8")
+    xfs = re.search(r'<cellXfs count="(\d+)"', styles_xml).group(1)
+    print(f"{name:<14}{aufbau:>10.2f} s{gesamt - aufbau:>10.2f} s{gesamt:>10.2f} s{xfs:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zeilen", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"Details-Blatt mit {args.zeilen} Zeilen x 7 Spalten\n")
+    print(f"{'Verfahren':<14}{'Aufbau':>12}{'Speichern':>12}{'Gesamt':>12}{'cellXfs':>10}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        miss("vorher", args.zeilen, _legacy_style_data_cell, out_dir)
+        miss("stil-register", args.zeilen, export_to_excel.style_data_cell, out_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Batch-Modus der Jahresuebersichten
+Rendert die Jahresuebersicht fuer N Mitarbeiter mit 1, 2, 4, ... Prozessen
+(bis zur Anzahl CPU-Kerne) und gibt Dateien/s und Speedup gegenueber einem
+Prozess aus. Zeiten stammen aus dem manifest.json des Batch-Laufs.
+
+Aufruf: python benchmarks/bench_year_batch.py [--mitarbeiter 200] [--format pdf|excel]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HIER)
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
+
+from payloads import erzeuge_jahres_batch  # noqa: E402
+
+
+def stufen(max_workers):
+    n = 1
+    while n < max_workers:
+        yield n
+        n *= 2
+    yield max_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mitarbeiter", type=int, default=200)
+    parser.add_argument("--format", choices=["pdf", "excel"], default="pdf")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.format == "pdf":
+        from export_employee_year import create_year_pdf_batch as batch
+    else:
+        from export_employee_year_excel import create_employee_year_excel_batch as batch
+
+    jobs = erzeuge_jahres_batch(args.mitarbeiter)
+    # Statusmeldungen der Exporter unterdruecken, nur die Tabelle ausgeben
+    konsole, sys.stdout = sys.stdout, open(os.devnull, "w")
+
+    zeilen = []
+    try:
+        basis = None
+        for workers in stufen(args.max_workers):
+            with tempfile.TemporaryDirectory() as out_dir:
+                manifest = batch(jobs, out_dir, workers)
+            sekunden = manifest["gesamt_ms"] / 1000
+            basis = basis or sekunden
+            zeilen.append((workers, sekunden, manifest["anzahl"] / sekunden, basis / sekunden))
+    finally:
+        sys.stdout.close()
+        sys.stdout = konsole
+
+    print(f"{args.mitarbeiter} Jahresuebersichten ({args.format}), {os.cpu_count()} CPU-Kerne\n")
+    print(f"{'Prozesse':>9}{'Gesamt':>10}{'Dateien/s':>12}{'Speedup':>10}")
+    for workers, sekunden, rate, speedup in zeilen:
+        print(f"{workers:>9}{sekunden:>9.1f}s{rate:>12.1f}{speedup:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
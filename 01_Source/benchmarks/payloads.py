@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetische Export-Payloads fuer die TeamFlow-Benchmarks
+Erzeugt dieselben Strukturen wie export-dialog.js bzw. detail-dialog.js –
+deterministisch (fester Seed), damit Messungen vergleichbar bleiben.
+"""
+
+import random
+from datetime import date, timedelta
+
+ABTEILUNGEN = ["Buchhaltung", "Geschäftsleitung", "Service", "Verkauf", "Werkstatt"]
+VORNAMEN    = ["Anna", "Ben", "Clara", "David", "Eva", "Felix", "Greta", "Hans", "Ida", "Jonas"]
+NACHNAMEN   = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker"]
+
+
+WOERTER     = ["Termin", "Absprache", "mit", "Team", "Vertretung", "geregelt", "laut", "Plan", "Kunde", "Projekt"]
+
+
+def _iso(d):
+    return d.isoformat()
+
+
+def abteilungen(anzahl=None):
+    """Die festen Abteilungen, bei anzahl > 5 ergaenzt um "Abteilung 6", "Abteilung 7", ..."""
+    if anzahl is None:
+        return ABTEILUNGEN
+    return (ABTEILUNGEN + [f"Abteilung {k}" for k in range(len(ABTEILUNGEN) + 1, anzahl + 1)])[:anzahl]
+
+
+def notiz(rng, laenge):
+    """Notiztext aus Fuellwoertern mit genau laenge Zeichen (auch fuer Zeilenumbrueche im PDF)"""
+    text = ""
+    while len(text) < laenge:
+        text += rng.choice(WOERTER) + " "
+    return text[:laenge].rstrip() or None
+
+
+def erzeuge_eintrag(rng, typ, start, span_tage, notiz_laenge=None):
+    von = start + timedelta(days=rng.randrange(span_tage))
+    if typ in ("urlaub", "krankheit"):
+        dauer = rng.randint(1, 10)
+        bis = von + timedelta(days=dauer - 1)
+        e = {"typ": typ, "von_datum": _iso(von), "bis_datum": _iso(bis),
+             "wert": float(dauer), "notiz": rng.choice([None, "", "Familienurlaub", "Arzttermin"]), "titel": None}
+    elif typ == "schulung":
+        e = {"typ": typ, "von_datum": _iso(von), "bis_datum": _iso(von),
+             "wert": rng.choice([0.5, 1.0, 2.0]), "notiz": None, "titel": rng.choice(["Erste Hilfe", "Excel Kurs", "Sicherheit"])}
+    else:
+        e = {"typ": typ, "von_datum": _iso(von), "bis_datum": _iso(von),
+             "wert": rng.choice([1.0, 2.5, 4.0]), "notiz": rng.choice([None, "Gleitzeit"]), "titel": None}
+    if notiz_laenge is not None:
+        e["notiz"] = notiz(rng, notiz_laenge)
+    return e
+
+
+def erzeuge_zeitraum_payload(mitarbeiter=50, eintraege_pro_typ=5, von="2025-01-01", tage=365, seed=1,
+                             anzahl_abteilungen=None, notiz_laenge=None):
+    """
+    Payload wie export-dialog.js (_starteExport) ihn an export:excel / export:pdf schickt.
+    anzahl_abteilungen/notiz_laenge: None = wie bisher (5 Abteilungen, kurze Notizen).
+    """
+    rng = random.Random(seed)
+    start = date.fromisoformat(von)
+    bis = start + timedelta(days=tage - 1)
+    abt = abteilungen(anzahl_abteilungen)
+
+    liste = []
+    for i in range(mitarbeiter):
+        eintraege = []
+        for typ in ("urlaub", "krankheit", "schulung", "ueberstunden"):
+            eintraege.extend(erzeuge_eintrag(rng, typ, start, tage, notiz_laenge) for _ in range(eintraege_pro_typ))
+        summe = lambda t: sum(e["wert"] for e in eintraege if e["typ"] == t)
+        liste.append({
+            "mitarbeiter": {
+                "id": f"MA{i:05d}",
+                "name": f"{rng.choice(VORNAMEN)} {rng.choice(NACHNAMEN)} {i}",
+                "abteilung": abt[i % len(abt)],
+            },
+            "zusammenfassung": {
+                "urlaub_tage":        summe("urlaub"),
+                "krankheit_tage":     summe("krankheit"),
+                "schulung_tage":      summe("schulung"),
+                "ueberstunden_abbau": summe("ueberstunden"),
+            },
+            "eintraege": eintraege,
+        })
+
+    liste.sort(key=lambda e: (e["mitarbeiter"]["abteilung"], e["mitarbeiter"]["name"]))
+    export_data = {"mitarbeiter": liste, "vonDatum": von, "bisDatum": _iso(bis)}
+    return {"exportData": export_data, "vonDatum": von, "bisDatum": _iso(bis)}
+
+
+def erzeuge_jahres_payload(eintraege_pro_typ=10, jahr=2025, seed=1, notiz_laenge=None):
+    """Payload wie detail-dialog.js (_exportJahresPDF / _exportJahresExcel)."""
+    rng = random.Random(seed)
+    start = date(jahr, 1, 1)
+    eintraege = []
+    for typ in ("urlaub", "krankheit", "schulung", "ueberstunden"):
+        eintraege.extend(erzeuge_eintrag(rng, typ, start, 365, notiz_laenge) for _ in range(eintraege_pro_typ))
+    return {
+        "employee": {"name": "Anna Müller", "department": "Verkauf"},
+        "jahr": str(jahr),
+        "stats": {
+            "urlaubsanspruch": 30, "uebertrag_vorjahr": 2.5, "urlaub_verfuegbar": 32.5,
+            "urlaub_genommen": 20, "urlaub_rest": 12.5,
+            "krankheitstage": 4, "schulungstage": 2, "ueberstunden": -3.5,
+        },
+        "eintraege": eintraege,
+    }
+
+
+def erzeuge_jahres_batch(mitarbeiter=200, eintraege_pro_typ=10, jahr=2025, seed=1):
+    """Batch-Eingabe fuer export_employee_year(.py|_excel.py) --batch"""
+    jobs = []
+    for i in range(mitarbeiter):
+        job = erzeuge_jahres_payload(eintraege_pro_typ, jahr, seed + i)
+        job["employee"] = {"name": f"Mitarbeiter {i:04d}", "department": ABTEILUNGEN[i % len(ABTEILUNGEN)]}
+        jobs.append(job)
+    return jobs
+
+
+def erzeuge_stammdaten_payload():
+    """Payload wie detail-dialog.js (_exportMitarbeiterPDF)."""
+    return {
+        "employee": {
+            "name": "Anna Müller", "vorname": "Anna", "nachname": "Müller",
+            "department": "Verkauf", "email": "anna@example.com",
+            "geburtsdatum": "1990-04-01", "eintrittsdatum": "2015-09-01", "austrittsdatum": None,
+            "status": "AKTIV", "urlaubstage_jahr": 30, "wochenstunden": 40,
+            "adresse": "Hauptstr. 1\n12345 Musterstadt", "gehalt": 4200,
+            "arbeitszeitmodell": [{"wochentag": i, "arbeitszeit": "VOLL"} for i in range(5)],
+        }
+    }
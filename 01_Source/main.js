@@ -362,6 +362,7 @@ app.whenReady().then(() => {
 
 app.on('window-all-closed', () => {
   logger.info('🛑 Alle Fenster geschlossen');
+  exportWorker.stop();
   if (db) { db.close(); logger.info('📁 Datenbank geschlossen'); }
   if (process.platform !== 'darwin') app.quit();
 });
@@ -444,46 +445,258 @@ ipcMain.handle('present-file', async (event, filePath) => {
 });
 
 // ── Export: gemeinsame Hilfsfunktion ──────────────────────────────────────────
+// Export-Typ -> Python-Script (Entwicklung) bzw. Unterbefehl von teamflow_export.exe (gepackt)
+// fortschritt: Script meldet mit --fortschritt JSON-Zeilen {"phase", "done", "total"} auf stdout
+// zeitlimit: Script bricht mit --timeout-s ab (TEAMFLOW_EXPORT_TIMEOUT_S)
+const EXPORT_SCRIPTS = {
+  excel:             { script: 'export_to_excel.py',            befehl: 'excel', fortschritt: true, zeitlimit: true },
+  pdf:               { script: 'export_to_pdf.py',              befehl: 'pdf',   fortschritt: true, zeitlimit: true },
+  employeeDetailPdf: { script: 'export_employee_detail.py',     befehl: 'detail-pdf' },
+  employeeYearPdf:   { script: 'export_employee_year.py',       befehl: 'year-pdf' },
+  employeeYearExcel: { script: 'export_employee_year_excel.py', befehl: 'year-excel' },
+  // Batch: Ausgabe ist ein Ordner mit einer Datei pro Mitarbeiter + manifest.json
+  employeeYearPdfBatch:   { script: 'export_employee_year.py',       befehl: 'year-pdf',   args: ['--batch'], fortschritt: true },
+  employeeYearExcelBatch: { script: 'export_employee_year_excel.py', befehl: 'year-excel', args: ['--batch'], fortschritt: true },
+  // Sammelmappe: alle Mitarbeiter in einer .xlsx (Index-Blatt + ein Blatt pro Mitarbeiter)
+  employeeYearWorkbook:   { script: 'export_employee_year_excel.py', befehl: 'year-excel', args: ['--sammelmappe'], fortschritt: true },
+};
+
+// TEAMFLOW_EXPORT_PROFILE=1: Exporte mit --profile starten und Phasenzeiten,
+// Zeilenzahlen und Speicherspitze ins Log schreiben (teamflow_export_profil.py)
+const EXPORT_PROFILE = process.env.TEAMFLOW_EXPORT_PROFILE === '1';
+
+function logExportProfil(kind, profil) {
+  logger.info('⏱️ Export-Profil', { kind, ...profil });
+}
+
+// Export-Cache (teamflow_export_cache.py): gleiche Daten -> fertige Datei statt neu rendern.
+// Liegt neben dem Export-Ordner; TEAMFLOW_EXPORT_CACHE=0 schaltet ihn ab.
+const EXPORT_CACHE_AKTIV = process.env.TEAMFLOW_EXPORT_CACHE !== '0';
+const EXPORT_CACHE_MB    = Number(process.env.TEAMFLOW_EXPORT_CACHE_MB) || 256;
+
+function getExportCache(kind) {
+  // Batch-Exporte schreiben einen Ordner – dafür gibt es keinen Cache. Die Sammelmappe
+  // bekommt nur den DB-Auftrag; der Cache sähe geänderte Einträge nicht
+  if (!EXPORT_CACHE_AKTIV || EXPORT_SCRIPTS[kind].args) return null;
+  return { ordner: path.join(path.dirname(getExportPath()), 'ExportCache'), maxMb: EXPORT_CACHE_MB };
+}
+
+// TEAMFLOW_EXPORT_XLSX=nativ: Zeitraum-Excel ohne openpyxl direkt als zip/XML
+// schreiben (teamflow_xlsx_native.py) – gleiche Datei, mehrfach schneller
+const EXPORT_XLSX_NATIV = process.env.TEAMFLOW_EXPORT_XLSX === 'nativ';
+
+// TEAMFLOW_EXPORT_TIMEOUT_S=600: Zeitraum-Exporte nach so vielen Sekunden abbrechen
+// (teamflow_export_abbruch.py) – angefangene Dateien werden gelöscht, Exit Code 3
+const EXPORT_TIMEOUT_S = Number(process.env.TEAMFLOW_EXPORT_TIMEOUT_S) || 0;
+const EXIT_ABGEBROCHEN = 3;
+
+// "Erstellt am" der Exporte (Ortszeit, ISO ohne Zeitzone) – Teil der Eingabe statt
+// datetime.now() im Script, damit gleiche Daten gleiche Dateien ergeben
+function erstelltAmJetzt() {
+  const d = new Date();
+  const p = (n) => String(n).padStart(2, '0');
+  return `${d.getFullYear()}-${p(d.getMonth() + 1)}-${p(d.getDate())}T${p(d.getHours())}:${p(d.getMinutes())}:${p(d.getSeconds())}`;
+}
+
+// Fortschritt an den Renderer (export-dialog.js); die Scripts begrenzen die Rate selbst
+function sendeExportFortschritt(kind, ereignis) {
+  if (mainWindow && !mainWindow.isDestroyed()) {
+    mainWindow.webContents.send('export:progress', { kind, ...ereignis });
+  }
+}
+
+function getScriptDir() {
+  return app.isPackaged
+    ? path.join(process.resourcesPath, 'scripts')
+    : path.join(__dirname, 'scripts');
+}
+
+function getPythonCommand() {
+  return process.platform === 'win32' ? 'python' : 'python3';
+}
+
 /**
- * FIX: Export-Handler waren 4× identisch dupliziert (~80 Zeilen je Handler).
- * Jetzt eine einzige Funktion; alle vier Handler delegieren hierher.
+ * Alle Exporte laufen gepackt über ein gemeinsames PyInstaller-Programm
+ * (scripts/teamflow_export/teamflow_export.exe, onedir) mit Unterbefehlen.
+ */
+function getExportExe() {
+  return path.join(getScriptDir(), 'teamflow_export', 'teamflow_export.exe');
+}
+
+// ── Export-Worker ─────────────────────────────────────────────────────────────
+/**
+ * Langlebiger Python-Prozess für alle Exporte (scripts/export_worker.py).
+ * Wird beim ersten Export gestartet und danach wiederverwendet – spart pro Export
+ * den Prozessstart, das Entpacken der PyInstaller-Runtime und den Import von
+ * reportlab/openpyxl.
  *
- * @param {object} data        - Daten für das Script (werden als JSON geschrieben)
- * @param {string} scriptName  - Dateiname des Python-Scripts ohne Pfad (z.B. 'export_to_excel.py')
- * @param {string} outputName  - Dateiname der Ausgabedatei inkl. Endung
- * @returns {{ success: boolean, path?: string, error?: string }}
+ * Protokoll: ein JSON-Auftrag pro Zeile auf stdin, eine JSON-Antwort pro Zeile auf stdout.
+ * Vor der Antwort können Zwischenmeldungen { id, fortschritt: {...} } kommen.
  */
-async function runExportScript(data, scriptName, outputName) {
-  const exportDir  = getExportPath();
-  const timestamp  = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
-  const tempJson   = path.join(exportDir, `temp_${timestamp}.json`);
-  const outputPath = path.join(exportDir, outputName.replace('{ts}', timestamp));
+class ExportWorker {
+  constructor() {
+    this.child   = null;
+    this.ready   = null;
+    this.pending = new Map();
+    this.nextId  = 1;
+    this.buffer  = '';
+  }
 
-  fs.writeFileSync(tempJson, JSON.stringify(data, null, 2), 'utf-8');
-  logger.info('✅ Export-JSON geschrieben', { script: scriptName, output: outputPath });
+  _start() {
+    const scriptDir = getScriptDir();
+    const command = app.isPackaged ? getExportExe() : getPythonCommand();
+    const args    = app.isPackaged ? ['worker'] : [path.join(scriptDir, 'export_worker.py')];
+
+    logger.info('🐍 Starte Export-Worker', { command });
+    const child = spawn(command, args, { shell: false, cwd: getExportPath() });
+    this.child  = child;
+    this.buffer = '';
+    this.ready  = new Promise((resolve, reject) => { this._readyResolve = resolve; this._readyReject = reject; });
+    // Unhandled Rejection vermeiden, falls niemand auf ready wartet
+    this.ready.catch(() => {});
+
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', chunk => this._onData(chunk));
+    child.stderr.on('data', d => logger.debug('Export-Worker stderr:', d.toString()));
+    child.on('error', e => this._onExit(child, `Export-Worker Fehler: ${e.message}`));
+    child.on('close', code => this._onExit(child, `Export-Worker beendet (Exit Code ${code})`));
+  }
 
-  const scriptDir = app.isPackaged
-    ? path.join(process.resourcesPath, 'scripts')
-    : path.join(__dirname, 'scripts');
+  _onData(chunk) {
+    this.buffer += chunk;
+    let idx;
+    while ((idx = this.buffer.indexOf('\n')) >= 0) {
+      const line = this.buffer.slice(0, idx).trim();
+      this.buffer = this.buffer.slice(idx + 1);
+      if (!line) continue;
+
+      let msg;
+      try { msg = JSON.parse(line); }
+      catch { logger.warn('Export-Worker: ungültige Antwortzeile', { line }); continue; }
+
+      if (msg.ready) { logger.success('✅ Export-Worker bereit', { kinds: msg.kinds }); this._readyResolve(); continue; }
+
+      const job = this.pending.get(msg.id);
+      if (!job) { logger.warn('Export-Worker: Antwort ohne Auftrag', msg); continue; }
+      if (msg.fortschritt) { job.onFortschritt?.(msg.fortschritt); continue; }
+      this.pending.delete(msg.id);
+      job.resolve(msg);
+    }
+  }
+
+  _onExit(child, reason) {
+    if (this.child !== child) return;
+    this.child = null;
+    logger.warn(`⚠️ ${reason}`);
+    this._readyReject(new Error(reason));
+    for (const job of this.pending.values()) job.reject(new Error(reason));
+    this.pending.clear();
+  }
+
+  /**
+   * Führt einen Export im Worker aus.
+   * Rejected nur, wenn der Worker selbst nicht verfügbar ist – Fehler beim
+   * Erstellen der Datei kommen als { ok: false, error } zurück.
+   * onFortschritt(ereignis) bekommt die Zwischenmeldungen des Auftrags.
+   */
+  async run(kind, payload, output, onFortschritt) {
+    if (!this.child) this._start();
+    await this.ready;
+
+    const id = String(this.nextId++);
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject, onFortschritt });
+      const auftrag = { id, kind, payload, output };
+      if (EXPORT_PROFILE) auftrag.profile = true;
+      if (onFortschritt) auftrag.fortschritt = true;
+      const cache = getExportCache(kind);
+      if (cache) auftrag.cache = cache;
+      if (EXPORT_XLSX_NATIV && kind === 'excel') auftrag.backend = 'nativ';
+      if (EXPORT_TIMEOUT_S && EXPORT_SCRIPTS[kind].zeitlimit) auftrag.timeoutS = EXPORT_TIMEOUT_S;
+      this.child.stdin.write(JSON.stringify(auftrag) + '\n', 'utf8');
+    });
+  }
+
+  stop() {
+    if (!this.child) return;
+    logger.info('🛑 Beende Export-Worker');
+    this.child.stdin.end();
+    this.child = null;
+  }
+}
+
+const exportWorker = new ExportWorker();
+
+/**
+ * Fallback: ein eigener Prozess pro Export (Übergabe der JSON über stdin, "-").
+ * Wird nur genutzt, wenn der Export-Worker nicht gestartet werden kann.
+ */
+async function runExportProcess(data, kind, outputPath, exportDir, onFortschritt) {
+  let { script, befehl, args: scriptArgs = [], fortschritt, zeitlimit } = EXPORT_SCRIPTS[kind];
+
+  // Zeitraum-Aufträge aus der DB brauchen keine JSON – das Script liest selbst
+  // aus der Datenbank. Alle anderen bekommen die JSON über stdin.
+  let stdinJson = null, quelleArgs;
+  if (data.quelle === 'db' && data.vonDatum) {
+    quelleArgs = ['--db', data.db, '--von', data.vonDatum, '--bis', data.bisDatum, '--types', data.typen.join(',')];
+    if (!data.nurMitEintraegen) quelleArgs.push('--alle-mitarbeiter');
+    if (data.erstelltAm) quelleArgs.push('--erstellt-am', data.erstelltAm);
+  } else {
+    stdinJson = JSON.stringify(data);
+    quelleArgs = ['-'];
+  }
+
+  if (EXPORT_PROFILE) scriptArgs = [...scriptArgs, '--profile'];
+  if (fortschritt && onFortschritt) scriptArgs = [...scriptArgs, '--fortschritt'];
+  const cache = getExportCache(kind);
+  if (cache) scriptArgs = [...scriptArgs, '--cache', cache.ordner, '--cache-max-mb', String(cache.maxMb)];
+  if (EXPORT_XLSX_NATIV && kind === 'excel') scriptArgs = [...scriptArgs, '--backend', 'nativ'];
+  if (EXPORT_TIMEOUT_S && zeitlimit) scriptArgs = [...scriptArgs, '--timeout-s', String(EXPORT_TIMEOUT_S)];
 
   let command, args;
   if (app.isPackaged) {
-    command = path.join(scriptDir, scriptName.replace('.py', '.exe'));
-    args = [tempJson, outputPath];
+    command = getExportExe();
+    args = [befehl, ...scriptArgs, ...quelleArgs, outputPath];
   } else {
-    command = process.platform === 'win32' ? 'python' : 'python3';
-    args = [path.join(scriptDir, scriptName), tempJson, outputPath];
+    command = getPythonCommand();
+    args = [path.join(getScriptDir(), script), ...scriptArgs, ...quelleArgs, outputPath];
   }
 
   const result = await new Promise((resolve) => {
     const child = spawn(command, args, { shell: false, cwd: exportDir });
+    child.stdin.on('error', () => { /* Script schon beendet, der Fehler kommt über close */ });
+    if (stdinJson) child.stdin.end(stdinJson, 'utf8');
+    else child.stdin.end();
     let stdout = '', stderr = '';
-    child.stdout.on('data', d => { stdout += d.toString(); logger.debug('Export stdout:', d.toString()); });
-    child.stderr.on('data', d => { stderr += d.toString(); logger.warn('Export stderr:', d.toString()); });
+    child.stdout.on('data', d => {
+      stdout += d.toString();
+      // --fortschritt: vollständige Zeilen {"phase": ...} weiterreichen, Rest ins Log
+      let idx;
+      while ((idx = stdout.indexOf('\n')) >= 0) {
+        const zeile = stdout.slice(0, idx).trim();
+        stdout = stdout.slice(idx + 1);
+        if (zeile.startsWith('{"phase"')) {
+          try { onFortschritt?.(JSON.parse(zeile)); continue; } catch (_) { /* als Text loggen */ }
+        }
+        if (zeile) logger.debug('Export stdout:', zeile);
+      }
+    });
+    child.stderr.on('data', d => {
+      stderr += d.toString();
+      if (!d.toString().startsWith('PROFILE ')) logger.warn('Export stderr:', d.toString());
+    });
     child.on('close', code => {
+      // --profile: eine Zeile "PROFILE {...}" auf stderr
+      const profilZeile = stderr.split('\n').find(z => z.startsWith('PROFILE '));
+      if (profilZeile) {
+        try { logExportProfil(kind, JSON.parse(profilZeile.slice(8))); } catch (_) { /* ignore */ }
+        stderr = stderr.replace(profilZeile, '').trim();
+      }
       if (code === 0) {
-        logger.success('✅ Export erfolgreich', { path: outputPath });
         resolve({ success: true, path: outputPath });
+      } else if (code === EXIT_ABGEBROCHEN) {
+        logger.warn('⏹️ Export abgebrochen', { kind, stderr });
+        resolve({ success: false, error: stderr });
       } else {
         logger.error('❌ Export fehlgeschlagen', { code, stderr });
         resolve({ success: false, error: `Exit Code ${code}: ${stderr}` });
@@ -492,42 +705,122 @@ async function runExportScript(data, scriptName, outputName) {
     child.on('error', e => { logger.error('❌ Prozess Fehler', { error: e.message }); resolve({ success: false, error: e.message }); });
   });
 
-  try { fs.unlinkSync(tempJson); } catch (_) { /* ignore */ }
+  return result;
+}
+
+/**
+ * FIX: Export-Handler waren 4× identisch dupliziert (~80 Zeilen je Handler).
+ * Jetzt eine einzige Funktion; alle Handler delegieren hierher.
+ *
+ * @param {object} data        - Daten für das Script
+ * @param {string} kind        - Export-Typ (Schlüssel in EXPORT_SCRIPTS, z.B. 'excel')
+ * @param {string} outputName  - Dateiname der Ausgabedatei inkl. Endung
+ * @returns {{ success: boolean, path?: string, error?: string }}
+ */
+async function runExportScript(data, kind, outputName) {
+  data = { ...data, erstelltAm: erstelltAmJetzt() };
+  const exportDir  = getExportPath();
+  const timestamp  = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
+  const outputPath = path.join(exportDir, outputName.replace('{ts}', timestamp));
+
+  const onFortschritt = EXPORT_SCRIPTS[kind].fortschritt
+    ? (ereignis) => sendeExportFortschritt(kind, ereignis)
+    : undefined;
+
+  let result;
+  try {
+    const antwort = await exportWorker.run(kind, data, outputPath, onFortschritt);
+    if (antwort.profil) logExportProfil(kind, antwort.profil);
+    if (antwort.cache) logger.info('♻️ Export aus dem Cache', { kind, path: outputPath });
+    if (antwort.ok) {
+      result = { success: true, path: outputPath };
+    } else if (antwort.abgebrochen) {
+      logger.warn('⏹️ Export abgebrochen', { kind, error: antwort.error });
+      result = { success: false, error: antwort.error };
+    } else {
+      logger.error('❌ Export fehlgeschlagen', { kind, error: antwort.error });
+      result = { success: false, error: antwort.error };
+    }
+  } catch (e) {
+    logger.warn('⚠️ Export-Worker nicht verfügbar, starte Einzelprozess', { error: e.message });
+    result = await runExportProcess(data, kind, outputPath, exportDir, onFortschritt);
+  }
 
   if (result.success) {
+    logger.success('✅ Export erfolgreich', { path: outputPath });
     const { shell } = require('electron');
     await shell.openPath(exportDir);
   }
   return result;
 }
 
+/**
+ * Zeitraum-Export (Excel/PDF): Der Renderer schickt nur noch die Filter,
+ * das Python-Script liest die Einträge selbst read-only aus der Datenbank
+ * (teamflow_export_db.py) – statt vier IPC-Abfragen pro Mitarbeiter.
+ * Fertige exportData-Payloads werden weiterhin unverändert durchgereicht.
+ */
+function zeitraumAuftrag(data) {
+  if (data.exportData) return data;
+  return {
+    quelle:           'db',
+    db:               getDatabasePath(),
+    vonDatum:         data.vonDatum,
+    bisDatum:         data.bisDatum,
+    typen:            data.typen,
+    nurMitEintraegen: data.nurMitEintraegen !== false,
+  };
+}
+
 ipcMain.handle('export:excel', async (event, data) => {
-  logger.info('📊 Excel-Export gestartet');
-  return runExportScript(data, 'export_to_excel.py', `Abwesenheit_{ts}.xlsx`);
+  logger.info('📊 Excel-Export gestartet', { von: data.vonDatum, bis: data.bisDatum });
+  return runExportScript(zeitraumAuftrag(data), 'excel', `Abwesenheit_{ts}.xlsx`);
 });
 
 ipcMain.handle('export:pdf', async (event, data) => {
-  logger.info('📄 PDF-Export gestartet');
-  return runExportScript(data, 'export_to_pdf.py', `Abwesenheit_{ts}.pdf`);
+  logger.info('📄 PDF-Export gestartet', { von: data.vonDatum, bis: data.bisDatum });
+  return runExportScript(zeitraumAuftrag(data), 'pdf', `Abwesenheit_{ts}.pdf`);
 });
 
 ipcMain.handle('export:employeeDetailPdf', async (event, data) => {
   const name = (data.employee?.name || 'Mitarbeiter').replace(/[^a-zA-Z0-9]/g, '_');
   logger.info('📄 Stammdaten-PDF-Export gestartet', { employee: data.employee?.name });
-  return runExportScript(data, 'export_employee_detail.py', `Mitarbeiter_${name}_{ts}.pdf`);
+  return runExportScript(data, 'employeeDetailPdf', `Mitarbeiter_${name}_{ts}.pdf`);
 });
 
 
   ipcMain.handle('export:employeeYearPdf', async (event, data) => {
     const name = (data.employee?.name || 'Mitarbeiter').replace(/[^a-zA-Z0-9]/g, '_');
     logger.info('📄 Jahres-PDF-Export gestartet', { employee: data.employee?.name, jahr: data.jahr });
-    return runExportScript(data, 'export_employee_year.py', `Jahresuebersicht_${name}_${data.jahr}_{ts}.pdf`);
+    return runExportScript(data, 'employeeYearPdf', `Jahresuebersicht_${name}_${data.jahr}_{ts}.pdf`);
   });
  
   ipcMain.handle('export:employeeYearExcel', async (event, data) => {
     const name = (data.employee?.name || 'Mitarbeiter').replace(/[^a-zA-Z0-9]/g, '_');
     logger.info('📊 Jahres-Excel-Export gestartet', { employee: data.employee?.name, jahr: data.jahr });
-    return runExportScript(data, 'export_employee_year_excel.py', `Jahresuebersicht_${name}_${data.jahr}_{ts}.xlsx`);
+    return runExportScript(data, 'employeeYearExcel', `Jahresuebersicht_${name}_${data.jahr}_{ts}.xlsx`);
+  });
+
+  /**
+   * Jahresübersichten aller aktiven Mitarbeiter in einem Lauf (Ordner + manifest.json).
+   * Einträge liest das Script aus der Datenbank; stats ({ mitarbeiterId: {...} })
+   * kommen vom DataManager, weil Anspruch/Übertrag/Verfall dort berechnet werden.
+   * format 'excel' mit sammelmappe: eine .xlsx mit allen Mitarbeitern statt eines Ordners.
+   */
+  ipcMain.handle('export:employeeYearBatch', async (event, data) => {
+    const sammelmappe = data.format === 'excel' && !!data.sammelmappe;
+    const kind = sammelmappe ? 'employeeYearWorkbook'
+      : data.format === 'excel' ? 'employeeYearExcelBatch' : 'employeeYearPdfBatch';
+    logger.info('📚 Jahres-Batch-Export gestartet', { format: data.format, jahr: data.jahr });
+    const auftrag = {
+      quelle:           'db',
+      db:               getDatabasePath(),
+      jahr:             String(data.jahr),
+      typen:            data.typen,
+      stats:            data.stats,
+      nurMitEintraegen: !!data.nurMitEintraegen,
+    };
+    return runExportScript(auftrag, kind, `Jahresuebersichten_${data.jahr}_{ts}${sammelmappe ? '.xlsx' : ''}`);
   });
 
 // ── Fehlerbehandlung ──────────────────────────────────────────────────────────
@@ -16,6 +16,13 @@ contextBridge.exposeInMainWorld('electronAPI', {
   exportEmployeeDetailPdf: (data) => ipcRenderer.invoke('export:employeeDetailPdf', data),
   exportEmployeeYearPdf: (data) => ipcRenderer.invoke('export:employeeYearPdf', data),
   exportEmployeeYearExcel: (data) => ipcRenderer.invoke('export:employeeYearExcel', data),
+  exportEmployeeYearBatch: (data) => ipcRenderer.invoke('export:employeeYearBatch', data),
+  // Fortschritt laufender Exporte ({ kind, phase, done, total }); Rückgabe meldet ab
+  onExportProgress: (callback) => {
+    const listener = (event, ereignis) => callback(ereignis);
+    ipcRenderer.on('export:progress', listener);
+    return () => ipcRenderer.removeListener('export:progress', listener);
+  },
 
   db: {
     query: (sql, params) => ipcRenderer.invoke('db:query', sql, params),
@@ -6,9 +6,15 @@ Erstellt eine formatierte PDF mit den Stammdaten eines Mitarbeiters
 """
 
 import sys
-import json
-import io
-from datetime import datetime
+import argparse
+from functools import partial
+
+from teamflow_export_profil import KEIN_PROFIL, add_profil_argumente, profil_aus_argumenten
+from teamflow_export_cache import exportiere, add_cache_argumente, cache_aus_argumenten
+from teamflow_export_modell import lade_json, erstellt_am
+from teamflow_export_datum import fmt_datum as datum_text
+from teamflow_export_stdio import ausgabe_ziel, senden
+from teamflow_export_reproduzierbar import pdf_canvas
 
 try:
     from reportlab.lib.pagesizes import A4
@@ -36,14 +42,8 @@ C_WHITE    = colors.white
 C_SECTION  = colors.HexColor("#E8EEF7")
 
 
-def fmt_datum(d):
-    """YYYY-MM-DD -> DD.MM.YYYY"""
-    if not d:
-        return "–"
-    try:
-        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
-    except Exception:
-        return d
+# Fehlendes Datum als Gedankenstrich (teamflow_export_datum)
+fmt_datum = partial(datum_text, leer="–")
 
 
 def fmt_zahl(v, einheit=""):
@@ -67,7 +67,7 @@ def fmt_waehrung(v):
         return "–"
 
 
-def footer_canvas(canvas, doc):
+def footer_canvas(canvas, doc, erstellt):
     canvas.saveState()
     canvas.setFont("Helvetica", 8)
     canvas.setFillColor(C_MUTED)
@@ -79,7 +79,7 @@ def footer_canvas(canvas, doc):
     canvas.drawString(
         2*cm,
         1.2*cm,
-        f"TeamFlow – Stammdaten-Export – {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+        f"TeamFlow – Stammdaten-Export – {erstellt:%d.%m.%Y}"
     )
     # Linie
     canvas.setStrokeColor(C_GREY)
@@ -120,8 +120,9 @@ def info_zeile(label, wert, col_widths=(5*cm, 10*cm)):
     return t
 
 
-def create_stammdaten_pdf(data, output_path):
-    emp = data.get("employee", {})
+def create_stammdaten_pdf(data, output_path, profil=KEIN_PROFIL):
+    emp      = data.get("employee", {})
+    erstellt = erstellt_am(data)
 
     doc = SimpleDocTemplate(
         output_path,
@@ -132,6 +133,7 @@ def create_stammdaten_pdf(data, output_path):
         rightMargin=2*cm,
     )
 
+    profil.naechste_phase("tabellen")
     styles = getSampleStyleSheet()
     elements = []
 
@@ -160,7 +162,7 @@ def create_stammdaten_pdf(data, output_path):
         fontSize=8, textColor=C_MUTED, alignment=TA_RIGHT, spaceAfter=16
     )
     elements.append(Paragraph(
-        f"Erstellt am {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}",
+        f"Erstellt am {erstellt:%d.%m.%Y}",
         erstellt_style
     ))
 
@@ -246,33 +248,41 @@ def create_stammdaten_pdf(data, output_path):
         elements.append(Spacer(1, 0.3*cm))
 
     # ── PDF bauen ─────────────────────────────────────────────────────────────
-    doc.build(elements, onFirstPage=footer_canvas, onLaterPages=footer_canvas)
+    profil.naechste_phase("speichern")
+    fusszeile = partial(footer_canvas, erstellt=erstellt)
+    doc.build(elements, onFirstPage=fusszeile, onLaterPages=fusszeile, canvasmaker=pdf_canvas(erstellt))
+    profil.naechste_phase(None)
+    profil.zaehle("seiten", doc.page)
     sys.stdout.buffer.write(f"PDF erfolgreich erstellt: {output_path}\n".encode("utf-8"))
 
 
 def main():
-    if len(sys.argv) != 3:
-        sys.stderr.buffer.write(
-            b"FEHLER: Usage: python export_employee_detail.py <input.json> <output.pdf>\n"
-        )
-        sys.exit(1)
-
-    input_file  = sys.argv[1]
-    output_file = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Stammdaten-Export fuer TeamFlow (PDF)")
+    parser.add_argument("input_file", help="Export-Daten als JSON, - fuer stdin")
+    parser.add_argument("output_file", help="Ziel-Datei (.pdf), - fuer stdout")
+    add_profil_argumente(parser)
+    add_cache_argumente(parser)
+    args = parser.parse_args()
+    ziel = ausgabe_ziel(args.output_file, ".pdf")
+    profil = profil_aus_argumenten(args, "export_employee_detail")
 
     try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with profil.phase("json_laden"):
+            data = lade_json(args.input_file)
         sys.stdout.buffer.write(b"JSON gelesen\n")
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
         sys.exit(1)
 
     try:
-        create_stammdaten_pdf(data, output_file)
+        exportiere(cache_aus_argumenten(args), create_stammdaten_pdf, data, ziel, profil=profil)
+        senden(ziel)
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Erstellen der PDF: {e}\n".encode("utf-8"))
         sys.exit(1)
+    finally:
+        if profil.aktiv:
+            profil.schreibe()
 
 
 if __name__ == "__main__":
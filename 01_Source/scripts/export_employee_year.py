@@ -6,8 +6,18 @@ Erstellt eine formatierte PDF mit allen Eintraegen eines Mitarbeiters fuer ein J
 """
 
 import sys
-import json
-from datetime import datetime
+import argparse
+from functools import partial
+
+from teamflow_export_profil import KEIN_PROFIL, add_profil_argumente, profil_aus_argumenten
+from teamflow_export_cache import exportiere, add_cache_argumente, cache_aus_argumenten
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, add_fortschritt_argumente, fortschritt_aus_argumenten
+from teamflow_export_batch import fuehre_batch_aus, add_batch_argumente, pruefe_batch_argumente
+from teamflow_export_db import add_jahres_db_argumente
+from teamflow_export_modell import UEBERSTUNDEN, eintraege as als_eintraege, lade_json, erstellt_am
+from teamflow_export_datum import fmt_datum as datum_text
+from teamflow_export_stdio import ausgabe_ziel, senden
+from teamflow_export_reproduzierbar import pdf_canvas
 
 try:
     from reportlab.lib.pagesizes import A4
@@ -19,6 +29,7 @@ try:
     )
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    from teamflow_pdf_stile import hintergruende, StilTabelle
 except ImportError:
     print("FEHLER: reportlab nicht installiert!", file=sys.stderr)
     sys.exit(1)
@@ -52,13 +63,8 @@ TYP_LABEL = {
 }
 
 
-def fmt_datum(d):
-    if not d:
-        return "–"
-    try:
-        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
-    except Exception:
-        return d
+# Fehlendes Datum als Gedankenstrich (teamflow_export_datum)
+fmt_datum = partial(datum_text, leer="–")
 
 
 def fmt_zahl(v, einheit=""):
@@ -72,7 +78,7 @@ def fmt_zahl(v, einheit=""):
         return "–"
 
 
-def footer_canvas(canvas, doc):
+def footer_canvas(canvas, doc, erstellt):
     canvas.saveState()
     canvas.setFont("Helvetica", 8)
     canvas.setFillColor(C_MUTED)
@@ -82,7 +88,7 @@ def footer_canvas(canvas, doc):
     )
     canvas.drawString(
         2*cm, 1.2*cm,
-        f"TeamFlow – Jahresuebersicht – {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+        f"TeamFlow – Jahresuebersicht – {erstellt:%d.%m.%Y}"
     )
     canvas.setStrokeColor(C_GREY)
     canvas.setLineWidth(0.5)
@@ -90,11 +96,14 @@ def footer_canvas(canvas, doc):
     canvas.restoreState()
 
 
-def create_year_pdf(data, output_path):
+def create_year_pdf(data, output_path, profil=KEIN_PROFIL):
     emp      = data.get("employee", {})
     jahr     = data.get("jahr", "")
     stats    = data.get("stats", {})
-    eintraege = data.get("eintraege", [])
+    erstellt = erstellt_am(data)
+    with profil.phase("modell"):
+        eintraege = als_eintraege(data.get("eintraege"))
+    profil.zaehle("eintraege", len(eintraege))
 
     doc = SimpleDocTemplate(
         output_path,
@@ -105,6 +114,7 @@ def create_year_pdf(data, output_path):
         rightMargin=2*cm,
     )
 
+    profil.naechste_phase("tabellen")
     styles = getSampleStyleSheet()
     elements = []
 
@@ -140,7 +150,7 @@ def create_year_pdf(data, output_path):
     elements.append(header_table)
     elements.append(HRFlowable(width="100%", thickness=2, color=C_PRIMARY, spaceAfter=4))
     elements.append(Paragraph(
-        f"Jahresuebersicht {jahr}  |  Erstellt am {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}",
+        f"Jahresuebersicht {jahr}  |  Erstellt am {erstellt:%d.%m.%Y}",
         erstellt_style
     ))
 
@@ -242,41 +252,41 @@ def create_year_pdf(data, output_path):
             ("ALIGN",         (1,1), (3,-1), "CENTER"),
             ("GRID",          (0,0), (-1,-1), 0.4, C_GREY),
         ]
+        farben = []
 
         for i, e in enumerate(eintraege, 1):
-            typ   = e.get("typ", "")
+            typ   = e.typ_name
             farbe = TYP_FARBEN.get(typ, C_WHITE)
             label = TYP_LABEL.get(typ, typ)
 
             # Von/Bis
-            von_str = fmt_datum(e.get("von_datum") or e.get("datum"))
-            bis_str = fmt_datum(e.get("bis_datum") or e.get("datum"))
+            von_str = fmt_datum(e.von)
+            bis_str = fmt_datum(e.bis)
 
             # Wert
-            wert = e.get("wert", 0)
-            if typ == "ueberstunden":
-                vorzeichen = "+" if float(wert or 0) >= 0 else ""
+            wert = e.wert
+            if e.typ == UEBERSTUNDEN:
+                vorzeichen = "+" if wert >= 0 else ""
                 wert_str = f"{vorzeichen}{fmt_zahl(wert, 'h')}"
             else:
                 wert_str = fmt_zahl(wert, " T")
 
-            notiz = e.get("notiz") or e.get("titel") or ""
+            notiz = e.notiz or e.titel or ""
 
             tbl_data.append([label, von_str, bis_str, wert_str, notiz])
 
-            # Typ-Farbe auf alle Spalten
-            style_cmds.append(("BACKGROUND", (0, i), (-1, i), farbe))
-
-            # Abwechselnde Zeilen leicht aufhellen
+            # Typ-Farbe auf alle Spalten, abwechselnde Zeilen leicht abgedunkelt
             if i % 2 == 0:
-                style_cmds.append(("BACKGROUND", (0, i), (-1, i),
-                    colors.Color(farbe.red * 0.95, farbe.green * 0.95, farbe.blue * 0.95)))
+                farbe = colors.Color(farbe.red * 0.95, farbe.green * 0.95, farbe.blue * 0.95)
+            farben.append(farbe)
 
         col_w = [3*cm, 2.8*cm, 2.8*cm, 2.4*cm, 0]
         seite_b = A4[0] - 4*cm
         col_w[-1] = seite_b - sum(col_w[:-1])
 
-        tbl = Table(tbl_data, colWidths=col_w, repeatRows=1)
+        style_cmds += hintergruende(farben)
+
+        tbl = StilTabelle(tbl_data, colWidths=col_w, repeatRows=1)
         tbl.setStyle(TableStyle(style_cmds))
         elements.append(tbl)
 
@@ -304,33 +314,59 @@ def create_year_pdf(data, output_path):
     elements.append(leg_table)
 
     # ── Bauen ──────────────────────────────────────────────────────────────────
-    doc.build(elements, onFirstPage=footer_canvas, onLaterPages=footer_canvas)
+    profil.naechste_phase("speichern")
+    fusszeile = partial(footer_canvas, erstellt=erstellt)
+    doc.build(elements, onFirstPage=fusszeile, onLaterPages=fusszeile, canvasmaker=pdf_canvas(erstellt))
+    profil.naechste_phase(None)
+    profil.zaehle("seiten", doc.page)
     sys.stdout.buffer.write(f"PDF erfolgreich erstellt: {output_path}\n".encode("utf-8"))
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.stderr.buffer.write(
-            b"FEHLER: Usage: python export_employee_year.py <input.json> <output.pdf>\n"
-        )
-        sys.exit(1)
+def create_year_pdf_batch(payload, ausgabe_ordner, workers=None, fortschritt=KEIN_FORTSCHRITT):
+    """Jahresuebersichten aller Mitarbeiter nach ausgabe_ordner (siehe teamflow_export_batch)"""
+    return fuehre_batch_aus(create_year_pdf, payload, ausgabe_ordner, ".pdf", workers, fortschritt)
 
-    input_file  = sys.argv[1]
-    output_file = sys.argv[2]
+
+def main():
+    parser = argparse.ArgumentParser(description="Jahres-Export fuer TeamFlow (PDF)")
+    parser.add_argument("input_file", nargs="?", help="Export-Daten als JSON, - fuer stdin (entfaellt mit --db)")
+    parser.add_argument("output", help="Ziel-Datei (.pdf), - fuer stdout, mit --batch ein Ordner")
+    add_batch_argumente(parser)
+    add_jahres_db_argumente(parser)
+    add_profil_argumente(parser)
+    add_cache_argumente(parser)
+    add_fortschritt_argumente(parser)
+    args = parser.parse_args()
+    pruefe_batch_argumente(parser, args)
+    ziel = ausgabe_ziel(args.output, ".pdf")
+    profil = profil_aus_argumenten(args, "export_employee_year")
+    fortschritt = fortschritt_aus_argumenten(args)
 
     try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        sys.stdout.buffer.write(b"JSON gelesen\n")
+        if args.db:
+            data = {"quelle": "db", "db": args.db, "jahr": args.jahr, "typen": args.types}
+        else:
+            with profil.phase("json_laden"):
+                data = lade_json(args.input_file)
+            sys.stdout.buffer.write(b"JSON gelesen\n")
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
         sys.exit(1)
 
     try:
-        create_year_pdf(data, output_file)
+        if args.batch:
+            with profil.phase("batch"):
+                manifest = create_year_pdf_batch(data, args.output, args.workers, fortschritt)
+            profil.zaehle("dateien", manifest["anzahl"])
+        else:
+            exportiere(cache_aus_argumenten(args), create_year_pdf, data, ziel, profil=profil)
+            senden(ziel)
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Erstellen der PDF: {e}\n".encode("utf-8"))
         sys.exit(1)
+    finally:
+        if profil.aktiv:
+            profil.schreibe()
 
 
 if __name__ == "__main__":
@@ -2,18 +2,29 @@
 # -*- coding: utf-8 -*-
 """
 Mitarbeiter-Jahres-Excel-Export fuer TeamFlow
-Erstellt eine formatierte Excel-Datei mit Jahresuebersicht eines Mitarbeiters
+Erstellt eine formatierte Excel-Datei mit Jahresuebersicht eines Mitarbeiters,
+mit --batch eine Datei pro Mitarbeiter, mit --sammelmappe alle in einer Datei
 """
 
+import re
 import sys
-import json
-import io
-from datetime import datetime
+import argparse
+
+from teamflow_export_profil import KEIN_PROFIL, add_profil_argumente, profil_aus_argumenten
+from teamflow_export_cache import exportiere, add_cache_argumente, cache_aus_argumenten
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, add_fortschritt_argumente, fortschritt_aus_argumenten
+from teamflow_export_batch import batch_jobs, fuehre_batch_aus, add_batch_argumente, pruefe_batch_argumente
+from teamflow_export_db import add_jahres_db_argumente
+from teamflow_export_modell import UEBERSTUNDEN, eintraege as als_eintraege, lade_json, erstellt_am
+from teamflow_export_datum import fmt_datum
+from teamflow_export_stdio import ausgabe_ziel, senden
+from teamflow_export_reproduzierbar import speichere_xlsx
 
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
     from openpyxl.utils import get_column_letter
+    from teamflow_xlsx_styles import stil_register
+    from teamflow_xlsx_native import Mappe
 except ImportError:
     print("FEHLER: openpyxl nicht installiert!", file=sys.stderr)
     print("Installiere mit: pip install openpyxl", file=sys.stderr)
@@ -46,20 +57,13 @@ TYP_LABEL = {
     "ueberstunden": "Ueberstunden",
 }
 
-
-def make_border(thin=True):
-    s = "thin" if thin else "medium"
-    side = Side(style=s)
-    return Border(left=side, right=side, top=side, bottom=side)
-
-
-def fmt_datum(d):
-    if not d:
-        return ""
-    try:
-        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
-    except Exception:
-        return d
+LEGENDE = [
+    (C_URLAUB,     "Urlaub (Tage)"),
+    (C_KRANKHEIT,  "Krankheit (Tage)"),
+    (C_SCHULUNG,   "Schulung (Tage)"),
+    (C_UEBERSTD,   "Ueberstunden (Stunden)"),
+    (C_SUMME_BG,   "Summenzeile / Resturlaub"),
+]
 
 
 def fmt_zahl(v, einheit=""):
@@ -73,44 +77,80 @@ def fmt_zahl(v, einheit=""):
         return "–"
 
 
+def stil(cell, **kwargs):
+    """Weist einen gemeinsamen Zellstil zu (siehe teamflow_xlsx_styles)"""
+    cell.style = stil_register(cell.parent.parent).name(**kwargs)
+
+
+# Zellstile als Schluessel fuer stil() bzw. Mappe.stile.index() (Sammelmappe)
+def stil_header(bg=C_PRIMARY_BG, fg=C_PRIMARY_FG, size=10, bold=True, center=True):
+    return dict(bg=bg, fg=fg, bold=bold, size=size,
+                horizontal="center" if center else "left", vertical="center", wrap=True, border="thin")
+
+
+def stil_daten(bg=None, center=False, bold=False, size=9):
+    return dict(bg=bg, bold=bold, size=size,
+                horizontal="center" if center else "left", vertical="center", border="thin")
+
+
+def stil_label(bold=True, size=9, color="666666", bg=None):
+    return dict(bg=bg, fg=color, bold=bold, size=size, horizontal="left", vertical="center", border="thin")
+
+
+def stil_wert(bold=False, size=10, bg=None):
+    return dict(bg=bg, bold=bold, size=size, horizontal="left", vertical="center", border="thin")
+
+
+def stil_titel(size):
+    return dict(fg=C_TITLE_FONT, bold=True, size=size, horizontal="center", vertical="center")
+
+
+def stil_untertitel(horizontal):
+    return dict(fg="888888", italic=True, size=9, horizontal=horizontal)
+
+
+STIL_ABSCHNITT = dict(fg=C_TITLE_FONT, bold=True, size=11, horizontal="left", vertical="center")
+STIL_TYP       = dict(bg=C_PRIMARY_BG, fg=C_PRIMARY_FG, bold=True, size=10,
+                      horizontal="left", vertical="center", indent=1, border="thin")
+
+
 def style_header(cell, bg=C_PRIMARY_BG, fg=C_PRIMARY_FG, size=10, bold=True, center=True):
-    cell.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
-    cell.font = Font(color=fg, bold=bold, size=size)
-    cell.alignment = Alignment(
-        horizontal="center" if center else "left",
-        vertical="center",
-        wrap_text=True
-    )
-    cell.border = make_border()
+    stil(cell, **stil_header(bg, fg, size, bold, center))
 
 
 def style_data(cell, bg=None, center=False, bold=False, size=9):
-    if bg:
-        cell.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
-    cell.font = Font(bold=bold, size=size)
-    cell.alignment = Alignment(
-        horizontal="center" if center else "left",
-        vertical="center"
-    )
-    cell.border = make_border()
+    stil(cell, **stil_daten(bg, center, bold, size))
 
 
-def style_label(cell, text, bold=True, size=9, color="666666"):
+def style_label(cell, text, bold=True, size=9, color="666666", bg=None):
     cell.value = text
-    cell.font = Font(bold=bold, color=color, size=size)
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-    cell.border = make_border()
+    stil(cell, **stil_label(bold, size, color, bg))
 
 
-def style_value(cell, text, bold=False, size=10):
+def style_value(cell, text, bold=False, size=10, bg=None):
     cell.value = text
-    cell.font = Font(bold=bold, size=size)
-    cell.alignment = Alignment(horizontal="left", vertical="center")
-    cell.border = make_border()
+    stil(cell, **stil_wert(bold, size, bg))
+
+
+def style_rahmen(cell, bg=None):
+    """Nur Rahmen (und ggf. Hintergrund) – fuer Zellen innerhalb verbundener Bereiche"""
+    stil(cell, bg=bg, border="thin")
+
+
+def style_titel(cell, size):
+    stil(cell, **stil_titel(size))
+
+
+def style_untertitel(cell, horizontal):
+    stil(cell, **stil_untertitel(horizontal))
+
+
+def style_abschnitt(cell):
+    stil(cell, **STIL_ABSCHNITT)
 
 
 # ── Tabellenblatt 1: Uebersicht ───────────────────────────────────────────────
-def schreibe_uebersicht(wb, emp, jahr, stats):
+def schreibe_uebersicht(wb, emp, jahr, stats, erstellt):
     ws = wb.active
     ws.title = "Uebersicht"
 
@@ -121,16 +161,14 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
     ws.merge_cells("A1:F1")
     tc = ws["A1"]
     tc.value = f"Jahresuebersicht {jahr}  –  {name}"
-    tc.font = Font(color=C_TITLE_FONT, bold=True, size=16)
-    tc.alignment = Alignment(horizontal="center", vertical="center")
+    style_titel(tc, 16)
     ws.row_dimensions[1].height = 32
 
     # Untertitel
     ws.merge_cells("A2:F2")
     sc = ws["A2"]
-    sc.value = f"{department}  |  Erstellt am {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-    sc.font = Font(color="888888", italic=True, size=9)
-    sc.alignment = Alignment(horizontal="center")
+    sc.value = f"{department}  |  Erstellt am {erstellt:%d.%m.%Y}"
+    style_untertitel(sc, "center")
     ws.row_dimensions[2].height = 16
     ws.row_dimensions[3].height = 8  # Abstandszeile
 
@@ -138,8 +176,7 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
     row = 4
     ws.merge_cells(f"A{row}:F{row}")
     hc = ws.cell(row=row, column=1, value="URLAUBSSTATISTIK")
-    hc.font = Font(color=C_TITLE_FONT, bold=True, size=11)
-    hc.alignment = Alignment(horizontal="left", vertical="center")
+    style_abschnitt(hc)
     ws.row_dimensions[row].height = 22
     row += 1
 
@@ -155,26 +192,13 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
         bg = C_SUMME_BG if label == "Resturlaub" else (C_GREY_BG if i % 2 == 0 else None)
         bold_row = label == "Resturlaub"
 
-        lc = ws.cell(row=row, column=1, value=label)
-        lc.font = Font(bold=bold_row, color="666666", size=9)
-        lc.alignment = Alignment(horizontal="left", vertical="center")
-        lc.border = make_border()
-        if bg:
-            lc.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+        style_label(ws.cell(row=row, column=1), label, bold=bold_row, bg=bg)
 
         ws.merge_cells(f"B{row}:F{row}")
-        vc = ws.cell(row=row, column=2, value=wert)
-        vc.font = Font(bold=bold_row, size=10)
-        vc.alignment = Alignment(horizontal="left", vertical="center")
-        vc.border = make_border()
-        if bg:
-            vc.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+        style_value(ws.cell(row=row, column=2), wert, bold=bold_row, bg=bg)
         # Merge-Zellen Border-Fix
         for col in range(3, 7):
-            c = ws.cell(row=row, column=col)
-            c.border = make_border()
-            if bg:
-                c.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+            style_rahmen(ws.cell(row=row, column=col), bg=bg)
 
         ws.row_dimensions[row].height = 18
         row += 1
@@ -183,8 +207,7 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
     row += 1
     ws.merge_cells(f"A{row}:F{row}")
     hc2 = ws.cell(row=row, column=1, value="WEITERE ABWESENHEITEN")
-    hc2.font = Font(color=C_TITLE_FONT, bold=True, size=11)
-    hc2.alignment = Alignment(horizontal="left", vertical="center")
+    style_abschnitt(hc2)
     ws.row_dimensions[row].height = 22
     row += 1
 
@@ -197,25 +220,12 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
     for i, (label, wert) in enumerate(weitere):
         bg = C_GREY_BG if i % 2 == 0 else None
 
-        lc = ws.cell(row=row, column=1, value=label)
-        lc.font = Font(color="666666", size=9)
-        lc.alignment = Alignment(horizontal="left", vertical="center")
-        lc.border = make_border()
-        if bg:
-            lc.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+        style_label(ws.cell(row=row, column=1), label, bold=False, bg=bg)
 
         ws.merge_cells(f"B{row}:F{row}")
-        vc = ws.cell(row=row, column=2, value=wert)
-        vc.font = Font(size=10)
-        vc.alignment = Alignment(horizontal="left", vertical="center")
-        vc.border = make_border()
-        if bg:
-            vc.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+        style_value(ws.cell(row=row, column=2), wert, bg=bg)
         for col in range(3, 7):
-            c = ws.cell(row=row, column=col)
-            c.border = make_border()
-            if bg:
-                c.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
+            style_rahmen(ws.cell(row=row, column=col), bg=bg)
 
         ws.row_dimensions[row].height = 18
         row += 1
@@ -229,8 +239,21 @@ def schreibe_uebersicht(wb, emp, jahr, stats):
     ws.freeze_panes = "A4"
 
 
+def eintrag_zeile(eintrag, label):
+    """Typ | Von | Bis | Wert | Titel | Notiz eines Eintrags"""
+    wert = eintrag.wert
+    if eintrag.typ == UEBERSTUNDEN:
+        vorzeichen = "+" if wert >= 0 else ""
+        wert_str = f"{vorzeichen}{fmt_zahl(wert)}h"
+    else:
+        wert_str = fmt_zahl(wert, " T")
+
+    return [label, fmt_datum(eintrag.von), fmt_datum(eintrag.bis or eintrag.von), wert_str,
+            eintrag.titel or "", eintrag.notiz or ""]
+
+
 # ── Tabellenblatt 2: Eintraege ────────────────────────────────────────────────
-def schreibe_eintraege(wb, emp, jahr, eintraege):
+def schreibe_eintraege(wb, emp, jahr, eintraege, erstellt):
     ws = wb.create_sheet("Eintraege")
 
     name = emp.get("name", "–")
@@ -240,15 +263,13 @@ def schreibe_eintraege(wb, emp, jahr, eintraege):
     ws.merge_cells("A1:G1")
     tc = ws["A1"]
     tc.value = f"Eintraege {jahr}  –  {name}"
-    tc.font = Font(color=C_TITLE_FONT, bold=True, size=14)
-    tc.alignment = Alignment(horizontal="center", vertical="center")
+    style_titel(tc, 14)
     ws.row_dimensions[1].height = 28
 
     ws.merge_cells("A2:G2")
     sc = ws["A2"]
-    sc.value = f"{department}  |  Erstellt am {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-    sc.font = Font(color="888888", italic=True, size=9)
-    sc.alignment = Alignment(horizontal="right")
+    sc.value = f"{department}  |  Erstellt am {erstellt:%d.%m.%Y}"
+    style_untertitel(sc, "right")
     ws.row_dimensions[2].height = 16
     ws.row_dimensions[3].height = 8
 
@@ -266,15 +287,14 @@ def schreibe_eintraege(wb, emp, jahr, eintraege):
     if not eintraege:
         ws.merge_cells("A5:F5")
         nc = ws.cell(row=5, column=1, value="Keine Eintraege vorhanden.")
-        nc.font = Font(color="888888", italic=True, size=9)
-        nc.alignment = Alignment(horizontal="center")
+        style_untertitel(nc, "center")
     else:
         # Typ-Trennzeilen
         aktueller_typ = None
         data_row = 5
 
         for eintrag in eintraege:
-            typ = eintrag.get("typ", "")
+            typ = eintrag.typ_name
             farbe = TYP_FARBEN.get(typ, "FFFFFF")
             label = TYP_LABEL.get(typ, typ)
 
@@ -283,37 +303,13 @@ def schreibe_eintraege(wb, emp, jahr, eintraege):
                 aktueller_typ = typ
                 ws.merge_cells(f"A{data_row}:F{data_row}")
                 gc = ws.cell(row=data_row, column=1, value=label.upper())
-                gc.fill = PatternFill(start_color=C_PRIMARY_BG, end_color=C_PRIMARY_BG, fill_type="solid")
-                gc.font = Font(color=C_PRIMARY_FG, bold=True, size=10)
-                gc.alignment = Alignment(horizontal="left", vertical="center", indent=1)
-                gc.border = make_border()
+                stil(gc, **STIL_TYP)
                 for col in range(2, 7):
-                    c = ws.cell(row=data_row, column=col)
-                    c.fill = PatternFill(start_color=C_PRIMARY_BG, end_color=C_PRIMARY_BG, fill_type="solid")
-                    c.border = make_border()
+                    style_rahmen(ws.cell(row=data_row, column=col), bg=C_PRIMARY_BG)
                 ws.row_dimensions[data_row].height = 20
                 data_row += 1
 
-            von_str = fmt_datum(eintrag.get("von_datum"))
-            bis_str = fmt_datum(eintrag.get("bis_datum") or eintrag.get("von_datum"))
-            wert = eintrag.get("wert", 0)
-
-            if typ == "ueberstunden":
-                try:
-                    f = float(wert)
-                    vorzeichen = "+" if f >= 0 else ""
-                    wert_str = f"{vorzeichen}{fmt_zahl(wert)}h"
-                except Exception:
-                    wert_str = f"{wert}h"
-            else:
-                wert_str = fmt_zahl(wert, " T")
-
-            titel = eintrag.get("titel") or ""
-            notiz = eintrag.get("notiz") or ""
-
-            zeile = [label, von_str, bis_str, wert_str, titel, notiz]
-
-            for col, val in enumerate(zeile, 1):
+            for col, val in enumerate(eintrag_zeile(eintrag, label), 1):
                 cell = ws.cell(row=data_row, column=col, value=val)
                 center = col in (2, 3, 4)
                 style_data(cell, bg=farbe, center=center)
@@ -338,18 +334,9 @@ def schreibe_legende(wb):
     style_header(ws["B1"])
     ws.row_dimensions[1].height = 20
 
-    legende = [
-        (C_URLAUB,     "Urlaub (Tage)"),
-        (C_KRANKHEIT,  "Krankheit (Tage)"),
-        (C_SCHULUNG,   "Schulung (Tage)"),
-        (C_UEBERSTD,   "Ueberstunden (Stunden)"),
-        (C_SUMME_BG,   "Summenzeile / Resturlaub"),
-    ]
-
-    for i, (farbe, text) in enumerate(legende, 2):
+    for i, (farbe, text) in enumerate(LEGENDE, 2):
         ca = ws.cell(row=i, column=1, value="")
-        ca.fill = PatternFill(start_color=farbe, end_color=farbe, fill_type="solid")
-        ca.border = make_border()
+        style_rahmen(ca, bg=farbe)
         cb = ws.cell(row=i, column=2, value=text)
         style_data(cb)
         ws.row_dimensions[i].height = 18
@@ -358,46 +345,274 @@ def schreibe_legende(wb):
     ws.column_dimensions["B"].width = 30
 
 
+# ── Sammelmappe: alle Mitarbeiter in einer Datei ──────────────────────────────
+# Fuer den Jahresabschluss (Lohnbuchhaltung): vorne ein Index-Blatt mit den
+# Kennzahlen aller Mitarbeiter, dahinter ein kompaktes Blatt pro Mitarbeiter.
+# Geschrieben wird mit teamflow_xlsx_native: jedes Blatt geht Zeile fuer Zeile
+# in die Datei, gehalten werden nur gemeinsame Strings und Zellformate – die
+# Zellformate werden einmal pro Mappe angelegt und von allen Blaettern geteilt.
+INDEX_TITEL   = "Uebersicht"
+INDEX_HEADERS = ["Mitarbeiter", "Abteilung", "Anspruch", "Uebertrag", "Verfuegbar", "Genommen",
+                 "Resturlaub", "Krankheit", "Schulung", "Ueberstd.", "Eintraege"]
+INDEX_BREITEN = [28, 20, 11, 11, 11, 11, 11, 11, 11, 11, 10]
+INDEX_FELDER  = ["urlaubsanspruch", "uebertrag_vorjahr", "urlaub_verfuegbar", "urlaub_genommen",
+                 "urlaub_rest", "krankheitstage", "schulungstage", "ueberstunden"]
+
+BLATT_HEADERS = ["Typ", "Von", "Bis", "Wert", "Titel", "Notiz"]
+BLATT_BREITEN = [18, 14, 14, 12, 25, 35]
+
+# Excel: hoechstens 31 Zeichen, keines von []:*?/\, eindeutig ohne Gross-/Kleinschreibung
+_BLATT_UNERLAUBT = re.compile(r"[\[\]:*?/\\]")
+
+
+def blattname(name, vergeben):
+    basis = _BLATT_UNERLAUBT.sub("_", name or "").strip(" '")[:31] or "Mitarbeiter"
+    kandidat, n = basis, 2
+    while kandidat.lower() in vergeben:
+        zusatz = f" ({n})"
+        kandidat, n = basis[:31 - len(zusatz)] + zusatz, n + 1
+    vergeben.add(kandidat.lower())
+    return kandidat
+
+
+def _zahl(v):
+    """Kennzahl als Zahl fuer das Index-Blatt (summierbar), "–" wenn keine"""
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return "–"
+    return int(f) if f == int(f) else round(f, 2)
+
+
+class _Stile:
+    """Zellformate der Sammelmappe, einmal angelegt und von allen Blaettern geteilt"""
+
+    def __init__(self, mappe):
+        i = mappe.stile.index
+        self.titel      = i(**stil_titel(14))
+        self.untertitel = i(**stil_untertitel("center"))
+        self.header     = i(**stil_header())
+        self.typ        = i(**STIL_TYP)
+        self.rahmen_typ = i(bg=C_PRIMARY_BG, border="thin")
+        self.leer       = i(**stil_untertitel("center"))
+        self.link       = i(**stil_daten(bold=True), fg=C_TITLE_FONT)
+        self.summe      = i(**stil_daten(bg=C_SUMME_BG, center=True, bold=True))
+        self.summe_text = i(**stil_daten(bg=C_SUMME_BG, bold=True))
+        self.daten      = {(bg, center): i(**stil_daten(bg, center))
+                           for bg in (None, C_GREY_BG, *TYP_FARBEN.values(), "FFFFFF")
+                           for center in (False, True)}
+        self.label      = {bg: i(**stil_label(bg=bg)) for bg in (None, C_SUMME_BG)}
+        self.wert       = {(bg, bold): i(**stil_wert(bold, bg=bg))
+                           for bg in (None, C_SUMME_BG) for bold in (False, True)}
+        self.rahmen     = {farbe: i(bg=farbe, border="thin") for farbe, _ in LEGENDE}
+
+
+def _kopf(blatt, st, titel, untertitel, letzte_spalte):
+    merge = f"A{{row}}:{letzte_spalte}{{row}}"
+    blatt.zeile([(titel, st.titel)], 28, merge=merge)
+    blatt.zeile([(untertitel, st.untertitel)], 16, merge=merge)
+    blatt.zeile([], 8)
+
+
+def schreibe_index(mappe, st, jobs, namen, jahr, erstellt):
+    blatt = mappe.blatt(INDEX_TITEL, INDEX_BREITEN, freeze="C5")
+    _kopf(blatt, st, f"Jahresuebersicht {jahr}  –  alle Mitarbeiter",
+          f"{len(jobs)} Mitarbeiter  |  Erstellt am {erstellt:%d.%m.%Y}", "K")
+    blatt.zeile([(h, st.header) for h in INDEX_HEADERS], 22)
+
+    summen = [0] * (len(INDEX_FELDER) + 1)
+    for i, (job, name) in enumerate(zip(jobs, namen)):
+        emp   = job.get("employee") or {}
+        stats = job.get("stats") or {}
+        werte = [_zahl(stats.get(feld)) for feld in INDEX_FELDER] + [len(job.get("eintraege") or [])]
+        for k, w in enumerate(werte):
+            if w != "–":
+                summen[k] += w
+
+        bg = C_GREY_BG if i % 2 == 0 else None
+        zellen = [(emp.get("name", "–"), st.link), (emp.get("department") or "–", st.daten[bg, False])]
+        zellen += [(w, st.summe if k == 4 else st.daten[bg, True]) for k, w in enumerate(werte)]
+        blatt.zeile(zellen, 18)
+        # Name fuehrt zum Blatt des Mitarbeiters
+        blatt.verweis(1, "'{}'!A1".format(name.replace("'", "''")))
+
+    zellen = [("GESAMT", st.summe_text), (None, st.summe_text)]
+    zellen += [(_zahl(w), st.summe) for w in summen]
+    blatt.zeile(zellen, 20, merge="A{row}:B{row}")
+
+
+def schreibe_mitarbeiter_blatt(mappe, st, job, name, jahr, erstellt):
+    emp   = job.get("employee") or {}
+    stats = job.get("stats") or {}
+    eintraege = als_eintraege(job.get("eintraege"))
+
+    blatt = mappe.blatt(name, BLATT_BREITEN, freeze="A9")
+    _kopf(blatt, st, f"Jahresuebersicht {jahr}  –  {emp.get('name', '–')}",
+          f"{emp.get('department', '–')}  |  Erstellt am {erstellt:%d.%m.%Y}", "F")
+
+    # Kennzahlen kompakt in drei Zeilen: Label | Wert | Label | Wert | Label | Wert
+    kennzahlen = [
+        [("Jahresanspruch",     fmt_zahl(stats.get("urlaubsanspruch"), " Tage")),
+         ("Genommen",           fmt_zahl(stats.get("urlaub_genommen"), " Tage")),
+         ("Krankheitstage",     fmt_zahl(stats.get("krankheitstage"), " Tage"))],
+        [(f"Uebertrag aus {int(jahr)-1}", fmt_zahl(stats.get("uebertrag_vorjahr"), " Tage")),
+         ("Resturlaub",         fmt_zahl(stats.get("urlaub_rest"), " Tage")),
+         ("Schulungstage",      fmt_zahl(stats.get("schulungstage"), " Tage"))],
+        [("Verfuegbar gesamt",  fmt_zahl(stats.get("urlaub_verfuegbar"), " Tage")),
+         ("Eintraege",          str(len(eintraege))),
+         ("Ueberstunden-Saldo", fmt_zahl(stats.get("ueberstunden"), "h"))],
+    ]
+    for paare in kennzahlen:
+        zellen = []
+        for label, wert in paare:
+            bg = C_SUMME_BG if label == "Resturlaub" else None
+            zellen += [(label, st.label[bg]), (wert, st.wert[bg, bg is not None])]
+        blatt.zeile(zellen, 18)
+    blatt.zeile([], 8)
+    blatt.zeile([(h, st.header) for h in BLATT_HEADERS], 22)
+
+    if not eintraege:
+        blatt.zeile([("Keine Eintraege vorhanden.", st.leer)], 16, merge="A{row}:F{row}")
+        return blatt.row
+
+    aktueller_typ = None
+    for eintrag in eintraege:
+        typ = eintrag.typ_name
+        farbe = TYP_FARBEN.get(typ, "FFFFFF")
+        label = TYP_LABEL.get(typ, typ)
+        if typ != aktueller_typ:
+            aktueller_typ = typ
+            blatt.zeile([(label.upper(), st.typ)] + [(None, st.rahmen_typ)] * 5, 20, merge="A{row}:F{row}")
+
+        blatt.zeile([(w, st.daten[farbe, col in (2, 3, 4)])
+                     for col, w in enumerate(eintrag_zeile(eintrag, label), 1)], 16)
+    return blatt.row
+
+
+def schreibe_legende_nativ(mappe, st):
+    blatt = mappe.blatt("Legende", [14, 30])
+    blatt.zeile([("Farbcode", st.header), ("Bedeutung", st.header)], 20)
+    for farbe, text in LEGENDE:
+        blatt.zeile([(None, st.rahmen[farbe]), (text, st.daten[None, False])], 18)
+
+
+def create_year_workbook(payload, output_path, profil=KEIN_PROFIL, fortschritt=KEIN_FORTSCHRITT):
+    """
+    Jahresuebersicht aller Mitarbeiter als eine Arbeitsmappe (--sammelmappe).
+    payload wie im Batch-Modus (Liste, {"batch": [...]} oder DB-Auftrag)
+    """
+    with profil.phase("modell"):
+        jobs = batch_jobs(payload)
+    erstellt = erstellt_am(jobs[0] if jobs else payload)
+    jahr     = jobs[0].get("jahr", str(erstellt.year)) if jobs else str(erstellt.year)
+
+    vergeben = {INDEX_TITEL.lower(), "legende"}
+    namen = [blattname((job.get("employee") or {}).get("name"), vergeben) for job in jobs]
+    profil.zaehle("mitarbeiter", len(jobs))
+
+    with profil.phase("tabellen"):
+        # Schreibt sofort in output_path – bei einem Fehler keine halbe Datei stehen lassen
+        mappe = Mappe(output_path, zeitstempel=erstellt)
+        try:
+            st = _Stile(mappe)
+            schreibe_index(mappe, st, jobs, namen, jahr, erstellt)
+            zaehler = fortschritt.zaehler("mitarbeiter", len(jobs))
+            zeilen = 0
+            for job, name in zip(jobs, namen):
+                zeilen += schreibe_mitarbeiter_blatt(mappe, st, job, name, jahr, erstellt)
+                zaehler.weiter()
+            zaehler.fertig()
+            schreibe_legende_nativ(mappe, st)
+        except BaseException:
+            mappe.verwerfen()
+            raise
+    profil.zaehle("zeilen_mitarbeiter", zeilen)
+
+    fortschritt.melde("speichern", erzwingen=True)
+    with profil.phase("speichern"):
+        mappe.speichere()
+    sys.stdout.buffer.write(f"Excel erfolgreich erstellt ({len(jobs)} Mitarbeiter): {output_path}\n".encode("utf-8"))
+
+
 # ── Haupt ─────────────────────────────────────────────────────────────────────
-def create_employee_year_excel(data, output_path):
+def create_employee_year_excel(data, output_path, profil=KEIN_PROFIL):
     emp      = data.get("employee", {})
-    jahr     = data.get("jahr", str(datetime.now().year))
+    erstellt = erstellt_am(data)
+    jahr     = data.get("jahr", str(erstellt.year))
     stats    = data.get("stats", {})
-    eintraege = data.get("eintraege", [])
+    with profil.phase("modell"):
+        eintraege = als_eintraege(data.get("eintraege"))
+    profil.zaehle("eintraege", len(eintraege))
 
-    wb = Workbook()
+    with profil.phase("tabellen"):
+        wb = Workbook()
 
-    schreibe_uebersicht(wb, emp, jahr, stats)
-    schreibe_eintraege(wb, emp, jahr, eintraege)
-    schreibe_legende(wb)
+        schreibe_uebersicht(wb, emp, jahr, stats, erstellt)
+        schreibe_eintraege(wb, emp, jahr, eintraege, erstellt)
+        schreibe_legende(wb)
+    for ws in wb.worksheets:
+        profil.zaehle(f"zeilen_{ws.title.lower()}", ws.max_row)
 
-    wb.save(output_path)
+    with profil.phase("speichern"):
+        speichere_xlsx(wb, output_path, erstellt)
     sys.stdout.buffer.write(f"Excel erfolgreich erstellt: {output_path}\n".encode("utf-8"))
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.stderr.write(
-            "FEHLER: Usage: python export_employee_year_excel.py <input.json> <output.xlsx>\n"
-        )
-        sys.exit(1)
+def create_employee_year_excel_batch(payload, ausgabe_ordner, workers=None, fortschritt=KEIN_FORTSCHRITT):
+    """Jahresuebersichten aller Mitarbeiter nach ausgabe_ordner (siehe teamflow_export_batch)"""
+    return fuehre_batch_aus(create_employee_year_excel, payload, ausgabe_ordner, ".xlsx", workers, fortschritt)
+
 
-    input_file  = sys.argv[1]
-    output_file = sys.argv[2]
+def main():
+    parser = argparse.ArgumentParser(description="Jahres-Export fuer TeamFlow (Excel)")
+    parser.add_argument("input_file", nargs="?", help="Export-Daten als JSON, - fuer stdin (entfaellt mit --db)")
+    parser.add_argument("output", help="Ziel-Datei (.xlsx), - fuer stdout, mit --batch ein Ordner")
+    add_batch_argumente(parser)
+    parser.add_argument("--sammelmappe", action="store_true",
+                        help="Alle Mitarbeiter in eine Datei: Index-Blatt + ein Blatt pro Mitarbeiter "
+                             "(Eingabe wie --batch, auch --db)")
+    add_jahres_db_argumente(parser, "--batch oder --sammelmappe")
+    add_profil_argumente(parser)
+    add_cache_argumente(parser)
+    add_fortschritt_argumente(parser)
+    args = parser.parse_args()
+    pruefe_batch_argumente(parser, args)
+    ziel = ausgabe_ziel(args.output, ".xlsx")
+    profil = profil_aus_argumenten(args, "export_employee_year_excel")
+    fortschritt = fortschritt_aus_argumenten(args)
 
     try:
-        with io.open(input_file, "r", encoding="utf-8-sig") as f:
-            data = json.load(f)
-        sys.stdout.buffer.write(b"JSON gelesen\n")
+        if args.db:
+            data = {"quelle": "db", "db": args.db, "jahr": args.jahr, "typen": args.types}
+        else:
+            with profil.phase("json_laden"):
+                data = lade_json(args.input_file)
+            sys.stdout.buffer.write(b"JSON gelesen\n")
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
         sys.exit(1)
 
     try:
-        create_employee_year_excel(data, output_file)
+        if args.batch:
+            with profil.phase("batch"):
+                manifest = create_employee_year_excel_batch(data, args.output, args.workers, fortschritt)
+            profil.zaehle("dateien", manifest["anzahl"])
+        elif args.sammelmappe:
+            # DB-Auftrag schon hier aufloesen: der Export-Cache soll die Daten sehen, nicht den Auftrag
+            with profil.phase("db_laden" if args.db else "modell"):
+                jobs = batch_jobs(data)
+            exportiere(cache_aus_argumenten(args), create_year_workbook, jobs, ziel,
+                       profil=profil, fortschritt=fortschritt)
+            senden(ziel)
+        else:
+            exportiere(cache_aus_argumenten(args), create_employee_year_excel, data, ziel, profil=profil)
+            senden(ziel)
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Erstellen der Excel: {e}\n".encode("utf-8"))
         sys.exit(1)
+    finally:
+        if profil.aktiv:
+            profil.schreibe()
 
 
 if __name__ == "__main__":
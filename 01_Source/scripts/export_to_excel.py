@@ -6,13 +6,29 @@ Neue Struktur: Zusammenfassung + Detailtabelle
 """
 
 import sys
-import json
-import io
-from datetime import datetime
+import argparse
+
+from teamflow_export_profil import KEIN_PROFIL, add_profil_argumente, profil_aus_argumenten
+from teamflow_export_cache import exportiere, add_cache_argumente, cache_aus_argumenten
+from teamflow_export_fragmente import KEINE_FRAGMENTE, fragmente_aus_cache
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, add_fortschritt_argumente, fortschritt_aus_argumenten
+from teamflow_export_core import auswerten
+from teamflow_export_modell import lade_json, erstellt_am
+from teamflow_export_datum import fmt_datum
+from teamflow_export_spalten import ZUSAMMENFASSUNG, DETAILS, Layout, detail_formatierer, zusammenfassung_werte
+from teamflow_export_db import add_db_argumente, pruefe_db_argumente, lade_db_payload
+from teamflow_export_stdio import ausgabe_ziel, senden
+from teamflow_export_vorschau import add_vorschau_argumente, vorschau, schreibe_vorschau
+from teamflow_export_reproduzierbar import speichere_xlsx
+from teamflow_export_abbruch import (EXIT_ABGEBROCHEN, Abgebrochen, add_abbruch_argumente, abbruch_aus_argumenten,
+                                     datei_stand, raeume_auf, melde_abbruch)
 
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+    from teamflow_xlsx_styles import stil_register
+    from teamflow_xlsx_native import Mappe
 except ImportError:
     print("FEHLER: openpyxl nicht installiert!", file=sys.stderr)
     print("Installiere mit: pip install openpyxl", file=sys.stderr)
@@ -45,232 +61,240 @@ TYP_LABEL = {
     "ueberstunden": "Ueberstunden-Abbau",
 }
 
+# Ab dieser Gesamtzahl an Eintraegen wird die Arbeitsmappe im Streaming-Modus
+# (openpyxl write_only) geschrieben. Ueberschreibbar per --streaming-ab.
+STREAMING_AB_EINTRAEGEN = 20000
 
-def make_border(thin=True):
-    s = 'thin' if thin else 'medium'
-    side = Side(style=s)
-    return Border(left=side, right=side, top=side, bottom=side)
+# openpyxl (Standard) oder der eigene zipfile-Schreiber teamflow_xlsx_native
+BACKENDS = ("openpyxl", "nativ")
 
 
-def fmt_datum(d):
-    """YYYY-MM-DD -> DD.MM.YYYY"""
-    if not d:
-        return ""
-    try:
-        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
-    except Exception:
-        return d
+def vorschau_variante(backend, streaming_ab):
+    """Funktion anzahl_eintraege -> Variante in teamflow_export_kalibrierung (wie create_excel waehlt)"""
+    if backend == "nativ":
+        return lambda anzahl: "xlsx/nativ"
+    return lambda anzahl: "xlsx/streaming" if anzahl >= streaming_ab else "xlsx/openpyxl"
 
+# Spalten von Zusammenfassung und Details (teamflow_export_spalten)
+SUMMARY = Layout(ZUSAMMENFASSUNG, "xlsx")
+DETAIL  = Layout(DETAILS, "xlsx")
+SUMMARY_LETZTE = get_column_letter(len(SUMMARY))
+DETAIL_LETZTE  = get_column_letter(len(DETAIL))
+
+detail_werte = detail_formatierer(TYP_LABEL)
+
+
+def stil(cell, **kwargs):
+    """Weist einen gemeinsamen Zellstil zu (siehe teamflow_xlsx_styles)"""
+    cell.style = stil_register(cell.parent.parent).name(**kwargs)
+
+
+# Zellstile als Schluessel fuer stil() bzw. Mappe.stile.index() (Backend nativ)
+def stil_header(bg=C_HEADER_BG, fg=C_HEADER_FONT, size=10, bold=True):
+    return dict(bg=bg, fg=fg, bold=bold, size=size,
+                horizontal='center', vertical='center', wrap=True, border='thin')
+
+
+def stil_daten(bg=None, center=False, bold=False):
+    return dict(bg=bg, bold=bold, size=9,
+                horizontal='center' if center else 'left', vertical='center', wrap=False, border='thin')
 
-def fmt_zahl(v):
-    if v is None:
-        return 0
-    try:
-        f = float(v)
-        return int(f) if f == int(f) else round(f, 2)
-    except Exception:
-        return 0
+
+STIL_TITEL     = dict(fg=C_TITLE_FONT, bold=True, size=14, horizontal='center', vertical='center')
+STIL_ERSTELLT  = dict(fg="888888", italic=True, size=9, horizontal='right')
+STIL_ABTEILUNG = dict(bg=C_ABT_BG, fg=C_ABT_FONT, bold=True, size=10,
+                      horizontal='left', vertical='center', indent=1, border='thin')
 
 
 def style_header_cell(cell, bg=C_HEADER_BG, fg=C_HEADER_FONT, size=10, bold=True):
-    cell.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
-    cell.font = Font(color=fg, bold=bold, size=size)
-    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    cell.border = make_border()
+    stil(cell, **stil_header(bg, fg, size, bold))
 
 
 def style_data_cell(cell, bg=None, center=False, bold=False):
-    if bg:
-        cell.fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid")
-    cell.font = Font(bold=bold, size=9)
-    cell.alignment = Alignment(
-        horizontal='center' if center else 'left',
-        vertical='center',
-        wrap_text=False
-    )
-    cell.border = make_border()
+    stil(cell, **stil_daten(bg, center, bold))
+
+
+def style_titel(cell):
+    stil(cell, **STIL_TITEL)
+
+
+def style_erstellt(cell):
+    stil(cell, **STIL_ERSTELLT)
+
+
+def style_abteilung(cell):
+    stil(cell, **STIL_ABTEILUNG)
+
+
+# ── Zeileninhalte (gemeinsam fuer normalen und Streaming-Modus) ─────────────
+def mitarbeiter_block(auswertung, i, zeitraum):
+    """
+    Zusammenfassungs-Zeile und Detail-Zeilen (farbe, werte) von Mitarbeiter i –
+    die Einheit, die teamflow_export_fragmente zwischen Exporten aufhebt
+    """
+    name, abt, eintraege = auswertung.mitarbeiter[i]
+    details = [(TYP_FARBEN.get(e.typ_name, "FFFFFF"), detail_werte(name, abt, e)) for e in eintraege]
+    return [zusammenfassung_werte(auswertung, i, zeitraum), details]
+
+
+def zusammenfassung_zeilen(auswertung, bloecke):
+    """Liefert ("abteilung", name) bzw. ("mitarbeiter", werte) in Ausgabereihenfolge"""
+    for art, wert in auswertung.zusammenfassung():
+        if art == "abteilung":
+            yield "abteilung", wert
+            continue
+        yield "mitarbeiter", bloecke[wert][0]
+
+
+def zusammenfassung_summen(auswertung):
+    """Summen fuer die GESAMT-Zeile: Spalte -> Wert"""
+    return dict(enumerate(auswertung.gesamt_zahlen(), 3))
+
+
+def detail_zeilen(auswertung, bloecke):
+    """Liefert ("abteilung", name) bzw. ("eintrag", farbe, zeile) in Ausgabereihenfolge"""
+    for neue_abteilung, i, abt in auswertung.mit_eintraegen():
+        if neue_abteilung:
+            yield "abteilung", abt
+
+        for farbe, werte in bloecke[i][1]:
+            yield "eintrag", farbe, werte
 
 
 # ── Tabellenblatt 1: Zusammenfassung ────────────────────────────────────────
-def schreibe_zusammenfassung(wb, mitarbeiter_liste, von_datum, bis_datum):
+def schreibe_zusammenfassung(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt=KEIN_FORTSCHRITT):
     ws = wb.active
     ws.title = "Zusammenfassung"
 
     # Titel
-    ws.merge_cells("A1:H1")
+    ws.merge_cells(f"A1:{SUMMARY_LETZTE}1")
     titel_cell = ws["A1"]
     titel_cell.value = f"Abwesenheits-Uebersicht  |  {fmt_datum(von_datum)} – {fmt_datum(bis_datum)}"
-    titel_cell.font = Font(color=C_TITLE_FONT, bold=True, size=14)
-    titel_cell.alignment = Alignment(horizontal='center', vertical='center')
+    style_titel(titel_cell)
     ws.row_dimensions[1].height = 28
 
     # Erstellt-Zeile
-    ws.merge_cells("A2:H2")
-    ws["A2"].value = f"Erstellt am {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-    ws["A2"].font = Font(color="888888", italic=True, size=9)
-    ws["A2"].alignment = Alignment(horizontal='right')
+    ws.merge_cells(f"A2:{SUMMARY_LETZTE}2")
+    ws["A2"].value = f"Erstellt am {erstellt:%d.%m.%Y}"
+    style_erstellt(ws["A2"])
     ws.row_dimensions[2].height = 16
 
     # Leerzeile
     ws.row_dimensions[3].height = 8
 
     # Header
-    headers = ["Mitarbeiter", "Abteilung", "Urlaub (T)", "Krankheit (T)", "Schulung (T)", "UE-Abbau (h)", "Eintraege", "Zeitraum"]
-    for col, h in enumerate(headers, 1):
+    for col, h in enumerate(SUMMARY.titel, 1):
         cell = ws.cell(row=4, column=col, value=h)
         style_header_cell(cell)
     ws.row_dimensions[4].height = 22
 
     row = 5
-    aktuelle_abteilung = None
-
-    for eintrag in mitarbeiter_liste:
-        ma   = eintrag.get("mitarbeiter", {})
-        zus  = eintrag.get("zusammenfassung", {})
-        abt  = ma.get("abteilung", "")
-        name = ma.get("name", "")
+    zaehler = fortschritt.zaehler("zusammenfassung", len(auswertung))
+    stile = SUMMARY.zell_stile(stil_register(wb).name, stil_daten)
 
+    for art, werte in zusammenfassung_zeilen(auswertung, bloecke):
         # Abteilungs-Trennzeile
-        if abt != aktuelle_abteilung:
-            aktuelle_abteilung = abt
-            ws.merge_cells(f"A{row}:H{row}")
-            abt_cell = ws.cell(row=row, column=1, value=abt)
-            abt_cell.fill = PatternFill(start_color=C_ABT_BG, end_color=C_ABT_BG, fill_type="solid")
-            abt_cell.font = Font(color=C_ABT_FONT, bold=True, size=10)
-            abt_cell.alignment = Alignment(horizontal='left', vertical='center', indent=1)
-            abt_cell.border = make_border()
+        if art == "abteilung":
+            ws.merge_cells(f"A{row}:{SUMMARY_LETZTE}{row}")
+            abt_cell = ws.cell(row=row, column=1, value=werte)
+            style_abteilung(abt_cell)
             ws.row_dimensions[row].height = 20
             row += 1
+            continue
 
-        anzahl = len(eintrag.get("eintraege", []))
-
-        werte = [
-            name,
-            abt,
-            fmt_zahl(zus.get("urlaub_tage", 0)),
-            fmt_zahl(zus.get("krankheit_tage", 0)),
-            fmt_zahl(zus.get("schulung_tage", 0)),
-            fmt_zahl(zus.get("ueberstunden_abbau", 0)),
-            anzahl,
-            f"{fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
-        ]
-
-        for col, wert in enumerate(werte, 1):
-            cell = ws.cell(row=row, column=col, value=wert)
-            center = col > 2
-            style_data_cell(cell, center=center)
+        for col, (wert, s) in enumerate(zip(werte, stile()), 1):
+            ws.cell(row=row, column=col, value=wert).style = s
 
         ws.row_dimensions[row].height = 18
         row += 1
+        zaehler.weiter()
+    zaehler.fertig()
 
     # Summenzeile
     ws.merge_cells(f"A{row}:B{row}")
     summe_cell = ws.cell(row=row, column=1, value="GESAMT")
     style_data_cell(summe_cell, bg=C_SUMME_BG, bold=True, center=True)
-    ws.cell(row=row, column=2).fill = PatternFill(start_color=C_SUMME_BG, end_color=C_SUMME_BG, fill_type="solid")
-    ws.cell(row=row, column=2).border = make_border()
-
-    summen = {
-        3: sum(fmt_zahl(e.get("zusammenfassung", {}).get("urlaub_tage", 0))       for e in mitarbeiter_liste),
-        4: sum(fmt_zahl(e.get("zusammenfassung", {}).get("krankheit_tage", 0))    for e in mitarbeiter_liste),
-        5: sum(fmt_zahl(e.get("zusammenfassung", {}).get("schulung_tage", 0))     for e in mitarbeiter_liste),
-        6: sum(fmt_zahl(e.get("zusammenfassung", {}).get("ueberstunden_abbau", 0)) for e in mitarbeiter_liste),
-        7: sum(len(e.get("eintraege", []))                                         for e in mitarbeiter_liste),
-    }
-    for col, val in summen.items():
+    stil(ws.cell(row=row, column=2), bg=C_SUMME_BG, border='thin')
+
+    for col, val in zusammenfassung_summen(auswertung).items():
         cell = ws.cell(row=row, column=col, value=val)
         style_data_cell(cell, bg=C_SUMME_BG, bold=True, center=True)
 
-    ws.cell(row=row, column=8).border = make_border()
+    stil(ws.cell(row=row, column=len(SUMMARY)), border='thin')
     ws.row_dimensions[row].height = 20
 
     # Spaltenbreiten
-    breiten = [28, 20, 12, 14, 13, 14, 10, 22]
-    for i, b in enumerate(breiten, 1):
-        ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = b
+    for i, b in enumerate(SUMMARY.breiten, 1):
+        ws.column_dimensions[get_column_letter(i)].width = b
 
     ws.freeze_panes = "A5"
+    return ws.max_row
 
 
 # ── Tabellenblatt 2: Detailtabelle ──────────────────────────────────────────
-def schreibe_detail(wb, mitarbeiter_liste, von_datum, bis_datum):
+def schreibe_detail(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt=KEIN_FORTSCHRITT):
     ws = wb.create_sheet("Details")
 
     # Titel
-    ws.merge_cells("A1:G1")
+    ws.merge_cells(f"A1:{DETAIL_LETZTE}1")
     titel_cell = ws["A1"]
     titel_cell.value = f"Abwesenheits-Details  |  {fmt_datum(von_datum)} – {fmt_datum(bis_datum)}"
-    titel_cell.font = Font(color=C_TITLE_FONT, bold=True, size=14)
-    titel_cell.alignment = Alignment(horizontal='center', vertical='center')
+    style_titel(titel_cell)
     ws.row_dimensions[1].height = 28
 
-    ws.merge_cells("A2:G2")
-    ws["A2"].value = f"Erstellt am {datetime.now().strftime('%d.%m.%Y %H:%M')}"
-    ws["A2"].font = Font(color="888888", italic=True, size=9)
-    ws["A2"].alignment = Alignment(horizontal='right')
+    ws.merge_cells(f"A2:{DETAIL_LETZTE}2")
+    ws["A2"].value = f"Erstellt am {erstellt:%d.%m.%Y}"
+    style_erstellt(ws["A2"])
     ws.row_dimensions[2].height = 16
     ws.row_dimensions[3].height = 8
 
-    headers = ["Mitarbeiter", "Abteilung", "Typ", "Von", "Bis", "Wert", "Notiz / Titel"]
-    for col, h in enumerate(headers, 1):
+    for col, h in enumerate(DETAIL.titel, 1):
         cell = ws.cell(row=4, column=col, value=h)
         style_header_cell(cell)
     ws.row_dimensions[4].height = 22
 
     row = 5
-    aktuelle_abteilung = None
-
-    for eintrag in mitarbeiter_liste:
-        ma       = eintrag.get("mitarbeiter", {})
-        eintraege = eintrag.get("eintraege", [])
-        abt      = ma.get("abteilung", "")
-        name     = ma.get("name", "")
-
-        if not eintraege:
-            continue
+    zaehler = fortschritt.zaehler("detail", auswertung.anzahl_eintraege)
+    stile = DETAIL.zell_stile(stil_register(wb).name, stil_daten)
 
+    for zeile in detail_zeilen(auswertung, bloecke):
         # Abteilungs-Trennzeile
-        if abt != aktuelle_abteilung:
-            aktuelle_abteilung = abt
-            ws.merge_cells(f"A{row}:G{row}")
-            abt_cell = ws.cell(row=row, column=1, value=abt)
-            abt_cell.fill = PatternFill(start_color=C_ABT_BG, end_color=C_ABT_BG, fill_type="solid")
-            abt_cell.font = Font(color=C_ABT_FONT, bold=True, size=10)
-            abt_cell.alignment = Alignment(horizontal='left', vertical='center', indent=1)
-            abt_cell.border = make_border()
+        if zeile[0] == "abteilung":
+            ws.merge_cells(f"A{row}:{DETAIL_LETZTE}{row}")
+            abt_cell = ws.cell(row=row, column=1, value=zeile[1])
+            style_abteilung(abt_cell)
             ws.row_dimensions[row].height = 20
             row += 1
+            continue
 
-        for e in eintraege:
-            typ   = e.get("typ", "")
-            farbe = TYP_FARBEN.get(typ, "FFFFFF")
-            label = TYP_LABEL.get(typ, typ)
-
-            wert = fmt_zahl(e.get("wert", 0))
-            einheit = "h" if typ == "ueberstunden" else "T"
-            wert_str = f"{wert} {einheit}"
-
-            notiz = e.get("notiz") or e.get("titel") or ""
-
-            zeile = [name, abt, label, fmt_datum(e.get("von_datum")), fmt_datum(e.get("bis_datum")), wert_str, notiz]
-
-            for col, val in enumerate(zeile, 1):
-                cell = ws.cell(row=row, column=col, value=val)
-                center = col in (3, 4, 5, 6)
-                style_data_cell(cell, bg=farbe if col > 2 else None, center=center)
+        _, farbe, werte = zeile
+        for col, (wert, s) in enumerate(zip(werte, stile(farbe)), 1):
+            ws.cell(row=row, column=col, value=wert).style = s
 
-            ws.row_dimensions[row].height = 16
-            row += 1
+        ws.row_dimensions[row].height = 16
+        row += 1
+        zaehler.weiter()
+    zaehler.fertig()
 
     # Spaltenbreiten
-    breiten = [28, 20, 18, 12, 12, 10, 35]
-    for i, b in enumerate(breiten, 1):
-        ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = b
+    for i, b in enumerate(DETAIL.breiten, 1):
+        ws.column_dimensions[get_column_letter(i)].width = b
 
     ws.freeze_panes = "A5"
+    return ws.max_row
 
 
 # ── Legende ─────────────────────────────────────────────────────────────────
+LEGENDE = [
+    (C_URLAUB,    "Urlaub (Tage)"),
+    (C_KRANKHEIT, "Krankheit (Tage)"),
+    (C_SCHULUNG,  "Schulung (Tage)"),
+    (C_UEBERSTD,  "Ueberstunden-Abbau (Stunden)"),
+    (C_ABT_BG,    "Abteilung"),
+    (C_SUMME_BG,  "Summenzeile"),
+]
+
+
 def schreibe_legende(wb):
     ws = wb.create_sheet("Legende")
 
@@ -280,68 +304,307 @@ def schreibe_legende(wb):
     style_header_cell(ws["B1"])
     ws.row_dimensions[1].height = 20
 
-    legende = [
-        (C_URLAUB,    "Urlaub (Tage)"),
-        (C_KRANKHEIT, "Krankheit (Tage)"),
-        (C_SCHULUNG,  "Schulung (Tage)"),
-        (C_UEBERSTD,  "Ueberstunden-Abbau (Stunden)"),
-        (C_ABT_BG,    "Abteilung"),
-        (C_SUMME_BG,  "Summenzeile"),
-    ]
-
-    for i, (farbe, text) in enumerate(legende, 2):
+    for i, (farbe, text) in enumerate(LEGENDE, 2):
         cell_a = ws.cell(row=i, column=1, value="")
-        cell_a.fill = PatternFill(start_color=farbe, end_color=farbe, fill_type="solid")
-        cell_a.border = make_border()
+        stil(cell_a, bg=farbe, border='thin')
         cell_b = ws.cell(row=i, column=2, value=text)
         style_data_cell(cell_b)
         ws.row_dimensions[i].height = 18
 
     ws.column_dimensions["A"].width = 14
     ws.column_dimensions["B"].width = 30
+    return ws.max_row
+
+
+# ── Streaming-Modus (write_only) ─────────────────────────────────────────────
+# Zeilen werden sofort in die Datei geschrieben statt bis wb.save im Speicher
+# zu bleiben. Zeilenhoehen, Spaltenbreiten, Freeze-Panes und verbundene Zellen
+# muessen deshalb gesetzt werden, bevor die jeweilige Zeile geschrieben wird.
+class _StreamBlatt:
+    def __init__(self, wb, titel, breiten, freeze=None):
+        self.ws  = wb.create_sheet(titel)
+        self.row = 0
+        for i, b in enumerate(breiten, 1):
+            self.ws.column_dimensions[get_column_letter(i)].width = b
+        if freeze:
+            self.ws.freeze_panes = freeze
+
+    def zelle(self, wert=None, header=False, **style):
+        if header:
+            return self.rohzelle(wert, **stil_header())
+        if style:
+            return self.rohzelle(wert, **stil_daten(**style))
+        return self.rohzelle(wert)
+
+    def rohzelle(self, wert=None, **kwargs):
+        cell = WriteOnlyCell(self.ws, value=wert)
+        if kwargs:
+            stil(cell, **kwargs)
+        return cell
+
+    def stil(self, **kwargs):
+        """Zellstil, wie zellen() ihn erwartet (hier: Name im Stil-Register)"""
+        return stil_register(self.ws.parent).name(**kwargs)
+
+    def zellen(self, werte, stile):
+        """Eine Zeile aus Werten und vorab aufgeloesten Stilen (Layout.zell_stile)"""
+        ergebnis = []
+        for wert, s in zip(werte, stile):
+            cell = WriteOnlyCell(self.ws, value=wert)
+            cell.style = s
+            ergebnis.append(cell)
+        return ergebnis
+
+    def zeile(self, zellen, hoehe, merge=None):
+        self.row += 1
+        if merge:
+            self.ws.merged_cells.add(merge.format(row=self.row))
+        self.ws.row_dimensions[self.row].height = hoehe
+        self.ws.append(zellen)
+        # Zeilendimension wurde beim append geschrieben – nicht bis zum Ende aufheben
+        del self.ws.row_dimensions[self.row]
+
+    def kopf(self, titel, erstellt, letzte_spalte, headers):
+        self.zeile([self.rohzelle(titel, **STIL_TITEL)], 28, merge=f"A{{row}}:{letzte_spalte}{{row}}")
+        self.zeile([self.rohzelle(erstellt, **STIL_ERSTELLT)], 16, merge=f"A{{row}}:{letzte_spalte}{{row}}")
+        self.zeile([], 8)
+        self.zeile([self.zelle(h, header=True) for h in headers], 22)
+
+    def abteilung(self, name, letzte_spalte):
+        self.zeile([self.rohzelle(name, **STIL_ABTEILUNG)], 20, merge=f"A{{row}}:{letzte_spalte}{{row}}")
+
+
+class _NativBlatt(_StreamBlatt):
+    """
+    Dieselben Zeilen fuer --backend nativ: Zellen sind (wert, stil_index),
+    geschrieben wird direkt in das Zip-Paket (teamflow_xlsx_native)
+    """
+
+    def __init__(self, mappe, titel, breiten, freeze=None):
+        self.stile = mappe.stile
+        self.blatt = mappe.blatt(titel, breiten, freeze)
+
+    @property
+    def row(self):
+        return self.blatt.row
+
+    def rohzelle(self, wert=None, **kwargs):
+        return wert, self.stile.index(**kwargs)
+
+    def stil(self, **kwargs):
+        return self.stile.index(**kwargs)
+
+    def zellen(self, werte, stile):
+        return list(zip(werte, stile))
+
+    def zeile(self, zellen, hoehe, merge=None):
+        self.blatt.zeile(zellen, hoehe, merge)
+
+
+def _stream_blatt(wb, titel, breiten, freeze=None):
+    if isinstance(wb, Mappe):
+        return _NativBlatt(wb, titel, breiten, freeze)
+    return _StreamBlatt(wb, titel, breiten, freeze)
+
+
+def schreibe_zusammenfassung_stream(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt=KEIN_FORTSCHRITT):
+    blatt = _stream_blatt(wb, "Zusammenfassung", SUMMARY.breiten, freeze="A5")
+    blatt.kopf(
+        f"Abwesenheits-Uebersicht  |  {fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
+        f"Erstellt am {erstellt:%d.%m.%Y}",
+        SUMMARY_LETZTE, SUMMARY.titel,
+    )
+
+    zaehler = fortschritt.zaehler("zusammenfassung", len(auswertung))
+    stile = SUMMARY.zell_stile(blatt.stil, stil_daten)
+    for art, werte in zusammenfassung_zeilen(auswertung, bloecke):
+        if art == "abteilung":
+            blatt.abteilung(werte, SUMMARY_LETZTE)
+            continue
+        blatt.zeile(blatt.zellen(werte, stile()), 18)
+        zaehler.weiter()
+    zaehler.fertig()
+
+    # Summenzeile
+    summen = zusammenfassung_summen(auswertung)
+    zellen = [blatt.zelle("GESAMT", bg=C_SUMME_BG, bold=True, center=True)]
+    zellen.append(blatt.rohzelle(bg=C_SUMME_BG, border='thin'))
+    zellen += [blatt.zelle(summen[col], bg=C_SUMME_BG, bold=True, center=True) for col in range(3, len(SUMMARY))]
+    zellen.append(blatt.rohzelle(border='thin'))
+    blatt.zeile(zellen, 20, merge="A{row}:B{row}")
+    return blatt.row
+
+
+def schreibe_detail_stream(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt=KEIN_FORTSCHRITT):
+    blatt = _stream_blatt(wb, "Details", DETAIL.breiten, freeze="A5")
+    blatt.kopf(
+        f"Abwesenheits-Details  |  {fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
+        f"Erstellt am {erstellt:%d.%m.%Y}",
+        DETAIL_LETZTE, DETAIL.titel,
+    )
+
+    zaehler = fortschritt.zaehler("detail", auswertung.anzahl_eintraege)
+    stile = DETAIL.zell_stile(blatt.stil, stil_daten)
+    for zeile in detail_zeilen(auswertung, bloecke):
+        if zeile[0] == "abteilung":
+            blatt.abteilung(zeile[1], DETAIL_LETZTE)
+            continue
+        _, farbe, werte = zeile
+        blatt.zeile(blatt.zellen(werte, stile(farbe)), 16)
+        zaehler.weiter()
+    zaehler.fertig()
+    return blatt.row
+
+
+def schreibe_legende_stream(wb):
+    blatt = _stream_blatt(wb, "Legende", [14, 30])
+    blatt.zeile([blatt.zelle("Farbcode", header=True), blatt.zelle("Bedeutung", header=True)], 20)
+
+    for farbe, text in LEGENDE:
+        blatt.zeile([blatt.rohzelle("", bg=farbe, border='thin'), blatt.zelle(text, center=False)], 18)
+    return blatt.row
 
 
 # ── Haupt ────────────────────────────────────────────────────────────────────
-def create_excel(payload, output_path):
+def _stream_blaetter(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt):
+    return (
+        schreibe_zusammenfassung_stream(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt),
+        schreibe_detail_stream(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt),
+        schreibe_legende_stream(wb),
+    )
+
+
+def create_excel(payload, output_path, streaming_ab=None, profil=KEIN_PROFIL, fortschritt=KEIN_FORTSCHRITT,
+                 fragmente=KEINE_FRAGMENTE, backend="openpyxl"):
     export_data = payload.get("exportData", payload)
     mitarbeiter_liste = export_data.get("mitarbeiter", [])
     von_datum = export_data.get("vonDatum", "")
     bis_datum = export_data.get("bisDatum", "")
-
-    wb = Workbook()
-
-    schreibe_zusammenfassung(wb, mitarbeiter_liste, von_datum, bis_datum)
-    schreibe_detail(wb, mitarbeiter_liste, von_datum, bis_datum)
-    schreibe_legende(wb)
-
-    wb.save(output_path)
-    sys.stdout.buffer.write(f"Excel erfolgreich erstellt: {output_path}\n".encode("utf-8"))
+    erstellt  = erstellt_am(payload)
+
+    # Ein Durchlauf ueber die Payload fuer Zahlen, Summen und Detail-Gruppen
+    with profil.phase("modell"):
+        auswertung = auswerten(mitarbeiter_liste)
+    profil.zaehle("mitarbeiter", len(auswertung))
+    profil.zaehle("eintraege", auswertung.anzahl_eintraege)
+
+    # Formatierte Zeilen pro Mitarbeiter – mit --cache nur fuer geaenderte Mitarbeiter neu
+    zeitraum = f"{fmt_datum(von_datum)} – {fmt_datum(bis_datum)}"
+    with profil.phase("fragmente"):
+        bloecke, neu = fragmente.bloecke("excel", auswertung, (von_datum, bis_datum),
+                                         lambda i: mitarbeiter_block(auswertung, i, zeitraum))
+        fragmente.lege_ab(neu)
+    if fragmente.aktiv:
+        profil.zaehle("fragmente_neu", len(neu))
+    fortschritt.pruefe()
+
+    if streaming_ab is None:
+        streaming_ab = STREAMING_AB_EINTRAEGEN
+    nativ = backend == "nativ"
+    streaming = nativ or auswertung.anzahl_eintraege >= streaming_ab
+
+    with profil.phase("tabellen"):
+        if nativ:
+            # Schreibt sofort in output_path – bei einem Fehler oder Abbruch keine halbe Datei stehen lassen
+            wb = Mappe(output_path, zeitstempel=erstellt)
+            try:
+                zeilen = _stream_blaetter(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt)
+                fortschritt.melde("speichern", erzwingen=True)
+            except BaseException:
+                wb.verwerfen()
+                raise
+        elif streaming:
+            wb = Workbook(write_only=True)
+            zeilen = _stream_blaetter(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt)
+        else:
+            wb = Workbook()
+            zeilen = (
+                schreibe_zusammenfassung(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt),
+                schreibe_detail(wb, auswertung, bloecke, von_datum, bis_datum, erstellt, fortschritt),
+                schreibe_legende(wb),
+            )
+    profil.zaehle("zeilen_zusammenfassung", zeilen[0])
+    profil.zaehle("zeilen_details", zeilen[1])
+    profil.zaehle("zeilen_legende", zeilen[2])
+
+    if not nativ:
+        fortschritt.melde("speichern", erzwingen=True)
+    with profil.phase("speichern"):
+        if nativ:
+            wb.speichere()
+        else:
+            speichere_xlsx(wb, output_path, erstellt)
+    # Das Speichern selbst laesst sich nicht unterbrechen – ein Abbruch waehrenddessen
+    # gilt trotzdem, main() loescht die fertige Datei
+    fortschritt.pruefe()
+    modus = " (nativ)" if nativ else " (Streaming)" if streaming else ""
+    sys.stdout.buffer.write(f"Excel erfolgreich erstellt{modus}: {output_path}\n".encode("utf-8"))
 
 
 def main():
-    if len(sys.argv) != 3:
-        sys.stderr.write("FEHLER: Usage: python export_to_excel.py <input.json> <output.xlsx>\n")
-        sys.exit(1)
-
-    input_file  = sys.argv[1]
-    output_file = sys.argv[2]
+    parser = argparse.ArgumentParser(description="Excel-Export fuer TeamFlow")
+    parser.add_argument("input_file", nargs="?", help="Export-Daten als JSON, - fuer stdin (entfaellt mit --db)")
+    parser.add_argument("output_file", help="Ziel-Datei (.xlsx), - fuer stdout")
+    parser.add_argument("--streaming-ab", type=int, default=STREAMING_AB_EINTRAEGEN, metavar="N",
+                        help=f"Streaming-Modus ab N Eintraegen (Standard: {STREAMING_AB_EINTRAEGEN})")
+    parser.add_argument("--backend", choices=BACKENDS, default="openpyxl",
+                        help="nativ: xlsx direkt per zipfile schreiben statt mit openpyxl (fuer sehr grosse Exporte)")
+    add_db_argumente(parser)
+    add_profil_argumente(parser)
+    add_cache_argumente(parser)
+    add_fortschritt_argumente(parser)
+    add_vorschau_argumente(parser)
+    add_abbruch_argumente(parser)
+    args = parser.parse_args()
+    pruefe_db_argumente(parser, args)
+    # --dry-run schreibt keine Datei, stdout bleibt fuer die JSON-Zeile
+    ziel = None if args.dry_run else ausgabe_ziel(args.output_file, ".xlsx")
+    profil = profil_aus_argumenten(args, "export_to_excel")
+    abbruch = abbruch_aus_argumenten(parser, args)
+    fortschritt = abbruch.ueberwache(fortschritt_aus_argumenten(args))
 
     try:
-        with io.open(input_file, "r", encoding="utf-8-sig") as f:
-            payload = json.load(f)
+        with profil.phase("db_laden" if args.db else "json_laden"):
+            if args.db:
+                payload = lade_db_payload(args)
+                quelle = "Datenbank"
+            else:
+                payload = lade_json(args.input_file)
+                quelle = "JSON"
         mitarbeiter_liste = payload.get("exportData", payload).get("mitarbeiter", payload)
         anzahl = len(mitarbeiter_liste) if isinstance(mitarbeiter_liste, list) else "?"
-        sys.stdout.buffer.write(f"JSON gelesen: {anzahl} Mitarbeiter\n".encode("utf-8"))
+        if not args.dry_run:
+            sys.stdout.buffer.write(f"{quelle} gelesen: {anzahl} Mitarbeiter\n".encode("utf-8"))
     except Exception as e:
-        sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
+        sys.stderr.buffer.write(f"FEHLER beim Lesen der Daten: {e}\n".encode("utf-8"))
         sys.exit(1)
 
+    if args.dry_run:
+        try:
+            schreibe_vorschau(vorschau(payload, vorschau_variante(args.backend, args.streaming_ab)))
+        except Exception as e:
+            sys.stderr.buffer.write(f"FEHLER bei der Vorschau: {e}\n".encode("utf-8"))
+            sys.exit(1)
+        return
+
+    stand = datei_stand(ziel)
     try:
-        create_excel(payload, output_file)
+        cache = cache_aus_argumenten(args)
+        exportiere(cache, create_excel, payload, ziel,
+                   streaming_ab=args.streaming_ab, profil=profil, fortschritt=fortschritt,
+                   fragmente=fragmente_aus_cache(cache), backend=args.backend)
+        senden(ziel)
+    except Abgebrochen:
+        raeume_auf(ziel, stand)
+        melde_abbruch(abbruch)
+        sys.exit(EXIT_ABGEBROCHEN)
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Erstellen der Excel: {e}\n".encode("utf-8"))
         sys.exit(1)
+    finally:
+        if profil.aktiv:
+            profil.schreibe()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
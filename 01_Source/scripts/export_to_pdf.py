@@ -5,10 +5,26 @@ PDF-Export fuer TeamFlow
 Neue Struktur: Zusammenfassung + Detailtabelle
 """
 
-import sys
-import json
 import io
-from datetime import datetime
+import os
+import sys
+import argparse
+
+from teamflow_export_profil import KEIN_PROFIL, add_profil_argumente, profil_aus_argumenten
+from teamflow_export_cache import exportiere, add_cache_argumente, cache_aus_argumenten
+from teamflow_export_fragmente import KEINE_FRAGMENTE, fragmente_aus_cache
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, add_fortschritt_argumente, fortschritt_aus_argumenten
+from teamflow_export_core import auswerten
+from teamflow_export_modell import lade_json, erstellt_am
+from teamflow_export_datum import fmt_datum
+from teamflow_export_spalten import ZUSAMMENFASSUNG, DETAILS, Layout, detail_formatierer, zusammenfassung_werte
+from teamflow_export_db import add_db_argumente, pruefe_db_argumente, lade_db_payload
+from teamflow_export_stdio import ausgabe_ziel, senden
+from teamflow_export_vorschau import add_vorschau_argumente, vorschau, schreibe_vorschau
+from teamflow_export_abbruch import (EXIT_ABGEBROCHEN, Abgebrochen, add_abbruch_argumente, abbruch_aus_argumenten,
+                                     datei_stand, raeume_auf, melde_abbruch)
+from teamflow_export_reproduzierbar import pdf_canvas
+from teamflow_pdf_teile import seitenplan, abschnitte, zusammenfuegen, prozesspool
 
 try:
     from reportlab.lib.pagesizes import A4, landscape
@@ -16,10 +32,11 @@ try:
     from reportlab.lib.units import cm
     from reportlab.platypus import (
         SimpleDocTemplate, Table, TableStyle,
-        Paragraph, Spacer, PageBreak, HRFlowable
+        Paragraph, Spacer, PageBreak, HRFlowable, Flowable
     )
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    from teamflow_pdf_stile import hintergruende, StilTabelle
 except ImportError:
     print("FEHLER: reportlab nicht installiert!", file=sys.stderr)
     print("Installiere mit: pip install reportlab", file=sys.stderr)
@@ -53,24 +70,21 @@ TYP_LABEL = {
     "ueberstunden": "UE-Abbau",
 }
 
+# Spalten von Zusammenfassung und Details (teamflow_export_spalten)
+SUMMARY = Layout(ZUSAMMENFASSUNG, "pdf")
+DETAIL  = Layout(DETAILS, "pdf")
 
-def fmt_datum(d):
-    if not d:
-        return ""
-    try:
-        return datetime.strptime(d[:10], "%Y-%m-%d").strftime("%d.%m.%Y")
-    except Exception:
-        return d
+detail_werte = detail_formatierer(TYP_LABEL)
 
 
-def fmt_zahl(v):
-    if v is None:
-        return 0
-    try:
-        f = float(v)
-        return int(f) if f == int(f) else round(f, 2)
-    except Exception:
-        return 0
+def spalten_breiten(layout):
+    """Breiten in Punkt; eine Spalte mit Breite 0 fuellt den Rest der Seite"""
+    col_widths = [b*cm for b in layout.breiten]
+
+    # Gesamtbreite berechnen (Querformat A4 = 29.7cm - 3cm Rand = 26.7cm)
+    seite_b = landscape(A4)[0] - 3*cm
+    rest = seite_b - sum(col_widths)
+    return [b or rest for b in col_widths]
 
 
 def get_styles():
@@ -115,32 +129,33 @@ def get_styles():
 
 
 # ── Seitennummer ─────────────────────────────────────────────────────────────
-def footer_canvas(canvas, doc):
+def footer_canvas(canvas, doc, erstellt, versatz=0):
+    """versatz: Seiten vor diesem Teil, wenn das PDF in Abschnitten entsteht"""
     canvas.saveState()
     canvas.setFont("Helvetica", 8)
     canvas.setFillColor(colors.grey)
     canvas.drawRightString(
         doc.pagesize[0] - 1.5*cm,
         1.0*cm,
-        f"Seite {doc.page}"
+        f"Seite {doc.page + versatz}"
     )
     canvas.drawString(
         1.5*cm,
         1.0*cm,
-        f"TeamFlow Export – {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+        f"TeamFlow Export – {erstellt:%d.%m.%Y}"
     )
     canvas.restoreState()
 
 
 # ── Zusammenfassungs-Tabelle ──────────────────────────────────────────────────
-def baue_zusammenfassung(mitarbeiter_liste, von_datum, bis_datum):
+def baue_zusammenfassung(auswertung, bloecke, von_datum, bis_datum, erstellt):
     elements = []
 
     # Kopf-Tabelle mit Zeitraum
     info_data = [[
         f"Zeitraum:  {fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
-        f"Mitarbeiter:  {len(mitarbeiter_liste)}",
-        f"Erstellt:  {datetime.now().strftime('%d.%m.%Y')}",
+        f"Mitarbeiter:  {len(auswertung)}",
+        f"Erstellt:  {erstellt:%d.%m.%Y}",
     ]]
     info_table = Table(info_data, colWidths=[8*cm, 5*cm, 6*cm])
     info_table.setStyle(TableStyle([
@@ -160,10 +175,9 @@ def baue_zusammenfassung(mitarbeiter_liste, von_datum, bis_datum):
     elements.append(Spacer(1, 0.5*cm))
 
     # Tabellen-Header
-    headers = ["Mitarbeiter", "Abteilung", "Urlaub\n(T)", "Krank\n(T)", "Schulung\n(T)", "UE-Abbau\n(h)", "Eintr."]
-    col_widths = [5.5*cm, 4*cm, 2.2*cm, 2.2*cm, 2.5*cm, 2.5*cm, 1.8*cm]
+    col_widths = spalten_breiten(SUMMARY)
 
-    table_data = [headers]
+    table_data = [SUMMARY.titel]
     style_cmds = [
         # Header
         ("BACKGROUND",    (0,0), (-1,0), C_PRIMARY),
@@ -177,70 +191,48 @@ def baue_zusammenfassung(mitarbeiter_liste, von_datum, bis_datum):
         # Daten
         ("FONTNAME",  (0,1), (-1,-1), "Helvetica"),
         ("FONTSIZE",  (0,1), (-1,-1), 8),
-        ("ALIGN",     (2,1), (-1,-1), "CENTER"),
-        ("ALIGN",     (0,1), (1,-1), "LEFT"),
+        *SUMMARY.ausrichtung(),
         ("TOPPADDING",    (0,1), (-1,-1), 4),
         ("BOTTOMPADDING", (0,1), (-1,-1), 4),
         ("LEFTPADDING",   (0,0), (-1,-1), 5),
         ("GRID",      (0,0), (-1,-1), 0.4, C_GREY),
     ]
 
-    aktuelle_abteilung = None
     data_row = 1
+    farben = []  # Hintergrund je Datenzeile, am Ende zusammengefasst
 
-    for eintrag in mitarbeiter_liste:
-        ma  = eintrag.get("mitarbeiter", {})
-        zus = eintrag.get("zusammenfassung", {})
-        abt = ma.get("abteilung", "")
-
+    for art, wert in auswertung.zusammenfassung():
         # Abteilungs-Trennzeile
-        if abt != aktuelle_abteilung:
-            aktuelle_abteilung = abt
-            table_data.append([abt, "", "", "", "", "", ""])
+        if art == "abteilung":
+            table_data.append([wert] + [""] * (len(SUMMARY) - 1))
+            farben.append(C_ABT)
             style_cmds += [
-                ("BACKGROUND", (0, data_row), (-1, data_row), C_ABT),
                 ("TEXTCOLOR",  (0, data_row), (-1, data_row), C_WHITE),
                 ("FONTNAME",   (0, data_row), (-1, data_row), "Helvetica-Bold"),
                 ("FONTSIZE",   (0, data_row), (-1, data_row), 9),
                 ("SPAN",       (0, data_row), (-1, data_row)),
             ]
             data_row += 1
+            continue
 
-        anzahl = len(eintrag.get("eintraege", []))
-        zeile = [
-            ma.get("name", ""),
-            abt,
-            fmt_zahl(zus.get("urlaub_tage", 0)),
-            fmt_zahl(zus.get("krankheit_tage", 0)),
-            fmt_zahl(zus.get("schulung_tage", 0)),
-            fmt_zahl(zus.get("ueberstunden_abbau", 0)),
-            anzahl,
-        ]
-        table_data.append(zeile)
+        table_data.append(bloecke[wert][0])
 
         # Abwechselnde Zeilenfarbe
-        if data_row % 2 == 0:
-            style_cmds.append(("BACKGROUND", (0, data_row), (-1, data_row), C_LIGHT))
+        farben.append(C_LIGHT if data_row % 2 == 0 else None)
 
         data_row += 1
 
     # Summenzeile
-    table_data.append([
-        "GESAMT", "",
-        sum(fmt_zahl(e.get("zusammenfassung", {}).get("urlaub_tage", 0))        for e in mitarbeiter_liste),
-        sum(fmt_zahl(e.get("zusammenfassung", {}).get("krankheit_tage", 0))     for e in mitarbeiter_liste),
-        sum(fmt_zahl(e.get("zusammenfassung", {}).get("schulung_tage", 0))      for e in mitarbeiter_liste),
-        sum(fmt_zahl(e.get("zusammenfassung", {}).get("ueberstunden_abbau", 0)) for e in mitarbeiter_liste),
-        sum(len(e.get("eintraege", []))                                          for e in mitarbeiter_liste),
-    ])
+    table_data.append(["GESAMT", "", *auswertung.gesamt_zahlen()])
+    farben.append(C_SUMME)
     style_cmds += [
-        ("BACKGROUND", (0, data_row), (-1, data_row), C_SUMME),
         ("FONTNAME",   (0, data_row), (-1, data_row), "Helvetica-Bold"),
         ("FONTSIZE",   (0, data_row), (-1, data_row), 9),
         ("SPAN",       (0, data_row), (1, data_row)),
     ]
+    style_cmds += hintergruende(farben)
 
-    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    table = StilTabelle(table_data, colWidths=col_widths, repeatRows=1)
     table.setStyle(TableStyle(style_cmds))
     elements.append(table)
 
@@ -248,54 +240,84 @@ def baue_zusammenfassung(mitarbeiter_liste, von_datum, bis_datum):
 
 
 # ── Detail-Tabelle ────────────────────────────────────────────────────────────
-def baue_detail(mitarbeiter_liste, von_datum, bis_datum):
-    elements = []
-    elements.append(Spacer(1, 0.5*cm))
-
-    headers = ["Mitarbeiter", "Abteilung", "Typ", "Von", "Bis", "Wert", "Notiz / Titel"]
-    col_widths = [4.5*cm, 3.5*cm, 2.8*cm, 2.5*cm, 2.5*cm, 2*cm, 0]  # letzte Spalte füllt Rest
-
-    # Gesamtbreite berechnen (Querformat A4 = 29.7cm - 3cm Rand = 26.7cm)
-    seite_b = landscape(A4)[0] - 3*cm
-    feste_b = sum(col_widths[:-1])
-    col_widths[-1] = seite_b - feste_b
-
-    table_data = [headers]
-    style_cmds = [
-        ("BACKGROUND",    (0,0), (-1,0), C_PRIMARY),
-        ("TEXTCOLOR",     (0,0), (-1,0), C_WHITE),
-        ("FONTNAME",      (0,0), (-1,0), "Helvetica-Bold"),
-        ("FONTSIZE",      (0,0), (-1,0), 9),
-        ("ALIGN",         (0,0), (-1,0), "CENTER"),
-        ("VALIGN",        (0,0), (-1,-1), "MIDDLE"),
-        ("TOPPADDING",    (0,0), (-1,0), 7),
-        ("BOTTOMPADDING", (0,0), (-1,0), 7),
-        ("FONTNAME",      (0,1), (-1,-1), "Helvetica"),
-        ("FONTSIZE",      (0,1), (-1,-1), 8),
-        ("ALIGN",         (3,1), (5,-1), "CENTER"),
-        ("ALIGN",         (0,1), (2,-1), "LEFT"),
-        ("TOPPADDING",    (0,1), (-1,-1), 3),
-        ("BOTTOMPADDING", (0,1), (-1,-1), 3),
-        ("LEFTPADDING",   (0,0), (-1,-1), 5),
-        ("GRID",          (0,0), (-1,-1), 0.4, C_GREY),
-    ]
-
-    aktuelle_abteilung = None
-    data_row = 1
-
-    for eintrag in mitarbeiter_liste:
-        ma       = eintrag.get("mitarbeiter", {})
-        eintraege = eintrag.get("eintraege", [])
-        abt      = ma.get("abteilung", "")
-        name     = ma.get("name", "")
-
-        if not eintraege:
-            continue
-
+DETAIL_STYLE = [
+    ("BACKGROUND",    (0,0), (-1,0), C_PRIMARY),
+    ("TEXTCOLOR",     (0,0), (-1,0), C_WHITE),
+    ("FONTNAME",      (0,0), (-1,0), "Helvetica-Bold"),
+    ("FONTSIZE",      (0,0), (-1,0), 9),
+    ("ALIGN",         (0,0), (-1,0), "CENTER"),
+    ("VALIGN",        (0,0), (-1,-1), "MIDDLE"),
+    ("TOPPADDING",    (0,0), (-1,0), 7),
+    ("BOTTOMPADDING", (0,0), (-1,0), 7),
+    ("FONTNAME",      (0,1), (-1,-1), "Helvetica"),
+    ("FONTSIZE",      (0,1), (-1,-1), 8),
+    *DETAIL.ausrichtung(),
+    ("TOPPADDING",    (0,1), (-1,-1), 3),
+    ("BOTTOMPADDING", (0,1), (-1,-1), 3),
+    ("LEFTPADDING",   (0,0), (-1,-1), 5),
+    ("GRID",          (0,0), (-1,-1), 0.4, C_GREY),
+]
+
+# Zeilen pro Fenster beim Seitenumbruch – mehr als auf eine Querformat-Seite
+# passen (ca. 30); reicht es nicht, wird das Fenster verdoppelt
+DETAIL_FENSTER = 64
+
+
+def mitarbeiter_block(auswertung, i):
+    """
+    Zusammenfassungs-Zeile, Detail-Zeilen (werte, typ) und deren Hoehen (None =
+    noch nicht gemessen) von Mitarbeiter i – die Einheit, die
+    teamflow_export_fragmente zwischen Exporten aufhebt
+    """
+    name, abt, eintraege = auswertung.mitarbeiter[i]
+    details = [(detail_werte(name, abt, e), e.typ_name) for e in eintraege]
+    return [zusammenfassung_werte(auswertung, i), details, [None] * len(details)]
+
+
+def detail_zeilen(auswertung, bloecke):
+    """
+    Zeilen der Detail-Tabelle als (werte, farbe) – farbe None = Abteilungs-Trennzeile –
+    und parallel dazu die bekannten Zeilenhoehen
+    """
+    zeilen = []
+    hoehen = []
+
+    for neue_abteilung, i, abt in auswertung.mit_eintraegen():
         # Abteilungs-Trennzeile
-        if abt != aktuelle_abteilung:
-            aktuelle_abteilung = abt
-            table_data.append([abt, "", "", "", "", "", ""])
+        if neue_abteilung:
+            zeilen.append(([abt, "", "", "", "", "", ""], None))
+            hoehen.append(None)
+
+        _, details, block_hoehen = bloecke[i]
+        zeilen.extend((werte, TYP_FARBEN.get(typ, C_WHITE)) for werte, typ in details)
+        hoehen.extend(block_hoehen)
+
+    return zeilen, hoehen
+
+
+def hoehen_in_bloecke(auswertung, bloecke, hoehen):
+    """Die beim Aufbau gemessenen Zeilenhoehen zurueck in die Bloecke schreiben"""
+    pos = 0
+    for neue_abteilung, i, _ in auswertung.mit_eintraegen():
+        pos += neue_abteilung
+        block_hoehen = bloecke[i][2]
+        block_hoehen[:] = hoehen[pos:pos + len(block_hoehen)]
+        pos += len(block_hoehen)
+
+
+def detail_tabelle(zeilen, col_widths, hoehen=None):
+    """
+    Eine Table mit Kopfzeile fuer die gegebenen Detail-Zeilen. Mit hoehen
+    misst reportlab nur die Zeilen mit Hoehe None selbst aus.
+    """
+    table_data = [DETAIL.titel]
+    style_cmds = list(DETAIL_STYLE)
+    typ_farben = []
+
+    for data_row, (werte, farbe) in enumerate(zeilen, 1):
+        table_data.append(werte)
+        typ_farben.append(farbe)
+        if farbe is None:
             style_cmds += [
                 ("BACKGROUND", (0, data_row), (-1, data_row), C_ABT),
                 ("TEXTCOLOR",  (0, data_row), (-1, data_row), C_WHITE),
@@ -303,30 +325,89 @@ def baue_detail(mitarbeiter_liste, von_datum, bis_datum):
                 ("FONTSIZE",   (0, data_row), (-1, data_row), 9),
                 ("SPAN",       (0, data_row), (-1, data_row)),
             ]
-            data_row += 1
-
-        for e in eintraege:
-            typ   = e.get("typ", "")
-            farbe = TYP_FARBEN.get(typ, C_WHITE)
-            label = TYP_LABEL.get(typ, typ)
 
-            wert     = fmt_zahl(e.get("wert", 0))
-            einheit  = "h" if typ == "ueberstunden" else "T"
-            wert_str = f"{wert} {einheit}"
-            notiz    = e.get("notiz") or e.get("titel") or ""
+    style_cmds += hintergruende(typ_farben, spalten=DETAIL.typfarbe_spalten)
 
-            zeile = [name, abt, label, fmt_datum(e.get("von_datum")), fmt_datum(e.get("bis_datum")), wert_str, notiz]
-            table_data.append(zeile)
-
-            # Typ-Farbe auf Spalten 3-6
-            style_cmds.append(("BACKGROUND", (2, data_row), (5, data_row), farbe))
-
-            data_row += 1
-
-    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    row_heights = [None, *hoehen] if hoehen is not None else None
+    table = StilTabelle(table_data, colWidths=col_widths, rowHeights=row_heights, repeatRows=1)
     table.setStyle(TableStyle(style_cmds))
-    elements.append(table)
-
+    return table
+
+
+class DetailTabelle(Flowable):
+    """
+    Detail-Tabelle, die Seite fuer Seite gebaut wird.
+
+    Eine einzige Table ueber alle Eintraege teilt reportlab bei jedem
+    Seitenumbruch neu auf und kopiert dabei jedes Mal alle restlichen Zeilen
+    und Stil-Kommandos – der Aufwand waechst quadratisch mit der Zeilenzahl.
+    Hier wird pro Seite nur eine Table aus den naechsten DETAIL_FENSTER Zeilen
+    gebaut und von reportlab an derselben Stelle gesplittet. Der Rest bleibt
+    eine DetailTabelle ab der ersten nicht gedruckten Zeile. Die Seiten sehen
+    genauso aus wie mit einer grossen Table (gleiche Umbrueche, Kopfzeile auf
+    jeder Seite). Nach jedem Umbruch geht der Stand an fortschritt ("detail").
+
+    hoehen laeuft parallel zu zeilen: bekannte Zeilenhoehen (aus dem
+    Fragment-Cache) gehen an die Table, die uebrigen traegt jedes Fenster nach
+    dem Ausmessen ein.
+    """
+
+    def __init__(self, zeilen, col_widths, start=0, fortschritt=KEIN_FORTSCHRITT, hoehen=None):
+        Flowable.__init__(self)
+        self.zeilen      = zeilen
+        self.col_widths  = col_widths
+        self.start       = start
+        self.fortschritt = fortschritt
+        self.hoehen      = hoehen if hoehen is not None else [None] * len(zeilen)
+        self._fenster    = None  # (aW, aH, table, w, h)
+
+    def _baue_fenster(self, aW, aH):
+        # reportlab ruft wrap/split fuer dieselbe Stelle mehrfach auf
+        if self._fenster and self._fenster[:2] == (aW, aH):
+            return self._fenster[2:]
+        # Fenster so gross waehlen, dass es nicht auf die Seite passt – sonst
+        # wuerde die naechste Table mitten auf der Seite eine Kopfzeile zeigen
+        ende = self.start + DETAIL_FENSTER
+        while True:
+            table = detail_tabelle(self.zeilen[self.start:ende], self.col_widths, self.hoehen[self.start:ende])
+            w, h = table.wrap(aW, aH)
+            if ende >= len(self.zeilen) or h > aH:
+                break
+            ende += ende - self.start
+        gemessen = table._rowHeights[1:]
+        self.hoehen[self.start:self.start + len(gemessen)] = gemessen
+        self._fenster = (aW, aH, table, w, h)
+        return table, w, h
+
+    def wrap(self, aW, aH):
+        _, w, h = self._baue_fenster(aW, aH)
+        return w, h
+
+    def split(self, aW, aH):
+        table, _, _ = self._baue_fenster(aW, aH)
+        teile = table.split(aW, aH)
+        if not teile:
+            return []
+        seite = teile[0]
+        gedruckt = len(seite._cellvalues) - 1  # ohne Kopfzeile
+        if self.start + gedruckt >= len(self.zeilen):
+            return [seite]
+        self.fortschritt.melde("detail", self.start + gedruckt, len(self.zeilen))
+        return [seite, DetailTabelle(self.zeilen, self.col_widths, self.start + gedruckt,
+                                     self.fortschritt, self.hoehen)]
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self._fenster[2].drawOn(canvas, x, y, _sW)
+
+
+def detail_breiten():
+    return spalten_breiten(DETAIL)
+
+
+def baue_detail(zeilen, hoehen, fortschritt=KEIN_FORTSCHRITT):
+    elements = []
+    elements.append(Spacer(1, 0.5*cm))
+    elements.append(DetailTabelle(zeilen, detail_breiten(), fortschritt=fortschritt, hoehen=hoehen))
     return elements
 
 
@@ -361,15 +442,152 @@ def baue_legende():
     return elements
 
 
-# ── Haupt ─────────────────────────────────────────────────────────────────────
-def create_pdf(payload, output_path):
-    export_data       = payload.get("exportData", payload)
-    mitarbeiter_liste = export_data.get("mitarbeiter", [])
-    von_datum         = export_data.get("vonDatum", "")
-    bis_datum         = export_data.get("bisDatum", "")
+# ── Parallel: Abschnitte in eigenen Prozessen (teamflow_pdf_teile) ───────────
+# Ab so vielen Eintraegen verteilt create_pdf die Details auf mehrere Prozesse
+PARALLEL_AB_EINTRAEGEN = 10000
+# So oft wird beim Warten auf einen Abschnitt auf Abbruch geprueft (Sekunden)
+WARTE_S = 0.1
+
+
+class _Messpunkt(Flowable):
+    """Unsichtbar; merkt sich, wie viel Hoehe an seiner Stelle im Rahmen noch frei ist"""
+
+    def __init__(self, ergebnis):
+        Flowable.__init__(self)
+        self.ergebnis = ergebnis
+
+    def wrap(self, aW, aH):
+        self.ergebnis.append(aH)
+        return 0, 0
+
+    def draw(self):
+        pass
+
+
+def detail_hoehen(zeilen, hoehen, col_widths):
+    """
+    Fehlende Hoehen der Detail-Zeilen ergaenzen, ohne jede Zeile auszumessen:
+    Texte brechen in einer Table nicht um, die Hoehe haengt nur an der Art
+    (Abteilung/Eintrag) und der Zahl der Textzeilen. Jede Kombination wird
+    einmal von reportlab gemessen. Gibt die Hoehe der Kopfzeile zurueck.
+    """
+    gemessen = {}
+    for i, h in enumerate(hoehen):
+        if h is None:
+            werte, farbe = zeilen[i]
+            art = (farbe is None, max(str(w).count("\n") for w in werte))
+            h = gemessen.get(art)
+            if h is None:
+                table = detail_tabelle([zeilen[i]], col_widths)
+                table.wrap(sum(col_widths), 1e9)
+                h = gemessen[art] = table._rowHeights[1]
+            hoehen[i] = h
+    kopf = detail_tabelle([], col_widths)
+    kopf.wrap(sum(col_widths), 1e9)
+    return kopf._rowHeights[0]
+
+
+def rendere_abschnitt(auftrag):
+    """
+    Ein Abschnitt der Details als eigenes PDF – laeuft im Prozesspool.
+    Gibt (pdf-bytes, seiten) zurueck.
+    """
+    erstellt = auftrag["erstellt"]
+    ziel = io.BytesIO()
+    doc = dokument(ziel)
 
-    doc = SimpleDocTemplate(
-        output_path,
+    elements = []
+    if auftrag["erster"]:
+        elements += kopf_elemente(auftrag["von"], auftrag["bis"], "Details")
+        elements.append(Spacer(1, 0.5*cm))
+    elements.append(DetailTabelle(auftrag["zeilen"], detail_breiten(), hoehen=auftrag["hoehen"]))
+    if auftrag["letzter"]:
+        elements.extend(baue_legende())
+
+    def seite(canvas, doc):
+        footer_canvas(canvas, doc, erstellt, auftrag["versatz"])
+
+    doc.build(elements, onFirstPage=seite, onLaterPages=seite, canvasmaker=pdf_canvas(erstellt))
+    return ziel.getvalue(), doc.page
+
+
+def _baue_parallel(auswertung, bloecke, zeilen_details, hoehen, von_datum, bis_datum, erstellt,
+                   output_path, workers, profil, fortschritt):
+    """
+    Zusammenfassung im eigenen Prozess, Details in Abschnitten aus ganzen
+    Seiten im Prozesspool, danach zu einer Datei zusammengesetzt. Gibt die
+    Seitenzahl zurueck – oder None, wenn ein Abschnitt anders umgebrochen hat
+    als geplant (dann nichts geschrieben, create_pdf baut seriell).
+    """
+    with profil.phase("seitenplan"):
+        col_widths = detail_breiten()
+        kopf_hoehe = detail_hoehen(zeilen_details, hoehen, col_widths)
+
+        # Freie Hoehe vor der Zusammenfassung, vor den Details und auf einer Folgeseite
+        zusammenfassung = baue_zusammenfassung(auswertung, bloecke, von_datum, bis_datum, erstellt)
+        frei = []
+        dokument(io.BytesIO()).build([
+            *kopf_elemente(von_datum, bis_datum, "Zusammenfassung"), *zusammenfassung[:-1], _Messpunkt(frei),
+            PageBreak(), *kopf_elemente(von_datum, bis_datum, "Details"), Spacer(1, 0.5*cm), _Messpunkt(frei),
+            PageBreak(), _Messpunkt(frei),
+        ])
+        tabelle = zusammenfassung[-1]
+        tabelle.wrap(sum(col_widths), frei[0])
+        seiten_zusammenfassung = len(seitenplan(tabelle._rowHeights[0], tabelle._rowHeights[1:],
+                                                      frei[0], frei[2]))
+        seiten_details = seitenplan(kopf_hoehe, hoehen, frei[1], frei[2])
+
+    fortschritt.pruefe()
+    plan = abschnitte(seiten_details, workers)
+    profil.zaehle("abschnitte", len(plan))
+    auftraege = [{
+        "erstellt": erstellt, "von": von_datum, "bis": bis_datum,
+        "zeilen":   zeilen_details[zeile0:zeile0 + anzahl],
+        "hoehen":   hoehen[zeile0:zeile0 + anzahl],
+        "erster":   k == 0,
+        "letzter":  k == len(plan) - 1,
+        "versatz":  seiten_zusammenfassung + seite0,
+    } for k, (seite0, _, zeile0, anzahl) in enumerate(plan)]
+
+    with profil.phase("speichern"):
+        with prozesspool(min(workers, len(plan))) as pool:
+            laufend = [pool.apply_async(rendere_abschnitt, (auftrag,)) for auftrag in auftraege]
+
+            # Die Zusammenfassung rendert derweil dieser Prozess
+            fortschritt.pruefe()
+            s_abschnitt = io.BytesIO()
+            doc = dokument(s_abschnitt)
+            doc.build([*kopf_elemente(von_datum, bis_datum, "Zusammenfassung"),
+                       *baue_zusammenfassung(auswertung, bloecke, von_datum, bis_datum, erstellt)],
+                      onFirstPage=lambda c, d: footer_canvas(c, d, erstellt),
+                      onLaterPages=lambda c, d: footer_canvas(c, d, erstellt),
+                      canvasmaker=pdf_canvas(erstellt))
+            pdfs = [s_abschnitt.getvalue()]
+            stimmt = doc.page == seiten_zusammenfassung
+
+            fertig_zeilen, fertig_seiten = 0, doc.page
+            for (_, seiten, _, anzahl), auftrag, zukunft in zip(plan, auftraege, laufend):
+                while not zukunft.ready():
+                    fortschritt.pruefe()
+                    zukunft.wait(WARTE_S)
+                daten, gerendert = zukunft.get()
+                # Die Legende am Ende kann eine Seite anhaengen – danach kommt nichts mehr
+                stimmt = stimmt and (gerendert == seiten or auftrag["letzter"])
+                pdfs.append(daten)
+                fertig_zeilen += anzahl
+                fertig_seiten += gerendert
+                fortschritt.melde("detail", fertig_zeilen, len(zeilen_details))
+                fortschritt.melde("seiten", fertig_seiten)
+
+        if not stimmt:
+            return None
+        return zusammenfuegen(pdfs, output_path)
+
+
+# ── Haupt ─────────────────────────────────────────────────────────────────────
+def dokument(ziel):
+    return SimpleDocTemplate(
+        ziel,
         pagesize=landscape(A4),
         topMargin=1.5*cm,
         bottomMargin=2*cm,
@@ -377,61 +595,160 @@ def create_pdf(payload, output_path):
         rightMargin=1.5*cm,
     )
 
-    s_titel, s_untertitel, s_abschnitt, s_klein = get_styles()
 
-    elements = []
+def kopf_elemente(von_datum, bis_datum, abschnitt):
+    s_titel, s_untertitel, s_abschnitt, _ = get_styles()
+    return [
+        Paragraph("Abwesenheits-Uebersicht", s_titel),
+        Paragraph(f"{fmt_datum(von_datum)} – {fmt_datum(bis_datum)}", s_untertitel),
+        HRFlowable(width="100%", thickness=1, color=C_PRIMARY, spaceAfter=10),
+        Paragraph(abschnitt, s_abschnitt),
+    ]
+
 
-    # ── Seite 1: Zusammenfassung ──
-    elements.append(Paragraph("Abwesenheits-Uebersicht", s_titel))
-    elements.append(Paragraph(
-        f"{fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
-        s_untertitel
-    ))
-    elements.append(HRFlowable(width="100%", thickness=1, color=C_PRIMARY, spaceAfter=10))
-    elements.append(Paragraph("Zusammenfassung", s_abschnitt))
-    elements.extend(baue_zusammenfassung(mitarbeiter_liste, von_datum, bis_datum))
-
-    # ── Seite 2: Details ──
-    elements.append(PageBreak())
-    elements.append(Paragraph("Abwesenheits-Uebersicht", s_titel))
-    elements.append(Paragraph(
-        f"{fmt_datum(von_datum)} – {fmt_datum(bis_datum)}",
-        s_untertitel
-    ))
-    elements.append(HRFlowable(width="100%", thickness=1, color=C_PRIMARY, spaceAfter=10))
-    elements.append(Paragraph("Details", s_abschnitt))
-    elements.extend(baue_detail(mitarbeiter_liste, von_datum, bis_datum))
-
-    # ── Legende ──
-    elements.extend(baue_legende())
-
-    doc.build(elements, onFirstPage=footer_canvas, onLaterPages=footer_canvas)
+def create_pdf(payload, output_path, profil=KEIN_PROFIL, fortschritt=KEIN_FORTSCHRITT,
+               fragmente=KEINE_FRAGMENTE, workers=None):
+    """
+    workers: Prozesse fuer die Details (teamflow_pdf_teile); None = ab
+    PARALLEL_AB_EINTRAEGEN so viele wie CPU-Kerne, sonst seriell
+    """
+    export_data       = payload.get("exportData", payload)
+    mitarbeiter_liste = export_data.get("mitarbeiter", [])
+    von_datum         = export_data.get("vonDatum", "")
+    bis_datum         = export_data.get("bisDatum", "")
+    erstellt          = erstellt_am(payload)
+
+    # Ein Durchlauf ueber die Payload fuer Zahlen, Summen und Detail-Gruppen
+    with profil.phase("modell"):
+        auswertung = auswerten(mitarbeiter_liste)
+    profil.zaehle("mitarbeiter", len(auswertung))
+    profil.zaehle("eintraege", auswertung.anzahl_eintraege)
+
+    # Formatierte Zeilen und Zeilenhoehen pro Mitarbeiter – mit --cache nur
+    # fuer geaenderte Mitarbeiter neu
+    with profil.phase("fragmente"):
+        bloecke, neu = fragmente.bloecke("pdf", auswertung, (von_datum, bis_datum),
+                                         lambda i: mitarbeiter_block(auswertung, i))
+        zeilen_details, hoehen = detail_zeilen(auswertung, bloecke)
+    if fragmente.aktiv:
+        profil.zaehle("fragmente_neu", len(neu))
+    fortschritt.pruefe()
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if auswertung.anzahl_eintraege >= PARALLEL_AB_EINTRAEGEN else 1
+    seiten = None
+    if workers > 1 and zeilen_details:
+        seiten = _baue_parallel(auswertung, bloecke, zeilen_details, hoehen, von_datum, bis_datum, erstellt,
+                                output_path, workers, profil, fortschritt)
+        if seiten is None:
+            sys.stderr.buffer.write(b"WARNUNG PDF: Abschnitte anders umgebrochen als geplant, baue seriell\n")
+    if seiten is None:
+        seiten = _baue_seriell(auswertung, bloecke, zeilen_details, hoehen, von_datum, bis_datum, erstellt,
+                               output_path, profil, fortschritt)
+    fortschritt.melde("detail", len(zeilen_details), len(zeilen_details), erzwingen=True)
+    fortschritt.melde("seiten", seiten, erzwingen=True)
+    profil.zaehle("zeilen_details", len(zeilen_details))
+
+    # Neue Bloecke erst jetzt ablegen – mit den beim Aufbau gemessenen Hoehen
+    if neu:
+        hoehen_in_bloecke(auswertung, bloecke, hoehen)
+        fragmente.lege_ab(neu)
+    profil.zaehle("seiten", seiten)
     sys.stdout.buffer.write(f"PDF erfolgreich erstellt: {output_path}\n".encode("utf-8"))
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.stderr.write("FEHLER: Usage: python export_to_pdf.py <input.json> <output.pdf>\n")
-        sys.exit(1)
+def _baue_seriell(auswertung, bloecke, zeilen_details, hoehen, von_datum, bis_datum, erstellt,
+                  output_path, profil, fortschritt):
+    doc = dokument(output_path)
+
+    with profil.phase("tabellen"):
+        elements = []
 
-    input_file  = sys.argv[1]
-    output_file = sys.argv[2]
+        # ── Seite 1: Zusammenfassung ──
+        elements.extend(kopf_elemente(von_datum, bis_datum, "Zusammenfassung"))
+        elements.extend(baue_zusammenfassung(auswertung, bloecke, von_datum, bis_datum, erstellt))
+
+        # ── Seite 2: Details ──
+        elements.append(PageBreak())
+        elements.extend(kopf_elemente(von_datum, bis_datum, "Details"))
+        elements.extend(baue_detail(zeilen_details, hoehen, fortschritt))
+
+        # ── Legende ──
+        elements.extend(baue_legende())
+
+    def seite(canvas, doc):
+        footer_canvas(canvas, doc, erstellt)
+        fortschritt.melde("seiten", doc.page)
+
+    with profil.phase("speichern"):
+        doc.build(elements, onFirstPage=seite, onLaterPages=seite, canvasmaker=pdf_canvas(erstellt))
+    return doc.page
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF-Export fuer TeamFlow")
+    parser.add_argument("input_file", nargs="?", help="Export-Daten als JSON, - fuer stdin (entfaellt mit --db)")
+    parser.add_argument("output_file", help="Ziel-Datei (.pdf), - fuer stdout")
+    add_db_argumente(parser)
+    add_profil_argumente(parser)
+    add_cache_argumente(parser)
+    add_fortschritt_argumente(parser)
+    add_vorschau_argumente(parser)
+    add_abbruch_argumente(parser)
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="Prozesse fuer die Detail-Seiten (Standard: ab "
+                             f"{PARALLEL_AB_EINTRAEGEN} Eintraegen CPU-Kerne, sonst 1)")
+    args = parser.parse_args()
+    pruefe_db_argumente(parser, args)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers muss mindestens 1 sein")
+    # --dry-run schreibt keine Datei, stdout bleibt fuer die JSON-Zeile
+    ziel = None if args.dry_run else ausgabe_ziel(args.output_file, ".pdf")
+    profil = profil_aus_argumenten(args, "export_to_pdf")
+    abbruch = abbruch_aus_argumenten(parser, args)
+    fortschritt = abbruch.ueberwache(fortschritt_aus_argumenten(args))
 
     try:
-        with io.open(input_file, "r", encoding="utf-8-sig") as f:
-            payload = json.load(f)
+        with profil.phase("db_laden" if args.db else "json_laden"):
+            if args.db:
+                payload = lade_db_payload(args)
+                quelle = "Datenbank"
+            else:
+                payload = lade_json(args.input_file)
+                quelle = "JSON"
         mitarbeiter_liste = payload.get("exportData", payload).get("mitarbeiter", payload)
         anzahl = len(mitarbeiter_liste) if isinstance(mitarbeiter_liste, list) else "?"
-        sys.stdout.buffer.write(f"JSON gelesen: {anzahl} Mitarbeiter\n".encode("utf-8"))
+        if not args.dry_run:
+            sys.stdout.buffer.write(f"{quelle} gelesen: {anzahl} Mitarbeiter\n".encode("utf-8"))
     except Exception as e:
-        sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
+        sys.stderr.buffer.write(f"FEHLER beim Lesen der Daten: {e}\n".encode("utf-8"))
         sys.exit(1)
 
+    if args.dry_run:
+        try:
+            schreibe_vorschau(vorschau(payload, lambda anzahl: "pdf"))
+        except Exception as e:
+            sys.stderr.buffer.write(f"FEHLER bei der Vorschau: {e}\n".encode("utf-8"))
+            sys.exit(1)
+        return
+
+    stand = datei_stand(ziel)
     try:
-        create_pdf(payload, output_file)
+        cache = cache_aus_argumenten(args)
+        exportiere(cache, create_pdf, payload, ziel,
+                   profil=profil, fortschritt=fortschritt, fragmente=fragmente_aus_cache(cache),
+                   workers=args.workers)
+        senden(ziel)
+    except Abgebrochen:
+        raeume_auf(ziel, stand)
+        melde_abbruch(abbruch)
+        sys.exit(EXIT_ABGEBROCHEN)
     except Exception as e:
         sys.stderr.buffer.write(f"FEHLER beim Erstellen der PDF: {e}\n".encode("utf-8"))
         sys.exit(1)
+    finally:
+        if profil.aktiv:
+            profil.schreibe()
 
 
 if __name__ == "__main__":
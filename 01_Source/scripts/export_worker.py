@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export-Worker fuer TeamFlow
+Langlebiger Prozess: liest Export-Auftraege als JSON-Zeilen von stdin und
+antwortet mit JSON-Zeilen auf stdout. reportlab/openpyxl werden nur einmal
+beim Start importiert statt bei jedem Export.
+
+Auftrag: {"id": "...", "kind": "excel", "payload": {...}, "output": "C:/.../x.xlsx"}
+         Fuer excel/pdf (und die Batch-Jobs) darf payload auch ein DB-Auftrag sein
+         ({"quelle": "db", "db": ..., "vonDatum", "bisDatum", "typen", "nurMitEintraegen"}).
+         Mit "profile": true enthaelt die Antwort zusaetzlich "profil" – Phasenzeiten,
+         Zeilenzahlen und Speicherspitze wie bei --profile (teamflow_export_profil).
+         Mit "fortschritt": true kommen vor der Antwort Zwischenmeldungen
+         {"id": "...", "fortschritt": {"phase": "detail", "done": 1200, "total": 18000}}
+         (teamflow_export_fortschritt; nur Zeitraum- und Batch-Exporte).
+         Mit "cache": {"ordner": ..., "maxMb": 256} kommt eine schon einmal
+         gerenderte Datei aus dem Export-Cache (teamflow_export_cache, nicht fuer
+         Batch-Jobs); die Antwort hat dann "cache": true. excel/pdf legen
+         dort ausserdem formatierte Zeilen pro Mitarbeiter ab und formatieren
+         beim naechsten Export nur geaenderte Mitarbeiter neu (teamflow_export_fragmente).
+         excel versteht "backend": "nativ" wie --backend nativ (teamflow_xlsx_native).
+         excel/pdf brechen mit "timeoutS": 600 nach so vielen Sekunden ab (teamflow_export_abbruch).
+Abbruch: {"id": "...", "kind": "abbrechen"} bricht den laufenden oder einen wartenden
+         Auftrag ab – auch waehrend eines Exports, stdin wird nebenher gelesen.
+         Unbekannte oder schon beantwortete ids werden ignoriert; es gibt keine eigene Antwort.
+Antwort: {"id": "...", "ok": true, "output": "...", "ms": 123.4}
+         {"id": "...", "ok": false, "error": "..."}
+         {"id": "...", "ok": false, "abgebrochen": true, "error": "..."} – angefangene Datei geloescht
+"""
+
+import sys
+import json
+import time
+import queue
+import threading
+
+# Alle Exporter vorab importieren – genau das spart der Worker gegenueber
+# dem Start eines eigenen Prozesses pro Export.
+import export_to_excel
+import export_to_pdf
+import export_employee_detail
+import export_employee_year
+import export_employee_year_excel
+from teamflow_export_db import payload_aus_db_auftrag
+from teamflow_export_modell import lade_json_text
+from teamflow_export_profil import KEIN_PROFIL, Profil
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT, Fortschritt
+from teamflow_export_cache import ExportCache, MAX_MB, exportiere
+from teamflow_export_fragmente import fragmente_aus_cache
+from teamflow_export_abbruch import Abbruch, Abgebrochen, datei_stand, raeume_auf, zeilen
+
+
+JOBS = {
+    "excel":             export_to_excel.create_excel,
+    "pdf":               export_to_pdf.create_pdf,
+    "employeeDetailPdf": export_employee_detail.create_stammdaten_pdf,
+    "employeeYearPdf":   export_employee_year.create_year_pdf,
+    "employeeYearExcel": export_employee_year_excel.create_employee_year_excel,
+    # output ist hier ein Ordner (eine Datei pro Mitarbeiter + manifest.json)
+    "employeeYearPdfBatch":   export_employee_year.create_year_pdf_batch,
+    "employeeYearExcelBatch": export_employee_year_excel.create_employee_year_excel_batch,
+    # alle Mitarbeiter in einer Arbeitsmappe (Index-Blatt + ein Blatt pro Mitarbeiter)
+    "employeeYearWorkbook":   export_employee_year_excel.create_year_workbook,
+}
+
+# Zeitraum-Exporte koennen statt exportData einen DB-Auftrag bekommen; die
+# Batch-Jobs loesen ihren DB-Auftrag selbst auf (teamflow_export_batch)
+ZEITRAUM_JOBS = {"excel", "pdf"}
+
+# Diese Jobs nehmen kein profil-Argument, sie werden als Ganzes gemessen
+# (und ohne Cache, der nur den DB-Auftrag saehe statt der Daten)
+BATCH_JOBS = {"employeeYearPdfBatch", "employeeYearExcelBatch", "employeeYearWorkbook"}
+
+# Nur diese Jobs melden Fortschritt, die uebrigen sind eine Seite/ein Blatt
+FORTSCHRITT_JOBS = ZEITRAUM_JOBS | BATCH_JOBS
+
+
+def bearbeite_auftrag(auftrag, melde=None, abbruch=None):
+    """
+    melde(nachricht) schickt Zwischenmeldungen vor der Antwort (Fortschritt).
+    abbruch: Abbruch, den main() bei {"kind": "abbrechen"} ausloest.
+    """
+    job_id = auftrag.get("id")
+    kind   = auftrag.get("kind")
+
+    if kind == "ping":
+        return {"id": job_id, "ok": True}
+
+    create = JOBS.get(kind)
+    if create is None:
+        return {"id": job_id, "ok": False, "error": f"Unbekannter Export-Typ: {kind}"}
+
+    output = auftrag.get("output")
+    if not output:
+        return {"id": job_id, "ok": False, "error": "Kein Ausgabepfad angegeben"}
+
+    timeout_s = auftrag.get("timeoutS")
+    if timeout_s is not None and (not isinstance(timeout_s, (int, float)) or timeout_s <= 0):
+        return {"id": job_id, "ok": False, "error": "timeoutS muss eine Zahl groesser 0 sein"}
+    if abbruch is None:
+        abbruch = Abbruch()
+    # Die Frist zaehlt ab dem Start des Auftrags, nicht ab dem Einreihen
+    abbruch.setze_zeitlimit(timeout_s if kind in ZEITRAUM_JOBS else None)
+
+    # Im Worker sind alle Module seit dem Start geladen – keine Import-Phase
+    profil = Profil(kind, mit_import=False) if auftrag.get("profile") else KEIN_PROFIL
+    fortschritt = KEIN_FORTSCHRITT
+    if melde is not None and auftrag.get("fortschritt") and kind in FORTSCHRITT_JOBS:
+        fortschritt = Fortschritt(lambda ereignis: melde({"id": job_id, "fortschritt": ereignis}))
+    # Pruefpunkte gibt es nur in den Zeitraum-Exporten; die anderen Jobs
+    # koennen nur abgebrochen werden, solange sie noch warten
+    if kind in ZEITRAUM_JOBS:
+        fortschritt = abbruch.ueberwache(fortschritt)
+    cache_auftrag = auftrag.get("cache")
+    cache = None
+    if cache_auftrag and kind not in BATCH_JOBS:
+        cache = ExportCache(cache_auftrag["ordner"], cache_auftrag.get("maxMb", MAX_MB))
+
+    start = time.perf_counter()
+    aus_cache = False
+    stand = datei_stand(output)
+    try:
+        abbruch.pruefe()
+        payload = auftrag.get("payload") or {}
+        if kind in ZEITRAUM_JOBS:
+            with profil.phase("db_laden"):
+                payload = payload_aus_db_auftrag(payload)
+        if kind in BATCH_JOBS:
+            with profil.phase("batch"):
+                create(payload, output, fortschritt=fortschritt)
+        elif kind in ZEITRAUM_JOBS:
+            optionen = {"backend": auftrag["backend"]} if kind == "excel" and auftrag.get("backend") else {}
+            aus_cache = exportiere(cache, create, payload, output, profil=profil, fortschritt=fortschritt,
+                                   fragmente=fragmente_aus_cache(cache), **optionen)
+        else:
+            aus_cache = exportiere(cache, create, payload, output, profil=profil)
+    except Abgebrochen:
+        raeume_auf(output, stand)
+        antwort = {"id": job_id, "ok": False, "abgebrochen": True, "error": f"Abgebrochen: {abbruch.grund}"}
+    except Exception as e:
+        antwort = {"id": job_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    else:
+        ms = round((time.perf_counter() - start) * 1000, 1)
+        antwort = {"id": job_id, "ok": True, "output": output, "ms": ms}
+        if aus_cache:
+            antwort["cache"] = True
+
+    if profil.aktiv:
+        antwort["profil"] = profil.beenden()
+    return antwort
+
+
+def main():
+    # stdout gehoert exklusiv dem Protokoll. Die Statusmeldungen der Exporter
+    # ("PDF erfolgreich erstellt ...") landen deshalb auf stderr.
+    protokoll = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    schreiben = threading.Lock()
+
+    def antworte(antwort):
+        with schreiben:
+            protokoll.write(json.dumps(antwort, ensure_ascii=False).encode("utf-8") + b"\n")
+            protokoll.flush()
+
+    # stdin liest ein eigener Thread, damit "abbrechen" auch waehrend eines
+    # Exports ankommt; die Auftraege laufen weiter nacheinander in diesem
+    auftraege = queue.Queue()
+    offen = {}  # id -> Abbruch der wartenden und des laufenden Auftrags
+    sperre = threading.Lock()
+
+    def lesen():
+        for zeile in zeilen(sys.stdin.fileno()):
+            zeile = zeile.strip()
+            if not zeile:
+                continue
+            try:
+                auftrag = lade_json_text(zeile.decode("utf-8-sig"))
+            except Exception as e:
+                antworte({"id": None, "ok": False, "error": f"Ungueltige Auftragszeile: {e}"})
+                continue
+            if not isinstance(auftrag, dict):
+                antworte({"id": None, "ok": False, "error": "Auftrag muss ein JSON-Objekt sein"})
+                continue
+            with sperre:
+                if auftrag.get("kind") == "abbrechen":
+                    abbruch = offen.get(auftrag.get("id"))
+                    if abbruch is not None:
+                        abbruch.abbrechen("Abbruch angefordert")
+                    continue
+                abbruch = offen[auftrag.get("id")] = Abbruch()
+            auftraege.put((auftrag, abbruch))
+        auftraege.put(None)
+
+    antworte({"id": None, "ok": True, "ready": True, "kinds": sorted(JOBS)})
+    threading.Thread(target=lesen, daemon=True).start()
+
+    while (naechster := auftraege.get()) is not None:
+        auftrag, abbruch = naechster
+        try:
+            antworte(bearbeite_auftrag(auftrag, antworte, abbruch))
+        finally:
+            with sperre:
+                if offen.get(auftrag.get("id")) is abbruch:
+                    del offen[auftrag.get("id")]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer Einstiegspunkt fuer alle TeamFlow-Exporte
+Ersetzt die fuenf einzelnen PyInstaller-Builds durch ein Programm mit
+Unterbefehlen. Jeder Unterbefehl importiert nur sein eigenes Exportmodul –
+reportlab nur fuer PDF, openpyxl nur fuer Excel.
+
+Aufruf:
+    teamflow_export [--timings] excel      <input.json> <output.xlsx>
+    teamflow_export [--timings] pdf        <input.json> <output.pdf>
+    teamflow_export [--timings] excel|pdf  --db <TeamFlow.db> --von YYYY-MM-DD --bis YYYY-MM-DD
+                                           [--types urlaub,krankheit,...] <output>
+    teamflow_export [--timings] detail-pdf <input.json> <output.pdf>
+    teamflow_export [--timings] year-pdf   <input.json> <output.pdf>
+    teamflow_export [--timings] year-excel <input.json> <output.xlsx>
+    teamflow_export [--timings] year-pdf|year-excel --batch [--workers N] <input.json> <ordner>
+    teamflow_export [--timings] year-pdf|year-excel --batch --db <TeamFlow.db> --jahr YYYY <ordner>
+    teamflow_export [--timings] year-excel --sammelmappe [--db <TeamFlow.db> --jahr YYYY] [<input.json>] <output.xlsx>
+    teamflow_export worker
+    teamflow_export binaer     <input.json> <output.tfex>
+
+Alle Export-Befehle verstehen --profile [--profile-cprofile PFAD]
+(Phasenzeiten als PROFILE-Zeile auf stderr, siehe teamflow_export_profil.py).
+excel, pdf und die Batch-Befehle zusaetzlich --fortschritt (JSON-Zeilen auf
+stdout, siehe teamflow_export_fortschritt.py).
+Ohne --batch gibt es --cache ORDNER [--cache-max-mb MB]: gleiche Eingabe ->
+fertige Datei aus dem Export-Cache (teamflow_export_cache.py). excel und pdf
+formatieren dann ausserdem nur Mitarbeiter mit geaenderten Daten neu
+(teamflow_export_fragmente.py).
+Ohne --batch darf <input.json> und <output> "-" sein: JSON von stdin, Datei
+auf stdout, Meldungen dann auf stderr (teamflow_export_stdio.py).
+excel und pdf lesen statt der JSON auch das Binaerformat aus
+teamflow_export_binaer.py (.tfex, wird automatisch erkannt).
+excel schreibt mit --backend nativ ohne openpyxl direkt zip/XML
+(teamflow_xlsx_native.py).
+pdf rendert ab 10 000 Eintraegen die Details in mehreren Prozessen
+(--workers N, teamflow_pdf_teile.py).
+excel und pdf schaetzen mit --dry-run Umfang, Seiten, Groesse und Dauer,
+ohne etwas zu erzeugen (JSON-Zeile auf stdout, teamflow_export_vorschau.py).
+excel und pdf brechen mit --timeout-s S, bei SIGTERM oder mit --abbruch-stdin
+auf die Zeile "abbrechen" ab: angefangene Datei geloescht, Exit-Code 3
+(teamflow_export_abbruch.py).
+"""
+
+import sys
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import multiprocessing
+
+
+# Unterbefehl -> Modul mit main()
+BEFEHLE = {
+    "excel":      "export_to_excel",
+    "pdf":        "export_to_pdf",
+    "detail-pdf": "export_employee_detail",
+    "year-pdf":   "export_employee_year",
+    "year-excel": "export_employee_year_excel",
+    "worker":     "export_worker",
+    "binaer":     "teamflow_export_binaer",
+}
+
+
+def schreibe_timings(befehl, import_ms, export_ms, exit_code):
+    timings = {
+        "befehl":    befehl,
+        "exit_code": exit_code,
+        "start_ms":  round(import_ms[0], 1),
+        "import_ms": round(import_ms[1], 1),
+        "export_ms": round(export_ms, 1),
+        "gesamt_ms": round((time.perf_counter() - _START) * 1000, 1),
+        "reportlab": "reportlab" in sys.modules,
+        "openpyxl":  "openpyxl" in sys.modules,
+    }
+    sys.stderr.buffer.write(f"TIMINGS {json.dumps(timings)}\n".encode("utf-8"))
+
+
+def main():
+    # Batch-Modus der Jahresuebersichten startet Prozesse (ProcessPoolExecutor);
+    # im PyInstaller-Build laufen diese ueber dieselbe exe
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(
+        prog="teamflow_export",
+        description="TeamFlow Export (Excel/PDF)",
+    )
+    parser.add_argument("--timings", action="store_true",
+                        help="Start-, Import- und Exportzeit als JSON auf stderr ausgeben")
+    parser.add_argument("befehl", choices=sorted(BEFEHLE))
+    parser.add_argument("argumente", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    t_import = time.perf_counter()
+    modul = importlib.import_module(BEFEHLE[args.befehl])
+    t_export = time.perf_counter()
+
+    # Die Module lesen ihre Argumente selbst aus sys.argv
+    sys.argv = [f"teamflow_export {args.befehl}", *args.argumente]
+
+    exit_code = 0
+    try:
+        modul.main()
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        if args.timings:
+            ende = time.perf_counter()
+            schreibe_timings(
+                args.befehl,
+                ((t_import - _START) * 1000, (t_export - t_import) * 1000),
+                (ende - t_export) * 1000,
+                exit_code,
+            )
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Ein gemeinsamer Build fuer alle Exporte (teamflow_export.py mit Unterbefehlen).
+# onedir statt onefile: die Runtime liegt entpackt neben der .exe und muss
+# nicht bei jedem Export erneut nach %TEMP% entpackt werden.
+# Gebaut mit reportlab==5.0.1 (teamflow_pdf_stile.REPORTLAB_GETESTET, siehe README).
+
+
+a = Analysis(
+    ['teamflow_export.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    # Werden per importlib geladen und sind deshalb fuer die Analyse unsichtbar
+    hiddenimports=[
+        'export_to_excel',
+        'export_to_pdf',
+        'export_employee_detail',
+        'export_employee_year',
+        'export_employee_year_excel',
+        'export_worker',
+        'teamflow_export_binaer',
+    ],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='teamflow_export',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='teamflow_export',
+)
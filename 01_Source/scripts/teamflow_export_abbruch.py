@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Abbruch und Zeitlimit fuer laufende Exporte
+Bisher liess sich ein ausufernder Export nur hart beenden – mit dem Risiko
+einer halb geschriebenen xlsx/pdf im Export-Ordner. Jetzt bricht der Export
+selbst ab, an Stellen, an denen er ohnehin seinen Fortschritt meldet:
+
+    - Zaehler.weiter() in den Zeilenschleifen (alle PRUEF_SCHRITT Zeilen)
+    - melde() nach jeder PDF-Seite, jedem Umbruch der Detail-Tabelle und
+      jedem fertigen Abschnitt aus dem Prozesspool
+    - pruefe() zwischen den reportlab-Laeufen und beim Warten auf Abschnitte
+
+Ausloeser:
+
+    --timeout-s S     Zeitlimit ab dem Start des Exports
+    SIGTERM           setzt nur die Marke; ein zweites SIGTERM beendet sofort
+                      (unter Windows nicht abfangbar – dort --abbruch-stdin)
+    --abbruch-stdin   Zeile "abbrechen" auf stdin (nicht mit "-" als Eingabe)
+    Export-Worker     {"kind": "abbrechen", "id": ...} bzw. "timeoutS" im Auftrag
+
+Abbruch.ueberwache(fortschritt) haengt die Pruefung an das Fortschritts-
+Objekt; die create_*-Funktionen bekommen es wie bisher als fortschritt und
+werfen dann Abgebrochen. main() loescht, was der Export von der Zieldatei
+geschrieben hat, und endet mit EXIT_ABGEBROCHEN. Eine Pruefung kostet einen
+Vergleich mit time.monotonic() – gemessen mit benchmarks/bench_abbruch.py.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+
+from teamflow_export_fortschritt import mit_pruefung
+
+
+# Exit-Code nach einem Abbruch (1 bleibt fuer Fehler)
+EXIT_ABGEBROCHEN = 3
+
+
+class Abgebrochen(Exception):
+    """Der Export wurde abgebrochen oder hat sein Zeitlimit ueberschritten"""
+
+
+class Abbruch:
+    """Marke und Frist eines Exports; pruefe() wirft Abgebrochen"""
+
+    def __init__(self, timeout_s=None):
+        self.grund = None
+        self.setze_zeitlimit(timeout_s)
+
+    def setze_zeitlimit(self, timeout_s):
+        """Frist timeout_s Sekunden ab jetzt (None: keine)"""
+        self.timeout_s = timeout_s
+        self.frist = time.monotonic() + timeout_s if timeout_s else None
+
+    def abbrechen(self, grund="abgebrochen"):
+        # Aus Signal-Handlern und anderen Threads – nur eine Zuweisung
+        if self.grund is None:
+            self.grund = grund
+
+    def pruefe(self):
+        if self.grund is None and self.frist is not None and time.monotonic() >= self.frist:
+            self.grund = f"Zeitlimit von {self.timeout_s:g} s ueberschritten"
+        if self.grund is not None:
+            raise Abgebrochen(self.grund)
+
+    def ueberwache(self, fortschritt):
+        """fortschritt, dessen melde() und Zaehler vorher pruefe() aufrufen"""
+        return mit_pruefung(fortschritt, self.pruefe)
+
+    def bei_sigterm(self):
+        """Erstes SIGTERM: Marke setzen, der Export raeumt auf. Zweites: sofort beenden."""
+        pid = os.getpid()
+
+        def handler(signum, frame):
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if os.getpid() != pid:
+                # Per fork geerbt (PDF-Prozesspool): Pool.terminate() beendet so den Prozess
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+            self.abbrechen("SIGTERM erhalten")
+        signal.signal(signal.SIGTERM, handler)
+
+    def lies_stdin(self, fd=None):
+        """Im Hintergrund stdin lesen; eine Zeile "abbrechen" setzt die Marke, Dateiende nicht"""
+        def lesen():
+            for zeile in zeilen(sys.stdin.fileno() if fd is None else fd):
+                if zeile.strip() == b"abbrechen":
+                    self.abbrechen("Abbruch ueber stdin")
+                    return
+        threading.Thread(target=lesen, daemon=True).start()
+
+
+def zeilen(fd):
+    """
+    Zeilen (bytes mit Zeilenende) von einem Datei-Deskriptor. Fuer Lese-
+    Threads statt sys.stdin: dessen Puffer haelt beim Warten eine Sperre,
+    und die Prozesse des PDF-Pools (fork) blieben beim Schliessen ihres
+    stdin daran haengen.
+    """
+    rest = b""
+    while True:
+        block = os.read(fd, 65536)
+        if not block:
+            if rest:
+                yield rest
+            return
+        teile = (rest + block).split(b"\n")
+        rest = teile.pop()
+        for teil in teile:
+            yield teil + b"\n"
+
+
+# ── Aufraeumen ───────────────────────────────────────────────────────────────
+def datei_stand(pfad):
+    """(Groesse, mtime) der Zieldatei oder None – vor dem Export merken, fuer raeume_auf()"""
+    if not isinstance(pfad, str):
+        return None
+    try:
+        st = os.stat(pfad)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def raeume_auf(pfad, stand):
+    """
+    Loescht pfad, wenn der abgebrochene Export ihn angelegt oder veraendert
+    hat. Ein StdoutPuffer (Ziel "-") hat noch nichts gesendet.
+    """
+    if not isinstance(pfad, str) or datei_stand(pfad) in (None, stand):
+        return
+    try:
+        os.remove(pfad)
+    except OSError as e:
+        sys.stderr.buffer.write(f"WARNUNG Abbruch: {pfad} nicht geloescht: {e}\n".encode("utf-8"))
+
+
+def melde_abbruch(abbruch):
+    # Den Grund aus dem Abbruch, nicht aus der Ausnahme: reportlab setzt vor
+    # Ausnahmen aus Seiten-Callbacks eigenen Text
+    sys.stderr.buffer.write(f"ABGEBROCHEN: {abbruch.grund}\n".encode("utf-8"))
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def add_abbruch_argumente(parser):
+    parser.add_argument("--timeout-s", type=float, default=None, metavar="S",
+                        help=f"Export nach S Sekunden abbrechen (Exit-Code {EXIT_ABGEBROCHEN}, "
+                             "angefangene Datei wird geloescht)")
+    parser.add_argument("--abbruch-stdin", action="store_true",
+                        help='Zeile "abbrechen" auf stdin bricht den Export ab (wie SIGTERM)')
+
+
+def abbruch_aus_argumenten(parser, args):
+    """Abbruch mit --timeout-s; SIGTERM und ggf. stdin werden ab jetzt beachtet"""
+    if args.timeout_s is not None and args.timeout_s <= 0:
+        parser.error("--timeout-s muss groesser als 0 sein")
+    if args.abbruch_stdin and args.input_file == "-":
+        parser.error("--abbruch-stdin geht nicht zusammen mit - als Eingabe")
+    abbruch = Abbruch(args.timeout_s)
+    abbruch.bei_sigterm()
+    if args.abbruch_stdin:
+        abbruch.lies_stdin()
+    return abbruch
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Batch-Modus fuer die Jahresuebersichten (PDF und Excel)
+Rendert die Jahresuebersicht aller Mitarbeiter in einem Lauf statt eines
+Exports pro Klick. Die Dateien werden auf einen ProcessPoolExecutor verteilt
+(ein Prozess pro CPU-Kern); jeder Prozess importiert reportlab/openpyxl nur
+einmal und rendert dann viele Dateien.
+
+Eingabe (input.json):
+    [{"employee", "jahr", "stats", "eintraege"}, ...]
+    {"batch": [...]}
+    {"quelle": "db", "db": pfad, "jahr": "2025", "typen": [...],
+     "stats": {mitarbeiter_id: {...}}, "nurMitEintraegen": false}
+Ein "erstelltAm" der Dict-Formen gilt fuer alle Dateien des Laufs.
+
+Ausgabe: ein Ordner mit einer Datei pro Mitarbeiter und manifest.json
+(Laufzeit pro Datei, Gesamtzeit, Anzahl Prozesse).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from teamflow_export_db import lade_jahres_daten, TYPEN
+from teamflow_export_fortschritt import KEIN_FORTSCHRITT
+
+
+MANIFEST = "manifest.json"
+
+
+def batch_jobs(payload):
+    """Normalisiert die drei Eingabeformen zu einer Liste von Jahres-Auftraegen"""
+    if isinstance(payload, list):
+        return payload
+    if payload.get("quelle") == "db":
+        jobs = lade_jahres_daten(
+            payload["db"],
+            payload["jahr"],
+            payload.get("typen") or TYPEN,
+            payload.get("stats"),
+            payload.get("nurMitEintraegen", False),
+        )
+    else:
+        jobs = payload.get("batch", [])
+    if payload.get("erstelltAm"):
+        # Neue Dicts – die Auftraege des Aufrufers bleiben, wie sie waren
+        jobs = [{**job, "erstelltAm": job.get("erstelltAm") or payload["erstelltAm"]} for job in jobs]
+    return jobs
+
+
+def dateiname(job, endung, vergeben):
+    """Jahresuebersicht_<Name>_<Jahr><endung> – Name bereinigt wie in main.js, eindeutig im Ordner"""
+    name = re.sub(r"[^a-zA-Z0-9]", "_", (job.get("employee") or {}).get("name") or "Mitarbeiter")
+    basis = f"Jahresuebersicht_{name}_{job.get('jahr', '')}"
+    kandidat, n = basis, 2
+    while kandidat in vergeben:
+        kandidat, n = f"{basis}_{n}", n + 1
+    vergeben.add(kandidat)
+    return kandidat + endung
+
+
+def _init_prozess():
+    # Statusmeldungen der Exporter nicht auf stdout – das kann das
+    # Worker-Protokoll sein (siehe export_worker.py)
+    sys.stdout = sys.stderr
+
+
+def _rendere(create, job, pfad):
+    start = time.perf_counter()
+    try:
+        create(job, pfad)
+    except Exception as e:
+        return round((time.perf_counter() - start) * 1000, 1), f"{type(e).__name__}: {e}"
+    return round((time.perf_counter() - start) * 1000, 1), None
+
+
+def fuehre_batch_aus(create, payload, ausgabe_ordner, endung, workers=None, fortschritt=KEIN_FORTSCHRITT):
+    """
+    Rendert alle Auftraege mit create(job, pfad) nach ausgabe_ordner und
+    schreibt manifest.json. workers=None: so viele Prozesse wie CPU-Kerne,
+    workers=1: ohne Prozesspool im aktuellen Prozess. Fertige Dateien gehen
+    als Phase "dateien" an fortschritt.
+    Gibt das Manifest zurueck.
+    """
+    jobs = batch_jobs(payload)
+    if not jobs:
+        raise ValueError("Keine Mitarbeiter fuer den Batch-Export gefunden")
+
+    os.makedirs(ausgabe_ordner, exist_ok=True)
+    vergeben = set()
+    pfade = [os.path.join(ausgabe_ordner, dateiname(job, endung, vergeben)) for job in jobs]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+
+    start = time.perf_counter()
+    zaehler = fortschritt.zaehler("dateien", len(jobs), schritt=1)
+    ergebnisse = []
+    if workers == 1:
+        for job, pfad in zip(jobs, pfade):
+            ergebnisse.append(_rendere(create, job, pfad))
+            zaehler.weiter()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_prozess) as pool:
+            for ergebnis in pool.map(_rendere, [create] * len(jobs), jobs, pfade):
+                ergebnisse.append(ergebnis)
+                zaehler.weiter()
+    zaehler.fertig()
+    gesamt_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    dateien = []
+    for job, pfad, (ms, fehler) in zip(jobs, pfade, ergebnisse):
+        eintrag = {
+            "datei":       os.path.basename(pfad),
+            "mitarbeiter": (job.get("employee") or {}).get("name"),
+            "ok":          fehler is None,
+            "ms":          ms,
+        }
+        if fehler:
+            eintrag["error"] = fehler
+        dateien.append(eintrag)
+
+    manifest = {
+        "format":     endung.lstrip("."),
+        "anzahl":     len(dateien),
+        "fehler":     sum(1 for d in dateien if not d["ok"]),
+        "workers":    workers,
+        "gesamt_ms":  gesamt_ms,
+        "summe_ms":   round(sum(d["ms"] for d in dateien), 1),
+        "dateien":    dateien,
+    }
+    with open(os.path.join(ausgabe_ordner, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    sys.stdout.buffer.write(
+        f"Batch erstellt: {manifest['anzahl'] - manifest['fehler']}/{manifest['anzahl']} Dateien "
+        f"in {gesamt_ms / 1000:.1f} s ({workers} Prozesse): {ausgabe_ordner}\n".encode("utf-8")
+    )
+    if manifest["fehler"]:
+        raise RuntimeError(f"{manifest['fehler']} Datei(en) fehlgeschlagen, siehe {MANIFEST}")
+    return manifest
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def add_batch_argumente(parser):
+    parser.add_argument("--batch", action="store_true",
+                        help="Alle Mitarbeiter rendern; output ist dann ein Ordner (mit manifest.json)")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="Anzahl Prozesse im Batch-Modus (Standard: CPU-Kerne)")
+
+
+def pruefe_batch_argumente(parser, args):
+    # --sammelmappe (nur Jahres-Excel): alle Mitarbeiter wie --batch, aber in eine Datei
+    sammelmappe = getattr(args, "sammelmappe", False)
+    if args.batch and sammelmappe:
+        parser.error("--batch und --sammelmappe schliessen sich aus")
+    if args.batch and args.cache:
+        parser.error("--cache nicht zusammen mit --batch")
+    if args.batch and args.output == "-":
+        parser.error("--batch schreibt einen Ordner, nicht nach stdout")
+    if args.db:
+        if not (args.batch or sammelmappe):
+            parser.error("--db nur zusammen mit --batch oder --sammelmappe")
+        if args.input_file:
+            parser.error("input.json und --db schliessen sich aus")
+        if not args.jahr:
+            parser.error("--db benoetigt --jahr")
+    elif not args.input_file:
+        parser.error("input.json oder --db angeben")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Binaeres Spaltenformat (.tfex) als Alternative zur JSON-Payload des
+Zeitraum-Exports (Excel/PDF)
+Bei mehrjaehrigen Zeitraeumen ist die JSON gross (jeder Eintrag wiederholt
+alle Schluessel und ISO-Daten) und json.load samt object_hook bestimmt den
+Start von export_to_excel/export_to_pdf. Hier liegt jede Eigenschaft als
+eigene Spalte fester Breite vor, alle Texte genau einmal in einer Texttabelle.
+
+lade_json (teamflow_export_modell) erkennt das Format an den ersten vier
+Bytes; die Exporter nehmen also input.tfex statt input.json ohne weitere
+Option, auch ueber stdin ("-"). Umwandeln:
+
+    teamflow_export binaer <input.json> <output.tfex>
+
+Format, Version 1 – little-endian, jeder Abschnitt beginnt auf einer durch
+8 teilbaren Position (f64-Spalten lassen sich so direkt abbilden):
+
+    Kopf, 28 Bytes (_KOPF, "<4sHHIIIIi"):
+        magic "TFEX", version (u16), reserviert (u16, 0),
+        M Mitarbeiter (u32), N Eintraege (u32), S Texte (u32), T Typen (u32),
+        meta (i32, Textverweis)
+    Abschnitte in dieser Reihenfolge:
+        text_offsets  u32[S+1]   Byte-Position jedes Texts in text_daten
+        text_daten    u8[...]    utf-8, Texte hintereinander
+        typen         i32[T]     Typ-Code -> Textverweis auf den Typnamen
+        ma_rest       i32[M]     JSON der uebrigen Mitarbeiter-Felder (id, ...)
+        ma_name       i32[M]
+        ma_abteilung  i32[M]
+        ma_summen     f64[M*4]   urlaub_tage, krankheit_tage, schulung_tage,
+                                 ueberstunden_abbau je Mitarbeiter
+        ma_start      u32[M+1]   erster Eintrag je Mitarbeiter (+ Ende)
+        e_typ         u8[N]      Index in typen
+        e_von, e_bis  i32[N]     Datum
+        e_wert        f64[N]
+        e_titel       i32[N]
+        e_notiz       i32[N]
+
+    Textverweis: Index in die Texttabelle, -1 = None.
+    Datum: >= 0 Tagesnummer (date.toordinal()), -1 = None, <= -2 Verweis
+    -(wert + 2) auf einen Text, der kein reines JJJJ-MM-TT-Datum ist.
+    meta: JSON der Payload ohne exportData.mitarbeiter (vonDatum, bisDatum,
+    erstelltAm, ...), damit nichts verloren geht.
+
+BinaerDatei liest die Spalten ohne Kopie als memoryview (aus einem mmap oder
+aus Bytes von stdin) – ohne ein Objekt pro Zeile. Erst payload() baut daraus
+die Eintrag-Listen, die die Renderer brauchen: spaltenweise per map() statt
+einem json-dict pro Eintrag, jedes Datum und jeder Text nur einmal dekodiert.
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from datetime import date
+
+from teamflow_export_modell import Eintrag, TYP_NAMEN, typ_code, text, eintraege as als_eintraege, lade_json
+from teamflow_export_datum import iso_datum
+
+
+MAGIC   = b"TFEX"
+VERSION = 1
+
+_KOPF = struct.Struct("<4sHHIIIIi")
+
+SUMMEN_FELDER = ("urlaub_tage", "krankheit_tage", "schulung_tage", "ueberstunden_abbau")
+
+# memoryview.cast nimmt die native Byte-Reihenfolge
+_LITTLE = sys.byteorder == "little"
+
+
+def _ausgerichtet(pos):
+    return (pos + 7) & ~7
+
+
+# ── Lesen ────────────────────────────────────────────────────────────────────
+class BinaerDatei:
+    """
+    Spalten einer .tfex-Datei als memoryview ueber puffer (bytes oder mmap).
+    freigeben() vor dem Schliessen eines mmap aufrufen.
+    """
+
+    def __init__(self, puffer):
+        self._puffer = memoryview(puffer)
+        magic, version, _, m, n, s, t, self.meta_ref = _KOPF.unpack_from(self._puffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Keine TFEX-Datei")
+        if version != VERSION:
+            raise ValueError(f"TFEX-Version {version} wird nicht unterstuetzt (erwartet {VERSION})")
+        self.anzahl_mitarbeiter = m
+        self.anzahl_eintraege   = n
+        self._pos = _ausgerichtet(_KOPF.size)
+
+        self.text_offsets = self._spalte("I", s + 1)
+        self.text_daten   = self._spalte("B", self.text_offsets[s] if s else 0)
+        self.typen        = self._spalte("i", t)
+        self.ma_rest      = self._spalte("i", m)
+        self.ma_name      = self._spalte("i", m)
+        self.ma_abteilung = self._spalte("i", m)
+        self.ma_summen    = self._spalte("d", m * len(SUMMEN_FELDER))
+        self.ma_start     = self._spalte("I", m + 1)
+        self.e_typ        = self._spalte("B", n)
+        self.e_von        = self._spalte("i", n)
+        self.e_bis        = self._spalte("i", n)
+        self.e_wert       = self._spalte("d", n)
+        self.e_titel      = self._spalte("i", n)
+        self.e_notiz      = self._spalte("i", n)
+        if self._pos > len(self._puffer):
+            raise ValueError("TFEX-Datei ist unvollstaendig")
+
+    def _spalte(self, code, anzahl):
+        start = self._pos
+        breite = struct.calcsize(code)
+        ende = start + anzahl * breite
+        self._pos = _ausgerichtet(ende)
+        roh = self._puffer[start:ende]
+        if len(roh) != anzahl * breite:
+            raise ValueError("TFEX-Datei ist unvollstaendig")
+        if _LITTLE or breite == 1:
+            return roh.cast(code)
+        # Big-endian: einmal kopieren und umdrehen
+        from array import array
+        spalte = array(code, roh)
+        spalte.byteswap()
+        return spalte
+
+    def texte(self):
+        """Alle Texte der Tabelle, dazu None am Ende – Verweis -1 trifft so None"""
+        daten = bytes(self.text_daten)
+        offsets = self.text_offsets.tolist()
+        tabelle = [text(daten[a:b].decode("utf-8")) for a, b in zip(offsets, offsets[1:])]
+        tabelle.append(None)
+        return tabelle
+
+    def payload(self):
+        """Dieselbe Struktur wie lade_json fuer die JSON-Payload, Eintraege als Eintrag"""
+        texte = self.texte()
+        meta = json.loads(texte[self.meta_ref]) if self.meta_ref >= 0 else {}
+        typ_codes = [typ_code(texte[r]) for r in self.typen.tolist()]
+
+        von, bis = self.e_von.tolist(), self.e_bis.tolist()
+        daten = {}
+        for d in set(von).union(bis):
+            daten[d] = text(iso_datum(d)) if d >= 0 else texte[-d - 2] if d <= -2 else None
+        liste = list(map(
+            Eintrag,
+            map(typ_codes.__getitem__, self.e_typ.tolist()),
+            map(daten.__getitem__, von),
+            map(daten.__getitem__, bis),
+            self.e_wert.tolist(),
+            map(texte.__getitem__, self.e_titel.tolist()),
+            map(texte.__getitem__, self.e_notiz.tolist()),
+        ))
+
+        summen = self.ma_summen.tolist()
+        start = self.ma_start.tolist()
+        mitarbeiter = []
+        for i, (rest, name, abt) in enumerate(zip(self.ma_rest.tolist(), self.ma_name.tolist(),
+                                                 self.ma_abteilung.tolist())):
+            ma = json.loads(texte[rest]) if rest >= 0 else {}
+            ma["name"] = texte[name]
+            ma["abteilung"] = texte[abt]
+            basis = i * len(SUMMEN_FELDER)
+            mitarbeiter.append({
+                "mitarbeiter":     ma,
+                "zusammenfassung": dict(zip(SUMMEN_FELDER, summen[basis:basis + len(SUMMEN_FELDER)])),
+                "eintraege":       liste[start[i]:start[i + 1]],
+            })
+
+        meta.setdefault("exportData", {})["mitarbeiter"] = mitarbeiter
+        return meta
+
+    def freigeben(self):
+        for wert in list(vars(self).values()):
+            if isinstance(wert, memoryview):
+                wert.release()
+        self._puffer.release()
+
+
+def lade_binaer(quelle):
+    """Payload aus einer .tfex-Datei (Pfad, per mmap) oder aus Bytes (stdin)"""
+    if isinstance(quelle, (bytes, bytearray)):
+        datei = BinaerDatei(quelle)
+        try:
+            return datei.payload()
+        finally:
+            datei.freigeben()
+
+    with open(quelle, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as puffer:
+        datei = BinaerDatei(puffer)
+        try:
+            return datei.payload()
+        finally:
+            datei.freigeben()
+
+
+# ── Schreiben ────────────────────────────────────────────────────────────────
+class _Texte:
+    def __init__(self):
+        self.index = {}
+
+    def ref(self, wert):
+        if wert is None:
+            return -1
+        wert = str(wert)
+        i = self.index.get(wert)
+        if i is None:
+            i = self.index[wert] = len(self.index)
+        return i
+
+
+def _datum(texte, wert):
+    if wert is None:
+        return -1
+    if type(wert) is str and len(wert) == 10:
+        try:
+            d = date.fromisoformat(wert)
+        except ValueError:
+            pass
+        else:
+            if d.isoformat() == wert:
+                return d.toordinal()
+    return -texte.ref(wert) - 2
+
+
+def _summe(wert):
+    if wert is None:
+        return 0.0
+    try:
+        return float(wert)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def schreibe_binaer(payload, ziel):
+    """Zeitraum-Payload (wie von lade_json) als .tfex nach ziel (Pfad oder Datei-Objekt)"""
+    from array import array
+
+    export_data = payload.get("exportData", payload)
+    mitarbeiter_liste = export_data.get("mitarbeiter", [])
+
+    texte = _Texte()
+    meta = {k: v for k, v in payload.items() if k not in ("exportData", "mitarbeiter")}
+    if export_data is not payload:
+        meta["exportData"] = {k: v for k, v in export_data.items() if k != "mitarbeiter"}
+    meta_ref = texte.ref(json.dumps(meta, ensure_ascii=False))
+
+    typen = []
+    typ_index = {}
+    spalten = {name: array(code) for name, code in (
+        ("ma_rest", "i"), ("ma_name", "i"), ("ma_abteilung", "i"), ("ma_summen", "d"), ("ma_start", "I"),
+        ("e_typ", "B"), ("e_von", "i"), ("e_bis", "i"), ("e_wert", "d"), ("e_titel", "i"), ("e_notiz", "i"),
+    )}
+
+    for eintrag in mitarbeiter_liste:
+        ma  = eintrag.get("mitarbeiter", {})
+        zus = eintrag.get("zusammenfassung", {})
+        rest = {k: v for k, v in ma.items() if k not in ("name", "abteilung")}
+        spalten["ma_rest"].append(texte.ref(json.dumps(rest, ensure_ascii=False)) if rest else -1)
+        spalten["ma_name"].append(texte.ref(ma.get("name", "")))
+        spalten["ma_abteilung"].append(texte.ref(ma.get("abteilung", "")))
+        spalten["ma_summen"].extend(_summe(zus.get(feld, 0)) for feld in SUMMEN_FELDER)
+        spalten["ma_start"].append(len(spalten["e_typ"]))
+
+        for e in als_eintraege(eintrag.get("eintraege")):
+            t = typ_index.get(e.typ)
+            if t is None:
+                if len(typen) == 256:
+                    raise ValueError("Mehr als 256 Abwesenheitstypen")
+                t = typ_index[e.typ] = len(typen)
+                typen.append(texte.ref(TYP_NAMEN[e.typ]))
+            spalten["e_typ"].append(t)
+            spalten["e_von"].append(_datum(texte, e.von))
+            spalten["e_bis"].append(_datum(texte, e.bis))
+            spalten["e_wert"].append(e.wert)
+            spalten["e_titel"].append(texte.ref(e.titel))
+            spalten["e_notiz"].append(texte.ref(e.notiz))
+    spalten["ma_start"].append(len(spalten["e_typ"]))
+
+    daten = [t.encode("utf-8", "surrogatepass") for t in texte.index]
+    offsets = array("I", [0])
+    for d in daten:
+        offsets.append(offsets[-1] + len(d))
+
+    abschnitte = [offsets, b"".join(daten), array("i", typen)]
+    abschnitte += [spalten[name] for name in (
+        "ma_rest", "ma_name", "ma_abteilung", "ma_summen", "ma_start",
+        "e_typ", "e_von", "e_bis", "e_wert", "e_titel", "e_notiz",
+    )]
+
+    def schreibe(f):
+        pos = f.write(_KOPF.pack(MAGIC, VERSION, 0, len(mitarbeiter_liste), len(spalten["e_typ"]),
+                                 len(daten), len(typen), meta_ref))
+        for abschnitt in abschnitte:
+            pos += f.write(b"\0" * (_ausgerichtet(pos) - pos))
+            if isinstance(abschnitt, array) and not _LITTLE:
+                abschnitt = array(abschnitt.typecode, abschnitt)
+                abschnitt.byteswap()
+            pos += f.write(abschnitt)
+
+    if isinstance(ziel, str):
+        with open(ziel, "wb") as f:
+            schreibe(f)
+    else:
+        schreibe(ziel)
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="JSON-Payload des Zeitraum-Exports in das Binaerformat (.tfex) umwandeln")
+    parser.add_argument("input_file", help="Export-Daten als JSON, - fuer stdin")
+    parser.add_argument("output_file", help="Ziel-Datei (.tfex)")
+    args = parser.parse_args()
+
+    try:
+        payload = lade_json(args.input_file)
+    except Exception as e:
+        sys.stderr.buffer.write(f"FEHLER beim Lesen der JSON: {e}\n".encode("utf-8"))
+        sys.exit(1)
+
+    try:
+        schreibe_binaer(payload, args.output_file)
+    except Exception as e:
+        sys.stderr.buffer.write(f"FEHLER beim Schreiben der TFEX-Datei: {e}\n".encode("utf-8"))
+        sys.exit(1)
+    sys.stdout.buffer.write(f"TFEX-Datei erstellt: {args.output_file}\n".encode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
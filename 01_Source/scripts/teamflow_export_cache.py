@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Export-Cache (--cache ORDNER)
+Wer denselben Zeitraum mehrmals exportiert, bekommt ab dem zweiten Mal die
+fertige Datei aus dem Cache statt eines neuen Renderlaufs.
+
+Schluessel: sha256 ueber
+    - Exporter (Name der create_*-Funktion) und Dateiendung
+    - skript_version(): Inhalt der Export-Skripte bzw. die gepackte .exe,
+      dazu die Versionen von reportlab/openpyxl
+    - die normalisierte Payload (JSON mit sortierten Schluesseln, Eintraege
+      ueber Eintrag.als_dict), von "erstelltAm" nur der Tag – bei einer
+      Liste von Auftraegen (--sammelmappe nach batch_jobs()) in jedem Auftrag
+
+Mit der Uhrzeit gaebe es nie einen Treffer. Die Dateien zeigen deshalb nur
+den Tag (teamflow_export_modell.erstellt_am); ein Treffer hat denselben Tag
+wie ein neuer Export. Fehlt "erstelltAm", zaehlt heute.
+
+Treffer werden in die Zieldatei kopiert, nicht hart verlinkt: die exportierte
+Datei wird oft direkt geoeffnet und gespeichert, bei einem Hardlink aenderte
+das den Cache-Eintrag mit. Jeder Treffer setzt die mtime neu; nach jedem neuen
+Eintrag werden die am laengsten nicht benutzten Dateien geloescht, bis der
+Cache hoechstens max_mb gross ist (LRU nach Gesamtgroesse).
+
+Fehler im Cache (Rechte, volle Platte) brechen keinen Export ab – sie werden
+als WARNUNG auf stderr gemeldet und der Export laeuft ohne Cache.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from functools import lru_cache
+
+from teamflow_export_modell import Eintrag, erstellt_am
+
+
+MAX_MB = 256
+
+_HIER = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=1)
+def skript_version():
+    """Aendert sich mit jedem Build bzw. jeder Aenderung an scripts/*.py"""
+    h = hashlib.sha256()
+    if getattr(sys, "frozen", False):
+        st = os.stat(sys.executable)
+        h.update(f"exe:{st.st_size}:{st.st_mtime_ns}".encode())
+    else:
+        for name in sorted(os.listdir(_HIER)):
+            if name.endswith(".py"):
+                h.update(name.encode())
+                with open(os.path.join(_HIER, name), "rb") as f:
+                    h.update(f.read())
+    for modul, attr in (("reportlab", "Version"), ("openpyxl", "__version__")):
+        if modul in sys.modules:
+            h.update(f"{modul}:{getattr(sys.modules[modul], attr, '?')}".encode())
+    return h.hexdigest()
+
+
+def _json_default(obj):
+    if type(obj) is Eintrag:
+        return obj.als_dict()
+    raise TypeError(f"{type(obj).__name__} ist nicht JSON-serialisierbar")
+
+
+def _fuer_schluessel(payload):
+    if isinstance(payload, list):
+        return [_fuer_schluessel(job) for job in payload]
+    if isinstance(payload, dict):
+        return {**payload, "erstelltAm": f"{erstellt_am(payload):%Y-%m-%d}"}
+    return payload
+
+
+def cache_schluessel(create, endung, payload):
+    payload = _fuer_schluessel(payload)
+    daten = json.dumps(payload, sort_keys=True, separators=(",", ":"),
+                       ensure_ascii=False, default=_json_default)
+    h = hashlib.sha256()
+    h.update(f"{create.__name__}\0{endung}\0{skript_version()}\0".encode())
+    h.update(daten.encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+class ExportCache:
+    def __init__(self, ordner, max_mb=MAX_MB):
+        self.ordner    = ordner
+        self.max_bytes = int(max_mb * 2**20)
+
+    def _pfad(self, schluessel, endung):
+        return os.path.join(self.ordner, schluessel + endung)
+
+    def hole(self, schluessel, endung, ziel):
+        """Kopiert einen vorhandenen Eintrag nach ziel (Pfad oder Datei-Objekt); False = nicht im Cache"""
+        quelle = self._pfad(schluessel, endung)
+        try:
+            if _ist_pfad(ziel):
+                shutil.copyfile(quelle, ziel)
+            else:
+                with open(quelle, "rb") as f:
+                    shutil.copyfileobj(f, ziel)
+        except FileNotFoundError:
+            return False
+        os.utime(quelle)
+        return True
+
+    def lege_ab(self, schluessel, endung, quelle):
+        os.makedirs(self.ordner, exist_ok=True)
+        ziel = self._pfad(schluessel, endung)
+        # Erst vollstaendig kopieren, dann umbenennen – ein abgebrochener
+        # Export hinterlaesst keinen halben Eintrag
+        temp = f"{ziel}.{os.getpid()}.tmp"
+        if _ist_pfad(quelle):
+            shutil.copyfile(quelle, temp)
+        else:
+            quelle.seek(0)
+            with open(temp, "wb") as f:
+                shutil.copyfileobj(quelle, f)
+        os.replace(temp, ziel)
+        self.raeume_auf()
+
+    def raeume_auf(self):
+        """Loescht die am laengsten nicht benutzten Eintraege bis max_bytes"""
+        eintraege = []
+        with os.scandir(self.ordner) as it:
+            for e in it:
+                if e.is_file() and not e.name.endswith(".tmp"):
+                    st = e.stat()
+                    eintraege.append((st.st_mtime, st.st_size, e.path))
+        gesamt = sum(groesse for _, groesse, _ in eintraege)
+        for _, groesse, pfad in sorted(eintraege):
+            if gesamt <= self.max_bytes:
+                break
+            try:
+                os.remove(pfad)
+            except OSError:
+                continue
+            gesamt -= groesse
+
+
+def _ist_pfad(ziel):
+    return isinstance(ziel, (str, os.PathLike))
+
+
+def _endung(ziel):
+    # Datei-Objekte (StdoutPuffer bei "-") bringen ihre Endung selbst mit
+    if _ist_pfad(ziel):
+        return os.path.splitext(ziel)[1].lower()
+    return getattr(ziel, "endung", "")
+
+
+def _warnung(text):
+    sys.stderr.buffer.write(f"WARNUNG Export-Cache: {text}\n".encode("utf-8"))
+
+
+def exportiere(cache, create, payload, output_path, **kwargs):
+    """
+    create(payload, output_path, **kwargs) – ausser die Datei liegt schon im
+    Cache. output_path darf auch ein Datei-Objekt sein (teamflow_export_stdio).
+    Gibt True zurueck, wenn sie aus dem Cache kam.
+    """
+    if cache is None:
+        create(payload, output_path, **kwargs)
+        return False
+
+    endung = _endung(output_path)
+    schluessel = cache_schluessel(create, endung, payload)
+    try:
+        if cache.hole(schluessel, endung, output_path):
+            sys.stdout.buffer.write(f"Aus dem Export-Cache: {output_path}\n".encode("utf-8"))
+            return True
+    except OSError as e:
+        _warnung(e)
+
+    create(payload, output_path, **kwargs)
+    try:
+        cache.lege_ab(schluessel, endung, output_path)
+    except OSError as e:
+        _warnung(e)
+    return False
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def add_cache_argumente(parser):
+    parser.add_argument("--cache", metavar="ORDNER",
+                        help="Export-Cache: gleiche Eingabe -> fertige Datei aus ORDNER statt neu rendern")
+    parser.add_argument("--cache-max-mb", type=float, default=MAX_MB, metavar="MB",
+                        help=f"Groesse des Export-Caches, aelteste Eintraege fliegen zuerst (Standard: {MAX_MB})")
+
+
+def cache_aus_argumenten(args):
+    return ExportCache(args.cache, args.cache_max_mb) if args.cache else None
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer Auswertungs-Kern fuer export_to_excel.py und export_to_pdf.py
+Ein einziger Durchlauf ueber die Mitarbeiterliste liefert alles, was
+Zusammenfassung und Details brauchen: die Zahlen pro Mitarbeiter,
+Zwischensummen pro Abteilung und die GESAMT-Zeile. Die Zahlen liegen als
+kompakte array-Spalten vor (4 Summenfelder + Anzahl Eintraege), statt dass
+jeder Renderer die Payload fuer jede Summe noch einmal durchlaeuft.
+"""
+
+from array import array
+
+from teamflow_export_modell import eintraege as als_eintraege, text
+
+
+SUMMEN_FELDER = ("urlaub_tage", "krankheit_tage", "schulung_tage", "ueberstunden_abbau")
+
+# Spalten je Zeile in den Summen-Arrays: die vier Felder + Anzahl Eintraege
+SPALTEN = len(SUMMEN_FELDER) + 1
+
+
+def fmt_zahl(v):
+    if v is None:
+        return 0
+    try:
+        f = float(v)
+        return int(f) if f == int(f) else round(f, 2)
+    except Exception:
+        return 0
+
+
+def zahl(f):
+    """Wert aus einem Summen-Array fuer die Ausgabe: ganze Zahlen als int"""
+    return int(f) if f.is_integer() else f
+
+
+class Auswertung:
+    """
+    Ergebnis von auswerten().
+
+    mitarbeiter       – (name, abteilung, eintraege) in Payload-Reihenfolge,
+                        eintraege als Liste von teamflow_export_modell.Eintrag
+    werte             – array('d'), SPALTEN Werte pro Mitarbeiter
+    abteilungen       – (name, erster, ende) je Abteilungsblock (Index in mitarbeiter)
+    abteilungs_werte  – array('d'), SPALTEN Zwischensummen pro Abteilungsblock
+    gesamt            – array('d'), SPALTEN Werte fuer die GESAMT-Zeile
+    """
+
+    __slots__ = ("mitarbeiter", "werte", "abteilungen", "abteilungs_werte", "gesamt")
+
+    def __init__(self):
+        self.mitarbeiter      = []
+        self.werte            = array("d")
+        self.abteilungen      = []
+        self.abteilungs_werte = array("d")
+        self.gesamt           = array("d", [0.0] * SPALTEN)
+
+    def __len__(self):
+        return len(self.mitarbeiter)
+
+    @property
+    def anzahl_eintraege(self):
+        return int(self.gesamt[SPALTEN - 1])
+
+    def zahlen(self, i):
+        """Urlaub, Krank, Schulung, UE-Abbau und Anzahl Eintraege von Mitarbeiter i"""
+        return _zeile(self.werte, i)
+
+    def abteilungs_zahlen(self, k):
+        return _zeile(self.abteilungs_werte, k)
+
+    def gesamt_zahlen(self):
+        return _zeile(self.gesamt, 0)
+
+    def zusammenfassung(self):
+        """("abteilung", name) vor jedem Abteilungsblock, sonst ("mitarbeiter", i)"""
+        for k, (name, erster, ende) in enumerate(self.abteilungen):
+            # Wie bisher: ein erster Block ohne Abteilung (None) bekommt keine Trennzeile
+            if k or name is not None:
+                yield "abteilung", name
+            for i in range(erster, ende):
+                yield "mitarbeiter", i
+
+    def mit_eintraegen(self):
+        """
+        (neue_abteilung, i, abteilung) fuer alle Mitarbeiter i mit Eintraegen.
+        Die Detail-Tabelle trennt Abteilungen nur zwischen Mitarbeitern, die
+        dort auch Zeilen haben.
+        """
+        aktuelle_abteilung = None
+        for i, (_, abt, eintraege) in enumerate(self.mitarbeiter):
+            if not eintraege:
+                continue
+            neu = abt != aktuelle_abteilung
+            aktuelle_abteilung = abt
+            yield neu, i, abt
+
+
+def _zeile(werte, i):
+    start = i * SPALTEN
+    zeile = [zahl(w) for w in werte[start:start + SPALTEN - 1]]
+    zeile.append(int(werte[start + SPALTEN - 1]))
+    return zeile
+
+
+def auswerten(mitarbeiter_liste):
+    """Ein Durchlauf: Zahlen pro Mitarbeiter, Abteilungs-Zwischensummen und GESAMT"""
+    ergebnis = Auswertung()
+    werte    = ergebnis.werte
+    gesamt   = ergebnis.gesamt
+    abt_werte = ergebnis.abteilungs_werte
+
+    aktuelle_abteilung = None
+    for i, eintrag in enumerate(mitarbeiter_liste):
+        ma        = eintrag.get("mitarbeiter", {})
+        zus       = eintrag.get("zusammenfassung", {})
+        eintraege = als_eintraege(eintrag.get("eintraege"))
+        abt       = text(ma.get("abteilung", ""))
+
+        if i == 0 or abt != aktuelle_abteilung:
+            aktuelle_abteilung = abt
+            if ergebnis.abteilungen:
+                name, erster, _ = ergebnis.abteilungen[-1]
+                ergebnis.abteilungen[-1] = (name, erster, i)
+            ergebnis.abteilungen.append((abt, i, i))
+            abt_werte.extend([0.0] * SPALTEN)
+
+        ergebnis.mitarbeiter.append((text(ma.get("name", "")), abt, eintraege))
+
+        zeile = [fmt_zahl(zus.get(feld, 0)) for feld in SUMMEN_FELDER]
+        zeile.append(len(eintraege))
+        werte.extend(zeile)
+
+        basis = len(abt_werte) - SPALTEN
+        for s, w in enumerate(zeile):
+            abt_werte[basis + s] += w
+            gesamt[s] += w
+
+    if ergebnis.abteilungen:
+        name, erster, _ = ergebnis.abteilungen[-1]
+        ergebnis.abteilungen[-1] = (name, erster, len(ergebnis.mitarbeiter))
+
+    return ergebnis
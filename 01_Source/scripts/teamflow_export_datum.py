@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Datumsangaben der Exporte
+Alle Exporte zeigen Daten als TT.MM.JJJJ. Bisher hatte jedes Script sein
+eigenes fmt_datum, das fuer jedes Von/Bis jedes Eintrags strptime und
+strftime aufrief – obwohl in einem Export nur wenige hundert verschiedene
+Daten vorkommen.
+
+    tagesnummer()  "JJJJ-MM-TT" (auch mit Uhrzeit dahinter) -> date.toordinal(),
+                   None fuer Leeres und Unlesbares
+    tage()         Anzahl Kalendertage von..bis einschliesslich
+    iso_datum()    Tagesnummer -> "JJJJ-MM-TT"
+    anzeige()      Tagesnummer -> "TT.MM.JJJJ"
+    fmt_datum()    Eingabe-Datum -> "TT.MM.JJJJ" wie bisher: leer -> leer
+                   ("" bzw. "–" je nach Script), Unlesbares unveraendert
+
+fmt_datum merkt sich jedes Ergebnis pro Eingabe-Text; die Texte sind ohnehin
+interniert (teamflow_export_modell.text). Die Anzeige pro Tagesnummer kommt
+aus einer Tabelle, die fuer das Jahr jedes neuen Datums (+/- ein Jahr)
+vorberechnet und dann nur noch erweitert wird – nach wenigen Daten deckt
+sie den ganzen Export-Zeitraum ab.
+"""
+
+from datetime import date, datetime
+
+
+# Ergebnis je Eingabe-Text; wird geleert, wenn ein langlebiger Prozess
+# (export_worker) sehr viele verschiedene Texte gesehen hat
+_FORMATIERT = {}
+_FORMATIERT_MAX = 100000
+
+# Anzeige je Tagesnummer: _TABELLE[tag - _TABELLE_AB], hoechstens ueber 20 Jahre
+_TABELLE = []
+_TABELLE_AB = 0
+_TABELLE_MAX_TAGE = 20 * 366
+
+
+def tagesnummer(wert):
+    """
+    Tagesnummer der ersten zehn Zeichen (JJJJ-MM-TT) oder None. Nimmt an,
+    was auch datetime.strptime(wert[:10], "%Y-%m-%d") annimmt.
+    """
+    if not wert or not isinstance(wert, str):
+        return None
+    s = wert[:10]
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and s.isascii() \
+            and s[:4].isdigit() and s[5:7].isdigit() and s[8:].isdigit():
+        try:
+            return date(int(s[:4]), int(s[5:7]), int(s[8:])).toordinal()
+        except ValueError:
+            return None
+    # Seltene Schreibweisen wie 2025-1-5 – so nachsichtig wie strptime
+    try:
+        return datetime.strptime(s, "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def tage(von, bis):
+    """Kalendertage von..bis einschliesslich; None, wenn eines nicht lesbar ist"""
+    a, b = tagesnummer(von), tagesnummer(bis)
+    if a is None or b is None:
+        return None
+    return b - a + 1
+
+
+def iso_datum(tag):
+    return date.fromordinal(tag).isoformat()
+
+
+def _tabelle(ab, bis):
+    global _TABELLE, _TABELLE_AB
+    _TABELLE_AB = ab
+    _TABELLE = [d.strftime("%d.%m.%Y") for d in map(date.fromordinal, range(ab, bis + 1))]
+
+
+def anzeige(tag):
+    """Tagesnummer -> "TT.MM.JJJJ" """
+    i = tag - _TABELLE_AB
+    if 0 <= i < len(_TABELLE):
+        return _TABELLE[i]
+    # Tabelle um das Jahr (+/- eins) erweitern – Ausreisser wie 0001-01-01
+    # bekommen keine Tabelle ueber Jahrhunderte
+    jahr = date.fromordinal(tag).year
+    ab = date(max(1, jahr - 1), 1, 1).toordinal()
+    bis = date(min(9999, jahr + 1), 12, 31).toordinal()
+    if _TABELLE:
+        ab, bis = min(ab, _TABELLE_AB), max(bis, _TABELLE_AB + len(_TABELLE) - 1)
+    if bis - ab >= _TABELLE_MAX_TAGE:
+        return date.fromordinal(tag).strftime("%d.%m.%Y")
+    _tabelle(ab, bis)
+    return _TABELLE[tag - _TABELLE_AB]
+
+
+def fmt_datum(d, leer=""):
+    """JJJJ-MM-TT -> TT.MM.JJJJ; leer bei fehlendem Datum, Unlesbares unveraendert"""
+    if not d:
+        return leer
+    if not isinstance(d, str):
+        return d
+    ergebnis = _FORMATIERT.get(d)
+    if ergebnis is None:
+        tag = tagesnummer(d)
+        ergebnis = d if tag is None else anzeige(tag)
+        if len(_FORMATIERT) >= _FORMATIERT_MAX:
+            _FORMATIERT.clear()
+        _FORMATIERT[d] = ergebnis
+    return ergebnis
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+Direkte SQLite-Quelle fuer die Abwesenheits-Exporte (Excel/PDF)
+Liest die TeamFlow-Datenbank read-only und baut dieselbe Struktur, die
+export-dialog.js (_sammleExportDaten) bisher per IPC zusammengesetzt hat:
+
+    {"exportData": {"mitarbeiter": [{"mitarbeiter", "zusammenfassung", "eintraege"}, ...],
+                    "vonDatum", "bisDatum"},
+     "vonDatum", "bisDatum"}
+
+Statt bis zu 4 Abfragen pro Mitarbeiter gibt es eine Abfrage fuer die
+Mitarbeiter und eine pro Abwesenheitstyp fuer den ganzen Zeitraum.
+
+lade_jahres_daten() liefert auf die gleiche Weise die Auftraege fuer den
+Batch-Modus der Jahresuebersichten (teamflow_export_batch.py).
+Die Eintraege kommen dabei direkt als teamflow_export_modell.Eintrag heraus.
+"""
+
+import argparse
+import sqlite3
+import unicodedata
+from pathlib import Path
+
+from teamflow_export_modell import Eintrag, text
+from teamflow_export_datum import tagesnummer, tage, iso_datum
+
+
+TYPEN = ("urlaub", "krankheit", "schulung", "ueberstunden")
+
+# Nur aktive Mitarbeiter – wie DataManager.getAlleMitarbeiter()
+_MA_FILTER = "m.status = 'AKTIV' AND m.austrittsdatum IS NULL"
+
+_MITARBEITER_SQL = f"""
+    SELECT m.id, m.vorname, m.nachname, a.name AS abteilung_name
+    FROM mitarbeiter m
+    LEFT JOIN abteilungen a ON m.abteilung_id = a.id
+    WHERE {_MA_FILTER}
+"""
+
+# Gleiche Zeitraum-Bedingungen und Felder wie in export-dialog.js
+_TYP_SQL = {
+    "urlaub": f"""
+        SELECT t.mitarbeiter_id, 'urlaub' AS typ, t.von_datum, t.bis_datum, t.tage AS wert, t.notiz, NULL AS titel
+        FROM urlaub t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER}
+          AND ((t.von_datum BETWEEN :von AND :bis) OR (t.bis_datum BETWEEN :von AND :bis)
+               OR (t.von_datum <= :von AND t.bis_datum >= :bis))
+        ORDER BY t.mitarbeiter_id, t.von_datum
+    """,
+    "krankheit": f"""
+        SELECT t.mitarbeiter_id, 'krankheit' AS typ, t.von_datum, t.bis_datum, t.tage AS wert, t.notiz, NULL AS titel
+        FROM krankheit t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER}
+          AND ((t.von_datum BETWEEN :von AND :bis) OR (t.bis_datum BETWEEN :von AND :bis)
+               OR (t.von_datum <= :von AND t.bis_datum >= :bis))
+        ORDER BY t.mitarbeiter_id, t.von_datum
+    """,
+    "schulung": f"""
+        SELECT t.mitarbeiter_id, 'schulung' AS typ, t.datum AS von_datum, t.datum AS bis_datum,
+               t.dauer_tage AS wert, t.notiz, t.titel
+        FROM schulung t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND t.datum BETWEEN :von AND :bis
+        ORDER BY t.mitarbeiter_id, t.datum
+    """,
+    "ueberstunden": f"""
+        SELECT t.mitarbeiter_id, 'ueberstunden' AS typ, t.datum AS von_datum, t.datum AS bis_datum,
+               ABS(t.stunden) AS wert, t.notiz, NULL AS titel
+        FROM ueberstunden t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND t.datum BETWEEN :von AND :bis AND t.stunden < 0
+        ORDER BY t.mitarbeiter_id, t.datum
+    """,
+}
+
+_SUMMEN_FELD = {
+    "urlaub":       "urlaub_tage",
+    "krankheit":    "krankheit_tage",
+    "schulung":     "schulung_tage",
+    "ueberstunden": "ueberstunden_abbau",
+}
+
+
+def oeffne_readonly(db_pfad):
+    """Oeffnet die Datenbank read-only (funktioniert auch im WAL-Modus der laufenden App)"""
+    pfad = Path(db_pfad)
+    if not pfad.is_file():
+        raise FileNotFoundError(f"Datenbank nicht gefunden: {db_pfad}")
+    return sqlite3.connect(f"{pfad.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def _sortierschluessel(text):
+    """Naeherung an String.localeCompare: Umlaute wie Grundbuchstaben, ohne Gross/Klein"""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def lade_export_daten(db_pfad, von_datum, bis_datum, typen=TYPEN, nur_mit_eintraegen=True):
+    con = oeffne_readonly(db_pfad)
+    try:
+        con.row_factory = sqlite3.Row
+        mitarbeiter = {row["id"]: row for row in con.execute(_MITARBEITER_SQL)}
+        eintraege = {ma_id: [] for ma_id in mitarbeiter}
+
+        # Reihenfolge der Typen wie in export-dialog.js, innerhalb eines Typs nach Datum
+        params = {"von": von_datum, "bis": bis_datum}
+        for typ in TYPEN:
+            if typ not in typen:
+                continue
+            for row in con.execute(_TYP_SQL[typ], params):
+                eintraege[row["mitarbeiter_id"]].append(Eintrag.aus_zeile(row))
+    finally:
+        con.close()
+
+    ergebnis = []
+    for ma_id, ma in mitarbeiter.items():
+        liste = eintraege[ma_id]
+        if nur_mit_eintraegen and not liste:
+            continue
+
+        zusammenfassung = dict.fromkeys(_SUMMEN_FELD.values(), 0)
+        for e in liste:
+            zusammenfassung[_SUMMEN_FELD[e.typ_name]] += e.wert
+
+        ergebnis.append({
+            "mitarbeiter": {
+                "id":        ma_id,
+                "name":      f"{ma['vorname']} {ma['nachname']}",
+                "abteilung": text(ma["abteilung_name"]),
+            },
+            "zusammenfassung": zusammenfassung,
+            "eintraege": liste,
+        })
+
+    ergebnis.sort(key=lambda e: (
+        _sortierschluessel(e["mitarbeiter"]["abteilung"]),
+        _sortierschluessel(e["mitarbeiter"]["name"]),
+    ))
+
+    export_data = {"mitarbeiter": ergebnis, "vonDatum": von_datum, "bisDatum": bis_datum}
+    return {"exportData": export_data, "vonDatum": von_datum, "bisDatum": bis_datum}
+
+
+def payload_aus_db_auftrag(auftrag):
+    """
+    Baut den Export-Payload aus einem DB-Auftrag, wie main.js ihn schickt:
+    {"quelle": "db", "db": pfad, "vonDatum", "bisDatum", "typen": [...], "nurMitEintraegen", "erstelltAm"}
+    Andere Payloads werden unveraendert zurueckgegeben.
+    """
+    if auftrag.get("quelle") != "db":
+        return auftrag
+
+    payload = lade_export_daten(
+        auftrag["db"],
+        auftrag["vonDatum"],
+        auftrag["bisDatum"],
+        auftrag.get("typen") or TYPEN,
+        auftrag.get("nurMitEintraegen", True),
+    )
+    if not payload["exportData"]["mitarbeiter"]:
+        raise ValueError("Keine Daten für den gewählten Zeitraum gefunden")
+    if auftrag.get("erstelltAm"):
+        payload["erstelltAm"] = auftrag["erstelltAm"]
+    return payload
+
+
+# ── Jahresuebersicht (Batch) ─────────────────────────────────────────────────
+# Wie DetailDialog._ladeExportEintraege: Jahr ueber das Beginndatum,
+# Ueberstunden mit Vorzeichen (Aufbau und Abbau)
+_JAHR_SQL = {
+    "urlaub": f"""
+        SELECT t.mitarbeiter_id, 'urlaub' AS typ, t.von_datum, t.bis_datum, t.tage AS wert, t.notiz, NULL AS titel
+        FROM urlaub t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND strftime('%Y', t.von_datum) = :jahr
+        ORDER BY t.mitarbeiter_id, t.von_datum
+    """,
+    "krankheit": f"""
+        SELECT t.mitarbeiter_id, 'krankheit' AS typ, t.von_datum, t.bis_datum, t.tage AS wert, t.notiz, NULL AS titel
+        FROM krankheit t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND strftime('%Y', t.von_datum) = :jahr
+        ORDER BY t.mitarbeiter_id, t.von_datum
+    """,
+    "schulung": f"""
+        SELECT t.mitarbeiter_id, 'schulung' AS typ, t.datum AS von_datum, t.datum AS bis_datum,
+               t.dauer_tage AS wert, t.notiz, t.titel
+        FROM schulung t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND strftime('%Y', t.datum) = :jahr
+        ORDER BY t.mitarbeiter_id, t.datum
+    """,
+    "ueberstunden": f"""
+        SELECT t.mitarbeiter_id, 'ueberstunden' AS typ, t.datum AS von_datum, t.datum AS bis_datum,
+               t.stunden AS wert, t.notiz, NULL AS titel
+        FROM ueberstunden t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+        WHERE {_MA_FILTER} AND strftime('%Y', t.datum) = :jahr
+        ORDER BY t.mitarbeiter_id, t.datum
+    """,
+}
+
+# Ueberstunden-Saldo wie DataManager.getMitarbeiterStatistik: alle Jahre bis einschliesslich jahr
+_SALDO_SQL = f"""
+    SELECT t.mitarbeiter_id, SUM(t.stunden) AS summe
+    FROM ueberstunden t JOIN mitarbeiter m ON m.id = t.mitarbeiter_id
+    WHERE {_MA_FILTER} AND strftime('%Y', t.datum) <= :jahr
+    GROUP BY t.mitarbeiter_id
+"""
+
+
+def _summe(liste, typ):
+    return sum(e.wert for e in liste if e.typ_name == typ)
+
+
+def lade_jahres_daten(db_pfad, jahr, typen=TYPEN, stats=None, nur_mit_eintraegen=False):
+    """
+    Liefert fuer alle aktiven Mitarbeiter einen Auftrag {employee, jahr, stats, eintraege}
+    im Format von export:employeeYearPdf/-Excel (Reihenfolge: Nachname, Vorname).
+
+    Urlaubsanspruch, Uebertrag und Verfall rechnet der DataManager in der App;
+    stats ({mitarbeiter_id: {...}}) uebernimmt diese Werte. Fehlen sie, werden
+    nur die reinen Summen aus der Datenbank gefuellt.
+    """
+    jahr = str(jahr)
+    stats = stats or {}
+
+    con = oeffne_readonly(db_pfad)
+    try:
+        con.row_factory = sqlite3.Row
+        mitarbeiter = con.execute(_MITARBEITER_SQL + " ORDER BY m.nachname, m.vorname").fetchall()
+        eintraege = {ma["id"]: [] for ma in mitarbeiter}
+
+        params = {"jahr": jahr}
+        for typ in TYPEN:
+            if typ not in typen:
+                continue
+            for row in con.execute(_JAHR_SQL[typ], params):
+                eintraege[row["mitarbeiter_id"]].append(Eintrag.aus_zeile(row))
+        saldo = {row["mitarbeiter_id"]: row["summe"] for row in con.execute(_SALDO_SQL, params)}
+    finally:
+        con.close()
+
+    jobs = []
+    for ma in mitarbeiter:
+        liste = eintraege[ma["id"]]
+        if nur_mit_eintraegen and not liste:
+            continue
+
+        stat = stats.get(ma["id"])
+        if stat is None:
+            stat = {
+                "urlaub_genommen": _summe(liste, "urlaub"),
+                "krankheitstage":  _summe(liste, "krankheit"),
+                "schulungstage":   _summe(liste, "schulung"),
+                "ueberstunden":    saldo.get(ma["id"], 0),
+            }
+
+        jobs.append({
+            "id": ma["id"],
+            "employee": {
+                "name":       f"{ma['vorname']} {ma['nachname']}",
+                "department": text(ma["abteilung_name"]),
+            },
+            "jahr":      jahr,
+            "stats":     stat,
+            "eintraege": liste,
+        })
+    return jobs
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def _typen_liste(text):
+    typen = [t.strip() for t in text.split(",") if t.strip()]
+    unbekannt = [t for t in typen if t not in TYPEN]
+    if unbekannt or not typen:
+        raise argparse.ArgumentTypeError(
+            f"ungueltige Typen: {', '.join(unbekannt) or text} (erlaubt: {', '.join(TYPEN)})")
+    return typen
+
+
+def add_db_argumente(parser):
+    """Gemeinsame --db/--von/--bis/--types-Optionen fuer export_to_excel.py und export_to_pdf.py"""
+    gruppe = parser.add_argument_group("Datenbank als Quelle (statt input.json)")
+    gruppe.add_argument("--db", metavar="PFAD", help="TeamFlow-Datenbank (wird read-only geoeffnet)")
+    gruppe.add_argument("--von", metavar="YYYY-MM-DD", help="Beginn des Zeitraums")
+    gruppe.add_argument("--bis", metavar="YYYY-MM-DD", help="Ende des Zeitraums")
+    gruppe.add_argument("--types", type=_typen_liste, default=list(TYPEN), metavar="TYP,TYP",
+                        help=f"Abwesenheitstypen, kommagetrennt (Standard: {','.join(TYPEN)})")
+    gruppe.add_argument("--alle-mitarbeiter", action="store_true",
+                        help="Auch Mitarbeiter ohne Eintraege im Zeitraum exportieren")
+    gruppe.add_argument("--erstellt-am", metavar="YYYY-MM-DDTHH:MM",
+                        help="Tag fuer \"Erstellt am\" und Fusszeile, die Uhrzeit wird ignoriert (Standard: heute)")
+
+
+def pruefe_db_argumente(parser, args):
+    if args.db:
+        if args.input_file:
+            parser.error("input.json und --db schliessen sich aus")
+        if not (args.von and args.bis):
+            parser.error("--db benoetigt --von und --bis")
+        # Die Abfragen vergleichen Texte – nur JJJJ-MM-TT sortiert richtig
+        for name, wert in (("--von", args.von), ("--bis", args.bis)):
+            tag = tagesnummer(wert)
+            if tag is None or iso_datum(tag) != wert:
+                parser.error(f"{name}: kein Datum im Format YYYY-MM-DD: {wert}")
+        if tage(args.von, args.bis) < 1:
+            parser.error("--von liegt nach --bis")
+    elif not args.input_file:
+        parser.error("input.json oder --db angeben")
+
+
+def lade_db_payload(args):
+    return payload_aus_db_auftrag({
+        "quelle":           "db",
+        "db":               args.db,
+        "vonDatum":         args.von,
+        "bisDatum":         args.bis,
+        "typen":            args.types,
+        "nurMitEintraegen": not args.alle_mitarbeiter,
+        "erstelltAm":       args.erstellt_am,
+    })
+
+
+def add_jahres_db_argumente(parser, modi="--batch"):
+    """--db/--jahr/--types fuer den Batch-Modus der Jahresuebersichten; modi: womit --db erlaubt ist"""
+    gruppe = parser.add_argument_group(f"Datenbank als Quelle (statt input.json, nur mit {modi})")
+    gruppe.add_argument("--db", metavar="PFAD", help="TeamFlow-Datenbank (wird read-only geoeffnet)")
+    gruppe.add_argument("--jahr", metavar="YYYY", help="Jahr der Uebersichten")
+    gruppe.add_argument("--types", type=_typen_liste, default=list(TYPEN), metavar="TYP,TYP",
+                        help=f"Abwesenheitstypen, kommagetrennt (Standard: {','.join(TYPEN)})")
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Fortschrittsmeldungen fuer lange Exporte (--fortschritt)
+Eine JSON-Zeile pro Meldung, z.B.
+
+    {"phase": "detail", "done": 1200, "total": 18000}
+    {"phase": "seiten", "done": 42}
+    {"phase": "speichern"}
+
+Im Einzelprozess gehen die Zeilen auf stdout (main.js reicht sie an den
+Renderer weiter), im Export-Worker als {"id": ..., "fortschritt": {...}} ueber
+das Protokoll.
+
+Die Rate ist pro Phase auf eine Meldung je INTERVALL Sekunden begrenzt. In
+den Zeilenschleifen kostet ein Zaehler.weiter() nur eine Addition und einen
+Vergleich; auf die Uhr wird nur alle PRUEF_SCHRITT Zeilen geschaut.
+
+mit_pruefung() setzt eine Pruefung vor jede Meldung (Abbruch und Zeitlimit,
+teamflow_export_abbruch) – auch ohne --fortschritt, dann ohne Meldungen.
+"""
+
+import json
+import sys
+import time
+
+
+INTERVALL = 0.25
+PRUEF_SCHRITT = 64
+
+
+class _KeinZaehler:
+    def weiter(self, n=1):
+        pass
+
+    def fertig(self):
+        pass
+
+
+_KEIN_ZAEHLER = _KeinZaehler()
+
+
+class _KeinFortschritt:
+    """Platzhalter ohne Meldungen – create_* rufen melde()/zaehler() immer auf"""
+
+    aktiv = False
+
+    def melde(self, phase, done=None, total=None, erzwingen=False):
+        pass
+
+    def zaehler(self, phase, total, schritt=PRUEF_SCHRITT):
+        return _KEIN_ZAEHLER
+
+    def pruefe(self):
+        pass
+
+
+KEIN_FORTSCHRITT = _KeinFortschritt()
+
+
+class _Zaehler:
+    __slots__ = ("fortschritt", "phase", "total", "done", "schritt", "_naechste")
+
+    def __init__(self, fortschritt, phase, total, schritt):
+        self.fortschritt = fortschritt
+        self.phase       = phase
+        self.total       = total
+        self.done        = 0
+        self.schritt     = schritt
+        self._naechste   = schritt
+
+    def weiter(self, n=1):
+        self.done += n
+        if self.done >= self._naechste:
+            self._naechste = self.done + self.schritt
+            self.fortschritt.melde(self.phase, self.done, self.total)
+
+    def fertig(self):
+        self.fortschritt.melde(self.phase, self.done, self.total, erzwingen=True)
+
+
+class Fortschritt:
+    """senden(ereignis) bekommt jede Meldung als dict"""
+
+    aktiv = True
+
+    def __init__(self, senden, intervall=INTERVALL):
+        self._senden   = senden
+        self.intervall = intervall
+        self._letzte   = {}
+        self.gesendet  = 0
+
+    def melde(self, phase, done=None, total=None, erzwingen=False):
+        jetzt = time.monotonic()
+        if not erzwingen and jetzt - self._letzte.get(phase, -self.intervall) < self.intervall:
+            return
+        self._letzte[phase] = jetzt
+
+        ereignis = {"phase": phase}
+        if done is not None:
+            ereignis["done"] = done
+        if total is not None:
+            ereignis["total"] = total
+        self._senden(ereignis)
+        self.gesendet += 1
+
+    def zaehler(self, phase, total, schritt=PRUEF_SCHRITT):
+        """
+        Zaehler fuer eine Schleife; die Uhr wird alle schritt Durchlaeufe gefragt
+        (1 fuer langsame Schritte wie ganze Dateien). fertig() meldet den Endstand immer.
+        """
+        return _Zaehler(self, phase, total, schritt)
+
+    def pruefe(self):
+        pass
+
+
+class _MitPruefung:
+    """Reicht Meldungen an fortschritt weiter, ruft vorher pruefe() auf"""
+
+    def __init__(self, fortschritt, pruefe):
+        self._fortschritt = fortschritt
+        self.aktiv        = fortschritt.aktiv
+        self.pruefe       = pruefe
+
+    def melde(self, phase, done=None, total=None, erzwingen=False):
+        self.pruefe()
+        self._fortschritt.melde(phase, done, total, erzwingen)
+
+    def zaehler(self, phase, total, schritt=PRUEF_SCHRITT):
+        # Immer ein echter Zaehler – sonst gaebe es ohne --fortschritt keine Pruefung
+        return _Zaehler(self, phase, total, schritt)
+
+
+def mit_pruefung(fortschritt, pruefe):
+    """
+    fortschritt, bei dem jede Meldung (und damit jeder Zaehler alle schritt
+    Durchlaeufe) zuerst pruefe() aufruft. pruefe() kann eine Ausnahme werfen.
+    """
+    return _MitPruefung(fortschritt, pruefe)
+
+
+def stdout_senden(ereignis):
+    # stdout ist im Einzelprozess eine Pipe – ohne flush kaemen die Zeilen erst am Ende
+    sys.stdout.buffer.write(json.dumps(ereignis).encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def add_fortschritt_argumente(parser):
+    parser.add_argument("--fortschritt", action="store_true",
+                        help='Fortschritt als JSON-Zeilen auf stdout ({"phase": ..., "done": ..., "total": ...})')
+
+
+def fortschritt_aus_argumenten(args):
+    return Fortschritt(stdout_senden) if args.fortschritt else KEIN_FORTSCHRITT
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Fragment-Cache fuer den Zeitraum-Export (Excel/PDF)
+Der Export-Cache (teamflow_export_cache) hilft nur bei exakt gleicher
+Eingabe – aendert sich ein einziger Eintrag, wurden bisher Zusammenfassung und
+Details aller Mitarbeiter neu formatiert. Hier wird pro Mitarbeiter ein Block
+abgelegt:
+
+    Excel:  [zusammenfassungs_zeile, [(farbe, werte), ...]]
+    PDF:    [zusammenfassungs_zeile, [(werte, typ), ...], zeilenhoehen]
+
+Die Zeilenhoehen misst reportlab beim ersten Aufbau; danach bekommt die Table
+sie vorgegeben und muss nur noch die Zeilen neuer Bloecke ausmessen.
+
+Schluessel: sha1 ueber Art ("excel"/"pdf"), skript_version(), Zeitraum,
+Name, Abteilung, die Zahlen der Zusammenfassung und alle Eintraege des
+Mitarbeiters. Neu formatiert werden also nur Mitarbeiter, deren Daten sich
+geaendert haben; Abteilungs-Trennzeilen, Summen und Kopfzeilen entstehen wie
+bisher bei jedem Export.
+
+Ablage: sqlite-Datei ORDNER/fragmente/fragmente.sqlite (Unterordner, damit
+die LRU-Aufraeumung des Export-Caches sie nicht als Datei-Eintrag zaehlt),
+Bloecke per marshal. Es bleiben hoechstens max_bloecke Bloecke, die am
+laengsten nicht benutzten fliegen zuerst. Fehler (Rechte, gesperrte oder
+kaputte Datei) melden eine WARNUNG auf stderr, der Export laeuft dann ohne
+Fragmente weiter.
+"""
+
+import hashlib
+import marshal
+import os
+import sqlite3
+import sys
+import time
+
+from teamflow_export_cache import skript_version
+
+
+MAX_BLOECKE = 50000
+
+# Schluessel pro SELECT – unter dem sqlite-Limit fuer Parameter (999)
+_SCHLUESSEL_PRO_ABFRAGE = 500
+
+
+def _warnung(text):
+    sys.stderr.buffer.write(f"WARNUNG Fragment-Cache: {text}\n".encode("utf-8"))
+
+
+class _KeineFragmente:
+    """Platzhalter ohne Cache – bloecke() baut einfach alle Bloecke"""
+
+    aktiv = False
+
+    def bloecke(self, art, auswertung, kontext, bauen):
+        return [bauen(i) for i in range(len(auswertung))], {}
+
+    def lege_ab(self, neu):
+        pass
+
+
+KEINE_FRAGMENTE = _KeineFragmente()
+
+
+def block_schluessel(art, kontext, auswertung, i):
+    name, abt, eintraege = auswertung.mitarbeiter[i]
+    daten = marshal.dumps((
+        art, skript_version(), kontext, name, abt, auswertung.zahlen(i),
+        [e.__getstate__() for e in eintraege],
+    ))
+    return hashlib.sha1(daten).digest()
+
+
+class FragmentCache:
+    aktiv = True
+
+    def __init__(self, ordner, max_bloecke=MAX_BLOECKE):
+        self.pfad        = os.path.join(ordner, "fragmente", "fragmente.sqlite")
+        self.max_bloecke = max_bloecke
+        self.treffer     = 0
+        self.neu         = 0
+        self._db         = None
+
+    def _verbindung(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.pfad), exist_ok=True)
+            db = sqlite3.connect(self.pfad, timeout=10)
+            db.execute("CREATE TABLE IF NOT EXISTS fragmente ("
+                       "schluessel BLOB PRIMARY KEY, daten BLOB NOT NULL, benutzt REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS fragmente_benutzt ON fragmente(benutzt)")
+            self._db = db
+        return self._db
+
+    def hole(self, schluessel):
+        """Liste von Schluesseln -> {schluessel: block} fuer alle vorhandenen"""
+        db = self._verbindung()
+        gefunden = {}
+        for start in range(0, len(schluessel), _SCHLUESSEL_PRO_ABFRAGE):
+            teil = schluessel[start:start + _SCHLUESSEL_PRO_ABFRAGE]
+            platzhalter = ",".join("?" * len(teil))
+            for s, daten in db.execute(
+                    f"SELECT schluessel, daten FROM fragmente WHERE schluessel IN ({platzhalter})", teil):
+                gefunden[s] = marshal.loads(daten)
+        if gefunden:
+            with db:
+                db.executemany("UPDATE fragmente SET benutzt = ? WHERE schluessel = ?",
+                               [(time.time(), s) for s in gefunden])
+        return gefunden
+
+    def bloecke(self, art, auswertung, kontext, bauen):
+        """
+        Ein Block pro Mitarbeiter (Index in auswertung.mitarbeiter): aus dem
+        Cache oder von bauen(i). Gibt (bloecke, neu) zurueck; neu = {schluessel:
+        block} der neu gebauten, fuer lege_ab() – beim PDF erst nach dem Aufbau,
+        wenn die Zeilenhoehen feststehen.
+        """
+        schluessel = [block_schluessel(art, kontext, auswertung, i) for i in range(len(auswertung))]
+        try:
+            vorhanden = self.hole(schluessel)
+        except (OSError, sqlite3.Error, ValueError, EOFError, TypeError) as e:
+            _warnung(e)
+            vorhanden = {}
+
+        bloecke, neu = [], {}
+        for i, s in enumerate(schluessel):
+            block = vorhanden.get(s)
+            if block is None:
+                block = neu[s] = bauen(i)
+            bloecke.append(block)
+        self.treffer += len(schluessel) - len(neu)
+        self.neu     += len(neu)
+        return bloecke, neu
+
+    def lege_ab(self, neu):
+        if not neu:
+            return
+        try:
+            db = self._verbindung()
+            jetzt = time.time()
+            with db:
+                db.executemany("INSERT OR REPLACE INTO fragmente VALUES (?, ?, ?)",
+                               [(s, marshal.dumps(block), jetzt) for s, block in neu.items()])
+                # Nur die max_bloecke zuletzt benutzten behalten
+                db.execute("DELETE FROM fragmente WHERE schluessel IN ("
+                           "SELECT schluessel FROM fragmente ORDER BY benutzt DESC LIMIT -1 OFFSET ?)",
+                           (self.max_bloecke,))
+        except (OSError, sqlite3.Error, ValueError) as e:
+            _warnung(e)
+
+
+def fragmente_aus_cache(cache):
+    """Fragment-Cache im Ordner eines ExportCache (--cache ORDNER) oder KEINE_FRAGMENTE"""
+    return FragmentCache(cache.ordner) if cache is not None else KEINE_FRAGMENTE
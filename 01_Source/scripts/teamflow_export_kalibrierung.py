@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Erzeugt von benchmarks/bench_kalibrierung.py – nicht von Hand aendern.
+# Koeffizienten der Schaetzung in teamflow_export_vorschau (--dry-run).
+KALIBRIERUNG = {'meta': {'erstellt': '2026-10-17T08:42:21',
+          'python': '3.11.7',
+          'plattform': 'Linux-6.18.44-fc-v139-x86_64-with-glibc2.36',
+          'cpus': 1,
+          'wiederholungen': 2,
+          'groessen': [(20, 5, 4, 90),
+                       (300, 1, 8, 365),
+                       (100, 20, 6, 365),
+                       (400, 8, 10, 365),
+                       (150, 30, 8, 1095),
+                       (500, 25, 12, 1095)]},
+ 'modelle': {'pdf': {'sekunden': {'konstant': 0.236862946,
+                                  'zusammenfassung': 0.001101151,
+                                  'details': 0.000350582},
+                     'groesse_kb': {'konstant': 4.450019518,
+                                    'zusammenfassung': 0.146238214,
+                                    'details': 0.086890516},
+                     'seiten': {'konstant': 1.715200559,
+                                'zusammenfassung': 0.045214454,
+                                'details': 0.039988587}},
+             'xlsx/openpyxl': {'sekunden': {'konstant': 0.217915306,
+                                            'zusammenfassung': 0.000648918,
+                                            'details': 0.000239559},
+                               'groesse_kb': {'konstant': 7.368233867,
+                                              'zusammenfassung': 0.049383907,
+                                              'details': 0.029486242}},
+             'xlsx/streaming': {'sekunden': {'konstant': 0.278928741,
+                                             'zusammenfassung': 0.000619951,
+                                             'details': 0.000254097},
+                                'groesse_kb': {'konstant': 7.190273027,
+                                               'zusammenfassung': 0.048184616,
+                                               'details': 0.029835459}},
+             'xlsx/nativ': {'sekunden': {'konstant': 0.250569293,
+                                         'zusammenfassung': -4.0058e-05,
+                                         'details': 2.2073e-05},
+                            'groesse_kb': {'konstant': 4.846471732,
+                                           'zusammenfassung': 0.044703617,
+                                           'details': 0.027706874}}}}
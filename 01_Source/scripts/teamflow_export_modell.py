@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Kompaktes Datenmodell fuer Export-Eintraege
+Statt eines dicts pro Abwesenheits-Eintrag haelt jeder Eintrag nur sechs
+Slots: Typ als kleiner int-Code, Von/Bis als internierte Strings (dieselben
+Daten kommen tausendfach vor), Wert als float sowie Titel und Notiz.
+
+Die Payload wird genau einmal umgewandelt – beim Lesen der JSON (lade_json,
+lade_json_text) direkt im object_hook, so dass die dicts der Eintraege gar
+nicht erst alle gleichzeitig im Speicher liegen, bzw. beim Lesen aus der
+Datenbank (teamflow_export_db). Die Renderer arbeiten nur noch mit Eintrag.
+"""
+
+import io
+import json
+import sys
+from datetime import datetime, time
+
+
+# Typ-Codes: Index in TYP_NAMEN. Unbekannte Typen aus aelteren Payloads
+# bekommen beim Einlesen den naechsten freien Code.
+URLAUB, KRANKHEIT, SCHULUNG, UEBERSTUNDEN = range(4)
+TYP_NAMEN = ["urlaub", "krankheit", "schulung", "ueberstunden"]
+_TYP_CODES = {name: code for code, name in enumerate(TYP_NAMEN)}
+
+
+def typ_code(typ):
+    code = _TYP_CODES.get(typ)
+    if code is None:
+        code = _TYP_CODES[typ] = len(TYP_NAMEN)
+        TYP_NAMEN.append(typ)
+    return code
+
+
+def text(wert):
+    """Name/Abteilung/Datum internieren – None und Nicht-Strings bleiben wie sie sind"""
+    return sys.intern(wert) if type(wert) is str else wert
+
+
+def _zahl(wert):
+    # Fehlender Wert = 0 wie bisher (e.get("wert", 0)); None oder Unlesbares
+    # wird NaN, das die fmt_zahl-Funktionen wie bisher als "–" bzw. 0 ausgeben
+    try:
+        return float(wert)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class Eintrag:
+    """Ein Abwesenheits-Eintrag (Urlaub, Krankheit, Schulung, Ueberstunden-Abbau)"""
+
+    __slots__ = ("typ", "von", "bis", "wert", "titel", "notiz")
+
+    def __init__(self, typ, von, bis, wert, titel=None, notiz=None):
+        self.typ   = typ
+        self.von   = von
+        self.bis   = bis
+        self.wert  = wert
+        self.titel = titel
+        self.notiz = notiz
+
+    @classmethod
+    def aus_dict(cls, e):
+        # Schulungen/Ueberstunden aus der App haben teils nur "datum"
+        datum = e.get("datum")
+        return cls(
+            typ_code(e.get("typ", "")),
+            text(e.get("von_datum") or datum),
+            text(e.get("bis_datum") or datum),
+            _zahl(e.get("wert", 0)),
+            e.get("titel"),
+            e.get("notiz"),
+        )
+
+    @classmethod
+    def aus_zeile(cls, row):
+        """Aus einer sqlite3.Row der Abfragen in teamflow_export_db"""
+        return cls(
+            typ_code(row["typ"]),
+            text(row["von_datum"]),
+            text(row["bis_datum"]),
+            _zahl(row["wert"]),
+            row["titel"],
+            row["notiz"],
+        )
+
+    @property
+    def typ_name(self):
+        return TYP_NAMEN[self.typ]
+
+    def als_dict(self):
+        return {
+            "typ":       self.typ_name,
+            "von_datum": self.von,
+            "bis_datum": self.bis,
+            "wert":      self.wert,
+            "notiz":     self.notiz,
+            "titel":     self.titel,
+        }
+
+    def __getstate__(self):
+        # Fuer den Prozesspool im Batch-Modus: Typ als Name, die Codes
+        # unbekannter Typen koennen in einem anderen Prozess anders lauten
+        return (self.typ_name, self.von, self.bis, self.wert, self.titel, self.notiz)
+
+    def __setstate__(self, state):
+        typ, self.von, self.bis, self.wert, self.titel, self.notiz = state
+        self.typ = typ_code(typ)
+
+    def __repr__(self):
+        return f"Eintrag({self.typ_name!r}, {self.von!r}, {self.bis!r}, {self.wert!r})"
+
+
+def erstellt_am(payload):
+    """
+    Tag fuer "Erstellt am" und die Fusszeilen (als datetime um 0:00):
+    payload["erstelltAm"] (ISO, Ortszeit, von main.js gesetzt) oder – fehlt
+    das Feld – heute. Als Eingabe statt datetime.now() pro Seite, damit
+    gleiche Eingaben gleiche Dateien ergeben (teamflow_export_cache). Auch
+    die Metadaten der Dateien kommen daraus (teamflow_export_reproduzierbar).
+    Nur der Tag: der Export-Cache schluesselt danach, eine Datei aus dem
+    Cache traegt so nie einen anderen Tag als ein neuer Export.
+    """
+    wert = payload.get("erstelltAm") if isinstance(payload, dict) else None
+    erstellt = datetime.fromisoformat(wert) if wert else datetime.now()
+    return datetime.combine(erstellt.date(), time())
+
+
+def eintraege(liste):
+    """Liste aus dicts und/oder Eintraegen -> Liste von Eintraegen (bereits umgewandelte bleiben)"""
+    if not liste:
+        return []
+    if all(type(e) is Eintrag for e in liste):
+        return liste
+    return [e if type(e) is Eintrag else Eintrag.aus_dict(e) for e in liste]
+
+
+def _object_hook(obj):
+    # Eintraege erkennt man am Typ mit Wert bzw. Datum; alles andere
+    # (Mitarbeiter, Zusammenfassung, Stats) bleibt ein dict
+    if "typ" in obj and ("wert" in obj or "von_datum" in obj or "datum" in obj):
+        return Eintrag.aus_dict(obj)
+    for schluessel in ("abteilung", "department", "name"):
+        if schluessel in obj:
+            obj[schluessel] = text(obj[schluessel])
+    return obj
+
+
+def lade_json_text(daten):
+    """Wie json.loads, aber Eintraege kommen gleich als Eintrag heraus"""
+    return json.loads(daten, object_hook=_object_hook)
+
+
+def lade_json(pfad):
+    """
+    Export-Payload aus einer JSON-Datei (utf-8, BOM erlaubt); "-" liest stdin.
+    Beginnt die Eingabe mit "TFEX", ist es das Binaerformat aus
+    teamflow_export_binaer – das Ergebnis hat dieselbe Struktur.
+    """
+    from teamflow_export_binaer import MAGIC, lade_binaer
+
+    if pfad == "-":
+        # Bytes statt Text: json erkennt utf-8 samt BOM selbst
+        daten = sys.stdin.buffer.read()
+        return lade_binaer(daten) if daten[:len(MAGIC)] == MAGIC else lade_json_text(daten)
+    with io.open(pfad, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return lade_binaer(pfad)
+    with io.open(pfad, "r", encoding="utf-8-sig") as f:
+        return json.load(f, object_hook=_object_hook)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Profiling fuer die Export-Skripte (--profile)
+Misst die Phasen eines Exports (Import, Einlesen, Auswertung, Tabellen bauen,
+Speichern), zaehlt Zeilen/Seiten und den tracemalloc-Spitzenwert und schreibt
+das Ergebnis als eine Zeile auf stderr:
+
+    PROFILE {"skript": "export_to_pdf", "gesamt_ms": 5321.0, "peak_mb": 18.8,
+             "phasen": {"import": {"ms": 410.2}, "json_laden": {"ms": 35.1, "peak_mb": 4.2}, ...},
+             "zeilen": {"mitarbeiter": 200, "eintraege": 8000, "seiten": 331}}
+
+Mit --profile-cprofile PFAD wird zusaetzlich ein cProfile-Dump geschrieben
+(auswerten z.B. mit python -m pstats PFAD oder snakeviz).
+
+tracemalloc verlangsamt den Export spuerbar; die Phasenzeiten sind deshalb
+zum Vergleich der Phasen untereinander gedacht, nicht als absolute Laufzeit.
+Ohne --profile wird KEIN_PROFIL benutzt, das nichts misst.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+# Beginn der Imports: dieses Modul wird in den Export-Skripten vor
+# reportlab/openpyxl importiert
+_IMPORT_START = time.perf_counter()
+
+
+class _KeinePhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_KEINE_PHASE = _KeinePhase()
+
+
+class _KeinProfil:
+    """Platzhalter ohne Messung – create_* rufen phase()/zaehle() immer auf"""
+
+    aktiv = False
+
+    def phase(self, name):
+        return _KEINE_PHASE
+
+    def naechste_phase(self, name):
+        pass
+
+    def zaehle(self, name, anzahl):
+        pass
+
+
+KEIN_PROFIL = _KeinProfil()
+
+
+class _Phase:
+    __slots__ = ("profil", "name", "start")
+
+    def __init__(self, profil, name):
+        self.profil = profil
+        self.name   = name
+
+    def __enter__(self):
+        self.profil._peak_merken(zuruecksetzen=True)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        eintrag = self.profil.phasen.setdefault(self.name, {"ms": 0.0})
+        eintrag["ms"] += ms
+        peak = self.profil._peak_merken(zuruecksetzen=False)
+        if peak is not None:
+            eintrag["peak_mb"] = max(eintrag.get("peak_mb", 0.0), peak / 2**20)
+        return False
+
+
+class Profil:
+    """
+    Phasenmessung fuer einen Export.
+    mit_import=False im Export-Worker: dort sind die Module seit dem Start geladen.
+    """
+
+    aktiv = True
+
+    def __init__(self, skript, cprofile_datei=None, mit_import=True):
+        self.skript         = skript
+        self.cprofile_datei = cprofile_datei
+        self.phasen         = {}
+        self.zeilen         = {}
+        self._peak          = 0
+        self._offen         = None
+        self._start         = time.perf_counter()
+        if mit_import:
+            self.phasen["import"] = {"ms": (self._start - _IMPORT_START) * 1000}
+
+        self._eigenes_tracemalloc = not tracemalloc.is_tracing()
+        if self._eigenes_tracemalloc:
+            tracemalloc.start()
+
+        self._cprofile = None
+        if cprofile_datei:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _peak_merken(self, zuruecksetzen):
+        if not tracemalloc.is_tracing():
+            return None
+        peak = tracemalloc.get_traced_memory()[1]
+        self._peak = max(self._peak, peak)
+        if zuruecksetzen:
+            tracemalloc.reset_peak()
+        return peak
+
+    def phase(self, name):
+        """Kontextmanager; mehrfach benutzte Phasen werden aufsummiert"""
+        return _Phase(self, name)
+
+    def naechste_phase(self, name):
+        """
+        Fuer lange lineare Funktionen statt eines with-Blocks: beendet die
+        zuletzt mit naechste_phase begonnene Phase und beginnt name (None = keine)
+        """
+        if self._offen is not None:
+            self._offen.__exit__(None, None, None)
+            self._offen = None
+        if name is not None:
+            self._offen = self.phase(name).__enter__()
+
+    def zaehle(self, name, anzahl):
+        self.zeilen[name] = self.zeilen.get(name, 0) + anzahl
+
+    def beenden(self):
+        """Stoppt cProfile/tracemalloc und liefert den Bericht als dict"""
+        self.naechste_phase(None)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_datei)
+            self._cprofile = None
+        self._peak_merken(zuruecksetzen=False)
+        if self._eigenes_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        bericht = {
+            "skript":    self.skript,
+            "gesamt_ms": round((time.perf_counter() - self._start) * 1000 + self.phasen.get("import", {}).get("ms", 0), 1),
+            "peak_mb":   round(self._peak / 2**20, 1),
+            "phasen":    {name: {k: round(v, 1) for k, v in werte.items()} for name, werte in self.phasen.items()},
+            "zeilen":    self.zeilen,
+        }
+        if self.cprofile_datei:
+            bericht["cprofile"] = self.cprofile_datei
+        return bericht
+
+    def schreibe(self):
+        """Bericht als PROFILE-Zeile auf stderr (wie TIMINGS in teamflow_export.py)"""
+        bericht = self.beenden()
+        sys.stderr.buffer.write(f"PROFILE {json.dumps(bericht, ensure_ascii=False)}\n".encode("utf-8"))
+        sys.stderr.flush()
+        return bericht
+
+
+# ── Kommandozeile ────────────────────────────────────────────────────────────
+def add_profil_argumente(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Phasenzeiten, Zeilenzahlen und Speicherspitze als JSON auf stderr (PROFILE ...)")
+    parser.add_argument("--profile-cprofile", metavar="PFAD",
+                        help="mit --profile zusaetzlich einen cProfile-Dump nach PFAD schreiben")
+
+
+def profil_aus_argumenten(args, skript):
+    if not (args.profile or args.profile_cprofile):
+        return KEIN_PROFIL
+    return Profil(skript, args.profile_cprofile)
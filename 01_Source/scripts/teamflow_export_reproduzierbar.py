@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Reproduzierbare Export-Dateien
+Seit "erstelltAm" Teil der Eingabe ist (teamflow_export_modell.erstellt_am),
+haengen Kopf- und Fusszeilen nicht mehr von der Uhr ab. reportlab und openpyxl
+schreiben aber noch eigene Zeitstempel in die Datei:
+
+    PDF:   /CreationDate und /ModDate, dazu eine /ID aus Uhrzeit und Inhalt
+    xlsx:  docProps/core.xml (created/modified) und das Aenderungsdatum
+           jedes Zip-Eintrags
+
+Mit den Helfern hier kommen auch diese aus demselben Zeitpunkt erstellt.
+Die /ID haengt dann nur noch vom Inhalt ab (reportlab invariant). Die
+Reihenfolge der Zip-Eintraege legt openpyxl ohnehin fest. Gleiche Eingabe
+mit gleichem erstelltAm ergibt so byteweise dieselbe Datei, und der
+Export-Cache braucht keine Sonderbehandlung.
+
+Datumsangaben sind Ortszeit ohne Zeitzone wie erstelltAm selbst, damit die
+Datei nicht von der Zeitzone des Rechners abhaengt. Der eigene xlsx-Schreiber
+(teamflow_xlsx_native) nimmt erstellt direkt als zeitstempel.
+
+reportlab bzw. openpyxl werden erst in den Funktionen importiert – ein
+Excel-Export laedt so kein reportlab und umgekehrt.
+"""
+
+import shutil
+import zipfile
+
+
+def pdf_canvas(erstellt):
+    """
+    canvasmaker fuer doc.build: Erstellungs-/Aenderungsdatum = erstellt,
+    Dokument-ID nur aus dem Inhalt
+    """
+    from reportlab.pdfgen.canvas import Canvas
+
+    datum = f"D:{erstellt:%Y%m%d%H%M%S}"
+
+    class _Canvas(Canvas):
+        def __init__(self, *args, **kwargs):
+            kwargs["invariant"] = 1
+            super().__init__(*args, **kwargs)
+            self.setDateFormatter(lambda *_: datum)
+
+    return _Canvas
+
+
+class _Zip(zipfile.ZipFile):
+    """ZipFile, dessen Eintraege alle dasselbe Aenderungsdatum bekommen"""
+
+    def __init__(self, ziel, erstellt):
+        super().__init__(ziel, "w", zipfile.ZIP_DEFLATED, allowZip64=True)
+        self._datum = max(erstellt.timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+    def _info(self, name):
+        info = zipfile.ZipInfo(name, date_time=self._datum)
+        info.compress_type = self.compression
+        info.external_attr = 0o600 << 16
+        return info
+
+    def writestr(self, name, data, *args, **kwargs):
+        if not isinstance(name, zipfile.ZipInfo):
+            name = self._info(name)
+        super().writestr(name, data, *args, **kwargs)
+
+    def write(self, filename, arcname=None, *args, **kwargs):
+        # write_only-Blaetter liegen als temporaere Datei vor – deren mtime nicht uebernehmen
+        with open(filename, "rb") as quelle, self.open(self._info(arcname or filename), "w", force_zip64=True) as ziel:
+            shutil.copyfileobj(quelle, ziel)
+
+
+def speichere_xlsx(wb, ziel, erstellt):
+    """Wie wb.save(ziel), aber core.xml und alle Zip-Eintraege mit erstellt statt jetzt"""
+    from openpyxl.writer.excel import ExcelWriter
+
+    if wb.write_only and not wb.worksheets:
+        wb.create_sheet()
+    wb.properties.created = wb.properties.modified = erstellt.replace(microsecond=0)
+    ExcelWriter(wb, _Zip(ziel, erstellt)).save()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Spalten der Zeitraum-Exporte (Zusammenfassung und Details) – einmal fuer
+Excel und PDF
+Bisher standen Ueberschriften, Breiten, Ausrichtung und Typ-Farbe in
+export_to_excel und export_to_pdf je von Hand, Zelle fuer Zelle mit
+Bedingungen wie "center = col in (3, 4, 5, 6)". Hier steht jede Spalte
+einmal; Layout(spalten, format) macht daraus, was ein Format braucht:
+
+    titel, breiten       Ueberschriften und Breiten (Excel: Zeichen, PDF: cm)
+    zentriert, typfarbe  je Spalte: zentriert? Hintergrund in der Typ-Farbe?
+    ausrichtung()        ALIGN-Kommandos fuer die reportlab-TableStyle
+    typfarbe_spalten     erste/letzte Spalte mit Typ-Farbe (fuer hintergruende)
+    zell_stile()         je Typ-Farbe einmal die Zellstile aller Spalten –
+                         die Schleifen pro Zeile waehlen nur noch aus
+
+Die Werte einer Zeile kommen aus detail_formatierer() bzw.
+zusammenfassung_werte(): eine Funktion pro Zeile statt einer Bedingung pro
+Zelle. Typ-Texte werden je Typ-Code einmal nachgeschlagen.
+
+Wo sich die Formate bewusst unterscheiden (kuerzere PDF-Ueberschriften,
+Typ nur in Excel zentriert, Notiz nur in Excel in Typ-Farbe, Zeitraum-
+Spalte nur in Excel), steht das hier als Angabe pro Format statt verteilt
+in zwei Dateien.
+"""
+
+from typing import NamedTuple, Optional
+
+from teamflow_export_core import fmt_zahl
+from teamflow_export_datum import fmt_datum
+from teamflow_export_modell import UEBERSTUNDEN
+
+
+class Spalte(NamedTuple):
+    titel:         str
+    breite:        float            # Excel, Zeichen
+    breite_pdf:    float            # cm; 0 = Rest der Seitenbreite
+    zentriert:     bool = False
+    typfarbe:      bool = False
+    titel_pdf:     Optional[str] = None     # None = wie titel
+    zentriert_pdf: Optional[bool] = None    # None = wie zentriert
+    typfarbe_pdf:  Optional[bool] = None    # None = wie typfarbe
+    formate:       tuple = ("xlsx", "pdf")
+
+
+ZUSAMMENFASSUNG = (
+    Spalte("Mitarbeiter",   28, 5.5),
+    Spalte("Abteilung",     20, 4.0),
+    Spalte("Urlaub (T)",    12, 2.2, zentriert=True, titel_pdf="Urlaub\n(T)"),
+    Spalte("Krankheit (T)", 14, 2.2, zentriert=True, titel_pdf="Krank\n(T)"),
+    Spalte("Schulung (T)",  13, 2.5, zentriert=True, titel_pdf="Schulung\n(T)"),
+    Spalte("UE-Abbau (h)",  14, 2.5, zentriert=True, titel_pdf="UE-Abbau\n(h)"),
+    Spalte("Eintraege",     10, 1.8, zentriert=True, titel_pdf="Eintr."),
+    Spalte("Zeitraum",      22, 0,   zentriert=True, formate=("xlsx",)),
+)
+
+DETAILS = (
+    Spalte("Mitarbeiter",   28, 4.5),
+    Spalte("Abteilung",     20, 3.5),
+    Spalte("Typ",           18, 2.8, zentriert=True, typfarbe=True, zentriert_pdf=False),
+    Spalte("Von",           12, 2.5, zentriert=True, typfarbe=True),
+    Spalte("Bis",           12, 2.5, zentriert=True, typfarbe=True),
+    Spalte("Wert",          10, 2.0, zentriert=True, typfarbe=True),
+    Spalte("Notiz / Titel", 35, 0,   typfarbe=True, typfarbe_pdf=False),
+)
+
+
+def _pdf(wert, standard):
+    return standard if wert is None else wert
+
+
+class Layout:
+    """Die Spalten eines Schemas fuer ein Format ("xlsx" oder "pdf")"""
+
+    def __init__(self, spalten, format):
+        spalten = [s for s in spalten if format in s.formate]
+        pdf = format == "pdf"
+        self.titel     = [_pdf(s.titel_pdf, s.titel) if pdf else s.titel for s in spalten]
+        self.breiten   = [s.breite_pdf if pdf else s.breite for s in spalten]
+        self.zentriert = tuple(_pdf(s.zentriert_pdf, s.zentriert) if pdf else s.zentriert for s in spalten)
+        self.typfarbe  = tuple(_pdf(s.typfarbe_pdf, s.typfarbe) if pdf else s.typfarbe for s in spalten)
+        gefaerbt = [i for i, f in enumerate(self.typfarbe) if f]
+        if gefaerbt and gefaerbt != list(range(gefaerbt[0], gefaerbt[-1] + 1)):
+            raise ValueError("Spalten mit Typ-Farbe muessen nebeneinander liegen")
+        self.typfarbe_spalten = (gefaerbt[0], gefaerbt[-1]) if gefaerbt else None
+
+    def __len__(self):
+        return len(self.titel)
+
+    def ausrichtung(self, ab_zeile=1):
+        """ALIGN-Kommandos ab ab_zeile: ein Kommando je Folge gleich ausgerichteter Spalten"""
+        cmds = []
+        start = 0
+        for i in range(1, len(self.zentriert) + 1):
+            if i == len(self.zentriert) or self.zentriert[i] != self.zentriert[start]:
+                letzte = -1 if i == len(self.zentriert) else i - 1
+                cmds.append(("ALIGN", (start, ab_zeile), (letzte, -1),
+                             "CENTER" if self.zentriert[start] else "LEFT"))
+                start = i
+        return cmds
+
+    def zell_stile(self, stil, daten_stil):
+        """
+        Funktion farbe -> Zellstile aller Spalten. stil(**kwargs) liefert den
+        Stil, wie das Backend ihn zuweist (Name bzw. Index), daten_stil(bg,
+        center) die kwargs. Jede Farbe wird nur einmal aufgeloest.
+        """
+        cache = {}
+
+        def stile(farbe=None):
+            ergebnis = cache.get(farbe)
+            if ergebnis is None:
+                ergebnis = cache[farbe] = tuple(
+                    stil(**daten_stil(bg=farbe if f else None, center=z))
+                    for z, f in zip(self.zentriert, self.typfarbe))
+            return ergebnis
+        return stile
+
+
+# ── Zeilenwerte ──────────────────────────────────────────────────────────────
+def detail_formatierer(typ_label):
+    """
+    Funktion (name, abt, eintrag) -> Werte einer Detail-Zeile in der
+    Reihenfolge von DETAILS. typ_label: Typ-Name -> Anzeige (je Format).
+    """
+    typen = {}  # Typ-Code -> (Label, Einheit)
+
+    def zeile(name, abt, e):
+        typ = typen.get(e.typ)
+        if typ is None:
+            typ_name = e.typ_name
+            typ = typen[e.typ] = (typ_label.get(typ_name, typ_name), "h" if e.typ == UEBERSTUNDEN else "T")
+        return [name, abt, typ[0], fmt_datum(e.von), fmt_datum(e.bis), f"{fmt_zahl(e.wert)} {typ[1]}",
+                e.notiz or e.titel or ""]
+    return zeile
+
+
+def zusammenfassung_werte(auswertung, i, *extra):
+    """Werte einer Zusammenfassungs-Zeile in der Reihenfolge von ZUSAMMENFASSUNG (extra: Zeitraum)"""
+    name, abt, _ = auswertung.mitarbeiter[i]
+    return [name, abt, *auswertung.zahlen(i), *extra]
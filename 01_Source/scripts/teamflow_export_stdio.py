@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+"-" als Ein- und Ausgabe der Exporter
+    teamflow_export pdf - - < daten.json > bericht.pdf
+    teamflow_export excel --db TeamFlow.db --von ... --bis ... - | ...
+
+Eingabe "-": lade_json liest die JSON als Bytes von stdin
+(teamflow_export_modell), ohne temporaere Datei.
+
+Ausgabe "-": die create_*-Funktionen rendern in einen StdoutPuffer (BytesIO),
+der nach einem erfolgreichen Export am Stueck auf stdout geht. Nach einem
+Fehler kommt dort nichts an, der Exit-Code ist 1. stdout gehoert dann allein
+der Datei: Statusmeldungen und --fortschritt-Zeilen laufen ueber stderr, wie
+im Export-Worker.
+
+Die create_*-Funktionen nehmen statt eines Pfads jedes beschreibbare
+Datei-Objekt, z.B. io.BytesIO.
+"""
+
+import io
+import sys
+
+
+STDIO = "-"
+
+
+class StdoutPuffer(io.BytesIO):
+    """Ziel fuer "-"; endung fuer den Export-Cache, der sonst den Dateinamen nimmt"""
+
+    def __init__(self, endung, stdout):
+        super().__init__()
+        self.endung  = endung
+        self._stdout = stdout
+
+    def __str__(self):
+        # Fuer die Statusmeldungen ("PDF erfolgreich erstellt: stdout")
+        return "stdout"
+
+    def senden(self):
+        self._stdout.write(self.getbuffer())
+        self._stdout.flush()
+
+
+def ausgabe_ziel(pfad, endung):
+    """
+    pfad unveraendert – oder fuer "-" ein StdoutPuffer. Gleich nach dem
+    Parsen der Argumente aufrufen: ab dann gehen alle Meldungen auf stderr.
+    """
+    if pfad != STDIO:
+        return pfad
+    stdout = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    return StdoutPuffer(endung, stdout)
+
+
+def senden(ziel):
+    """Nach dem Export: einen StdoutPuffer auf stdout schreiben (Pfade: nichts zu tun)"""
+    if isinstance(ziel, StdoutPuffer):
+        ziel.senden()
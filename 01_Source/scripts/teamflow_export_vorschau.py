@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Vorschau fuer den Zeitraum-Export (--dry-run)
+Bevor jemand drei Jahre mit allen Typen exportiert, sagt nichts, wie gross
+und wie langsam das wird. Mit --dry-run lesen export_to_excel und
+export_to_pdf die Payload (bzw. fragen die Datenbank ab) und werten sie aus
+wie beim Export, rendern aber nichts. Auf stdout kommt eine JSON-Zeile:
+
+    {"variante": "pdf", "mitarbeiter": 200, "abteilungen": 8, "eintraege": 8000,
+     "eintraege_pro_typ": {"urlaub": 2000, ...},
+     "zeilen": {"zusammenfassung": 208, "details": 8008},
+     "geschaetzt": {"seiten": 278, "groesse_kb": 1790.4, "sekunden": 6.1}}
+
+Die Schaetzung ist je Variante (pdf, xlsx/openpyxl, xlsx/streaming,
+xlsx/nativ) linear in den Tabellenzeilen:
+
+    wert = konstant + zusammenfassung * Zeilen der Zusammenfassung
+                    + details * Zeilen der Details
+
+Die Koeffizienten stehen in teamflow_export_kalibrierung.py und kommen aus
+benchmarks/bench_kalibrierung.py (echte Exporte in mehreren Groessen, kleinste
+Quadrate). Gemessen wird die Laufzeit des ganzen Prozesses, die PDF mit einem
+Prozess – mit --workers auf mehreren Kernen geht es schneller. Fehlt eine
+Variante in der Tabelle, ist "geschaetzt" null.
+"""
+
+import json
+import sys
+
+from teamflow_export_core import auswerten
+from teamflow_export_modell import TYP_NAMEN
+from teamflow_export_kalibrierung import KALIBRIERUNG
+
+
+def add_vorschau_argumente(parser):
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nichts erzeugen: Umfang und geschaetzte Seiten/Groesse/Dauer als JSON auf stdout "
+                             "(teamflow_export_vorschau.py)")
+
+
+def merkmale(auswertung):
+    """Tabellenzeilen ohne Kopf: Mitarbeiter + Abteilungs-Trennzeilen (+ GESAMT) bzw. Eintraege + Trennzeilen"""
+    zusammenfassung = sum(1 for _ in auswertung.zusammenfassung()) + 1
+    details = auswertung.anzahl_eintraege + sum(1 for neu, _, _ in auswertung.mit_eintraegen() if neu)
+    return {"zusammenfassung": zusammenfassung, "details": details}
+
+
+def schaetze(modell, zeilen):
+    """Schaetzwerte eines Modells aus teamflow_export_kalibrierung fuer die gegebenen Zeilen"""
+    geschaetzt = {}
+    for groesse, koeffizienten in modell.items():
+        wert = koeffizienten.get("konstant", 0.0)
+        for merkmal, anzahl in zeilen.items():
+            wert += koeffizienten.get(merkmal, 0.0) * anzahl
+        geschaetzt[groesse] = wert
+    if "seiten" in geschaetzt:
+        geschaetzt["seiten"] = max(1, round(geschaetzt["seiten"]))
+    if "groesse_kb" in geschaetzt:
+        geschaetzt["groesse_kb"] = round(max(0.0, geschaetzt["groesse_kb"]), 1)
+    if "sekunden" in geschaetzt:
+        geschaetzt["sekunden"] = round(max(0.0, geschaetzt["sekunden"]), 2)
+    return geschaetzt
+
+
+def vorschau(payload, variante, kalibrierung=KALIBRIERUNG):
+    """
+    Umfang und Schaetzung als dict. variante: Funktion anzahl_eintraege ->
+    Schluessel in kalibrierung (Excel waehlt Streaming nach der Groesse).
+    """
+    export_data = payload.get("exportData", payload)
+    auswertung = auswerten(export_data.get("mitarbeiter", []))
+
+    pro_typ = [0] * len(TYP_NAMEN)
+    for _, _, eintraege in auswertung.mitarbeiter:
+        for e in eintraege:
+            pro_typ[e.typ] += 1
+
+    schluessel = variante(auswertung.anzahl_eintraege)
+    zeilen = merkmale(auswertung)
+    modell = kalibrierung.get("modelle", {}).get(schluessel)
+    return {
+        "variante":          schluessel,
+        "mitarbeiter":       len(auswertung),
+        "abteilungen":       sum(1 for art, _ in auswertung.zusammenfassung() if art == "abteilung"),
+        "eintraege":         auswertung.anzahl_eintraege,
+        "eintraege_pro_typ": dict(zip(TYP_NAMEN, pro_typ)),
+        "zeilen":            zeilen,
+        "geschaetzt":        schaetze(modell, zeilen) if modell else None,
+    }
+
+
+def schreibe_vorschau(ergebnis):
+    sys.stdout.buffer.write((json.dumps(ergebnis, ensure_ascii=False) + "\n").encode("utf-8"))
+    sys.stdout.buffer.flush()
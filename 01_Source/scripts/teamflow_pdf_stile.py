@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Zeilenfarben als wenige Stil-Kommandos fuer reportlab-Tabellen
+Die PDF-Exporte faerben Tabellenzeilen einzeln: Abteilungszeilen, Typ-Farben,
+abwechselnd helle Zeilen. Ein ("BACKGROUND", ...) pro Zeile ergibt so viele
+Kommandos wie Zeilen, und reportlab geht bei jedem Seitenumbruch alle
+restlichen Kommandos durch und legt sie fuer den Rest der Tabelle neu an.
+
+    hintergruende()  Aus der gewuenschten Farbe jeder Zeile die kleinste Liste
+                     aus BACKGROUND (gleiche Farbe ueber mehrere Zeilen) und
+                     ROWBACKGROUNDS (zwei Farben im Wechsel) – jede Zeile
+                     bekommt genau ein Rechteck in ihrer Farbe, nichts wird
+                     uebermalt.
+    StilTabelle      Table, bei der ein ROWBACKGROUNDS nach einem
+                     Seitenumbruch im Takt bleibt. reportlab beginnt den
+                     Farbwechsel im Rest der Tabelle sonst wieder mit der
+                     ersten Farbe.
+
+StilTabelle ueberschreibt dafuer Table._cr_1_1/_cr_1_0, interne Methoden von
+reportlab (getestet mit REPORTLAB_GETESTET, siehe README). Passen deren
+Parameter beim Import nicht mehr, ist StilTabelle die normale Table und
+hintergruende() gibt nur BACKGROUND ueber Zeilenbereiche aus – mehr
+Kommandos, aber keine Farben ausser Takt (WARNUNG auf stderr).
+
+Auf der Seite sieht das aus wie vorher; nur der Content-Stream enthaelt
+weniger, dafuer laengere Rechtecke. Importiert reportlab direkt – die
+Exporter binden das Modul in ihrem reportlab-Importblock ein.
+"""
+
+import sys
+
+from reportlab import Version as _REPORTLAB
+from reportlab.platypus import Table
+
+
+REPORTLAB_GETESTET = "5.0.1"
+
+# Parameter, mit denen StilTabelle die internen Methoden aufruft
+_ERWARTET = {
+    "_cr_1_1": ("self", "n", "nRows", "repeatRows", "cmds"),
+    "_cr_1_0": ("self", "n", "cmds"),
+}
+
+
+def _takt_moeglich():
+    """Haben Table._cr_1_1/_cr_1_0 noch die Parameter, die StilTabelle erwartet?"""
+    for name, parameter in _ERWARTET.items():
+        code = getattr(getattr(Table, name, None), "__code__", None)
+        if code is None or code.co_varnames[:len(parameter)] != parameter:
+            return False
+    return True
+
+
+IM_TAKT = _takt_moeglich()
+if not IM_TAKT:
+    sys.stderr.buffer.write(
+        f"WARNUNG reportlab {_REPORTLAB}: Table._cr_1_1/_cr_1_0 anders als in {REPORTLAB_GETESTET}, "
+        "Zeilenfarben ohne ROWBACKGROUNDS\n".encode("utf-8"))
+
+
+# ── Kommandos ────────────────────────────────────────────────────────────────
+def _gleich_bis(farben, i, abstand):
+    # Letzte Zeile j, bis zu der farben[k] == farben[k - abstand] fuer alle k in (i + abstand)..j gilt
+    j = i + abstand
+    while j < len(farben) and farben[j] == farben[j - abstand]:
+        j += 1
+    return j - 1
+
+
+def hintergruende(farben, start=1, spalten=(0, -1), wechsel=None):
+    """
+    farben: Farbe jeder Zeile ab Tabellenzeile start (None = kein Hintergrund);
+    spalten: erste und letzte Spalte; wechsel: ROWBACKGROUNDS verwenden
+    (Standard: IM_TAKT). Gibt die Stil-Kommandos zurueck.
+
+    Von jeder Zeile aus wird das laengste Stueck gewaehlt, das ein Kommando
+    abdeckt – eine Farbe oder zwei im Wechsel. Weil jedes Teilstueck eines
+    solchen Stuecks wieder eines ist, braucht keine andere Aufteilung weniger
+    Kommandos. Zeilen ohne Farbe kosten nichts.
+    """
+    sc, ec = spalten
+    if wechsel is None:
+        wechsel = IM_TAKT
+    cmds = []
+    i = 0
+    while i < len(farben):
+        gleich = _gleich_bis(farben, i, 1)
+        bis = _gleich_bis(farben, i, 2) if wechsel and gleich == i and i + 1 < len(farben) else i
+        if bis > gleich:
+            cmds.append(("ROWBACKGROUNDS", (sc, start + i), (ec, start + bis), [farben[i], farben[i + 1]]))
+            i = bis + 1
+            continue
+        if farben[i] is not None:
+            cmds.append(("BACKGROUND", (sc, start + i), (ec, start + gleich), farben[i]))
+        i = gleich + 1
+    return cmds
+
+
+# ── Tabelle ──────────────────────────────────────────────────────────────────
+def _im_takt(cmds, n):
+    """
+    ROWBACKGROUNDS, die ueber Zeile n (erste Zeile des Rests) hinausgehen, so
+    drehen, dass der Rest mit der Farbe von Zeile n beginnt
+    """
+    for c in cmds:
+        (sc, sr), (ec, er) = c[1:3]
+        if c[0] == "ROWBACKGROUNDS" and isinstance(sr, int) and 0 <= sr < n <= er:
+            k = (n - sr) % len(c[3])
+            c = (c[0], c[1], c[2], list(c[3][k:]) + list(c[3][:k]), *c[4:])
+        yield c
+
+
+class _TaktTabelle(Table):
+    """Table, deren ROWBACKGROUNDS auf jeder Seite im Takt weiterlaufen"""
+
+    def _cr_1_1(self, n, nRows, repeatRows, cmds, *args, **kwargs):
+        Table._cr_1_1(self, n, nRows, repeatRows, _im_takt(cmds, n), *args, **kwargs)
+
+    def _cr_1_0(self, n, cmds, *args, **kwargs):
+        Table._cr_1_0(self, n, _im_takt(cmds, n), *args, **kwargs)
+
+
+# Ohne passende interne Methoden gibt hintergruende() kein ROWBACKGROUNDS aus
+StilTabelle = _TaktTabelle if IM_TAKT else Table
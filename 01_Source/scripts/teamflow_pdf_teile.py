@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+PDF in Abschnitten rendern und zusammenfuegen (export_to_pdf --workers)
+Ein langer Zeitraum-Export ist eine einzige lange Tabelle; reportlab baut sie
+Seite fuer Seite in einem Prozess. Hier wird das Dokument vorab in Abschnitte
+aus ganzen Seiten geteilt, die unabhaengig voneinander gerendert werden
+koennen – jeder in einem eigenen Prozess – und danach wieder zu einer Datei
+zusammengesetzt.
+
+    seitenplan()      Welche Tabellenzeilen auf welche Seite kommen, allein aus
+                      den Zeilenhoehen – nach denselben Regeln wie Table.split
+                      (Kopfzeile auf jeder Seite, Umbruch vor der ersten Zeile,
+                      die nicht mehr passt).
+    abschnitte()      Aufeinanderfolgende Seiten zu Abschnitten mit etwa
+                      gleich vielen Zeilen buendeln.
+    zusammenfuegen()  Die PDF-Dateien der Abschnitte (von reportlab, einzeln
+                      gerendert) zu einem Dokument verbinden: Objekte neu
+                      nummerieren, ein Seitenbaum mit allen Seiten, Infos und
+                      Zeitstempel aus dem ersten Teil.
+
+Weil jeder Abschnitt auf einer neuen Seite beginnt, die auch im seriellen
+Aufbau eine neue Seite waere, sehen die Seiten genauso aus wie aus einem
+einzigen doc.build. Die Seitenzahlen stehen vorher fest; jeder Abschnitt
+druckt "Seite N" mit seinem Versatz. Ob der Plan gestimmt hat, zeigt die
+Seitenzahl jedes Teils (export_to_pdf faellt sonst auf den seriellen Aufbau
+zurueck).
+
+Der Zusammenbau kennt nur, was reportlab schreibt: unverschachtelter
+Seitenbaum, Querverweise als Tabelle, keine Lesezeichen. Kein pypdf noetig.
+"""
+
+import re
+import sys
+import hashlib
+from contextlib import contextmanager
+
+
+# ── Seitenplan ───────────────────────────────────────────────────────────────
+def seitenplan(kopf, hoehen, erste, folge):
+    """
+    Zeilen pro Seite fuer eine Table mit repeatRows=1: kopf = Hoehe der
+    Kopfzeile, hoehen = die uebrigen Zeilen, erste/folge = verfuegbare Hoehe
+    auf der ersten bzw. jeder weiteren Seite. Passt auf eine Seite nur die
+    Kopfzeile, bleibt sie leer (0) und die Tabelle beginnt auf der naechsten.
+    """
+    seiten = []
+    start, verfuegbar = 0, erste
+    while True:
+        # wie Table._getFirstPossibleSplitRowPosition, gleiche Summationsreihenfolge
+        h = kopf if kopf <= verfuegbar else None
+        n = start
+        if h is not None:
+            while n < len(hoehen) and h + hoehen[n] <= verfuegbar:
+                h += hoehen[n]
+                n += 1
+        if n >= len(hoehen):
+            seiten.append(len(hoehen) - start)
+            return seiten
+        if n == start and verfuegbar == folge:
+            raise ValueError(f"Zeile {start} passt auf keine Seite")
+        seiten.append(n - start)
+        start, verfuegbar = n, folge
+
+
+def abschnitte(seiten, anzahl):
+    """
+    seiten (Zeilen pro Seite) in hoechstens anzahl aufeinanderfolgende
+    Abschnitte mit etwa gleich vielen Zeilen teilen -> [(erste_seite, seiten, erste_zeile, zeilen)]
+    """
+    gesamt = sum(seiten)
+    ziel = gesamt / max(1, anzahl)
+    ergebnis = []
+    seite0 = zeile0 = 0
+    zeilen = 0
+    for i, n in enumerate(seiten):
+        zeilen += n
+        rest_abschnitte = anzahl - len(ergebnis) - 1
+        if rest_abschnitte > 0 and zeilen >= ziel and i < len(seiten) - 1:
+            ergebnis.append((seite0, i + 1 - seite0, zeile0, zeilen))
+            seite0, zeile0, zeilen = i + 1, zeile0 + zeilen, 0
+    ergebnis.append((seite0, len(seiten) - seite0, zeile0, zeilen))
+    return ergebnis
+
+
+def _init_prozess():
+    # Statusmeldungen nicht auf stdout – das kann das Worker-Protokoll oder
+    # bei "-" die Datei selbst sein
+    sys.stdout = sys.stderr
+
+
+@contextmanager
+def prozesspool(workers):
+    """
+    multiprocessing.Pool fuer die Abschnitte. Bei einer Ausnahme (auch einem
+    Abbruch) beendet terminate() laufende Abschnitte, statt sie abzuwarten.
+    """
+    # Erst hier: multiprocessing kostet beim Import ~23 ms, das soll ein
+    # serieller Export nicht bezahlen
+    from multiprocessing import Pool
+
+    pool = Pool(workers, initializer=_init_prozess)
+    try:
+        yield pool
+    except BaseException:
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+
+# ── Zusammenfuegen ───────────────────────────────────────────────────────────
+_STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+_VERWEIS   = re.compile(rb"(\d+) 0 R")
+_KIDS      = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+
+
+class _Teil:
+    """Eine von reportlab geschriebene PDF-Datei, zerlegt in ihre Objekte"""
+
+    def __init__(self, daten):
+        m = _STARTXREF.search(daten)
+        if not m:
+            raise ValueError("PDF ohne startxref")
+        xref = int(m.group(1))
+        zeilen = daten[xref:].split(b"\n")
+        erste, anzahl = (int(x) for x in zeilen[1].split())
+        offsets = {}
+        for i, zeile in enumerate(zeilen[2:2 + anzahl], erste):
+            if zeile[17:18] == b"n":
+                offsets[i] = int(zeile[:10])
+
+        # Ein Objekt reicht bis zum Beginn des naechsten (bzw. der xref-Tabelle)
+        grenzen = sorted(offsets.values()) + [xref]
+        ende = dict(zip(grenzen, grenzen[1:]))
+        self.objekte = {}
+        for nummer, start in offsets.items():
+            roh = daten[start:ende[start]]
+            roh = roh[roh.index(b" obj") + 4:roh.rindex(b"endobj")]
+            self.objekte[nummer] = roh
+
+        trailer = daten[daten.rindex(b"trailer", 0, m.start()):m.start()]
+        self.root = int(re.search(rb"/Root (\d+) 0 R", trailer).group(1))
+        self.info = int(re.search(rb"/Info (\d+) 0 R", trailer).group(1))
+        self.pages = int(re.search(rb"/Pages (\d+) 0 R", self.objekte[self.root]).group(1))
+        self.seiten = [int(n) for n in _VERWEIS.findall(_KIDS.search(self.objekte[self.pages]).group(1))]
+        self.kopf = daten[:offsets[min(offsets)]] if offsets else b"%PDF-1.4\n"
+
+
+def _umnummerieren(roh, neu):
+    # Nur im Objekt-Dictionary – Stream-Daten bleiben unangetastet
+    dictionary, trenner, stream = roh.partition(b"stream\n")
+    dictionary = _VERWEIS.sub(lambda m: b"%d 0 R" % neu[int(m.group(1))], dictionary)
+    return dictionary + trenner + stream
+
+
+def zusammenfuegen(teile, ziel):
+    """
+    teile: PDF-Dateien (bytes) in Seitenreihenfolge; ziel: Pfad oder
+    beschreibbares Datei-Objekt. Gibt die Seitenzahl zurueck.
+    """
+    teile = [_Teil(daten) for daten in teile]
+    CATALOG, PAGES, INFO = 1, 2, 3
+    naechste = 4
+
+    koerper = []   # (nummer, inhalt)
+    kids = []
+    for n, teil in enumerate(teile):
+        neu = {teil.root: CATALOG, teil.pages: PAGES, teil.info: INFO}
+        for nummer in sorted(teil.objekte):
+            if nummer not in neu:
+                neu[nummer], naechste = naechste, naechste + 1
+        if n == 0:
+            koerper.append((INFO, _umnummerieren(teil.objekte[teil.info], neu)))
+        for nummer in sorted(teil.objekte):
+            if nummer in (teil.root, teil.pages, teil.info):
+                continue
+            koerper.append((neu[nummer], _umnummerieren(teil.objekte[nummer], neu)))
+        kids += [neu[s] for s in teil.seiten]
+
+    koerper.append((CATALOG, b"\n<<\n/PageMode /UseNone /Pages %d 0 R /Type /Catalog\n>>\n" % PAGES))
+    koerper.append((PAGES, b"\n<<\n/Count %d /Kids [ %s ] /Type /Pages\n>>\n"
+                    % (len(kids), b" ".join(b"%d 0 R" % k for k in kids))))
+    koerper.sort()
+
+    ausgabe = bytearray(teile[0].kopf)
+    offsets = []
+    for nummer, inhalt in koerper:
+        offsets.append(len(ausgabe))
+        ausgabe += b"%d 0 obj%sendobj\n" % (nummer, inhalt)
+
+    # Dokument-ID nur aus dem Inhalt, wie reportlab mit invariant=1
+    digest = hashlib.md5(ausgabe).hexdigest().encode("ascii")
+    xref = len(ausgabe)
+    ausgabe += b"xref\n0 %d\n0000000000 65535 f \n" % (len(koerper) + 1)
+    ausgabe += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    ausgabe += (b"trailer\n<<\n/ID \n[<%s><%s>]\n/Info %d 0 R\n/Root %d 0 R\n/Size %d\n>>\nstartxref\n%d\n%%%%EOF\n"
+                % (digest, digest, INFO, CATALOG, len(koerper) + 1, xref))
+
+    if isinstance(ziel, (str, bytes)) or hasattr(ziel, "__fspath__"):
+        with open(ziel, "wb") as f:
+            f.write(ausgabe)
+    else:
+        ziel.write(ausgabe)
+    return len(kids)
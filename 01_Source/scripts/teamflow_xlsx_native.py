@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Eigener xlsx-Schreiber fuer sehr grosse Excel-Exporte (--backend nativ)
+Schreibt das xlsx-Paket direkt mit zipfile statt ueber openpyxl: jedes
+Tabellenblatt geht Zeile fuer Zeile als XML in einen offenen Zip-Eintrag,
+im Speicher bleiben nur
+
+    - die Tabelle der gemeinsamen Strings (jeder Name, jede Abteilung, jedes
+      Typ-Label und Datum steht nur einmal in xl/sharedStrings.xml),
+    - die Zellformate (eine feste, kleine Menge – siehe Stile),
+    - die verbundenen Zellen und Verweise des gerade offenen Blatts.
+
+Zellformate werden wie im StilRegister (teamflow_xlsx_styles) ueber dieselben
+Schluessel bg/fg/bold/italic/size/horizontal/vertical/wrap/indent/border
+beschrieben, so dass beide Backends gleich aussehen. Zeichen, die in XML nicht
+erlaubt sind (Steuerzeichen aus Notizen), werden weggelassen – openpyxl
+bricht an dieser Stelle mit IllegalCharacterError ab.
+
+Aufbau:
+    mappe = Mappe(pfad_oder_datei, zeitstempel)
+    blatt = mappe.blatt("Details", [28, 20, ...], freeze="A5")
+    blatt.zeile([(wert, mappe.stile.index(bg=..., ...)), ...], hoehe, merge="A{row}:G{row}")
+    blatt.verweis(1, "'Anderes Blatt'!A1")     # Link in der letzten Zeile
+    mappe.speichere()      # bzw. mappe.verwerfen() nach einem Fehler
+"""
+
+import os
+import re
+import zipfile
+from datetime import datetime
+
+
+# Wie openpyxl.cell.cell.ILLEGAL_CHARACTERS_RE
+_UNERLAUBT = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+_NS       = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_R     = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG   = "http://schemas.openxmlformats.org/package/2006/relationships"
+_REL_TYP  = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+_CT       = "application/vnd.openxmlformats-officedocument.spreadsheetml."
+
+# Zeilen, die gesammelt und dann auf einmal komprimiert werden
+_PUFFER_ZEILEN = 512
+
+
+def _xml(text):
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return _UNERLAUBT.sub("", text)
+
+
+def _attr(text):
+    return _xml(text).replace('"', "&quot;")
+
+
+def spalte(n):
+    """1 -> A, 27 -> AA"""
+    buchstaben = ""
+    while n:
+        n, rest = divmod(n - 1, 26)
+        buchstaben = chr(65 + rest) + buchstaben
+    return buchstaben
+
+
+_SPALTEN = [None] + [spalte(n) for n in range(1, 65)]
+
+
+def _zelle_teilen(ref):
+    """"A5" -> (1, 5)"""
+    m = re.fullmatch(r"([A-Z]+)(\d+)", ref)
+    col = 0
+    for c in m.group(1):
+        col = col * 26 + ord(c) - 64
+    return col, int(m.group(2))
+
+
+# ── Zellformate ──────────────────────────────────────────────────────────────
+class Stile:
+    """
+    Zellformate der Mappe: Schluessel wie StilRegister.name() -> Index in cellXfs.
+    Index 0 ist das Standardformat ohne Schrift/Fuellung/Rahmen.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._fonts = ['<font><sz val="11"/><color theme="1"/><name val="Calibri"/>'
+                       '<family val="2"/><scheme val="minor"/></font>']
+        self._fills = ['<fill><patternFill/></fill>', '<fill><patternFill patternType="gray125"/></fill>']
+        self._borders = ['<border><left/><right/><top/><bottom/><diagonal/></border>']
+        self._xfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
+
+    def index(self, bg=None, fg=None, bold=False, italic=False, size=None,
+              horizontal=None, vertical=None, wrap=None, indent=0, border=None):
+        key = (bg, fg, bold, italic, size, horizontal, vertical, wrap, indent, border)
+        i = self._index.get(key)
+        if i is None:
+            i = self._index[key] = self._anlegen(key)
+        return i
+
+    @staticmethod
+    def _teil(liste, xml):
+        if xml not in liste:
+            liste.append(xml)
+        return liste.index(xml)
+
+    def _anlegen(self, key):
+        bg, fg, bold, italic, size, horizontal, vertical, wrap, indent, border = key
+
+        font_id = 0
+        if size is not None:
+            font_id = self._teil(self._fonts, "<font>"
+                                 + ('<b val="1"/>' if bold else "")
+                                 + ('<i val="1"/>' if italic else "")
+                                 + (f'<color rgb="00{fg}"/>' if fg else "")
+                                 + f'<sz val="{size}"/></font>')
+
+        fill_id = 0
+        if bg:
+            fill_id = self._teil(self._fills, f'<fill><patternFill patternType="solid"><fgColor rgb="00{bg}"/>'
+                                              f'<bgColor rgb="00{bg}"/></patternFill></fill>')
+
+        border_id = 0
+        if border:
+            seite = f'style="{border}"'
+            border_id = self._teil(self._borders, f'<border><left {seite}/><right {seite}/><top {seite}/>'
+                                                  f'<bottom {seite}/></border>')
+
+        ausrichtung = ""
+        if horizontal:
+            ausrichtung += f' horizontal="{horizontal}"'
+        if vertical:
+            ausrichtung += f' vertical="{vertical}"'
+        if wrap:
+            ausrichtung += ' wrapText="1"'
+        if indent:
+            ausrichtung += f' indent="{indent}"'
+
+        xf = (f'<xf numFmtId="0" fontId="{font_id}" fillId="{fill_id}" borderId="{border_id}" xfId="0"'
+              ' applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+              f'<alignment{ausrichtung}/></xf>')
+        self._xfs.append(xf)
+        return len(self._xfs) - 1
+
+    def __len__(self):
+        return len(self._xfs)
+
+    def xml(self):
+        def liste(tag, eintraege):
+            return f'<{tag} count="{len(eintraege)}">{"".join(eintraege)}</{tag}>'
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<styleSheet xmlns="{_NS}">'
+                + liste("fonts", self._fonts) + liste("fills", self._fills) + liste("borders", self._borders)
+                + '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+                + liste("cellXfs", self._xfs)
+                + '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+                + "</styleSheet>")
+
+
+# ── Tabellenblatt ────────────────────────────────────────────────────────────
+class Blatt:
+    def __init__(self, mappe, nummer, titel, breiten, freeze=None):
+        self.mappe  = mappe
+        self.titel  = titel
+        self.row    = 0
+        self._merge = []
+        self._links = []
+        self._puffer = []
+        self._datei = mappe._zip.open(mappe._eintrag(f"xl/worksheets/sheet{nummer}.xml"), "w", force_zip64=True)
+
+        kopf = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{_NS}" xmlns:r="{_NS_R}"><sheetViews><sheetView workbookViewId="0">']
+        if freeze:
+            col, row = _zelle_teilen(freeze)
+            pane = {(True, True): "bottomRight", (False, True): "bottomLeft", (True, False): "topRight"}.get((col > 1, row > 1))
+            if pane:
+                kopf.append("<pane"
+                            + (f' xSplit="{col - 1}"' if col > 1 else "")
+                            + (f' ySplit="{row - 1}"' if row > 1 else "")
+                            + f' topLeftCell="{freeze}" activePane="{pane}" state="frozen"/>'
+                            f'<selection pane="{pane}" activeCell="{freeze}" sqref="{freeze}"/>')
+        kopf.append('</sheetView></sheetViews><sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>')
+        if breiten:
+            kopf.append("<cols>")
+            kopf += [f'<col min="{i}" max="{i}" width="{b}" customWidth="1"/>' for i, b in enumerate(breiten, 1)]
+            kopf.append("</cols>")
+        kopf.append("<sheetData>")
+        self._datei.write("".join(kopf).encode("utf-8"))
+
+    def zeile(self, zellen, hoehe=None, merge=None):
+        """zellen: Liste von (wert, stil_index); wert None/"" = leere, nur formatierte Zelle"""
+        self.row += 1
+        r = self.row
+        if merge:
+            self._merge.append(merge.format(row=r))
+
+        teile = [f'<row r="{r}" ht="{hoehe}" customHeight="1">' if hoehe is not None else f'<row r="{r}">']
+        strings = self.mappe._strings
+        for col, (wert, s) in enumerate(zellen, 1):
+            ref = f"{_SPALTEN[col]}{r}"
+            if wert is None or wert == "":
+                # Leere Strings schreibt openpyxl ebenfalls als leere Zelle
+                teile.append(f'<c r="{ref}" s="{s}"/>')
+            elif type(wert) is str:
+                i = strings.get(wert)
+                if i is None:
+                    i = strings[wert] = len(strings)
+                teile.append(f'<c r="{ref}" s="{s}" t="s"><v>{i}</v></c>')
+            elif type(wert) is bool:
+                teile.append(f'<c r="{ref}" s="{s}" t="b"><v>{int(wert)}</v></c>')
+            else:
+                teile.append(f'<c r="{ref}" s="{s}" t="n"><v>{wert!r}</v></c>')
+        teile.append("</row>")
+
+        self._puffer.append("".join(teile))
+        if len(self._puffer) >= _PUFFER_ZEILEN:
+            self._leeren()
+
+    def verweis(self, spalte, ziel):
+        """Interner Link auf ziel (z.B. "'Blatt'!A1") in Spalte spalte (1 = A) der letzten Zeile"""
+        self._links.append((f"{_SPALTEN[spalte]}{self.row}", ziel))
+
+    def _leeren(self):
+        if self._puffer:
+            self._datei.write("".join(self._puffer).encode("utf-8"))
+            self._puffer = []
+
+    def schliesse(self):
+        self._leeren()
+        ende = ["</sheetData>"]
+        if self._merge:
+            ende.append(f'<mergeCells count="{len(self._merge)}">')
+            ende += [f'<mergeCell ref="{ref}"/>' for ref in self._merge]
+            ende.append("</mergeCells>")
+        if self._links:
+            ende.append("<hyperlinks>")
+            ende += [f'<hyperlink ref="{ref}" location="{_attr(ziel)}"/>' for ref, ziel in self._links]
+            ende.append("</hyperlinks>")
+        ende.append("</worksheet>")
+        self._datei.write("".join(ende).encode("utf-8"))
+        self._datei.close()
+
+
+# ── Arbeitsmappe ─────────────────────────────────────────────────────────────
+class Mappe:
+    """
+    ziel: Pfad oder beschreibbares Datei-Objekt. zeitstempel (datetime) wird
+    Aenderungsdatum aller Zip-Eintraege – gleiche Eingabe, gleiche Datei.
+    """
+
+    def __init__(self, ziel, zeitstempel=None):
+        self._ziel    = ziel
+        self._zip     = zipfile.ZipFile(ziel, "w", zipfile.ZIP_DEFLATED)
+        self._datum   = (zeitstempel or datetime.now()).timetuple()[:6]
+        self._strings = {}
+        self.stile    = Stile()
+        self._blaetter = []
+        self._offen   = None
+
+    def _eintrag(self, name):
+        info = zipfile.ZipInfo(name, date_time=max(self._datum, (1980, 1, 1, 0, 0, 0)))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def _schreibe(self, name, text):
+        self._zip.writestr(self._eintrag(name), text.encode("utf-8"))
+
+    def blatt(self, titel, breiten=(), freeze=None):
+        """Neues Blatt; das vorige wird dabei abgeschlossen"""
+        if self._offen:
+            self._offen.schliesse()
+        self._offen = Blatt(self, len(self._blaetter) + 1, titel, breiten, freeze)
+        self._blaetter.append(titel)
+        return self._offen
+
+    def speichere(self):
+        if self._offen:
+            self._offen.schliesse()
+            self._offen = None
+
+        n = len(self._blaetter)
+        self._schreibe("[Content_Types].xml",
+                       '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                       '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                       '<Default Extension="xml" ContentType="application/xml"/>'
+                       f'<Override PartName="/xl/workbook.xml" ContentType="{_CT}sheet.main+xml"/>'
+                       + "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_CT}worksheet+xml"/>'
+                                 for i in range(1, n + 1))
+                       + f'<Override PartName="/xl/styles.xml" ContentType="{_CT}styles+xml"/>'
+                       f'<Override PartName="/xl/sharedStrings.xml" ContentType="{_CT}sharedStrings+xml"/>'
+                       "</Types>")
+        self._schreibe("_rels/.rels",
+                       f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_NS_PKG}">'
+                       f'<Relationship Id="rId1" Type="{_REL_TYP}officeDocument" Target="xl/workbook.xml"/>'
+                       "</Relationships>")
+        self._schreibe("xl/workbook.xml",
+                       f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<workbook xmlns="{_NS}" xmlns:r="{_NS_R}">'
+                       '<bookViews><workbookView/></bookViews><sheets>'
+                       + "".join(f'<sheet name="{_attr(titel)}" sheetId="{i}" r:id="rId{i}"/>'
+                                 for i, titel in enumerate(self._blaetter, 1))
+                       + "</sheets></workbook>")
+        self._schreibe("xl/_rels/workbook.xml.rels",
+                       f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<Relationships xmlns="{_NS_PKG}">'
+                       + "".join(f'<Relationship Id="rId{i}" Type="{_REL_TYP}worksheet" Target="worksheets/sheet{i}.xml"/>'
+                                 for i in range(1, n + 1))
+                       + f'<Relationship Id="rId{n + 1}" Type="{_REL_TYP}styles" Target="styles.xml"/>'
+                       f'<Relationship Id="rId{n + 2}" Type="{_REL_TYP}sharedStrings" Target="sharedStrings.xml"/>'
+                       "</Relationships>")
+        self._schreibe("xl/styles.xml", self.stile.xml())
+        self._schreibe_strings()
+        self._zip.close()
+
+    def verwerfen(self):
+        """Nach einem Fehler: Zip schliessen und die halbe Datei loeschen"""
+        try:
+            if self._offen:
+                self._offen._datei.close()
+            self._zip.close()
+        except (OSError, ValueError):
+            pass
+        if isinstance(self._ziel, (str, os.PathLike)):
+            try:
+                os.remove(self._ziel)
+            except OSError:
+                pass
+
+    def _schreibe_strings(self):
+        with self._zip.open(self._eintrag("xl/sharedStrings.xml"), "w", force_zip64=True) as f:
+            anzahl = len(self._strings)
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<sst xmlns="{_NS}" count="{anzahl}" uniqueCount="{anzahl}">'.encode("utf-8"))
+            puffer = []
+            # dicts behalten die Einfuegereihenfolge = Index
+            for text in self._strings:
+                if text != text.strip():
+                    puffer.append(f'<si><t xml:space="preserve">{_xml(text)}</t></si>')
+                else:
+                    puffer.append(f"<si><t>{_xml(text)}</t></si>")
+                if len(puffer) >= 4096:
+                    f.write("".join(puffer).encode("utf-8"))
+                    puffer = []
+            puffer.append("</sst>")
+            f.write("".join(puffer).encode("utf-8"))
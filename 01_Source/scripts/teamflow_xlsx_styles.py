@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Zellstile fuer die openpyxl-Exporte von TeamFlow
+Jede Kombination aus Hintergrund, Schrift, Ausrichtung und Rahmen wird pro
+Arbeitsmappe genau einmal als versteckter NamedStyle angelegt und danach nur
+noch per Name zugewiesen – statt pro Zelle neue Font/PatternFill/Alignment/
+Border-Objekte zu bauen, die openpyxl beim Zuweisen erst wieder deduplizieren
+muss.
+"""
+
+import weakref
+from copy import copy
+
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.styles.fills import DEFAULT_EMPTY_FILL
+from openpyxl.styles.borders import DEFAULT_BORDER
+
+
+_SIDES = {
+    "thin":   Side(style="thin"),
+    "medium": Side(style="medium"),
+}
+
+_REGISTER = weakref.WeakKeyDictionary()
+
+
+def _border(art):
+    if art is None:
+        return copy(DEFAULT_BORDER)
+    side = _SIDES[art]
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+class StilRegister:
+    """Interner Stil-Cache einer Arbeitsmappe: Schluessel -> NamedStyle-Name"""
+
+    def __init__(self, wb):
+        self.wb = wb
+        self._namen = {}
+
+    def name(self, bg=None, fg=None, bold=False, italic=False, size=None,
+             horizontal=None, vertical=None, wrap=None, indent=0, border=None):
+        """
+        Liefert den Namen des NamedStyle fuer diese Kombination und legt ihn
+        beim ersten Aufruf an.
+
+        size=None bedeutet: keine eigene Schrift, Standardschrift der Mappe.
+        border: None, "thin" oder "medium" (alle vier Seiten).
+        """
+        key = (bg, fg, bold, italic, size, horizontal, vertical, wrap, indent, border)
+        name = self._namen.get(key)
+        if name is None:
+            name = self._anlegen(key)
+        return name
+
+    def anwenden(self, cell, **stil):
+        cell.style = self.name(**stil)
+
+    def _anlegen(self, key):
+        bg, fg, bold, italic, size, horizontal, vertical, wrap, indent, border = key
+
+        if size is None:
+            font = copy(DEFAULT_FONT)
+        else:
+            font = Font(color=fg, bold=bold, italic=italic, size=size)
+
+        fill = PatternFill(start_color=bg, end_color=bg, fill_type="solid") if bg else copy(DEFAULT_EMPTY_FILL)
+
+        if horizontal or vertical or wrap is not None or indent:
+            alignment = Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap, indent=indent)
+        else:
+            alignment = Alignment()
+
+        name = f"tf_{len(self._namen)}"
+        self.wb.add_named_style(NamedStyle(
+            name=name,
+            font=font,
+            fill=fill,
+            border=_border(border),
+            alignment=alignment,
+            hidden=True,
+        ))
+        self._namen[key] = name
+        return name
+
+    def __len__(self):
+        return len(self._namen)
+
+
+def stil_register(wb):
+    """Liefert das (einmal pro Arbeitsmappe angelegte) Stil-Register"""
+    register = _REGISTER.get(wb)
+    if register is None:
+        register = _REGISTER[wb] = StilRegister(wb)
+    return register
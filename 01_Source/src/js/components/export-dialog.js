@@ -2,23 +2,11 @@
  * Export-Dialog
  * Einheitlicher Export für Excel und PDF mit Zeitraum-, Typ- und Mitarbeiter-Filter
  *
- * FIX: _sammleExportDaten() griff direkt auf die globalen Variablen
- * `database` und `dataManager` zu ohne zu prüfen ob sie initialisiert sind.
- * Falls renderer.js sich ändert oder der Dialog vor der App-Initialisierung
- * geöffnet wird, entstand ein stiller Fehler ("cannot read property of undefined").
- * Fix: Hilfsfunktion _getGlobals() die früh einen klaren Fehler wirft.
+ * Die Daten werden nicht mehr im Renderer gesammelt (vorher bis zu vier
+ * IPC-Abfragen pro Mitarbeiter plus temporäre JSON-Datei). Der Dialog schickt
+ * nur Zeitraum und Filter; das Export-Script liest die Datenbank selbst.
  */
 
-function _getGlobals() {
-  if (typeof dataManager === 'undefined' || !dataManager) {
-    throw new Error('dataManager nicht initialisiert – bitte App neu starten');
-  }
-  if (typeof database === 'undefined' || !database) {
-    throw new Error('database nicht initialisiert – bitte App neu starten');
-  }
-  return { dataManager, database };
-}
-
 async function zeigeExportDialog() {
   const heute = new Date();
   const ersterDesMonats = new Date(heute.getFullYear(), heute.getMonth(), 1);
@@ -77,10 +65,14 @@ async function zeigeExportDialog() {
                   <input class="form-check-input" type="radio" name="zeitraumModus" id="modusFreieBisDatum" value="frei">
                   <label class="form-check-label" for="modusFreieBisDatum">Freie Auswahl</label>
                 </div>
+                <div class="form-check form-check-inline">
+                  <input class="form-check-input" type="radio" name="zeitraumModus" id="modusJahr" value="jahr">
+                  <label class="form-check-label" for="modusJahr">Jahresübersicht je Mitarbeiter</label>
+                </div>
               </div>
               <div id="zeitraumMonat">
                 <div class="row g-2">
-                  <div class="col-md-6"><select class="form-select" id="exportMonat">${monatOptionen}</select></div>
+                  <div class="col-md-6" id="exportMonatSpalte"><select class="form-select" id="exportMonat">${monatOptionen}</select></div>
                   <div class="col-md-6"><select class="form-select" id="exportJahr">${jahrOptionen}</select></div>
                 </div>
               </div>
@@ -151,7 +143,8 @@ async function zeigeExportDialog() {
   modalElement.querySelectorAll('[name="zeitraumModus"]').forEach(radio => {
     radio.addEventListener('change', () => {
       const modus = modalElement.querySelector('[name="zeitraumModus"]:checked').value;
-      modalElement.querySelector('#zeitraumMonat').classList.toggle('d-none', modus !== 'monat');
+      modalElement.querySelector('#zeitraumMonat').classList.toggle('d-none', modus === 'frei');
+      modalElement.querySelector('#exportMonatSpalte').classList.toggle('d-none', modus === 'jahr');
       modalElement.querySelector('#zeitraumFrei').classList.toggle('d-none', modus !== 'frei');
     });
   });
@@ -160,6 +153,9 @@ async function zeigeExportDialog() {
     const btn = modalElement.querySelector('#btnExportStarten');
     btn.disabled = true;
     btn.innerHTML = '<span class="spinner-border spinner-border-sm me-2"></span>Wird erstellt...';
+    const abmelden = window.electronAPI.onExportProgress?.((ereignis) => {
+      btn.innerHTML = `<span class="spinner-border spinner-border-sm me-2"></span>${_fortschrittText(ereignis)}`;
+    });
     try {
       await _starteExport(modalElement);
       modal.hide();
@@ -167,6 +163,8 @@ async function zeigeExportDialog() {
       showNotification('Fehler', error.message, 'danger');
       btn.disabled = false;
       btn.innerHTML = '<i class="bi bi-box-arrow-up"></i> Export starten';
+    } finally {
+      abmelden?.();
     }
   });
 
@@ -174,10 +172,25 @@ async function zeigeExportDialog() {
   modalElement.addEventListener('hidden.bs.modal', () => { modal.dispose(); modalElement.remove(); });
 }
 
+// Fortschrittsmeldung der Export-Scripts -> Button-Text
+function _fortschrittText({ phase, done, total }) {
+  const stand = total ? `${done} / ${total}` : `${done ?? ''}`;
+  switch (phase) {
+    case 'zusammenfassung': return `Zusammenfassung ${stand}`;
+    case 'detail':          return `Einträge ${stand}`;
+    case 'seiten':          return `Seite ${done}`;
+    case 'dateien':         return `Dateien ${stand}`;
+    case 'speichern':       return 'Wird gespeichert...';
+    default:                return 'Wird erstellt...';
+  }
+}
+
 async function _starteExport(modalElement) {
   const format  = modalElement.querySelector('[name="exportFormat"]:checked').value;
   const modus   = modalElement.querySelector('[name="zeitraumModus"]:checked').value;
 
+  if (modus === 'jahr') return _starteJahresBatch(modalElement, format);
+
   let vonDatum, bisDatum;
   if (modus === 'monat') {
     const monat = parseInt(modalElement.querySelector('#exportMonat').value);
@@ -191,22 +204,13 @@ async function _starteExport(modalElement) {
     if (bisDatum < vonDatum) throw new Error('Bis-Datum muss nach Von-Datum liegen');
   }
 
-  const typen = {
-    urlaub:       modalElement.querySelector('#filterUrlaub').checked,
-    krankheit:    modalElement.querySelector('#filterKrankheit').checked,
-    schulung:     modalElement.querySelector('#filterSchulung').checked,
-    ueberstunden: modalElement.querySelector('#filterUeberstunden').checked,
-  };
-  if (!Object.values(typen).some(Boolean)) throw new Error('Bitte mindestens einen Abwesenheitstyp wählen');
-
+  const typen = _gewaehlteTypen(modalElement);
   const nurMitEintraegen = modalElement.querySelector('[name="mitarbeiterFilter"]:checked').value === 'mitEintraegen';
-  const exportData = await _sammleExportDaten(vonDatum, bisDatum, typen, nurMitEintraegen);
-
-  if (exportData.mitarbeiter.length === 0) throw new Error('Keine Daten für den gewählten Zeitraum gefunden');
 
   showNotification('Export', 'Wird erstellt...', 'info');
 
-  const payload = { exportData, vonDatum, bisDatum };
+  // "Keine Daten für den gewählten Zeitraum gefunden" meldet jetzt das Script
+  const payload = { vonDatum, bisDatum, typen, nurMitEintraegen };
   const result  = format === 'excel'
     ? await window.electronAPI.exportExcel(payload)
     : await window.electronAPI.exportPdf(payload);
@@ -218,48 +222,63 @@ async function _starteExport(modalElement) {
   }
 }
 
-async function _sammleExportDaten(vonDatum, bisDatum, typen, nurMitEintraegen) {
-  // FIX: Globals mit Fehlercheck statt stiller undefined-Zugriffe
-  const { dataManager: dm, database: db } = _getGlobals();
-
-  const alleMitarbeiter = await dm.getAlleMitarbeiter();
-  const ergebnis = [];
-
-  await Promise.all(alleMitarbeiter.map(async (ma) => {
-    const eintraege = [];
-    const zp = [ma.id, vonDatum, bisDatum, vonDatum, bisDatum, vonDatum, bisDatum];
-
-    const queries = [];
-    if (typen.urlaub)    queries.push(db.query(`SELECT 'urlaub' as typ, von_datum, bis_datum, tage as wert, notiz, NULL as titel FROM urlaub WHERE mitarbeiter_id = ? AND ((von_datum BETWEEN ? AND ?) OR (bis_datum BETWEEN ? AND ?) OR (von_datum <= ? AND bis_datum >= ?)) ORDER BY von_datum`, zp));
-    if (typen.krankheit) queries.push(db.query(`SELECT 'krankheit' as typ, von_datum, bis_datum, tage as wert, notiz, NULL as titel FROM krankheit WHERE mitarbeiter_id = ? AND ((von_datum BETWEEN ? AND ?) OR (bis_datum BETWEEN ? AND ?) OR (von_datum <= ? AND bis_datum >= ?)) ORDER BY von_datum`, zp));
-    if (typen.schulung)  queries.push(db.query(`SELECT 'schulung' as typ, datum as von_datum, datum as bis_datum, dauer_tage as wert, notiz, titel FROM schulung WHERE mitarbeiter_id = ? AND datum BETWEEN ? AND ? ORDER BY datum`, [ma.id, vonDatum, bisDatum]));
-    if (typen.ueberstunden) queries.push(db.query(`SELECT 'ueberstunden' as typ, datum as von_datum, datum as bis_datum, ABS(stunden) as wert, notiz, NULL as titel FROM ueberstunden WHERE mitarbeiter_id = ? AND datum BETWEEN ? AND ? AND stunden < 0 ORDER BY datum`, [ma.id, vonDatum, bisDatum]));
+function _gewaehlteTypen(modalElement) {
+  const typen = {
+    urlaub:       modalElement.querySelector('#filterUrlaub').checked,
+    krankheit:    modalElement.querySelector('#filterKrankheit').checked,
+    schulung:     modalElement.querySelector('#filterSchulung').checked,
+    ueberstunden: modalElement.querySelector('#filterUeberstunden').checked,
+  };
+  if (!Object.values(typen).some(Boolean)) throw new Error('Bitte mindestens einen Abwesenheitstyp wählen');
+  return Object.keys(typen).filter(typ => typen[typ]);
+}
 
-    const results = await Promise.all(queries);
-    results.forEach(r => { if (r.success) eintraege.push(...r.data); });
+/**
+ * Jahresübersicht für alle Mitarbeiter auf einmal (eine Datei pro Mitarbeiter).
+ * Die Einträge liest das Script aus der Datenbank; Anspruch, Übertrag und
+ * Verfall berechnet weiterhin der DataManager und wird als stats mitgeschickt.
+ */
+async function _starteJahresBatch(modalElement, format) {
+  if (typeof dataManager === 'undefined' || !dataManager) {
+    throw new Error('dataManager nicht initialisiert – bitte App neu starten');
+  }
+  const jahr  = parseInt(modalElement.querySelector('#exportJahr').value);
+  const typen = _gewaehlteTypen(modalElement);
+  const nurMitEintraegen = modalElement.querySelector('[name="mitarbeiterFilter"]:checked').value === 'mitEintraegen';
 
-    if (nurMitEintraegen && eintraege.length === 0) return;
+  showNotification('Export', 'Jahresübersichten werden erstellt...', 'info');
+
+  const originalJahr = dataManager.aktuellesJahr;
+  let statistiken;
+  try {
+    dataManager.aktuellesJahr = jahr;
+    dataManager.invalidateCache();
+    statistiken = await dataManager.getAlleStatistiken();
+  } finally {
+    dataManager.aktuellesJahr = originalJahr;
+    dataManager.invalidateCache();
+  }
 
-    const zusammenfassung = {
-      urlaub_tage:        eintraege.filter(e => e.typ === 'urlaub').reduce((s, e) => s + e.wert, 0),
-      krankheit_tage:     eintraege.filter(e => e.typ === 'krankheit').reduce((s, e) => s + e.wert, 0),
-      schulung_tage:      eintraege.filter(e => e.typ === 'schulung').reduce((s, e) => s + e.wert, 0),
-      ueberstunden_abbau: eintraege.filter(e => e.typ === 'ueberstunden').reduce((s, e) => s + e.wert, 0),
+  const stats = {};
+  for (const stat of statistiken) {
+    stats[stat.mitarbeiter.id] = {
+      urlaubsanspruch:   stat.urlaubsanspruch,
+      uebertrag_vorjahr: stat.uebertrag_vorjahr,
+      urlaub_verfuegbar: stat.urlaub_verfuegbar,
+      urlaub_genommen:   stat.urlaub_genommen,
+      urlaub_rest:       stat.urlaub_rest,
+      krankheitstage:    stat.krankheitstage,
+      schulungstage:     stat.schulungstage,
+      ueberstunden:      stat.ueberstunden,
     };
+  }
 
-    ergebnis.push({
-      mitarbeiter: { id: ma.id, name: `${ma.vorname} ${ma.nachname}`, abteilung: ma.abteilung_name },
-      zusammenfassung,
-      eintraege,
-    });
-  }));
-
-  ergebnis.sort((a, b) => {
-    const abt = (a.mitarbeiter.abteilung || '').localeCompare(b.mitarbeiter.abteilung || '');
-    return abt !== 0 ? abt : a.mitarbeiter.name.localeCompare(b.mitarbeiter.name);
-  });
-
-  return { mitarbeiter: ergebnis, vonDatum, bisDatum };
+  const result = await window.electronAPI.exportEmployeeYearBatch({ format, jahr, typen, stats, nurMitEintraegen });
+  if (result.success) {
+    showNotification('Erfolg', `Jahresübersichten ${jahr} erstellt: ${result.path}`, 'success');
+  } else {
+    throw new Error(result.error);
+  }
 }
 
 function _formatExportDatum(date) {
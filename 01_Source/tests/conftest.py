@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+# Die Exporter liegen in scripts/, die Test-Payloads in benchmarks/payloads.py
+import os
+import sys
+
+HIER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HIER, "..", "benchmarks"))
+sys.path.insert(0, os.path.join(HIER, "..", "scripts"))
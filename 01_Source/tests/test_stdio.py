@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+"-" als Ein- und Ausgabe (teamflow_export_stdio): JSON von stdin und Datei in
+den StdoutPuffer ergeben dieselbe Datei wie input.json und Ausgabepfad.
+Mit festem erstelltAm byteweise (teamflow_export_reproduzierbar).
+"""
+
+import io
+import json
+
+import pytest
+
+from payloads import erzeuge_zeitraum_payload, erzeuge_jahres_payload, erzeuge_stammdaten_payload
+from teamflow_export_modell import lade_json
+from teamflow_export_stdio import StdoutPuffer, senden
+import export_to_excel
+import export_to_pdf
+import export_employee_detail
+import export_employee_year
+import export_employee_year_excel
+
+
+FAELLE = {
+    # name: (create, kwargs, endung, payload-fabrik)
+    "excel":          (export_to_excel.create_excel, {}, ".xlsx", lambda: erzeuge_zeitraum_payload(20, 3)),
+    "excel/stream":   (export_to_excel.create_excel, {"streaming_ab": 0}, ".xlsx", lambda: erzeuge_zeitraum_payload(20, 3)),
+    "excel/nativ":    (export_to_excel.create_excel, {"backend": "nativ"}, ".xlsx", lambda: erzeuge_zeitraum_payload(20, 3)),
+    "pdf":            (export_to_pdf.create_pdf, {"workers": 1}, ".pdf", lambda: erzeuge_zeitraum_payload(20, 3)),
+    "detail-pdf":     (export_employee_detail.create_stammdaten_pdf, {}, ".pdf", erzeuge_stammdaten_payload),
+    "year-pdf":       (export_employee_year.create_year_pdf, {}, ".pdf", lambda: erzeuge_jahres_payload(5)),
+    "year-excel":     (export_employee_year_excel.create_employee_year_excel, {}, ".xlsx",
+                       lambda: erzeuge_jahres_payload(5)),
+}
+
+
+@pytest.mark.parametrize("name", FAELLE)
+def test_pipe_gleich_datei(name, tmp_path, monkeypatch):
+    create, kwargs, endung, fabrik = FAELLE[name]
+    payload = fabrik()
+    payload["erstelltAm"] = "2025-01-02T03:04"
+
+    eingabe = tmp_path / "input.json"
+    eingabe.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    ausgabe = tmp_path / f"ausgabe{endung}"
+    create(lade_json(str(eingabe)), str(ausgabe), **kwargs)
+
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(json.dumps(payload).encode("utf-8"))))
+    stdout = io.BytesIO()
+    ziel = StdoutPuffer(endung, stdout)
+    create(lade_json("-"), ziel, **kwargs)
+    assert stdout.getvalue() == b""  # erst nach dem Export
+    senden(ziel)
+
+    assert stdout.getvalue() == ausgabe.read_bytes()
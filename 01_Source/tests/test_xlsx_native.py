@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Eigener xlsx-Schreiber (export_to_excel --backend nativ) gegen openpyxl
+write_only: beide Dateien mit openpyxl geoeffnet und Zelle fuer Zelle
+verglichen (Werte, Schrift, Fuellung, Ausrichtung, Rahmen, verbundene Zellen,
+Freeze-Panes, Spaltenbreiten, Zeilenhoehen).
+"""
+
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from payloads import erzeuge_zeitraum_payload
+from teamflow_export_modell import lade_json_text
+import export_to_excel
+
+
+def inhalt(pfad):
+    """Alles, was die beiden Backends gleich schreiben muessen, als vergleichbare Liste"""
+    wb = load_workbook(pfad)
+    ergebnis = []
+    for ws in wb.worksheets:
+        ergebnis.append(("blatt", ws.title, ws.freeze_panes, sorted(str(r) for r in ws.merged_cells.ranges)))
+        ergebnis.append(("breiten", sorted((k, d.width) for k, d in ws.column_dimensions.items() if d.width)))
+        ergebnis.append(("hoehen", sorted((k, d.height) for k, d in ws.row_dimensions.items() if d.height)))
+        for zeile in ws.iter_rows():
+            for c in zeile:
+                if c.value is None and not c.has_style:
+                    continue
+                ergebnis.append((ws.title, c.coordinate, c.value, repr(c.font), repr(c.fill),
+                                 repr(c.alignment), repr(c.border), c.number_format))
+    return ergebnis
+
+
+@pytest.fixture(scope="module")
+def payload_text():
+    payload = erzeuge_zeitraum_payload(40, 5)
+    payload["erstelltAm"] = "2025-01-02T03:04"
+    payload["exportData"]["mitarbeiter"][0]["eintraege"][0]["notiz"] = '  Umlaute äöü & <Klammern> "Zitat"  '
+    return json.dumps(payload)
+
+
+def test_nativ_gleich_openpyxl(payload_text, tmp_path):
+    stream, nativ = tmp_path / "stream.xlsx", tmp_path / "nativ.xlsx"
+    export_to_excel.create_excel(lade_json_text(payload_text), str(stream), streaming_ab=0)
+    export_to_excel.create_excel(lade_json_text(payload_text), str(nativ), backend="nativ")
+
+    a, b = inhalt(stream), inhalt(nativ)
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        assert x == y
+
+
+def test_nativ_sonderzeichen(payload_text, tmp_path):
+    nativ = tmp_path / "nativ.xlsx"
+    export_to_excel.create_excel(lade_json_text(payload_text), str(nativ), backend="nativ")
+    werte = {c.value for ws in load_workbook(nativ).worksheets for zeile in ws.iter_rows() for c in zeile}
+    assert '  Umlaute äöü & <Klammern> "Zitat"  ' in werte